@@ -53,26 +53,30 @@ from litex_m2sdr.gateware.si5351           import SI5351
 from litex_m2sdr.gateware.ad9361.core import AD9361RFIC
 from litex_m2sdr.gateware.qpll        import SharedQPLL
 from litex_m2sdr.gateware.time        import TimeGenerator, TimeNsToPS
-from litex_m2sdr.gateware.ptp_discipline import PTPTimeDiscipline, TimeDisciplineCDC
+from litex_m2sdr.gateware.ptp_discipline import PTPTimeDiscipline, PTPDisciplineHistory, TimeDisciplineCDC
 from litex_m2sdr.gateware.ptp_identity   import PTPIdentityTracker
 from litex_m2sdr.gateware.pps         import PPSGenerator
+from litex_m2sdr.gateware.timestamper import DualEdgeSampler, ClockMarker, EventTimestamper
 from litex_m2sdr.gateware.pcie        import (
     PCIeLinkResetWorkaround,
     LitePCIeWishboneBurstReadSlave,
     add_s7_pcie_timing_constraints,
 )
-from litex_m2sdr.gateware.header      import TXRXHeader
+from litex_m2sdr.gateware.header      import TXRXHeader, TXScheduler, RXWindowGate
 from litex_m2sdr.gateware.led         import StatusLed
 from litex_m2sdr.gateware.measurement import MultiClkMeasurement
+from litex_m2sdr.gateware.telemetry   import TelemetrySnapshot
 from litex_m2sdr.gateware.gpio        import GPIO
 from litex_m2sdr.gateware.loopback    import TXRXLoopback
-from litex_m2sdr.gateware.rfic        import RFICDataPacketizer
+from litex_m2sdr.gateware.fanout      import RXFanout
+from litex_m2sdr.gateware.rfic        import RFICDataPacketizer, RFIC_SAMPLE_COUNT_BITS, rfic_rx_layout
 from litex_m2sdr.gateware.vrt         import VRTSignalPacketStreamer
 from litex_m2sdr.gateware.sata        import (
     SATA_HOST_BUFFER_BASE, SATA_HOST_BUFFER_SIZE, SATAHostBuffer,
     SATADMAMemoryRouter,
     M2SDRLiteSATASector2MemDMA, M2SDRLiteSATAMem2SectorDMA,
-    M2SDRLiteSATAStream2Sectors, M2SDRLiteSATASectors2Stream)
+    M2SDRLiteSATAStream2Sectors, M2SDRLiteSATASectors2Stream,
+    SATAStreamCompressor)
 
 from litex_m2sdr.software import generate_litepcie_software
 
@@ -258,6 +262,7 @@ class BaseSoC(SoCMini):
         "eth_ptp"          : 37,
         "ptp_discipline"   : 38,
         "ptp_identity"     : 39,
+        "ptp_history"      : 43,
 
         # SATA.
         "sata_phy"         : 18,
@@ -267,6 +272,7 @@ class BaseSoC(SoCMini):
         "sata_sector2mem"  : 28,
         "sata_rx_streamer" : 29,
         "sata_tx_streamer" : 32,
+        "sata_rx_compressor" : 22,
 
         # GPIO.
         "gpio"             : 21,
@@ -276,6 +282,8 @@ class BaseSoC(SoCMini):
         "clk10_discipline" : 40,
         "ptp_clk10_discipline" : 41,
         "header"           : 23,
+        "tx_scheduler"     : 45,
+        "rx_window"        : 46,
         "ad9361"           : 24,
         "crossbar"         : 25,
         "txrx_loopback"    : 33,
@@ -283,6 +291,8 @@ class BaseSoC(SoCMini):
         # Measurements/Analyzer.
         "clk_measurement"  : 30,
         "analyzer"         : 31,
+        "telemetry"        : 42,
+        "event_timestamper": 44,
         "eth_rx_mode"      : 35,
         "vrt_streamer"     : 36,
     }
@@ -292,14 +302,25 @@ class BaseSoC(SoCMini):
         with_eth               = False, eth_sfp=0, eth_phy="1000basex", eth_local_ip="192.168.1.50", eth_udp_port=2345,
         with_eth_ptp           = False, eth_ptp_p2p=False, eth_ptp_igmp=True, eth_ptp_igmp_interval=2,
         with_eth_ptp_rfic_clock = False,
-        with_eth_vrt           = False, vrt_dst_ip="239.168.1.100", vrt_dst_port=4991,
-        with_sata              = False, sata_gen=2,
+        with_ptp_history       = False,
+        with_eth_vrt           = False, vrt_dst_ip="239.168.1.100", vrt_dst_port=4991, vrt_stream_id=0xdeadbeef,
+        vrt_data_words         = 256,   vrt_max_data_words=None, vrt_with_class_id=False, vrt_with_trailer=False,
+        vrt_with_context       = False, vrt_timestamp="real-time",
+        with_sata              = False, sata_gen=2, with_sata_compression=False,
         with_white_rabbit      = False, wr_sfp=None, wr_dac_bits=16, wr_firmware=None,
         wr_nic_dir             = None,
         wr_ext_clk10_port      = None,  wr_ext_clk10_period=100.0, wr_ext_clk10_name="wr_ext_clk10",
         with_jtagbone          = True,
         with_gpio              = False,
+        with_event_timestamper = False,
+        with_telemetry         = False,
         with_rfic_oversampling = False,
+        rfic_bfp_bits          = None,
+        with_rx_ddc            = False,
+        with_tx_duc            = False,
+        with_rx_fanout         = False,
+        with_tx_scheduler      = False,
+        with_rx_window         = False,
     ):
         # Platform ---------------------------------------------------------------------------------
 
@@ -333,6 +354,8 @@ class BaseSoC(SoCMini):
             raise ValueError("PTP RFIC clock discipline requires --with-eth-ptp.")
         if with_eth_ptp_rfic_clock and with_white_rabbit:
             raise ValueError("PTP RFIC clock discipline uses the non-White-Rabbit clk10 MMCM path.")
+        if with_ptp_history and not with_eth_ptp:
+            raise ValueError("PTP discipline history requires --with-eth-ptp.")
 
         # SoCMini ----------------------------------------------------------------------------------
 
@@ -409,7 +432,8 @@ class BaseSoC(SoCMini):
         self.bus.add_master(name="si5351", master=self.si5351.sequencer.bus)
 
         # SI5351 ClkIn Ext/uFL.
-        self.comb += self.si5351.clkin_ufl.eq(platform.request("sync_clk_in"))
+        sync_clk_in = platform.request("sync_clk_in")
+        self.comb += self.si5351.clkin_ufl.eq(sync_clk_in)
 
         # SI5351 ClkIn/Out.
         si5351_clk0   = platform.request("si5351_clk0")
@@ -577,6 +601,11 @@ class BaseSoC(SoCMini):
                     self.ptm_requester.time.eq(self.time_gen.time)
                 ]
 
+        # RX stream: with VRT, RX words carry the low bits of their RFIC sample count to the VRT
+        # streamer (sample-count timestamps), other consumers ignore it.
+        rx_sample_count_bits = RFIC_SAMPLE_COUNT_BITS if (with_eth and with_eth_vrt) else 0
+        rx_layout            = rfic_rx_layout(64, rx_sample_count_bits)
+
         # Ethernet ---------------------------------------------------------------------------------
 
         if with_eth:
@@ -630,6 +659,8 @@ class BaseSoC(SoCMini):
                     sys_clk_freq      = sys_clk_freq,
                     nominal_time_inc  = nominal_time_inc,
                 )
+                if with_ptp_history:
+                    self.ptp_history    = PTPDisciplineHistory(self.ptp_discipline)
                 self.ptp_discipline_cdc = TimeDisciplineCDC(self.time_gen)
                 self.ptp_identity = PTPIdentityTracker()
                 self.comb += [
@@ -726,24 +757,39 @@ class BaseSoC(SoCMini):
                     ])
                 ])
 
-                self.eth_rx_demux = stream.Demultiplexer(layout=dma_layout(64), n=3, with_csr=False)
+                self.eth_rx_demux = stream.Demultiplexer(layout=rx_layout, n=3, with_csr=False)
                 self.comb += self.eth_rx_demux.sel.eq(self.eth_rx_mode.fields.sel)
                 self.comb += self.eth_rx_demux.source0.ready.eq(1)  # Flush path.
 
                 self.vrt_rx_conv = stream.Converter(64, 32)
-                self.vrt_rx_packetizer = RFICDataPacketizer(data_width=32, data_words=256)
                 self.vrt_streamer = VRTSignalPacketStreamer(
-                    udp_crossbar = self.ethcore_etherbone.udp.crossbar,
-                    ip_address   = vrt_dst_ip,
-                    udp_port     = vrt_dst_port,
-                    data_width   = 32,
-                    with_csr     = True,
+                    udp_crossbar      = self.ethcore_etherbone.udp.crossbar,
+                    ip_address        = vrt_dst_ip,
+                    udp_port          = vrt_dst_port,
+                    data_width        = 32,
+                    with_csr          = True,
+                    stream_id         = vrt_stream_id,
+                    data_words        = vrt_data_words,
+                    max_data_words    = vrt_max_data_words,
+                    with_class_id     = vrt_with_class_id,
+                    with_trailer      = vrt_with_trailer,
+                    with_context      = vrt_with_context,
+                    timestamp_mode    = vrt_timestamp,
+                    sample_count_bits = rx_sample_count_bits,
+                )
+                self.vrt_rx_packetizer = RFICDataPacketizer(
+                    data_width        = 32,
+                    data_words        = vrt_data_words,
+                    max_data_words    = self.vrt_streamer.max_data_words,
+                    sample_count_bits = rx_sample_count_bits,
                 )
                 self.comb += [
-                    self.eth_rx_demux.source2.connect(self.vrt_rx_conv.sink, omit={"error"}),
-                    self.vrt_rx_conv.source.connect(self.vrt_rx_packetizer.sink),
+                    self.eth_rx_demux.source2.connect(self.vrt_rx_conv.sink, omit={"error", "sample_count"}),
+                    # The converter holds each 64-bit word until its last 32-bit chunk.
+                    self.vrt_rx_packetizer.sink.sample_count.eq(self.eth_rx_demux.source2.sample_count),
+                    self.vrt_rx_conv.source.connect(self.vrt_rx_packetizer.sink, omit={"sample_count"}),
                     self.vrt_rx_packetizer.source.connect(self.vrt_streamer.sink),
-                    self.vrt_streamer.sink.stream_id.eq(0xdeadbeef),
+                    self.vrt_rx_packetizer.data_words.eq(self.vrt_streamer.data_words),
                     self.vrt_streamer.sink.timestamp_int.eq(self.time_s_vrt),
                     self.vrt_streamer.sink.timestamp_fra.eq(self.time_ps_vrt),
                 ]
@@ -757,6 +803,7 @@ class BaseSoC(SoCMini):
                 sata_gen     = sata_gen,
                 with_pcie    = with_pcie,
                 pcie_msis    = pcie_msis if with_pcie else None,
+                with_compression = with_sata_compression,
             )
 
         # AD9361 RFIC ------------------------------------------------------------------------------
@@ -770,40 +817,100 @@ class BaseSoC(SoCMini):
             tx_fifo_depth  = 8192,
             with_rx_fifo   = with_rfic_stream_fifos,
             rx_fifo_depth  = 8192,
+            bfp_bits       = rfic_bfp_bits,
+            with_rx_ddc    = with_rx_ddc,
+            with_tx_duc    = with_tx_duc,
         )
         self.ad9361.add_prbs()
         self.ad9361.add_agc()
+        if rx_sample_count_bits:
+            # VRT sample-count timestamps: count sample instants at the RFIC RX output.
+            self.ad9361.add_rx_sample_counter()
+            self.comb += [
+                self.ad9361.rx_sample_counter.clear.eq(self.vrt_streamer.sample_count_clear),
+                self.ad9361.rx_sample_counter.pps_clear.eq(self.vrt_streamer.sample_count_pps_clear),
+                self.ad9361.rx_sample_counter.pps.eq(self.pps_gen.pps_pulse),
+                self.vrt_streamer.sample_count_ref.eq(self.ad9361.rx_sample_counter.count),
+                self.vrt_streamer.sample_count_base.eq(self.ad9361.rx_sample_counter.base),
+            ]
 
         # TX/RX Header Extracter/Inserter ----------------------------------------------------------
 
-        self.header = TXRXHeader(data_width=64)
-        self.comb += [
-            self.header.rx.header.eq(0x5aa5_5aa5_5aa5_5aa5), # Unused for now, arbitrary.
-            self.header.rx.timestamp.eq(self.time_gen.time),
-        ]
+        self.header = TXRXHeader(data_width=64, rx_layout=rx_layout)
+        self.comb += self.header.rx.header.eq(0x5aa5_5aa5_5aa5_5aa5) # Unused for now, arbitrary.
+        if not with_rx_window:
+            self.comb += self.header.rx.timestamp.eq(self.time_gen.time)
+
+        # TX Scheduler (holds TX frames until their header timestamp) ------------------------------
+
+        if with_tx_scheduler:
+            self.tx_scheduler = TXScheduler(time=self.time_gen.time)
+            self.comb += [
+                self.tx_scheduler.reset.eq(self.header.tx.reset),
+                self.tx_scheduler.header_enable.eq(self.header.tx.header_enable),
+                self.tx_scheduler.timestamp.eq(self.header.tx.timestamp),
+            ]
+
+        # RX Window Gate (timed RX capture windows) ------------------------------------------------
+
+        if with_rx_window:
+            # RX header timestamps are the arrival times of the first word of each frame; with the
+            # gate enabled, headers wait for data so gated frames carry their exact window timestamps.
+            self.rx_window = RXWindowGate(time=self.time_gen.time, layout=rx_layout)
+            self.comb += [
+                self.rx_window.reset.eq(self.header.rx.reset),
+                self.rx_window.framed.eq(self.header.rx.header_enable),
+                self.rx_window.frame_end.eq(self.header.rx.frame_end),
+                self.header.rx.timestamp.eq(self.rx_window.timestamp),
+                self.header.rx.wait_data.eq(self.rx_window.enable),
+            ]
 
         # TX/RX Datapath ---------------------------------------------------------------------------
 
 
         # AD9361 <-> Loopback <-> Header.
         # -------------------------------
-        self.txrx_loopback = TXRXLoopback(data_width=64, with_csr=True)
-
-        # Header TX -> Loopback -> RFIC TX.
-        self.comb += [
-            self.header.tx.source.connect(self.txrx_loopback.tx_sink),
-            self.txrx_loopback.tx_source.connect(self.ad9361.sink),
-        ]
+        self.txrx_loopback = TXRXLoopback(data_width=64, rx_layout=rx_layout, with_csr=True)
 
-        # RFIC RX -> Loopback -> Header RX.
-        self.comb += [
-            self.ad9361.source.connect(self.txrx_loopback.rx_sink),
-            self.txrx_loopback.rx_source.connect(self.header.rx.sink),
-        ]
+        # Header TX -> (TX Scheduler) -> Loopback -> RFIC TX.
+        if with_tx_scheduler:
+            self.comb += [
+                self.header.tx.source.connect(self.tx_scheduler.sink),
+                self.tx_scheduler.source.connect(self.txrx_loopback.tx_sink),
+            ]
+        else:
+            self.comb += self.header.tx.source.connect(self.txrx_loopback.tx_sink)
+        self.comb += self.txrx_loopback.tx_source.connect(self.ad9361.sink)
+
+        # RFIC RX -> Loopback -> (RX Window Gate) -> Header RX.
+        self.comb += self.ad9361.source.connect(self.txrx_loopback.rx_sink)
+        if rx_sample_count_bits:
+            self.comb += self.txrx_loopback.rx_sink.sample_count.eq(self.ad9361.rx_sample_counter.count)
+        if with_rx_window:
+            self.comb += [
+                self.txrx_loopback.rx_source.connect(self.rx_window.sink),
+                self.rx_window.source.connect(self.header.rx.sink),
+            ]
+        else:
+            self.comb += self.txrx_loopback.rx_source.connect(self.header.rx.sink)
 
         # Crossbar.
         # ---------
-        self.crossbar = stream.Crossbar(layout=dma_layout(64), n=3, with_csr=True)
+        if with_rx_fanout:
+            # Same mux/demux CSRs as stream.Crossbar, with an RX demux also able to broadcast the
+            # RX stream to several consumers (ex SATA record + PCIe preview).
+            self.crossbar = LiteXModule()
+            self.crossbar.mux   = stream.Multiplexer(layout=dma_layout(64), n=3, with_csr=True)
+            self.crossbar.demux = RXFanout(layout=rx_layout, n=3, with_csr=True)
+            self.comb += self.crossbar.demux.frame_words.eq(
+                Mux(self.header.rx.header_enable, self.header.rx.frame_cycles + 2, 0))
+            rx_routed_to_pcie = (self.crossbar.demux.sel == 0) & ~self.crossbar.demux.broadcast
+        else:
+            # stream.Crossbar with an RX demux carrying the RX layout.
+            self.crossbar = LiteXModule()
+            self.crossbar.mux   = stream.Multiplexer(layout=dma_layout(64), n=3, with_csr=True)
+            self.crossbar.demux = stream.Demultiplexer(layout=rx_layout, n=3, with_csr=True)
+            rx_routed_to_pcie = (self.crossbar.demux.sel == 0)
 
         # TX: Comms -> Crossbar -> Header.
         # --------------------------------
@@ -839,8 +946,8 @@ class BaseSoC(SoCMini):
         self.comb += self.header.rx.source.connect(self.crossbar.demux.sink)
         if with_pcie:
             self.comb += [
-                self.crossbar.demux.source0.connect(self.pcie_dma0.sink),
-                If(self.crossbar.demux.sel == 0,
+                self.crossbar.demux.source0.connect(self.pcie_dma0.sink, omit={"sample_count"}),
+                If(rx_routed_to_pcie,
                     # Same as the TX Header FSM above: gating on the Writer enable aligns the
                     # inserted headers with the first DMA buffer on every Writer start (frames are
                     # exactly one buffer long, so a phase slip at start would persist for the
@@ -848,16 +955,31 @@ class BaseSoC(SoCMini):
                     self.header.rx.reset.eq(~self.pcie_dma0.synchronizer.synced | ~self.pcie_dma0.writer.enable)
                 )
             ]
+            if with_rx_fanout:
+                # Broadcast: the headers run for all consumers; the PCIe copy is flushed while the
+                # Writer is stopped so each start begins on a fresh, complete frame.
+                self.comb += self.crossbar.demux.flush[0].eq(~self.pcie_dma0.writer.enable)
         if with_eth:
             if with_eth_vrt:
                 self.comb += [
                     self.crossbar.demux.source1.connect(self.eth_rx_demux.sink, omit={"error"}),
-                    self.eth_rx_demux.source1.connect(self.eth_rx_streamer.sink),
+                    self.eth_rx_demux.source1.connect(self.eth_rx_streamer.sink, omit={"sample_count"}),
+                    # Trailer Over-Range: AGC high-threshold saturation (sticky per packet).
+                    self.vrt_streamer.over_range.eq(
+                        self.ad9361.agc_count_rx1_high.saturated |
+                        self.ad9361.agc_count_rx2_high.saturated
+                    ),
                 ]
             else:
                 self.comb += self.crossbar.demux.source1.connect(self.eth_rx_streamer.sink)
         if with_sata:
-            self.comb += self.crossbar.demux.source2.connect(self.sata_rx_streamer.sink, omit={"error"})
+            if with_sata_compression:
+                self.comb += [
+                    self.crossbar.demux.source2.connect(self.sata_rx_compressor.sink, omit={"error", "sample_count"}),
+                    self.sata_rx_compressor.source.connect(self.sata_rx_streamer.sink),
+                ]
+            else:
+                self.comb += self.crossbar.demux.source2.connect(self.sata_rx_streamer.sink, omit={"error", "sample_count"})
 
         # Leds -------------------------------------------------------------------------------------
 
@@ -898,6 +1020,36 @@ class BaseSoC(SoCMini):
             )
             self.gpio.connect_to_pads(pads=platform.request("gpios")) # TP1-2.
 
+        # Event Timestamper ------------------------------------------------------------------------
+
+        if with_event_timestamper:
+            # Inputs are dual-edge sampled in the TimeGenerator domain and latched with the
+            # undelayed time-domain time (before its CDC to sys): 5ns steps at 100MHz.
+            # pps_gen is the internal PPS of the board time; an external PPS comes in on sync_in
+            # (SYNCDBG), also the SI5351 clkin input and usually a 10MHz clock when used as
+            # reference, so only pps_gen has its rising edge enabled at reset.
+            event_inputs = [
+                ("pps_gen", self.pps_gen.pps),
+                ("sync_in", sync_clk_in),
+            ]
+            self.event_clk10_marker = ClockMarker(ClockSignal("clk10"), divider=int(10e6)) # 1Hz.
+            event_inputs.append(("clk10", self.event_clk10_marker.marker))
+            if with_gpio:
+                for n in range(len(self.gpio.i_async)):
+                    event_inputs.append((f"gpio{n}", self.gpio.i_async[n]))
+            event_channels = []
+            for name, i in event_inputs:
+                sampler = DualEdgeSampler(i, cd="time")
+                self.add_module(name=f"event_{name}_sampler", module=sampler)
+                event_channels.append((name, sampler.samples))
+            self.event_timestamper = EventTimestamper(
+                time          = self.time_gen.cdc.sink.time,
+                channels      = event_channels,
+                clk_period_ns = 1e9/100e6,
+                cd            = "time",
+                rising_reset  = 0b1, # pps_gen.
+            )
+
         # White Rabbit -----------------------------------------------------------------------------
 
         if with_white_rabbit:
@@ -1072,6 +1224,11 @@ class BaseSoC(SoCMini):
             "}}]"
         )
 
+        # Event Timestamper inputs: dual-edge synchronizers in the TimeGenerator domain.
+        if with_event_timestamper:
+            platform.add_platform_command("set_false_path -from [get_ports -quiet {{gpios*}}]")
+            add_guarded_false_path("*crg*s7mmcm*clkout*", "si5351_clk1")
+
         # Low-Speed Peripheral Return Inputs (SPI MISO/status, board timing intentionally not modeled).
         platform.add_platform_command(
             "set_false_path -from [get_ports -quiet {{"
@@ -1126,14 +1283,63 @@ class BaseSoC(SoCMini):
 
         # Clk Measurements -------------------------------------------------------------------------
 
-        self.clk_measurement = MultiClkMeasurement(clks={
-            "clk0" : ClockSignal("sys"),
-            "clk1" : 0 if not with_pcie else ClockSignal("pcie"),
-            "clk2" : si5351_clk0,
-            "clk3" : ClockSignal("rfic"),
-            "clk4" : si5351_clk1,
-            "clk5" : ClockSignal("clk10"),
-        })
+        # Free-running counters plus gated frequency/ppm error, with the gate timed by sys_clk or
+        # the PPS (board time base); clk3 (RFIC) follows the sample rate and has no nominal.
+        self.clk_measurement = MultiClkMeasurement(
+            clks = {
+                "clk0" : (ClockSignal("sys"), sys_clk_freq),
+                "clk1" : (0, None) if not with_pcie else (ClockSignal("pcie"), 125e6),
+                "clk2" : (si5351_clk0, 38.4e6),
+                "clk3" : (ClockSignal("rfic"), None),
+                "clk4" : (si5351_clk1, 100e6),
+                "clk5" : (ClockSignal("clk10"), 10e6),
+            },
+            sys_clk_freq = sys_clk_freq,
+            pps          = self.pps_gen.pps_pulse,
+        )
+
+        # Telemetry --------------------------------------------------------------------------------
+
+        if with_telemetry:
+            def handshake(ep):
+                return ep.valid & ep.ready
+
+            telemetry_values       = []
+            telemetry_counters     = []
+            telemetry_measurements = [(f"{name}_value", mod.value) for name, mod in self.clk_measurement.clk_modules.items()]
+            for name in ["rx1_low", "rx1_high", "rx2_low", "rx2_high"]:
+                telemetry_values.append((f"agc_{name}", getattr(self.ad9361, f"agc_count_{name}").status.fields.count))
+            if with_pcie:
+                telemetry_values += [
+                    ("dma_writer_loop", self.pcie_dma0.writer.table.loop_status.status),
+                    ("dma_reader_loop", self.pcie_dma0.reader.table.loop_status.status),
+                ]
+                telemetry_counters += [
+                    ("dma_writer_beats", handshake(self.pcie_dma0.sink)),
+                    ("dma_reader_beats", handshake(self.pcie_dma0.source)),
+                ]
+            if with_eth:
+                telemetry_counters += [
+                    ("udp_tx_beats", handshake(self.eth_rx_streamer.sink)),
+                    ("udp_rx_beats", handshake(self.eth_tx_streamer.source)),
+                ]
+            if with_eth_ptp:
+                telemetry_values += [
+                    ("ptp_locked",     self.ptp_discipline.locked),
+                    ("ptp_last_error", self.ptp_discipline.last_error),
+                ]
+            if with_sata:
+                telemetry_values += [("sata_rx_progress", self.sata_rx_streamer.progress.status)]
+                telemetry_counters += [("sata_rx_beats", handshake(self.sata_rx_streamer.sink))]
+            self.telemetry = TelemetrySnapshot(
+                time         = self.time_gen.time,
+                values       = telemetry_values,
+                counters     = telemetry_counters,
+                measurements = telemetry_measurements,
+            )
+            self.comb += self.telemetry.pps.eq(self.pps_gen.pps_pulse)
+            for mod in self.clk_measurement.clk_modules.values():
+                self.comb += If(self.telemetry.request, mod.latch.eq(1))
 
     # SATA -----------------------------------------------------------------------------------------
 
@@ -1145,7 +1351,7 @@ class BaseSoC(SoCMini):
             mode       = mode,
         )
 
-    def add_sata(self, platform, sys_clk_freq, sata_gen=2, with_pcie=False, pcie_msis=None):
+    def add_sata(self, platform, sys_clk_freq, sata_gen=2, with_pcie=False, pcie_msis=None, with_compression=False):
         if with_pcie and pcie_msis is None:
             raise ValueError("PCIe MSI map is required when SATA and PCIe are enabled.")
 
@@ -1249,6 +1455,11 @@ class BaseSoC(SoCMini):
             self.sata_tx_streamer.reset.eq(self.sata_streamer_control.fields.tx_reset),
         ]
 
+        # Optional lossless RX compression (frames restart on each RX streamer reset).
+        if with_compression:
+            self.sata_rx_compressor = ResetInserter()(SATAStreamCompressor())
+            self.comb += self.sata_rx_compressor.reset.eq(self.sata_streamer_control.fields.rx_reset)
+
         # IRQs.
         # -----
         if with_pcie:
@@ -1274,6 +1485,7 @@ class BaseSoC(SoCMini):
     # PCIe.
     def add_pcie_probe(self, depth=4096):
         self.pcie_phy.add_ltssm_tracer()
+        self.add_constant("pcie_phy_phy_ltssm_tracer_history_pop_on_read", 1) # Reads pop the tracer FIFO.
         self.pcie_clk_count = Signal(16)
         self.sync.pclk += self.pcie_clk_count.eq(self.pcie_clk_count + 1)
         analyzer_signals = [
@@ -1407,6 +1619,12 @@ def main():
 
     # RFIC parameters.
     parser.add_argument("--with-rfic-oversampling", action="store_true", help="Double the RFIC clock to enable the oversampling mode.")
+    parser.add_argument("--rfic-bfp-bits", default=None, type=int, choices=[4, 6, 12], help="Add a BFP transport mode (bitmode 3) with this mantissa width.")
+    parser.add_argument("--with-rx-ddc",   action="store_true", help="Add an RX digital down-converter (NCO + CIC + FIR decimator).")
+    parser.add_argument("--with-tx-duc",   action="store_true", help="Add a TX digital up-converter (half-band + CIC interpolator + NCO).")
+    parser.add_argument("--with-rx-fanout", action="store_true", help="Allow broadcasting RX to PCIe/Ethernet/SATA simultaneously (per consumer FIFO and drop policy).")
+    parser.add_argument("--with-tx-scheduler", action="store_true", help="Add a TX scheduler holding TX frames until their header timestamp.")
+    parser.add_argument("--with-rx-window",    action="store_true", help="Add an RX window gate for timed (periodic) RX capture windows.")
 
     # PCIe parameters.
     parser.add_argument("--with-pcie",       action="store_true", help="Enable PCIe Communication.")
@@ -1426,17 +1644,32 @@ def main():
     parser.add_argument("--eth-ptp-no-igmp", action="store_true",     help="Disable PTP multicast IGMP reports.")
     parser.add_argument("--eth-ptp-igmp-interval", default=2.0, type=float, help="PTP multicast IGMP report interval in seconds.")
     parser.add_argument("--with-eth-ptp-rfic-clock", action="store_true", help="Add optional PTP discipline for the FPGA 10MHz clock feeding SI5351C/AD9361 reference mode.")
+    parser.add_argument("--with-ptp-history", action="store_true", help="Record every PTP discipline update in a BRAM history FIFO (ptp_history CSRs, with --with-eth-ptp).")
     parser.add_argument("--with-eth-vrt",    action="store_true",     help="Enable Ethernet RX VRT UDP streamer path.")
     parser.add_argument("--vrt-dst-ip",      default="239.168.1.100", help="VRT destination IP address (when --with-eth-vrt).")
     parser.add_argument("--vrt-dst-port",    default=4991, type=int,  help="VRT destination UDP port (when --with-eth-vrt).")
+    parser.add_argument("--vrt-stream-id",   default=0xdeadbeef, type=lambda x: int(x, 0), help="VRT stream ID (when --with-eth-vrt); give each board sharing a receiver its own.")
+    parser.add_argument("--vrt-data-words",     default=256,  type=int, help="VRT default payload 32-bit words per packet (runtime CSR, when --with-eth-vrt).")
+    parser.add_argument("--vrt-max-data-words", default=None, type=int, help="VRT maximum payload words, sizes buffering (e.g. 2040 for 9000-byte jumbo frames).")
+    parser.add_argument("--vrt-with-class-id",  action="store_true",    help="Add VRT Class ID words (OUI/ICC/PCC CSRs) to signal packets.")
+    parser.add_argument("--vrt-with-trailer",   action="store_true",    help="Add VRT trailer word (valid-data/over-range indicators) to signal packets.")
+    parser.add_argument("--vrt-with-context",   action="store_true",    help="Interleave VRT IF-Context packets (sample rate, RF frequency, gain, bandwidth, format) with signal packets.")
+    parser.add_argument("--vrt-timestamp",      default="real-time", choices=["real-time", "sample-count"], help="Default VRT fractional timestamp: picoseconds (REAL_TIME) or sample index (SAMPLE_COUNT), runtime CSR.")
 
     # SATA parameters.
     parser.add_argument("--with-sata",       action="store_true", help="Enable SATA Storage.")
     parser.add_argument("--sata-gen",        default=2, type=int, help="SATA Generation.", choices=[1, 2, 3])
+    parser.add_argument("--with-sata-compression", action="store_true", help="Add lossless RX stream compression ahead of SATA recording (runtime CSR enable).")
 
     # GPIO parameters.
     parser.add_argument("--with-gpio",       action="store_true",     help="Enable GPIO support.")
 
+    # Telemetry parameters.
+    parser.add_argument("--with-telemetry", action="store_true", help="Add coherent telemetry snapshots (time + DMA/AGC/clock/PTP/SATA/UDP counters).")
+
+    # Event Timestamper parameters.
+    parser.add_argument("--with-event-timestamper", action="store_true", help="Add hardware timestamping of internal PPS/SYNCDBG/clk10 (and GPIO with --with-gpio) edges.")
+
     # White Rabbit parameters.
     parser.add_argument("--with-white-rabbit",   action="store_true",                    help="Enable White-Rabbit Support.")
     parser.add_argument("--wr-sfp",              default=None, type=int,                 help="White Rabbit SFP (default: auto-select first available).", choices=[0, 1])
@@ -1501,6 +1734,12 @@ def main():
 
         # RFIC.
         with_rfic_oversampling = args.with_rfic_oversampling,
+        rfic_bfp_bits          = args.rfic_bfp_bits,
+        with_rx_ddc            = args.with_rx_ddc,
+        with_tx_duc            = args.with_tx_duc,
+        with_rx_fanout         = args.with_rx_fanout,
+        with_tx_scheduler      = args.with_tx_scheduler,
+        with_rx_window         = args.with_rx_window,
 
         # PCIe.
         with_pcie     = args.with_pcie,
@@ -1520,18 +1759,33 @@ def main():
         eth_ptp_igmp  = not args.eth_ptp_no_igmp,
         eth_ptp_igmp_interval = args.eth_ptp_igmp_interval,
         with_eth_ptp_rfic_clock = args.with_eth_ptp_rfic_clock,
+        with_ptp_history        = args.with_ptp_history,
         with_eth_vrt  = args.with_eth_vrt,
         vrt_dst_ip    = args.vrt_dst_ip,
         vrt_dst_port  = args.vrt_dst_port,
+        vrt_stream_id = args.vrt_stream_id,
+        vrt_data_words     = args.vrt_data_words,
+        vrt_max_data_words = args.vrt_max_data_words,
+        vrt_with_class_id  = args.vrt_with_class_id,
+        vrt_with_trailer   = args.vrt_with_trailer,
+        vrt_with_context   = args.vrt_with_context,
+        vrt_timestamp      = args.vrt_timestamp,
 
         # SATA.
         with_sata     = args.with_sata,
         sata_gen      = args.sata_gen,
+        with_sata_compression = args.with_sata_compression,
 
         # GPIOs.
         with_gpio     = args.with_gpio,
         with_jtagbone = not args.without_jtagbone,
 
+        # Telemetry.
+        with_telemetry = args.with_telemetry,
+
+        # Event Timestamper.
+        with_event_timestamper = args.with_event_timestamper,
+
         # White Rabbit.
         with_white_rabbit = args.with_white_rabbit,
         wr_sfp            = wr_sfp,
@@ -1570,6 +1824,8 @@ def main():
                 r += "_ptp"
                 if args.with_eth_ptp_rfic_clock:
                     r += "_rfic_clock"
+                if args.with_ptp_history:
+                    r += "_history"
                 if args.eth_ptp_p2p:
                     r += "_p2p"
                 if args.eth_ptp_no_igmp:
@@ -1578,10 +1834,28 @@ def main():
                 r += "_vrt"
         if args.with_sata:
             r += f"_sata"
+            if args.with_sata_compression:
+                r += "_compression"
         if args.with_white_rabbit:
             r += f"_white_rabbit"
+        if args.with_telemetry:
+            r += "_telemetry"
+        if args.with_event_timestamper:
+            r += "_events"
         if args.with_rfic_oversampling:
             r += "_rfic_oversampling"
+        if args.rfic_bfp_bits is not None:
+            r += f"_bfp{args.rfic_bfp_bits}"
+        if args.with_rx_ddc:
+            r += "_ddc"
+        if args.with_tx_duc:
+            r += "_duc"
+        if args.with_rx_fanout:
+            r += "_fanout"
+        if args.with_tx_scheduler:
+            r += "_tx_scheduler"
+        if args.with_rx_window:
+            r += "_rx_window"
         if args.without_jtagbone:
             r += "_no_jtagbone"
         return r
@@ -43,6 +43,7 @@ class AGCSaturationCount(LiteXModule):
         self.status = CSRStatus(fields=[
             CSRField("count", size=32, description="Saturation event count (one event per accepted beat).")
         ])
+        self.saturated = Signal() # o (Accepted beat above threshold).
 
         # # #
 
@@ -56,6 +57,7 @@ class AGCSaturationCount(LiteXModule):
         iqs_abs   = [signed_abs(self, iq) for iq in iqs]
         saturated = Signal()
         self.comb += saturated.eq(reduce(or_, [iq_abs >= threshold for iq_abs in iqs_abs]))
+        self.comb += self.saturated.eq(enable & ce & saturated)
 
         # Compute Saturation.
         self.sync += [
@@ -4,6 +4,8 @@
 # Copyright (c) 2024-2026 Enjoy-Digital <enjoy-digital.fr>
 # SPDX-License-Identifier: BSD-2-Clause
 
+import math
+
 from migen import *
 
 from litex.gen import *
@@ -17,12 +19,26 @@ from litepcie.common import *
 _16_BIT_MODE = 0
 _8_BIT_MODE  = 1
 _BFP8_MODE   = 2
+_BFP_MODE    = 3
 
 BFP8_HEADER_MAGIC    = 0x38504642 # "BFP8" as a little-endian 32-bit word.
 BFP8_PAYLOAD_WORDS   = 127
 BFP8_BLOCK_WORDS     = 1 + BFP8_PAYLOAD_WORDS
 BFP8_SAMPLES_PER_CH  = BFP8_PAYLOAD_WORDS * 2
 
+# BFP8 with one exponent per channel: RX1 (I/Q lanes 0/1) exponent in header bits [32:36], RX2
+# (I/Q lanes 2/3) exponent in bits [36:40], header version 3.
+BFP8_CHANNEL_HEADER_VERSION = 3
+
+# Configurable-width BFP: same header, mantissa width in header bits [36:40], header version 2.
+# Payload words must hold a whole number of RFIC beats (4 mantissas each).
+BFP_HEADER_VERSION   = 2
+BFP_MANTISSA_BITS    = [4, 6, 12]
+BFP_PAYLOAD_WORDS    = {4: 127, 6: 126, 12: 126}
+
+def bfp_samples_per_channel(mantissa_bits, payload_words):
+    return (payload_words * 64) // (4 * mantissa_bits)
+
 def _sign_extend(data, nbits=16):
     return Cat(data, Replicate(data[-1], nbits - len(data)))
 
@@ -40,32 +56,37 @@ def _round_shift_12(module, data, shift):
     value_bits = 13 - shift
     return Cat(rounded[shift:13], Replicate(rounded[-1], 12 - value_bits))
 
-def _clamp_12_to_8(data):
+def _clamp_12(data, bits=8):
+    if bits == 12:
+        return data
+    sign_bits = (1 << (13 - bits)) - 1
     return Mux(
         data[-1],
-        Mux(data[7:12] != 0b11111, 0x80, data[0:8]),
-        Mux(data[7:12] != 0,      0x7f, data[0:8]),
+        Mux(data[bits-1:12] != sign_bits, 1 << (bits - 1),       data[0:bits]),
+        Mux(data[bits-1:12] != 0,         (1 << (bits - 1)) - 1, data[0:bits]),
     )
 
-def _bfp8_quantize(module, data, exponent):
-    shifted = [Signal(12) for _ in range(5)]
-    for shift in range(5):
+def _bfp_quantize(module, data, exponent, bits=8):
+    shifts  = range(12 - bits + 1)
+    shifted = [Signal(12) for _ in shifts]
+    for shift in shifts:
         module.comb += shifted[shift].eq(_round_shift_12(module, data, shift))
-    result = Signal(8)
+    result = Signal(bits)
     module.comb += Case(exponent, {
-        shift: result.eq(_clamp_12_to_8(shifted[shift]))
-        for shift in range(5)
+        shift: result.eq(_clamp_12(shifted[shift], bits))
+        for shift in shifts
     })
     return result
 
-def _scale_i8_to_12(module, data, exponent):
-    scaled = [Signal(12) for _ in range(5)]
-    for shift in range(5):
+def _scale_to_12(module, data, exponent, bits=8):
+    shifts = range(12 - bits + 1)
+    scaled = [Signal(12) for _ in shifts]
+    for shift in shifts:
         module.comb += scaled[shift].eq((_sign_extend(data, 12) << shift)[0:12])
     result = Signal(12)
     module.comb += Case(exponent, {
         shift: result.eq(scaled[shift])
-        for shift in range(5)
+        for shift in shifts
     })
     return result
 
@@ -78,51 +99,71 @@ def _sample_abs(module, data):
     ]
     return value
 
-def _max4(module, values):
-    max01 = Signal(13)
-    max23 = Signal(13)
-    maxv  = Signal(13)
-    module.comb += [
-        max01.eq(Mux(values[0] > values[1], values[0], values[1])),
-        max23.eq(Mux(values[2] > values[3], values[2], values[3])),
-        maxv.eq(Mux(max01 > max23, max01, max23)),
-    ]
+def _max2(module, a, b):
+    maxv = Signal(13)
+    module.comb += maxv.eq(Mux(a > b, a, b))
     return maxv
 
-def _bfp8_exponent(max_abs):
-    return Mux(max_abs <= (127 << 0), 0,
-        Mux(max_abs <= (127 << 1), 1,
-        Mux(max_abs <= (127 << 2), 2,
-        Mux(max_abs <= (127 << 3), 3, 4))))
+def _bfp_exponent(max_abs, bits=8):
+    # Smallest exponent that fits the block peak in the mantissa, capped to the 12-bit source.
+    max_mantissa = (1 << (bits - 1)) - 1
+    exponent     = 12 - bits
+    for shift in reversed(range(12 - bits)):
+        exponent = Mux(max_abs <= (max_mantissa << shift), shift, exponent)
+    return exponent
 
-def _bfp8_header(exponent, payload_words, sequence):
+def _bfp_header(exponent, payload_words, sequence, bits=8):
+    # BFP8 keeps its original header (width field 0, version 1), other widths are tagged.
     return Cat(
         Constant(BFP8_HEADER_MAGIC, 32),
         exponent,
-        Constant(0, 4),
+        Constant(0 if bits == 8 else bits, 4),
         Constant(payload_words, 8),
         sequence,
-        Constant(1, 8),
+        Constant(1 if bits == 8 else BFP_HEADER_VERSION, 8),
     )
 
-def _pack_bfp8_payload(module, word0, word1, exponent):
-    fields = []
-    for word in [word0, word1]:
-        for i in range(4):
-            fields.append(_bfp8_quantize(module, word[i*16:i*16 + 12], exponent))
-    return Cat(*fields)
+def _bfp8_channel_header(exponents, payload_words, sequence):
+    return Cat(
+        Constant(BFP8_HEADER_MAGIC, 32),
+        exponents[0],
+        exponents[1],
+        Constant(payload_words, 8),
+        sequence,
+        Constant(BFP8_CHANNEL_HEADER_VERSION, 8),
+    )
+
+# Beat helpers take one exponent per channel: lanes 0/1 (RX1/TX1 I/Q) use exponents[0], lanes 2/3
+# (RX2/TX2 I/Q) exponents[1]. Shared-exponent blocks pass the same exponent twice.
 
-def _unpack_bfp8_payload(module, data, exponent, half):
+def _pack_bfp_beat(module, data, exponents, bits=8):
+    return Cat(*[_bfp_quantize(module, data[i*16:i*16 + 12], exponents[i//2], bits) for i in range(4)])
+
+def _unpack_bfp_beat(module, data, exponents, bits=8):
     fields = []
     for i in range(4):
-        scaled = _scale_i8_to_12(module, data[(half*4 + i)*8:(half*4 + i + 1)*8], exponent)
+        scaled = _scale_to_12(module, data[i*bits:(i + 1)*bits], exponents[i//2], bits)
         fields.append(Cat(scaled, Constant(0, 4)))
     return Cat(*fields)
 
+def _pack_bfp8_payload(module, word0, word1, exponents):
+    return Cat(_pack_bfp_beat(module, word0, exponents), _pack_bfp_beat(module, word1, exponents))
+
+def _unpack_bfp8_payload(module, data, exponents, half):
+    return _unpack_bfp_beat(module, data[half*32:(half + 1)*32], exponents)
+
+def _bfp_config(bits, payload_words):
+    assert bits in BFP_MANTISSA_BITS
+    if payload_words is None:
+        payload_words = BFP_PAYLOAD_WORDS[bits]
+    assert 0 < payload_words < 256
+    assert (payload_words * 64) % (4 * bits) == 0, "BFP payload must hold a whole number of beats."
+    return payload_words
+
 # AD9361 TX BitMode --------------------------------------------------------------------------------
 
 class AD9361TXBitMode(LiteXModule):
-    def __init__(self, bfp8_payload_words=BFP8_PAYLOAD_WORDS):
+    def __init__(self, bfp8_payload_words=BFP8_PAYLOAD_WORDS, bfp_bits=None, bfp_payload_words=None):
         self.sink   = sink   = stream.Endpoint(dma_layout(64))
         self.source = source = stream.Endpoint(dma_layout(64))
         self.mode   = mode   = Signal(2)
@@ -147,9 +188,11 @@ class AD9361TXBitMode(LiteXModule):
 
         # BFP8 mode.
         # ----------
-        bfp8_exponent      = Signal(4)
+        bfp8_exponents     = [Signal(4), Signal(4)]
         bfp8_payload_count = Signal(max=bfp8_payload_words + 1)
         bfp8_payload_data  = Signal(64)
+        bfp8_channel_block = Signal()
+        self.comb += bfp8_channel_block.eq(sink.data[56:64] == BFP8_CHANNEL_HEADER_VERSION)
         self.fsm = fsm = FSM(reset_state="BFP8_HEADER")
         fsm.act("BFP8_HEADER",
             If(mode != _BFP8_MODE,
@@ -157,7 +200,8 @@ class AD9361TXBitMode(LiteXModule):
             ).Else(
                 sink.ready.eq(1),
                 If(sink.valid,
-                    NextValue(bfp8_exponent, sink.data[32:36]),
+                    NextValue(bfp8_exponents[0], sink.data[32:36]),
+                    NextValue(bfp8_exponents[1], Mux(bfp8_channel_block, sink.data[36:40], sink.data[32:36])),
                     NextValue(bfp8_payload_count, 0),
                     NextState("BFP8_PAYLOAD"),
                 )
@@ -179,7 +223,7 @@ class AD9361TXBitMode(LiteXModule):
                 NextState("BFP8_HEADER"),
             ).Else(
                 source.valid.eq(1),
-                source.data.eq(_unpack_bfp8_payload(self, bfp8_payload_data, bfp8_exponent, 0)),
+                source.data.eq(_unpack_bfp8_payload(self, bfp8_payload_data, bfp8_exponents, 0)),
                 If(source.ready,
                     NextState("BFP8_OUT1"),
                 )
@@ -190,7 +234,7 @@ class AD9361TXBitMode(LiteXModule):
                 NextState("BFP8_HEADER"),
             ).Else(
                 source.valid.eq(1),
-                source.data.eq(_unpack_bfp8_payload(self, bfp8_payload_data, bfp8_exponent, 1)),
+                source.data.eq(_unpack_bfp8_payload(self, bfp8_payload_data, bfp8_exponents, 1)),
                 source.last.eq(bfp8_payload_count == (bfp8_payload_words - 1)),
                 If(source.ready,
                     If(bfp8_payload_count == (bfp8_payload_words - 1),
@@ -203,13 +247,80 @@ class AD9361TXBitMode(LiteXModule):
             )
         )
 
+        # BFP mode (build-time mantissa width).
+        # -------------------------------------
+        # Payload words are shifted into a bit buffer and unpacked one RFIC beat (4 mantissas) at
+        # a time, so mantissas may straddle payload words.
+        if bfp_bits is not None:
+            bfp_payload_words = _bfp_config(bfp_bits, bfp_payload_words)
+            bfp_beat_bits     = 4 * bfp_bits
+            bfp_output_words  = bfp_samples_per_channel(bfp_bits, bfp_payload_words)
+            bfp_buffer_bits   = 64 + bfp_beat_bits
+            bfp_level_step    = math.gcd(64, bfp_beat_bits)
+
+            bfp_exponent      = Signal(4)
+            bfp_payload_count = Signal(max=bfp_payload_words + 1)
+            bfp_output_count  = Signal(max=bfp_output_words + 1)
+            bfp_buffer        = Signal(bfp_buffer_bits)
+            bfp_level         = Signal(max=bfp_buffer_bits + 1)
+            bfp_level_out     = Signal(max=bfp_buffer_bits + 1)
+            bfp_shifted       = Signal(bfp_buffer_bits)
+            bfp_inserted      = Signal(bfp_buffer_bits)
+            bfp_out           = Signal()
+            bfp_in            = Signal()
+            self.comb += [
+                bfp_level_out.eq(bfp_level - Mux(bfp_out, bfp_beat_bits, 0)),
+                bfp_shifted.eq(Mux(bfp_out, bfp_buffer[bfp_beat_bits:], bfp_buffer)),
+                Case(bfp_level_out, {
+                    level: bfp_inserted.eq(sink.data << level)
+                    for level in range(0, bfp_beat_bits + 1, bfp_level_step)
+                }),
+            ]
+
+            self.bfp_fsm = bfp_fsm = FSM(reset_state="BFP_HEADER")
+            bfp_fsm.act("BFP_HEADER",
+                NextValue(bfp_payload_count, 0),
+                NextValue(bfp_output_count,  0),
+                NextValue(bfp_level,         0),
+                NextValue(bfp_buffer,        0),
+                If(mode == _BFP_MODE,
+                    sink.ready.eq(1),
+                    If(sink.valid,
+                        NextValue(bfp_exponent, sink.data[32:36]),
+                        NextState("BFP_PAYLOAD"),
+                    )
+                )
+            )
+            bfp_fsm.act("BFP_PAYLOAD",
+                If(mode != _BFP_MODE,
+                    NextState("BFP_HEADER"),
+                ).Else(
+                    source.valid.eq(bfp_level >= bfp_beat_bits),
+                    source.data.eq(_unpack_bfp_beat(self, bfp_buffer[:bfp_beat_bits], [bfp_exponent]*2, bfp_bits)),
+                    source.last.eq(bfp_output_count == (bfp_output_words - 1)),
+                    sink.ready.eq((bfp_payload_count != bfp_payload_words) & (bfp_level_out <= bfp_beat_bits)),
+                    bfp_out.eq(source.valid & source.ready),
+                    bfp_in.eq(sink.valid & sink.ready),
+                    NextValue(bfp_buffer, bfp_shifted | Mux(bfp_in, bfp_inserted, 0)),
+                    NextValue(bfp_level, bfp_level_out + Mux(bfp_in, 64, 0)),
+                    NextValue(bfp_payload_count, bfp_payload_count + bfp_in),
+                    If(bfp_out,
+                        NextValue(bfp_output_count, bfp_output_count + 1),
+                        If(bfp_output_count == (bfp_output_words - 1),
+                            NextState("BFP_HEADER"),
+                        )
+                    )
+                )
+            )
+
 # AD9361 RX BitMode --------------------------------------------------------------------------------
 
 class AD9361RXBitMode(LiteXModule):
-    def __init__(self, bfp8_payload_words=BFP8_PAYLOAD_WORDS):
+    def __init__(self, bfp8_payload_words=BFP8_PAYLOAD_WORDS, bfp_bits=None, bfp_payload_words=None):
         self.sink   = sink   = stream.Endpoint(dma_layout(64))
         self.source = source = stream.Endpoint(dma_layout(64))
         self.mode   = mode   = Signal(2)
+        self.bfp8_channel_exponents = Signal() # i: One BFP8 exponent per channel (vs shared).
 
         # # #
 
@@ -236,30 +347,40 @@ class AD9361RXBitMode(LiteXModule):
 
         bfp8_collect_count = Signal(max=bfp8_input_words)
         bfp8_payload_count = Signal(max=bfp8_payload_words + 1)
-        bfp8_max_abs       = Signal(13)
-        bfp8_exponent      = Signal(4)
+        bfp8_max_abs       = [Signal(13), Signal(13)]
+        bfp8_exponents     = [Signal(4), Signal(4)]
+        bfp8_channel_block = Signal()
         bfp8_sequence      = Signal(8)
         bfp8_word0         = Signal(64)
 
+        # Peaks are tracked per channel; the shared exponent is the larger channel exponent, which
+        # is the exponent of the combined peak.
         sample_abs = [
             _sample_abs(self, sink.data[i*16:i*16 + 12])
             for i in range(4)
         ]
-        beat_max = _max4(self, sample_abs)
-        next_max_abs = Signal(13)
-        self.comb += next_max_abs.eq(Mux(bfp8_max_abs > beat_max, bfp8_max_abs, beat_max))
+        channel_max  = [_max2(self, sample_abs[0], sample_abs[1]), _max2(self, sample_abs[2], sample_abs[3])]
+        beat_max     = _max2(self, channel_max[0], channel_max[1])
+        next_max_abs = [Signal(13), Signal(13)]
+        channel_exponents = [Signal(4), Signal(4)]
+        shared_exponent   = Signal(4)
+        self.comb += [
+            [next_max_abs[i].eq(Mux(bfp8_max_abs[i] > channel_max[i], bfp8_max_abs[i], channel_max[i])) for i in range(2)],
+            [channel_exponents[i].eq(_bfp_exponent(bfp8_max_abs[i])) for i in range(2)],
+            shared_exponent.eq(Mux(channel_exponents[0] > channel_exponents[1], channel_exponents[0], channel_exponents[1])),
+        ]
 
         self.bfp8_fsm = bfp8_fsm = FSM(reset_state="BFP8_COLLECT")
         bfp8_fsm.act("BFP8_COLLECT",
             If(mode != _BFP8_MODE,
                 NextValue(bfp8_collect_count, 0),
-                NextValue(bfp8_max_abs, 0),
+                [NextValue(bfp8_max_abs[i], 0) for i in range(2)],
             ).Else(
                 sink.ready.eq(bfp8_fifo.sink.ready),
                 bfp8_fifo.sink.valid.eq(sink.valid),
                 bfp8_fifo.sink.data.eq(sink.data),
-                NextValue(bfp8_max_abs,
-                    Mux(sink.valid & sink.ready, next_max_abs, bfp8_max_abs)),
+                [NextValue(bfp8_max_abs[i],
+                    Mux(sink.valid & sink.ready, next_max_abs[i], bfp8_max_abs[i])) for i in range(2)],
                 If(sink.valid & sink.ready,
                     If(bfp8_collect_count == (bfp8_input_words - 1),
                         NextValue(bfp8_collect_count, 0),
@@ -272,12 +393,14 @@ class AD9361RXBitMode(LiteXModule):
         )
         bfp8_fsm.act("BFP8_EXPONENT",
             If(mode != _BFP8_MODE,
-                NextValue(bfp8_max_abs, 0),
+                [NextValue(bfp8_max_abs[i], 0) for i in range(2)],
                 NextState("BFP8_COLLECT"),
             ).Else(
                 # Keep the block max and exponent decode out of the same cycle.
-                NextValue(bfp8_exponent, _bfp8_exponent(bfp8_max_abs)),
-                NextValue(bfp8_max_abs, 0),
+                [NextValue(bfp8_exponents[i],
+                    Mux(self.bfp8_channel_exponents, channel_exponents[i], shared_exponent)) for i in range(2)],
+                NextValue(bfp8_channel_block, self.bfp8_channel_exponents),
+                [NextValue(bfp8_max_abs[i], 0) for i in range(2)],
                 NextState("BFP8_HEADER"),
             )
         )
@@ -287,7 +410,9 @@ class AD9361RXBitMode(LiteXModule):
             ).Else(
                 source.valid.eq(1),
                 source.first.eq(1),
-                source.data.eq(_bfp8_header(bfp8_exponent, bfp8_payload_words, bfp8_sequence)),
+                source.data.eq(Mux(bfp8_channel_block,
+                    _bfp8_channel_header(bfp8_exponents, bfp8_payload_words, bfp8_sequence),
+                    _bfp_header(bfp8_exponents[0], bfp8_payload_words, bfp8_sequence))),
                 If(source.ready,
                     NextValue(bfp8_payload_count, 0),
                     NextValue(bfp8_sequence, bfp8_sequence + 1),
@@ -311,7 +436,7 @@ class AD9361RXBitMode(LiteXModule):
                 NextState("BFP8_COLLECT"),
             ).Else(
                 source.valid.eq(bfp8_fifo.source.valid),
-                source.data.eq(_pack_bfp8_payload(self, bfp8_word0, bfp8_fifo.source.data, bfp8_exponent)),
+                source.data.eq(_pack_bfp8_payload(self, bfp8_word0, bfp8_fifo.source.data, bfp8_exponents)),
                 source.last.eq(bfp8_payload_count == (bfp8_payload_words - 1)),
                 bfp8_fifo.source.ready.eq(source.ready),
                 If(source.valid & source.ready,
@@ -324,3 +449,178 @@ class AD9361RXBitMode(LiteXModule):
                 )
             )
         )
+
+        # BFP mode (build-time mantissa width).
+        # -------------------------------------
+        # Same block flow as BFP8, but quantized beats (4 mantissas) are shifted into a bit buffer
+        # that emits a payload word whenever 64 bits are available.
+        if bfp_bits is not None:
+            bfp_payload_words = _bfp_config(bfp_bits, bfp_payload_words)
+            bfp_beat_bits     = 4 * bfp_bits
+            bfp_input_words   = bfp_samples_per_channel(bfp_bits, bfp_payload_words)
+            bfp_buffer_bits   = 64 + bfp_beat_bits
+            bfp_level_step    = math.gcd(64, bfp_beat_bits)
+            self.bfp_fifo = bfp_fifo = stream.SyncFIFO(dma_layout(64), depth=bfp_input_words, buffered=True)
+
+            bfp_collect_count = Signal(max=bfp_input_words)
+            bfp_input_count   = Signal(max=bfp_input_words + 1)
+            bfp_payload_count = Signal(max=bfp_payload_words + 1)
+            bfp_max_abs       = Signal(13)
+            bfp_next_max_abs  = Signal(13)
+            bfp_exponent      = Signal(4)
+            bfp_sequence      = Signal(8)
+            bfp_buffer        = Signal(bfp_buffer_bits)
+            bfp_level         = Signal(max=bfp_buffer_bits + 1)
+            bfp_level_out     = Signal(max=bfp_buffer_bits + 1)
+            bfp_shifted       = Signal(bfp_buffer_bits)
+            bfp_inserted      = Signal(bfp_buffer_bits)
+            bfp_out           = Signal()
+            bfp_in            = Signal()
+            bfp_beat          = _pack_bfp_beat(self, bfp_fifo.source.data, [bfp_exponent]*2, bfp_bits)
+            self.comb += [
+                bfp_next_max_abs.eq(Mux(bfp_max_abs > beat_max, bfp_max_abs, beat_max)),
+                bfp_level_out.eq(bfp_level - Mux(bfp_out, 64, 0)),
+                bfp_shifted.eq(Mux(bfp_out, bfp_buffer[64:], bfp_buffer)),
+                Case(bfp_level_out, {
+                    level: bfp_inserted.eq(bfp_beat << level)
+                    for level in range(0, 64 + 1, bfp_level_step)
+                }),
+            ]
+
+            self.bfp_fsm = bfp_fsm = FSM(reset_state="BFP_COLLECT")
+            bfp_fsm.act("BFP_COLLECT",
+                If(mode != _BFP_MODE,
+                    NextValue(bfp_collect_count, 0),
+                    NextValue(bfp_max_abs, 0),
+                ).Else(
+                    sink.ready.eq(bfp_fifo.sink.ready),
+                    bfp_fifo.sink.valid.eq(sink.valid),
+                    bfp_fifo.sink.data.eq(sink.data),
+                    If(sink.valid & sink.ready,
+                        NextValue(bfp_max_abs, bfp_next_max_abs),
+                        If(bfp_collect_count == (bfp_input_words - 1),
+                            NextValue(bfp_collect_count, 0),
+                            NextState("BFP_EXPONENT"),
+                        ).Else(
+                            NextValue(bfp_collect_count, bfp_collect_count + 1),
+                        )
+                    )
+                )
+            )
+            bfp_fsm.act("BFP_EXPONENT",
+                NextValue(bfp_max_abs, 0),
+                If(mode != _BFP_MODE,
+                    NextState("BFP_COLLECT"),
+                ).Else(
+                    NextValue(bfp_exponent, _bfp_exponent(bfp_max_abs, bfp_bits)),
+                    NextState("BFP_HEADER"),
+                )
+            )
+            bfp_fsm.act("BFP_HEADER",
+                NextValue(bfp_input_count,   0),
+                NextValue(bfp_payload_count, 0),
+                NextValue(bfp_level,         0),
+                NextValue(bfp_buffer,        0),
+                If(mode != _BFP_MODE,
+                    NextState("BFP_COLLECT"),
+                ).Else(
+                    source.valid.eq(1),
+                    source.first.eq(1),
+                    source.data.eq(_bfp_header(bfp_exponent, bfp_payload_words, bfp_sequence, bfp_bits)),
+                    If(source.ready,
+                        NextValue(bfp_sequence, bfp_sequence + 1),
+                        NextState("BFP_PAYLOAD"),
+                    )
+                )
+            )
+            bfp_fsm.act("BFP_PAYLOAD",
+                If(mode != _BFP_MODE,
+                    NextState("BFP_COLLECT"),
+                ).Else(
+                    source.valid.eq(bfp_level >= 64),
+                    source.data.eq(bfp_buffer[:64]),
+                    source.last.eq(bfp_payload_count == (bfp_payload_words - 1)),
+                    bfp_fifo.source.ready.eq((bfp_input_count != bfp_input_words) & (bfp_level_out <= 64)),
+                    bfp_out.eq(source.valid & source.ready),
+                    bfp_in.eq(bfp_fifo.source.valid & bfp_fifo.source.ready),
+                    NextValue(bfp_buffer, bfp_shifted | Mux(bfp_in, bfp_inserted, 0)),
+                    NextValue(bfp_level, bfp_level_out + Mux(bfp_in, bfp_beat_bits, 0)),
+                    NextValue(bfp_input_count, bfp_input_count + bfp_in),
+                    If(bfp_out,
+                        NextValue(bfp_payload_count, bfp_payload_count + 1),
+                        If(bfp_payload_count == (bfp_payload_words - 1),
+                            NextState("BFP_COLLECT"),
+                        )
+                    )
+                )
+            )
+
+# AD9361 RX Sample Counter -------------------------------------------------------------------------
+
+class AD9361RXSampleCounter(LiteXModule):
+    """Count the sample instants leaving the RX BitMode.
+
+    `count` is the number of sample instants completed before the beat presented on the RX output
+    (`ce` high when it is accepted): 16-bit beats complete 1 instant, 8-bit and BFP8 payload beats
+    2, BFP payload beats the instants whose last mantissa they carry, block headers (`first`) none;
+    twice as many with `one_channel` (PHY in 1R1T, each instant is a single I/Q pair).
+    `count` never restarts, so it can tag the stream: `clear` latches the count of the next beat in
+    `base` (sample index = count - base), `pps_clear` arms the same latch on the next `pps` pulse so
+    boards sharing a PPS index their samples from the same instant.
+    """
+    def __init__(self, bfp_bits=None):
+        self.ce          = Signal()   # i: RX output beat accepted.
+        self.first       = Signal()   # i: RX output beat is a BFP/BFP8 block header.
+        self.mode        = Signal(2)  # i: RX BitMode.
+        self.one_channel = Signal()   # i: PHY in 1R1T mode.
+        self.clear       = Signal()   # i
+        self.pps_clear   = Signal()   # i
+        self.pps         = Signal()   # i
+        self.count       = Signal(64) # o
+        self.base        = Signal(64) # o
+
+        # # #
+
+        instants = Signal(8)
+        armed    = Signal()
+        cases    = {
+            _16_BIT_MODE : instants.eq(Mux(self.one_channel, 2, 1)),
+            _8_BIT_MODE  : instants.eq(Mux(self.one_channel, 4, 2)),
+            _BFP8_MODE   : instants.eq(Mux(self.first, 0, Mux(self.one_channel, 4, 2))),
+        }
+
+        # BFP payload words do not hold a whole number of instants: track the mantissa bits of the
+        # 4-mantissa group left open by the previous word (block headers realign on a group).
+        if bfp_bits is not None:
+            group_bits = 4 * bfp_bits
+            residues   = range(0, group_bits, math.gcd(64, group_bits))
+            residue    = Signal(max=group_bits)
+            def completed(r, instant_bits):
+                return (r + 64)//instant_bits - r//instant_bits
+            cases[_BFP_MODE] = If(~self.first,
+                Case(residue, {r: instants.eq(Mux(self.one_channel,
+                    completed(r, group_bits//2),
+                    completed(r, group_bits))) for r in residues})
+            )
+            self.sync += If(self.ce & (self.mode == _BFP_MODE),
+                If(self.first,
+                    residue.eq(0)
+                ).Else(
+                    Case(residue, {r: residue.eq((r + 64)%group_bits) for r in residues})
+                )
+            )
+        self.comb += Case(self.mode, cases)
+
+        self.sync += [
+            If(self.pps_clear,
+                armed.eq(1)
+            ).Elif(self.pps,
+                armed.eq(0)
+            ),
+            If(self.clear | (armed & self.pps),
+                self.base.eq(self.count + Mux(self.ce, instants, 0))
+            ),
+            If(self.ce,
+                self.count.eq(self.count + instants)
+            ),
+        ]
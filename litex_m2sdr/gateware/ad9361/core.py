@@ -16,10 +16,13 @@ from litepcie.common import *
 
 from litex_m2sdr.gateware.gpio import GPIORXPacker, GPIOTXUnpacker
 
-from litex_m2sdr.gateware.ad9361.phy     import AD9361PHY
+from litex_m2sdr.gateware.ad9361.phy     import AD9361PHY, AD9361PHY1R1T_MODE
 from litex_m2sdr.gateware.ad9361.spi     import AD9361SPIMaster
 from litex_m2sdr.gateware.ad9361.bitmode import AD9361TXBitMode, AD9361RXBitMode
+from litex_m2sdr.gateware.ad9361.bitmode import AD9361RXSampleCounter
 from litex_m2sdr.gateware.ad9361.bitmode import _sign_extend
+from litex_m2sdr.gateware.ad9361.ddc     import AD9361RXDDC
+from litex_m2sdr.gateware.ad9361.duc     import AD9361TXDUC
 from litex_m2sdr.gateware.ad9361.prbs    import AD9361PRBSGenerator, AD9361PRBSChecker
 from litex_m2sdr.gateware.ad9361.prbs    import AD9361PRBS1R1TGenerator, AD9361PRBS1R1TChecker
 from litex_m2sdr.gateware.ad9361.agc     import (
@@ -99,7 +102,9 @@ class AD9361RFICStreamBypass(LiteXModule):
 class AD9361RFIC(LiteXModule):
     def __init__(self, rfic_pads, spi_pads, sys_clk_freq,
         with_tx_fifo = False, tx_fifo_depth = 8192,
-        with_rx_fifo = False, rx_fifo_depth = 8192):
+        with_rx_fifo = False, rx_fifo_depth = 8192,
+        bfp_bits     = None,  bfp_payload_words = None,
+        with_rx_ddc  = False, with_tx_duc = False):
         # Stream Endpoints -------------------------------------------------------------------------
         self.sink   = stream.Endpoint(dma_layout(64))
         self.source = stream.Endpoint(dma_layout(64))
@@ -140,7 +145,12 @@ class AD9361RFIC(LiteXModule):
                 ("``0b00``", "12-bit mode in SC16/Q11 transport containers."),
                 ("``0b01``", " 8-bit mode in SC8/Q7 transport containers."),
                 ("``0b10``", "BFP8 block-floating transport mode."),
-            ], description="Sample format.")
+                ("``0b11``", "BFP block-floating transport mode with build-time mantissa width (when built with ``bfp_bits``)."),
+            ], description="Sample format."),
+            CSRField("bfp8_channel_exponents", size=1, offset=4, values=[
+                ("``0b0``", "BFP8 blocks share one exponent between RX1 and RX2."),
+                ("``0b1``", "BFP8 blocks carry one exponent per channel (header version 3)."),
+            ]),
         ])
 
         # # #
@@ -216,20 +226,36 @@ class AD9361RFIC(LiteXModule):
             self.rx_rfic_fifo = rx_rfic_fifo = AD9361RFICStreamBypass()
 
         # BitMode ----------------------------------------------------------------------------------
-        self.tx_bitmode = tx_bitmode = AD9361TXBitMode()
-        self.rx_bitmode = rx_bitmode = AD9361RXBitMode()
+        self.bfp_bits   = bfp_bits
+        self.tx_bitmode = tx_bitmode = AD9361TXBitMode(bfp_bits=bfp_bits, bfp_payload_words=bfp_payload_words)
+        self.rx_bitmode = rx_bitmode = AD9361RXBitMode(bfp_bits=bfp_bits, bfp_payload_words=bfp_payload_words)
         self.comb += tx_bitmode.mode.eq(self._bitmode.fields.mode)
         self.comb += rx_bitmode.mode.eq(self._bitmode.fields.mode)
+        self.comb += rx_bitmode.bfp8_channel_exponents.eq(self._bitmode.fields.bfp8_channel_exponents)
+
+        # TX DUC (Optional) ------------------------------------------------------------------------
+        tx_duc = []
+        if with_tx_duc:
+            self.tx_duc = AD9361TXDUC()
+            tx_duc = [self.tx_duc]
+
+        # RX DDC (Optional) ------------------------------------------------------------------------
+        rx_ddc = []
+        if with_rx_ddc:
+            self.rx_ddc = AD9361RXDDC()
+            rx_ddc = [self.rx_ddc]
 
         # Data Flow --------------------------------------------------------------------------------
 
         # TX.
         # ---
-        # Sink -> TX Buffer -> TX BitMode -> TX CDC -> optional TX RFIC FIFO -> GPIOTXUnpacker -> PHY.
+        # Sink -> TX Buffer -> TX BitMode -> optional TX DUC -> TX CDC -> optional TX RFIC FIFO ->
+        # GPIOTXUnpacker -> PHY.
         self.tx_pipeline = stream.Pipeline(
             self.sink,
             tx_buffer,
             tx_bitmode,
+            *tx_duc,
             tx_cdc,
             tx_rfic_fifo,
             gpio_tx_unpacker,
@@ -245,7 +271,8 @@ class AD9361RFIC(LiteXModule):
 
         # RX.
         # ---
-        # PHY -> GPIORXUnpacker -> optional RX RFIC FIFO -> RX CDC -> RX BitMode -> RX Buffer -> Source.
+        # PHY -> GPIORXUnpacker -> optional RX RFIC FIFO -> RX CDC -> optional RX DDC -> RX BitMode ->
+        # RX Buffer -> Source.
         self.comb += [
             self.phy.source.connect(gpio_rx_packer.sink, keep={"valid", "ready"}),
             gpio_rx_packer.sink.data[0*16:1*16].eq(_sign_extend(self.phy.source.ia, 16)),
@@ -257,6 +284,7 @@ class AD9361RFIC(LiteXModule):
             gpio_rx_packer,
             rx_rfic_fifo,
             rx_cdc,
+            *rx_ddc,
             rx_bitmode,
             rx_buffer,
             self.source,
@@ -349,6 +377,15 @@ class AD9361RFIC(LiteXModule):
         self.comb += synced.eq(Mux(mode_rfic, prbs_checker_1r1t.synced, synced_2r2t))
         self.specials += MultiReg(synced, self.prbs_rx.fields.synced)
 
+    def add_rx_sample_counter(self):
+        self.rx_sample_counter = AD9361RXSampleCounter(bfp_bits=self.bfp_bits)
+        self.comb += [
+            self.rx_sample_counter.ce.eq(self.source.valid & self.source.ready),
+            self.rx_sample_counter.first.eq(self.source.first),
+            self.rx_sample_counter.mode.eq(self.rx_bitmode.mode),
+            self.rx_sample_counter.one_channel.eq(self.phy.control.fields.mode == AD9361PHY1R1T_MODE),
+        ]
+
     def add_agc(self):
         rx_cdc = self.rx_cdc
         self.agc_count_rx1_low = AGCSaturationCount(
@@ -0,0 +1,480 @@
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import math
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect     import stream
+from litex.soc.interconnect.csr import *
+
+from litepcie.common import *
+
+# Constants / Helpers ------------------------------------------------------------------------------
+
+DDC_LANES       = 4      # IA, QA, IB, QB.
+DDC_MIXER_BITS  = 18     # Mixer output / CIC input width.
+DDC_LUT_BITS    = 10     # NCO LUT address width (phase MSBs).
+DDC_LUT_ONE     = 2**16  # NCO LUT amplitude (Q16: phase 0 is an exact pass-through).
+DDC_COEF_BITS   = 18     # FIR coefficient width (signed).
+DDC_COEF_SHIFT  = 16     # FIR coefficient fractional bits (Q16).
+DDC_OUTPUT_BITS = 16     # Output sample containers (SC16).
+
+def ddc_nco_lut(lut_bits=DDC_LUT_BITS):
+    """Signed Q16 (cos, sin) pairs of the NCO LUT."""
+    n = 2**lut_bits
+    return [(round(DDC_LUT_ONE*math.cos(2*math.pi*k/n)), round(DDC_LUT_ONE*math.sin(2*math.pi*k/n)))
+        for k in range(n)]
+
+def ddc_cic_width(stages, max_decimation):
+    """CIC register width: input width plus the worst-case bit growth."""
+    return DDC_MIXER_BITS + stages*bits_for(max_decimation - 1)
+
+def _saturate(module, value, bits):
+    result = Signal((bits, True))
+    vmax   =  2**(bits - 1) - 1
+    vmin   = -2**(bits - 1)
+    module.comb += [
+        If(value > vmax,
+            result.eq(vmax),
+        ).Elif(value < vmin,
+            result.eq(vmin),
+        ).Else(
+            result.eq(value),
+        )
+    ]
+    return result
+
+# NCO Mixer ----------------------------------------------------------------------------------------
+
+class DDCNCOMixer(LiteXModule):
+    """
+    NCO Mixer.
+
+    Mixes the two I/Q channels of each input beat down by their own 32-bit NCO:
+    (i + jq)*exp(-j*phase), the phase advancing by increment/2^32 turn per sample. The LUT is
+    addressed by the phase MSBs and the products are truncated back to DDC_MIXER_BITS. Fixed 3-cycle
+    latency.
+    """
+    def __init__(self, lut_bits=DDC_LUT_BITS):
+        self.ce         = Signal()                                                    # Input valid (i).
+        self.lanes      = [Signal((16, True)) for _ in range(DDC_LANES)]              # IA, QA, IB, QB (i).
+        self.increments = [Signal(32) for _ in range(2)]                              # Per channel (i).
+        self.valid      = Signal()                                                    # Output valid (o).
+        self.outputs    = [Signal((DDC_MIXER_BITS, True)) for _ in range(DDC_LANES)]  # (o).
+
+        # # #
+
+        lut = Memory(36, 2**lut_bits, init=[
+            (cos & (2**18 - 1)) | ((sin & (2**18 - 1)) << 18) for cos, sin in ddc_nco_lut(lut_bits)
+        ])
+        self.specials += lut
+
+        # Valid Pipeline.
+        v1 = Signal()
+        v2 = Signal()
+        self.sync += [
+            v1.eq(self.ce),
+            v2.eq(v1),
+            self.valid.eq(v2),
+        ]
+
+        # Channels.
+        for channel in range(2):
+            port  = lut.get_port()
+            self.specials += port
+            phase = Signal(32)
+            i, q  = self.lanes[2*channel:2*channel + 2]
+            i0    = Signal((16, True))
+            q0    = Signal((16, True))
+            cos   = Signal((18, True))
+            sin   = Signal((18, True))
+            ic    = Signal((34, True))
+            qs    = Signal((34, True))
+            qc    = Signal((34, True))
+            is_   = Signal((34, True))
+            mi    = Signal((35, True))
+            mq    = Signal((35, True))
+            self.comb += [
+                port.adr.eq(phase[32 - lut_bits:]),
+                cos.eq(port.dat_r[0:18]),
+                sin.eq(port.dat_r[18:36]),
+                mi.eq(ic + qs),
+                mq.eq(qc - is_),
+            ]
+            self.sync += [
+                # Stage 0: LUT read, sample register, phase advance.
+                If(self.ce,
+                    phase.eq(phase + self.increments[channel]),
+                    i0.eq(i),
+                    q0.eq(q),
+                ),
+                # Stage 1: Products.
+                ic.eq(i0*cos),
+                qs.eq(q0*sin),
+                qc.eq(q0*cos),
+                is_.eq(i0*sin),
+                # Stage 2: Sum/Difference, back to Q0 (floor).
+                self.outputs[2*channel + 0].eq(mi[16:16 + DDC_MIXER_BITS]),
+                self.outputs[2*channel + 1].eq(mq[16:16 + DDC_MIXER_BITS]),
+            ]
+
+# CIC Decimator ------------------------------------------------------------------------------------
+
+class DDCCICDecimator(LiteXModule):
+    """
+    CIC Decimator.
+
+    `stages`-stage CIC (differential delay 1) decimating the DDC lanes by `decimation`
+    (1-max_decimation, 0 handled as 1). Integrators run on each input sample, combs on each
+    decimated sample; the output is shifted right by `shift` (floor) and saturated to
+    DDC_MIXER_BITS. The gain is decimation^stages: shift = ceil(stages*log2(decimation)) keeps
+    unity gain or below.
+    """
+    def __init__(self, stages=4, max_decimation=64):
+        width = ddc_cic_width(stages, max_decimation)
+        self.ce         = Signal()                                                    # Input valid (i).
+        self.lanes      = [Signal((DDC_MIXER_BITS, True)) for _ in range(DDC_LANES)]  # (i).
+        self.decimation = Signal(bits_for(max_decimation))                            # (i).
+        self.shift      = Signal(max=width)                                           # (i).
+        self.valid      = Signal()                                                    # Output valid (o).
+        self.outputs    = [Signal((DDC_MIXER_BITS, True)) for _ in range(DDC_LANES)]  # (o).
+
+        # # #
+
+        # Decimation Counter.
+        count = Signal(bits_for(max_decimation))
+        emit  = Signal()
+        self.comb += emit.eq(self.ce & ((count + 1) >= self.decimation))
+        self.sync += [
+            If(self.ce,
+                If(emit,
+                    count.eq(0),
+                ).Else(
+                    count.eq(count + 1),
+                )
+            )
+        ]
+
+        # Comb Valid Pipeline (one register per comb stage, then scaling).
+        valids = [Signal() for _ in range(stages + 2)]
+        self.sync += valids[0].eq(emit)
+        for k in range(1, stages + 2):
+            self.sync += valids[k].eq(valids[k - 1])
+        self.comb += self.valid.eq(valids[-1])
+
+        for lane in range(DDC_LANES):
+            # Integrators (pipelined: each stage accumulates the previous stage's last value).
+            integrators = [Signal((width, True)) for _ in range(stages)]
+            self.sync += If(self.ce,
+                integrators[0].eq(integrators[0] + self.lanes[lane]),
+                *[integrators[k].eq(integrators[k] + integrators[k - 1]) for k in range(1, stages)]
+            )
+
+            # Decimation.
+            sample = Signal((width, True))
+            self.sync += If(emit, sample.eq(integrators[-1]))
+
+            # Combs.
+            value = sample
+            for k in range(stages):
+                delayed = Signal((width, True))
+                result  = Signal((width, True))
+                self.sync += If(valids[k],
+                    delayed.eq(value),
+                    result.eq(value - delayed),
+                )
+                value = result
+
+            # Scaling.
+            shifted = Signal((width, True))
+            self.comb += shifted.eq(value >> self.shift)
+            self.sync += If(valids[stages], self.outputs[lane].eq(_saturate(self, shifted, DDC_MIXER_BITS)))
+
+# Serial FIR Decimator -----------------------------------------------------------------------------
+
+class DDCFIRDecimator(LiteXModule):
+    """
+    Serial FIR Decimator.
+
+    Decimate-by-2 FIR with `taps` programmable signed Q16 coefficients per channel (shared by its
+    I/Q lanes), computed with one multiply-accumulate per lane and cycle: each output takes about
+    taps + 4 cycles, so the input samples must be at least (taps + 4)/2 cycles apart on average.
+    When `enable` is low, samples are passed through without filtering or decimation. Outputs are
+    shifted back by 16 bits (floor) and saturated to DDC_OUTPUT_BITS.
+
+    Coefficients default to a unit impulse (pure decimation) and are written through
+    coef_channel/coef_index/coef_data/coef_we.
+    """
+    def __init__(self, taps=24):
+        assert taps >= 2
+        self.sink         = sink   = stream.Endpoint([("data", DDC_LANES*DDC_MIXER_BITS)])
+        self.source       = source = stream.Endpoint([("data", DDC_LANES*DDC_OUTPUT_BITS)])
+        self.enable       = Signal()
+        self.coef_channel = Signal()
+        self.coef_index   = Signal(max=taps)
+        self.coef_data    = Signal((DDC_COEF_BITS, True))
+        self.coef_we      = Signal()
+
+        # # #
+
+        acc_width = DDC_MIXER_BITS + DDC_COEF_BITS + bits_for(taps)
+
+        # Delay Line / Coefficients.
+        delay = Memory(DDC_LANES*DDC_MIXER_BITS, taps)
+        delay_wr = delay.get_port(write_capable=True)
+        delay_rd = delay.get_port(async_read=True)
+        coefs    = []
+        for channel in range(2):
+            coef    = Memory(DDC_COEF_BITS, taps, init=[2**DDC_COEF_SHIFT] + [0]*(taps - 1))
+            coef_wr = coef.get_port(write_capable=True)
+            coef_rd = coef.get_port(async_read=True)
+            self.specials += coef, coef_wr, coef_rd
+            self.comb += [
+                coef_wr.adr.eq(self.coef_index),
+                coef_wr.dat_w.eq(self.coef_data),
+                coef_wr.we.eq(self.coef_we & (self.coef_channel == channel)),
+            ]
+            coefs.append(coef_rd)
+        self.specials += delay, delay_wr, delay_rd
+
+        # Control.
+        newest = Signal(max=taps) # Index of the last written sample.
+        phase  = Signal()         # Second sample of a decimation pair.
+        tap    = Signal(max=taps + 1)
+        s1     = Signal()         # Product valid (accumulate).
+        clear  = Signal()
+        ptr    = Signal(max=taps)
+        self.comb += [
+            If(newest >= tap,
+                ptr.eq(newest - tap),
+            ).Else(
+                ptr.eq(newest + taps - tap),
+            ),
+            delay_rd.adr.eq(ptr),
+            coefs[0].adr.eq(tap),
+            coefs[1].adr.eq(tap),
+        ]
+
+        # Datapath.
+        products = [Signal((DDC_MIXER_BITS + DDC_COEF_BITS, True)) for _ in range(DDC_LANES)]
+        accs     = [Signal((acc_width, True)) for _ in range(DDC_LANES)]
+        outputs  = []
+        for lane in range(DDC_LANES):
+            sample = Signal((DDC_MIXER_BITS, True))
+            coef   = Signal((DDC_COEF_BITS, True))
+            self.comb += [
+                sample.eq(delay_rd.dat_r[lane*DDC_MIXER_BITS:(lane + 1)*DDC_MIXER_BITS]),
+                coef.eq(coefs[lane//2].dat_r),
+            ]
+            self.sync += [
+                products[lane].eq(sample*coef),
+                If(clear,
+                    accs[lane].eq(0),
+                ).Elif(s1,
+                    accs[lane].eq(accs[lane] + products[lane]),
+                ),
+            ]
+            shifted = Signal((acc_width - DDC_COEF_SHIFT, True))
+            self.comb += shifted.eq(accs[lane][DDC_COEF_SHIFT:])
+            outputs.append(shifted)
+
+        # Bypass output (no filtering).
+        bypass = []
+        for lane in range(DDC_LANES):
+            sample = Signal((DDC_MIXER_BITS, True))
+            self.comb += sample.eq(sink.data[lane*DDC_MIXER_BITS:(lane + 1)*DDC_MIXER_BITS])
+            bypass.append(_saturate(self, sample, DDC_OUTPUT_BITS))
+
+        fir_data = Signal(DDC_LANES*DDC_OUTPUT_BITS)
+        self.comb += source.data.eq(Mux(self.enable, fir_data, Cat(*bypass)))
+
+        self.fsm = fsm = FSM(reset_state="LOAD")
+        fsm.act("LOAD",
+            If(~self.enable,
+                sink.connect(source, omit={"data"}),
+            ).Else(
+                sink.ready.eq(1),
+                If(sink.valid,
+                    delay_wr.we.eq(1),
+                    NextValue(phase, ~phase),
+                    NextValue(newest, delay_wr.adr),
+                    If(phase,
+                        NextValue(tap, 0),
+                        clear.eq(1),
+                        NextState("MAC"),
+                    )
+                )
+            )
+        )
+        self.comb += [
+            delay_wr.adr.eq(Mux(newest == (taps - 1), 0, newest + 1)),
+            delay_wr.dat_w.eq(sink.data),
+        ]
+        fsm.act("MAC",
+            NextValue(tap, tap + 1),
+            If(tap == taps,
+                NextState("FLUSH")
+            )
+        )
+        self.sync += s1.eq(fsm.ongoing("MAC") & (tap != taps))
+        fsm.act("FLUSH",
+            # Wait for the last product to be accumulated.
+            If(~s1,
+                NextValue(fir_data, Cat(*[_saturate(self, o, DDC_OUTPUT_BITS) for o in outputs])),
+                NextState("OUTPUT"),
+            )
+        )
+        fsm.act("OUTPUT",
+            source.valid.eq(1),
+            If(source.ready,
+                NextState("LOAD"),
+            )
+        )
+        self.sync += If(~self.enable, phase.eq(0))
+
+# AD9361 RX DDC ------------------------------------------------------------------------------------
+
+class AD9361RXDDC(LiteXModule):
+    """
+    AD9361 RX Digital Down-Converter.
+
+    Optional RX stage working on the SC16 2R2T beats (IA, QA, IB, QB) in the sys domain:
+
+        NCO Mixer (per channel) -> CIC Decimator (shared ratio) -> FIR /2 (per-channel coefficients)
+
+    Both channels share the decimation so they stay packed in the same output beat. The RX path
+    cannot be backpressured: CIC outputs arriving while the FIR/downstream is busy are dropped and
+    counted. When disabled, samples are passed through unchanged.
+    """
+    def __init__(self, cic_stages=4, cic_max_decimation=64, fir_taps=24, fifo_depth=16, with_csr=True):
+        self.sink   = sink   = stream.Endpoint(dma_layout(64))
+        self.source = source = stream.Endpoint(dma_layout(64))
+
+        self.enable     = Signal()
+        self.fir_enable = Signal()
+        self.increments = [Signal(32) for _ in range(2)]
+        self.decimation = Signal(bits_for(cic_max_decimation))
+        self.shift      = Signal(max=ddc_cic_width(cic_stages, cic_max_decimation))
+        self.overflows  = Signal(32)
+
+        # # #
+
+        self.cic_stages         = cic_stages
+        self.cic_max_decimation = cic_max_decimation
+        self.fir_taps           = fir_taps
+
+        # Datapath (held in reset while disabled).
+        reset = Signal()
+        self.comb += reset.eq(~self.enable)
+        self.mixer = mixer = ResetInserter()(DDCNCOMixer())
+        self.cic   = cic   = ResetInserter()(DDCCICDecimator(stages=cic_stages, max_decimation=cic_max_decimation))
+        self.fifo  = fifo  = ResetInserter()(stream.SyncFIFO([("data", DDC_LANES*DDC_MIXER_BITS)], fifo_depth))
+        self.fir   = fir   = ResetInserter()(DDCFIRDecimator(taps=fir_taps))
+        self.comb += [
+            mixer.reset.eq(reset),
+            cic.reset.eq(reset),
+            fifo.reset.eq(reset),
+            fir.reset.eq(reset),
+        ]
+
+        # NCO Mixer.
+        self.comb += mixer.ce.eq(self.enable & sink.valid)
+        for lane in range(DDC_LANES):
+            self.comb += mixer.lanes[lane].eq(sink.data[16*lane:16*(lane + 1)])
+        for channel in range(2):
+            self.comb += mixer.increments[channel].eq(self.increments[channel])
+
+        # CIC.
+        self.comb += [
+            cic.ce.eq(mixer.valid),
+            cic.decimation.eq(self.decimation),
+            cic.shift.eq(self.shift),
+        ]
+        for lane in range(DDC_LANES):
+            self.comb += cic.lanes[lane].eq(mixer.outputs[lane])
+
+        # FIFO.
+        self.comb += [
+            fifo.sink.valid.eq(cic.valid),
+            fifo.sink.data.eq(Cat(*cic.outputs)),
+        ]
+        self.sync += [
+            If(reset,
+                self.overflows.eq(0),
+            ).Elif(fifo.sink.valid & ~fifo.sink.ready,
+                self.overflows.eq(self.overflows + 1),
+            )
+        ]
+
+        # FIR.
+        self.comb += [
+            fifo.source.connect(fir.sink),
+            fir.enable.eq(self.fir_enable),
+        ]
+
+        # Output / Bypass.
+        self.comb += [
+            If(self.enable,
+                sink.ready.eq(1),
+                fir.source.connect(source, omit={"data"}),
+                source.data.eq(fir.source.data),
+            ).Else(
+                sink.connect(source),
+            )
+        ]
+
+        if with_csr:
+            self.add_csr()
+
+    def add_csr(self):
+        self._control = CSRStorage(fields=[
+            CSRField("enable", size=1, offset=0, values=[
+                ("``0b0``", "DDC bypassed (samples passed through)."),
+                ("``0b1``", "DDC enabled."),
+            ]),
+            CSRField("fir_enable", size=1, offset=1, values=[
+                ("``0b0``", "FIR bypassed (CIC output only)."),
+                ("``0b1``", "FIR compensation filter and decimation by 2."),
+            ]),
+        ])
+        self._nco_a = CSRStorage(32, description="RX1 NCO phase increment (frequency = increment*fs/2^32).")
+        self._nco_b = CSRStorage(32, description="RX2 NCO phase increment (frequency = increment*fs/2^32).")
+        self._cic = CSRStorage(fields=[
+            CSRField("decimation", size=len(self.decimation), offset=0,
+                description=f"CIC decimation ratio (1-{self.cic_max_decimation}, shared by RX1/RX2)."),
+            CSRField("shift", size=len(self.shift), offset=16,
+                description="CIC output right shift (ceil(stages*log2(decimation)) for unity gain)."),
+        ])
+        self._fir_coef_index = CSRStorage(fields=[
+            CSRField("index",   size=len(self.fir.coef_index), offset=0,  description="FIR coefficient index."),
+            CSRField("channel", size=1,                        offset=16, description="FIR channel (0: RX1, 1: RX2)."),
+        ])
+        self._fir_coef = CSRStorage(DDC_COEF_BITS,
+            description="FIR coefficient (signed Q16); writing it updates the selected coefficient."
+        )
+        self._info = CSRStatus(fields=[
+            CSRField("cic_stages",         size=4,  offset=0,  reset=self.cic_stages),
+            CSRField("cic_max_decimation", size=12, offset=4,  reset=self.cic_max_decimation),
+            CSRField("fir_taps",           size=16, offset=16, reset=self.fir_taps),
+        ], description="DDC build-time configuration.")
+        self._overflows = CSRStatus(32, description="CIC outputs dropped while the FIR/downstream was busy.")
+
+        self.comb += [
+            self.enable.eq(self._control.fields.enable),
+            self.fir_enable.eq(self._control.fields.fir_enable),
+            self.increments[0].eq(self._nco_a.storage),
+            self.increments[1].eq(self._nco_b.storage),
+            self.decimation.eq(self._cic.fields.decimation),
+            self.shift.eq(self._cic.fields.shift),
+            self.fir.coef_index.eq(self._fir_coef_index.fields.index),
+            self.fir.coef_channel.eq(self._fir_coef_index.fields.channel),
+            self.fir.coef_data.eq(self._fir_coef.storage),
+            self.fir.coef_we.eq(self._fir_coef.re),
+            self._overflows.status.eq(self.overflows),
+        ]
@@ -0,0 +1,367 @@
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect     import stream
+from litex.soc.interconnect.csr import *
+
+from litepcie.common import *
+
+from litex_m2sdr.gateware.ad9361.ddc import DDC_LANES, DDC_LUT_BITS, ddc_nco_lut, _saturate
+
+# Constants / Helpers ------------------------------------------------------------------------------
+
+DUC_SAMPLE_BITS = 16                   # Inner sample containers (SC16).
+DUC_TX_BITS     = 12                   # AD9361 TX sample width (output saturation).
+DUC_HB_COEFS    = (39035, -7439, 1172) # Half-band odd taps h[+-1], h[+-3], h[+-5] (Q16, x2 gain).
+DUC_HB_SHIFT    = 16
+
+def duc_cic_width(stages, max_interpolation):
+    """CIC register width: input width plus the worst-case bit growth."""
+    return DUC_SAMPLE_BITS + stages*bits_for(max_interpolation - 1)
+
+def _lanes(data, bits=DUC_SAMPLE_BITS):
+    return [data[lane*bits:(lane + 1)*bits] for lane in range(DDC_LANES)]
+
+# Half-Band Interpolator ---------------------------------------------------------------------------
+
+class DUCHalfBandInterpolator(LiteXModule):
+    """
+    Half-Band Interpolator.
+
+    Interpolates the DUC lanes by 2 with a fixed 11-tap half-band filter (unity gain, about 60dB of
+    image rejection for signals within 40% of the input band). The even outputs are the input
+    samples themselves, the odd ones the symmetric DUC_HB_COEFS sum shifted back by 16 bits (floor)
+    and saturated. Full throughput: one output per cycle. When `enable` is low, samples are passed
+    through.
+    """
+    def __init__(self):
+        self.sink   = sink   = stream.Endpoint(dma_layout(64))
+        self.source = source = stream.Endpoint(dma_layout(64))
+        self.enable = Signal()
+
+        # # #
+
+        taps = 2*len(DUC_HB_COEFS) # Input samples spanned by the odd phase.
+
+        # Delay Line (newest first) / Output Phase.
+        delay = [[Signal((DUC_SAMPLE_BITS, True)) for _ in range(taps)] for _ in range(DDC_LANES)]
+        have  = Signal() # Delay line holds a sample with outputs left.
+        odd   = Signal() # Next output is the odd (filtered) one.
+
+        # Outputs.
+        evens = []
+        odds  = []
+        for lane in range(DDC_LANES):
+            d   = delay[lane]
+            mid = taps//2
+            acc = Signal((DUC_SAMPLE_BITS + 18 + 2, True))
+            out = Signal((len(acc) - DUC_HB_SHIFT, True))
+            self.comb += [
+                acc.eq(sum(coef*(d[mid - 1 - k] + d[mid + k]) for k, coef in enumerate(DUC_HB_COEFS))),
+                out.eq(acc[DUC_HB_SHIFT:]),
+            ]
+            evens.append(d[mid])
+            odds.append(_saturate(self, out, DUC_SAMPLE_BITS))
+
+        # Flow Control.
+        output = stream.Endpoint(dma_layout(64))
+        ready  = Signal()
+        ce     = Signal()
+        step   = Signal()
+        last   = Signal()
+        self.comb += [
+            ce.eq(~output.valid | output.ready),
+            step.eq(have & ce),
+            last.eq(step & odd),
+            ready.eq(~have | last),
+        ]
+        self.sync += [
+            If(ce,
+                output.valid.eq(step),
+                If(step,
+                    output.data.eq(Mux(odd, Cat(*odds), Cat(*evens))),
+                    odd.eq(~odd),
+                ),
+            ),
+            If(last,
+                have.eq(0),
+            ),
+            If(self.enable & sink.valid & ready,
+                have.eq(1),
+                *[delay[lane][0].eq(sample) for lane, sample in enumerate(_lanes(sink.data))],
+                *[delay[lane][k].eq(delay[lane][k - 1]) for lane in range(DDC_LANES) for k in range(1, taps)],
+            ),
+        ]
+
+        # Output / Bypass.
+        self.comb += [
+            If(self.enable,
+                sink.ready.eq(ready),
+                output.connect(source),
+            ).Else(
+                sink.connect(source),
+            )
+        ]
+
+# CIC Interpolator ---------------------------------------------------------------------------------
+
+class DUCCICInterpolator(LiteXModule):
+    """
+    CIC Interpolator.
+
+    `stages`-stage CIC (differential delay 1) interpolating the DUC lanes by `interpolation`
+    (1-max_interpolation, 0 handled as 1): combs run on each input sample, which is then followed by
+    interpolation - 1 zeros through the integrators. The output is shifted right by `shift` (floor)
+    and saturated. The gain is interpolation^(stages - 1): shift = ceil((stages - 1)*log2(interpolation))
+    keeps unity gain or below. Full throughput: one output per cycle.
+    """
+    def __init__(self, stages=4, max_interpolation=64):
+        width = duc_cic_width(stages, max_interpolation)
+        self.sink          = sink   = stream.Endpoint(dma_layout(64))
+        self.source        = source = stream.Endpoint(dma_layout(64))
+        self.interpolation = Signal(bits_for(max_interpolation))
+        self.shift         = Signal(max=width)
+
+        # # #
+
+        have  = Signal() # Comb output held with outputs left.
+        count = Signal(bits_for(max_interpolation))
+        ce    = Signal()
+        step  = Signal()
+        last  = Signal()
+        self.comb += [
+            ce.eq(~source.valid | source.ready),
+            step.eq(have & ce),
+            last.eq(step & ((count + 1) >= self.interpolation)),
+            sink.ready.eq(~have | last),
+        ]
+        self.sync += [
+            If(ce,
+                source.valid.eq(step),
+            ),
+            If(step,
+                count.eq(count + 1),
+            ),
+            If(last,
+                have.eq(0),
+            ),
+            If(sink.valid & sink.ready,
+                have.eq(1),
+                count.eq(0),
+            ),
+        ]
+
+        outputs = []
+        for lane, sample in enumerate(_lanes(sink.data)):
+            # Combs (input rate).
+            value = Signal((width, True))
+            self.comb += value.eq(Cat(sample, Replicate(sample[-1], width - DUC_SAMPLE_BITS)))
+            for k in range(stages):
+                delayed = Signal((width, True))
+                result  = Signal((width, True))
+                self.comb += result.eq(value - delayed)
+                self.sync += If(sink.valid & sink.ready, delayed.eq(value))
+                value = result
+            held = Signal((width, True))
+            self.sync += If(sink.valid & sink.ready, held.eq(value))
+
+            # Integrators (output rate, pipelined: each stage accumulates the previous stage's last value).
+            integrators = [Signal((width, True)) for _ in range(stages)]
+            self.sync += If(step,
+                integrators[0].eq(integrators[0] + Mux(count == 0, held, 0)),
+                *[integrators[k].eq(integrators[k] + integrators[k - 1]) for k in range(1, stages)]
+            )
+
+            # Scaling.
+            shifted = Signal((width, True))
+            self.comb += shifted.eq(integrators[-1] >> self.shift)
+            outputs.append(_saturate(self, shifted, DUC_SAMPLE_BITS))
+        self.comb += source.data.eq(Cat(*outputs))
+
+# NCO Mixer ----------------------------------------------------------------------------------------
+
+class DUCNCOMixer(LiteXModule):
+    """
+    NCO Mixer.
+
+    Mixes the two I/Q channels of each beat up by their own 32-bit NCO: (i + jq)*exp(+j*phase), the
+    phase advancing by increment/2^32 turn per sample. The LUT is addressed by the phase MSBs, the
+    products are shifted back by 16 bits (floor) and saturated to DUC_TX_BITS. 3-stage pipeline
+    stalled by the source.
+    """
+    def __init__(self, lut_bits=DDC_LUT_BITS):
+        self.sink       = sink   = stream.Endpoint(dma_layout(64))
+        self.source     = source = stream.Endpoint(dma_layout(64))
+        self.increments = [Signal(32) for _ in range(2)]
+
+        # # #
+
+        lut = Memory(36, 2**lut_bits, init=[
+            (cos & (2**18 - 1)) | ((sin & (2**18 - 1)) << 18) for cos, sin in ddc_nco_lut(lut_bits)
+        ])
+        self.specials += lut
+
+        # Valid Pipeline (advances when the output can move).
+        ce = Signal()
+        v1 = Signal()
+        v2 = Signal()
+        self.comb += [
+            ce.eq(~source.valid | source.ready),
+            sink.ready.eq(ce),
+        ]
+        self.sync += If(ce,
+            v1.eq(sink.valid),
+            v2.eq(v1),
+            source.valid.eq(v2),
+        )
+
+        # Channels.
+        lanes   = _lanes(sink.data)
+        outputs = []
+        for channel in range(2):
+            port  = lut.get_port(has_re=True)
+            self.specials += port
+            phase = Signal(32)
+            i0    = Signal((DUC_SAMPLE_BITS, True))
+            q0    = Signal((DUC_SAMPLE_BITS, True))
+            cos   = Signal((18, True))
+            sin   = Signal((18, True))
+            ic    = Signal((34, True))
+            qs    = Signal((34, True))
+            qc    = Signal((34, True))
+            is_   = Signal((34, True))
+            mi    = Signal((35, True))
+            mq    = Signal((35, True))
+            si    = Signal((19, True))
+            sq    = Signal((19, True))
+            oi    = Signal((DUC_TX_BITS, True))
+            oq    = Signal((DUC_TX_BITS, True))
+            self.comb += [
+                port.adr.eq(phase[32 - lut_bits:]),
+                port.re.eq(ce),
+                cos.eq(port.dat_r[0:18]),
+                sin.eq(port.dat_r[18:36]),
+                mi.eq(ic - qs),
+                mq.eq(qc + is_),
+                si.eq(mi[16:]),
+                sq.eq(mq[16:]),
+            ]
+            self.sync += If(ce,
+                # Stage 0: LUT read, sample register, phase advance.
+                If(sink.valid,
+                    phase.eq(phase + self.increments[channel]),
+                ),
+                i0.eq(lanes[2*channel + 0]),
+                q0.eq(lanes[2*channel + 1]),
+                # Stage 1: Products.
+                ic.eq(i0*cos),
+                qs.eq(q0*sin),
+                qc.eq(q0*cos),
+                is_.eq(i0*sin),
+                # Stage 2: Sum/Difference, back to Q0 (floor) and saturation.
+                oi.eq(_saturate(self, si, DUC_TX_BITS)),
+                oq.eq(_saturate(self, sq, DUC_TX_BITS)),
+            )
+            outputs += [oi, oq]
+        self.comb += source.data.eq(Cat(*[Cat(o, Replicate(o[-1], DUC_SAMPLE_BITS - DUC_TX_BITS)) for o in outputs]))
+
+# AD9361 TX DUC ------------------------------------------------------------------------------------
+
+class AD9361TXDUC(LiteXModule):
+    """
+    AD9361 TX Digital Up-Converter.
+
+    Optional TX stage working on the SC16 2R2T beats (IA, QA, IB, QB) in the sys domain:
+
+        Half-Band x2 (optional) -> CIC Interpolator (shared ratio) -> NCO Mixer (per channel)
+
+    The host then only streams sample_rate/interpolation (/2 with the half-band): the TX path is
+    paced by the RFIC, so the chain only pulls a new input every interpolation cycles of the RFIC
+    rate. The CIC droop is left to the host waveform (or to a narrow enough signal). When disabled,
+    samples are passed through unchanged.
+    """
+    def __init__(self, cic_stages=4, cic_max_interpolation=64, with_csr=True):
+        self.sink   = sink   = stream.Endpoint(dma_layout(64))
+        self.source = source = stream.Endpoint(dma_layout(64))
+
+        self.enable        = Signal()
+        self.hb_enable     = Signal()
+        self.increments    = [Signal(32) for _ in range(2)]
+        self.interpolation = Signal(bits_for(cic_max_interpolation))
+        self.shift         = Signal(max=duc_cic_width(cic_stages, cic_max_interpolation))
+
+        # # #
+
+        self.cic_stages            = cic_stages
+        self.cic_max_interpolation = cic_max_interpolation
+
+        # Datapath (held in reset while disabled).
+        reset = Signal()
+        self.comb += reset.eq(~self.enable)
+        self.hb    = hb    = ResetInserter()(DUCHalfBandInterpolator())
+        self.cic   = cic   = ResetInserter()(DUCCICInterpolator(stages=cic_stages, max_interpolation=cic_max_interpolation))
+        self.mixer = mixer = ResetInserter()(DUCNCOMixer())
+        self.comb += [
+            hb.reset.eq(reset),
+            cic.reset.eq(reset),
+            mixer.reset.eq(reset),
+            hb.enable.eq(self.hb_enable),
+            cic.interpolation.eq(self.interpolation),
+            cic.shift.eq(self.shift),
+            *[mixer.increments[channel].eq(self.increments[channel]) for channel in range(2)],
+            hb.source.connect(cic.sink),
+            cic.source.connect(mixer.sink),
+        ]
+
+        # Input / Output / Bypass.
+        self.comb += [
+            If(self.enable,
+                sink.connect(hb.sink),
+                mixer.source.connect(source),
+            ).Else(
+                sink.connect(source),
+            )
+        ]
+
+        if with_csr:
+            self.add_csr()
+
+    def add_csr(self):
+        self._control = CSRStorage(fields=[
+            CSRField("enable", size=1, offset=0, values=[
+                ("``0b0``", "DUC bypassed (samples passed through)."),
+                ("``0b1``", "DUC enabled."),
+            ]),
+            CSRField("hb_enable", size=1, offset=1, values=[
+                ("``0b0``", "Half-band bypassed (CIC interpolation only)."),
+                ("``0b1``", "Half-band interpolation by 2 before the CIC."),
+            ]),
+        ])
+        self._nco_a = CSRStorage(32, description="TX1 NCO phase increment (frequency = increment*fs/2^32).")
+        self._nco_b = CSRStorage(32, description="TX2 NCO phase increment (frequency = increment*fs/2^32).")
+        self._cic = CSRStorage(fields=[
+            CSRField("interpolation", size=len(self.interpolation), offset=0,
+                description=f"CIC interpolation ratio (1-{self.cic_max_interpolation}, shared by TX1/TX2)."),
+            CSRField("shift", size=len(self.shift), offset=16,
+                description="CIC output right shift (ceil((stages - 1)*log2(interpolation)) for unity gain)."),
+        ])
+        self._info = CSRStatus(fields=[
+            CSRField("cic_stages",            size=4,  offset=0,  reset=self.cic_stages),
+            CSRField("cic_max_interpolation", size=12, offset=4,  reset=self.cic_max_interpolation),
+        ])
+
+        self.comb += [
+            self.enable.eq(self._control.fields.enable),
+            self.hb_enable.eq(self._control.fields.hb_enable),
+            self.increments[0].eq(self._nco_a.storage),
+            self.increments[1].eq(self._nco_b.storage),
+            self.interpolation.eq(self._cic.fields.interpolation),
+            self.shift.eq(self._cic.fields.shift),
+        ]
@@ -0,0 +1,162 @@
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+
+# RX Fan-Out ---------------------------------------------------------------------------------------
+
+class RXFanout(LiteXModule):
+    """
+    RX Fan-Out.
+
+    Drop-in replacement for a stream.Demultiplexer distributing the RX stream to `n` consumers:
+
+    - Routed mode (`broadcast` low): the stream goes to the `sel` consumer only, with backpressure,
+      exactly as the Demultiplexer does.
+    - Broadcast mode: every `enable`d consumer receives a copy of the stream through its own FIFO
+      (`fifo_depth` words). Consumers with their `drop` bit low backpressure the stream when their
+      FIFO is full; consumers with their `drop` bit high lose data instead (counted in their
+      `overflows` counter), so a slow consumer never stalls the others.
+
+    When `frame_words` is non-zero (RX headers enabled), drops are done on whole frames: a frame is
+    only admitted when the FIFO has room for all of it, so consumers always receive complete frames
+    and `overflows` counts frames. Otherwise, or when a frame would not fit in the FIFO at all
+    (`frame_words` > `fifo_depth`, flagged by `oversize`), words are dropped and counted
+    individually. A consumer enabled (or `flush`ed) mid-frame starts at the next frame.
+    """
+    def __init__(self, layout, n, fifo_depth=2048, with_csr=False):
+        self.sink = sink = stream.Endpoint(layout) # i
+        sources = []
+        for i in range(n):
+            source = stream.Endpoint(layout) # o
+            setattr(self, f"source{i}", source)
+            sources.append(source)
+
+        self.sel         = Signal(max=max(n, 2)) # i (CSR).
+        self.broadcast   = Signal()              # i (CSR).
+        self.enable      = Signal(n)             # i (CSR).
+        self.drop        = Signal(n)             # i (CSR).
+        self.clear       = Signal()              # i (CSR).
+        self.flush       = Signal(n)             # i (Per consumer FIFO flush, ex when its DMA is stopped).
+        self.frame_words = Signal(32)            # i (Frame length in words, 0 when unframed).
+        self.framed      = Signal()              # o (Drops on whole frames).
+        self.oversize    = Signal()              # o (Frames larger than the FIFOs, drops on words).
+        self.overflows   = [Signal(32) for i in range(n)] # o (CSR).
+
+        self.n          = n
+        self.fifo_depth = fifo_depth
+
+        if with_csr:
+            self.add_csr()
+
+        # # #
+
+        # Signals.
+        # --------
+        framed = self.framed
+        stalls = Signal(n)
+        self.comb += [
+            self.oversize.eq(self.frame_words > fifo_depth),
+            framed.eq((self.frame_words != 0) & ~self.oversize),
+        ]
+
+        # Consumers.
+        # ----------
+        for i in range(n):
+            fifo = ResetInserter()(stream.SyncFIFO(layout, fifo_depth, buffered=True))
+            self.add_module(name=f"fifo{i}", module=fifo)
+            self.comb += fifo.reset.eq(~self.broadcast | ~self.enable[i] | self.flush[i])
+
+            room     = Signal()
+            new      = Signal()
+            skip     = Signal() # Rest of the current frame not forwarded to this consumer.
+            write    = Signal()
+            overflow = Signal()
+            self.comb += [
+                room.eq(Mux(framed, (fifo.level + self.frame_words) <= fifo_depth, fifo.sink.ready)),
+                new.eq(~framed | sink.first),
+                If(new,
+                    write.eq(~self.drop[i] | room),
+                ).Else(
+                    write.eq(~skip & (~self.drop[i] | fifo.sink.ready)),
+                ),
+                stalls[i].eq(self.enable[i] & write & ~fifo.sink.ready),
+                fifo.sink.valid.eq(sink.valid & sink.ready & write),
+                fifo.sink.payload.eq(sink.payload),
+                fifo.sink.param.eq(sink.param),
+                fifo.sink.first.eq(sink.first),
+                fifo.sink.last.eq(sink.last),
+                overflow.eq(sink.valid & sink.ready & self.enable[i] & ~write & (new | ~skip)),
+            ]
+            self.sync += [
+                If(fifo.reset,
+                    skip.eq(1),
+                ).Elif(sink.valid & sink.ready,
+                    skip.eq(~sink.last & ~write),
+                ),
+                If(self.clear,
+                    self.overflows[i].eq(0),
+                ).Elif(overflow & (self.overflows[i] != (2**32 - 1)),
+                    self.overflows[i].eq(self.overflows[i] + 1),
+                ),
+            ]
+            self.comb += If(self.broadcast, fifo.source.connect(sources[i]))
+
+        # Routing.
+        # --------
+        cases = {}
+        for i, source in enumerate(sources):
+            cases[i] = sink.connect(source)
+        self.comb += [
+            If(self.broadcast,
+                sink.ready.eq(stalls == 0),
+            ).Else(
+                Case(self.sel, cases),
+            )
+        ]
+
+    def add_csr(self, sel_default=0):
+        self._sel     = CSRStorage(len(self.sel), reset=sel_default, description="Routed mode consumer.")
+        self._control = CSRStorage(fields=[
+            CSRField("broadcast", size=1, offset=0, values=[
+                ("``0b0``", "Routed: the RX stream goes to the ``sel`` consumer only."),
+                ("``0b1``", "Broadcast: the RX stream goes to all enabled consumers."),
+            ]),
+            CSRField("clear", size=1, offset=1, pulse=True, description="Clear the overflow counters."),
+        ])
+        self._enable  = CSRStorage(self.n, description="Broadcast consumers enable (1 bit per consumer).")
+        self._drop    = CSRStorage(self.n, description="Broadcast consumers policy (1 bit per consumer): 0: backpressure, 1: drop on overflow.")
+        self._info    = CSRStatus(fields=[
+            CSRField("consumers",  size=8,  offset=0,  description="Number of consumers."),
+            CSRField("fifo_depth", size=24, offset=8,  description="Per consumer FIFO depth (words)."),
+        ])
+        self._status  = CSRStatus(fields=[
+            CSRField("framed",   size=1, offset=0, description="Drops are done on whole frames (RX headers enabled)."),
+            CSRField("oversize", size=1, offset=1, description="RX frames are larger than the FIFOs: drops are done on words."),
+        ])
+        for i in range(self.n):
+            setattr(self, f"_overflows{i}", CSRStatus(32, description=f"Consumer {i} dropped frames (words when unframed)."))
+
+        # # #
+
+        self.comb += [
+            self.sel.eq(self._sel.storage),
+            self.broadcast.eq(self._control.fields.broadcast),
+            self.clear.eq(self._control.fields.clear),
+            self.enable.eq(self._enable.storage),
+            self.drop.eq(self._drop.storage),
+            self._info.fields.consumers.eq(self.n),
+            self._info.fields.fifo_depth.eq(self.fifo_depth),
+            self._status.fields.framed.eq(self.framed),
+            self._status.fields.oversize.eq(self.oversize),
+        ]
+        for i in range(self.n):
+            self.comb += getattr(self, f"_overflows{i}").status.eq(self.overflows[i])
@@ -16,11 +16,12 @@ from litex.soc.interconnect.csr import *
 # Header Inserter/Extractor ------------------------------------------------------------------------
 
 class HeaderInserterExtractor(LiteXModule):
-    def __init__(self, mode="inserter", data_width=64, with_csr=True):
+    def __init__(self, mode="inserter", data_width=64, layout=None, with_csr=True):
         assert data_width == 64
         assert mode in ["inserter", "extractor"]
-        self.sink   = sink   = stream.Endpoint(dma_layout(data_width)) # i
-        self.source = source = stream.Endpoint(dma_layout(data_width)) # o
+        layout = dma_layout(data_width) if layout is None else layout
+        self.sink   = sink   = stream.Endpoint(layout) # i
+        self.source = source = stream.Endpoint(layout) # o
 
         self.reset         = Signal() # i
 
@@ -31,6 +32,8 @@ class HeaderInserterExtractor(LiteXModule):
         self.enable        = Signal()   # i (CSR).
         self.header_enable = Signal()   # i (CSR).
         self.frame_cycles  = Signal(32) # i (CSR).
+        self.wait_data     = Signal()   # i (Inserter: hold the header until payload is available).
+        self.frame_end     = Signal()   # o (Headers enabled and the next payload word ends the frame).
 
         if with_csr:
             self.add_csr()
@@ -42,6 +45,7 @@ class HeaderInserterExtractor(LiteXModule):
         cycles = Signal(32)
         frame_cycles_eff = Signal(32)
         self.comb += frame_cycles_eff.eq(Mux(self.frame_cycles == 0, 1, self.frame_cycles))
+        self.comb += self.frame_end.eq(self.header_enable & (cycles == (frame_cycles_eff - 1)))
 
         # FSM.
         # ----
@@ -75,7 +79,7 @@ class HeaderInserterExtractor(LiteXModule):
         if mode == "inserter":
             # Header.
             fsm.act("HEADER",
-                source.valid.eq(1),
+                source.valid.eq(~self.wait_data | sink.valid),
                 source.first.eq(1),
                 source.data[0:64].eq(self.header),
                 If(source.valid & source.ready,
@@ -153,32 +157,354 @@ class HeaderInserterExtractor(LiteXModule):
 # TX Header Extractor ------------------------------------------------------------------------------
 
 class TXHeaderExtractor(HeaderInserterExtractor):
-    def __init__(self, data_width=128, with_csr=True):
+    def __init__(self, data_width=128, layout=None, with_csr=True):
         HeaderInserterExtractor.__init__(self,
             mode       = "extractor",
             data_width = data_width,
+            layout     = layout,
             with_csr   = with_csr,
         )
 
 # RX Header Inserter -------------------------------------------------------------------------------
 
 class RXHeaderInserter(HeaderInserterExtractor):
-    def __init__(self, data_width=128, with_csr=True):
+    def __init__(self, data_width=128, layout=None, with_csr=True):
         HeaderInserterExtractor.__init__(self,
             mode       = "inserter",
             data_width = data_width,
+            layout     = layout,
             with_csr   = with_csr,
         )
 
+# TX Scheduler -------------------------------------------------------------------------------------
+
+class TXScheduler(LiteXModule):
+    """
+    TX Scheduler.
+
+    Placed after the TXHeaderExtractor: holds each TX frame until `time` (+ `latency`, the fixed
+    downstream latency to compensate) reaches the frame timestamp, so bursts leave at a known board
+    time without host-side waiting. At the first beat of a frame:
+
+    - Timestamp 0 (untimed): the frame is sent immediately.
+    - Timestamp ahead: the frame is held until its time (counted as early).
+    - Timestamp passed by at most `tolerance` ns: the frame is sent immediately (counted as on-time).
+    - Timestamp passed by more: the frame is dropped, or sent when `drop_late` is low (counted as
+      late).
+
+    Frames are delimited by the extractor first/last flags; the scheduler is transparent when
+    disabled or when headers are disabled.
+    """
+    def __init__(self, time, data_width=64, with_csr=True):
+        assert data_width == 64
+        self.sink   = sink   = stream.Endpoint(dma_layout(data_width)) # i
+        self.source = source = stream.Endpoint(dma_layout(data_width)) # o
+
+        self.reset         = Signal()   # i
+        self.header_enable = Signal()   # i (Extractor configuration).
+        self.timestamp     = Signal(64) # i (Extractor timestamp of the current frame).
+
+        self.enable    = Signal()             # i (CSR).
+        self.drop_late = Signal(reset=1)      # i (CSR).
+        self.latency   = Signal(32)           # i (CSR).
+        self.tolerance = Signal(32)           # i (CSR).
+        self.clear     = Signal()             # i (CSR).
+        self.early     = Signal(32)           # o (CSR).
+        self.on_time   = Signal(32)           # o (CSR).
+        self.late      = Signal(32)           # o (CSR).
+
+        if with_csr:
+            self.add_csr()
+
+        # # #
+
+        # Signals.
+        # --------
+        now       = Signal(64)
+        timestamp = Signal(64)
+        self.comb += now.eq(time + self.latency)
+
+        # Counters.
+        # ---------
+        early   = Signal()
+        on_time = Signal()
+        late    = Signal()
+        self.sync += [
+            If(self.clear,
+                self.early.eq(0),
+                self.on_time.eq(0),
+                self.late.eq(0),
+            ).Else(
+                If(early,   self.early.eq(  self.early   + 1)),
+                If(on_time, self.on_time.eq(self.on_time + 1)),
+                If(late,    self.late.eq(   self.late    + 1)),
+            )
+        ]
+
+        # FSM.
+        # ----
+        self.fsm = fsm = ResetInserter()(FSM(reset_state="IDLE"))
+        self.comb += self.fsm.reset.eq(self.reset | ~self.enable | ~self.header_enable)
+
+        # Idle (transparent when disabled, frame start decision otherwise).
+        fsm.act("IDLE",
+            If(~self.enable | ~self.header_enable,
+                sink.connect(source),
+            ).Elif(sink.valid,
+                NextValue(timestamp, self.timestamp),
+                If(~sink.first | (self.timestamp == 0),
+                    NextState("PASS"),
+                ).Elif(now < self.timestamp,
+                    early.eq(1),
+                    NextState("WAIT"),
+                ).Elif((now - self.timestamp) <= self.tolerance,
+                    on_time.eq(1),
+                    NextState("PASS"),
+                ).Else(
+                    late.eq(1),
+                    If(self.drop_late,
+                        NextState("DROP"),
+                    ).Else(
+                        NextState("PASS"),
+                    )
+                )
+            )
+        )
+
+        # Wait.
+        fsm.act("WAIT",
+            If(now >= timestamp,
+                NextState("PASS"),
+            )
+        )
+
+        # Pass.
+        fsm.act("PASS",
+            sink.connect(source),
+            If(sink.valid & sink.ready & sink.last,
+                NextState("IDLE"),
+            )
+        )
+
+        # Drop.
+        fsm.act("DROP",
+            sink.ready.eq(1),
+            If(sink.valid & sink.last,
+                NextState("IDLE"),
+            )
+        )
+
+    def add_csr(self):
+        self._control = CSRStorage(fields=[
+            CSRField("enable", size=1, offset=0, values=[
+                ("``0b0``", "Frames sent as soon as they arrive."),
+                ("``0b1``", "Frames held until their header timestamp."),
+            ]),
+            CSRField("drop_late", size=1, offset=1, values=[
+                ("``0b0``", "Late frames sent immediately (counted)."),
+                ("``0b1``", "Late frames dropped (counted)."),
+            ], reset=1),
+            CSRField("clear", size=1, offset=2, pulse=True, description="Clear the frame counters."),
+        ])
+        self._latency   = CSRStorage(32, description="Downstream latency compensation (ns): frames are released at timestamp - latency.")
+        self._tolerance = CSRStorage(32, description="Lateness (ns) still accepted as on-time.")
+        self._early     = CSRStatus(32,  description="Frames held until their timestamp.")
+        self._on_time   = CSRStatus(32,  description="Frames arrived within the on-time tolerance.")
+        self._late      = CSRStatus(32,  description="Frames arrived after their timestamp + tolerance.")
+
+        # # #
+
+        self.comb += [
+            self.enable.eq(self._control.fields.enable),
+            self.drop_late.eq(self._control.fields.drop_late),
+            self.clear.eq(self._control.fields.clear),
+            self.latency.eq(self._latency.storage),
+            self.tolerance.eq(self._tolerance.storage),
+            self._early.status.eq(self.early),
+            self._on_time.status.eq(self.on_time),
+            self._late.status.eq(self.late),
+        ]
+
+# RX Window Gate -----------------------------------------------------------------------------------
+
+class RXWindowGate(LiteXModule):
+    """
+    RX Window Gate.
+
+    Placed in front of the RXHeaderInserter: once armed, only forwards `count` words (64-bit beats)
+    starting with the first word arriving when `time` reaches `start`, then again every `period` ns
+    (0: single window). Words outside the windows are discarded. With `framed` set (inserter headers
+    enabled), each window is padded with zero words up to the inserter frame boundary (`frame_end`,
+    from the inserter own frame position) so every window starts a new frame/DMA buffer.
+
+    `timestamp` is the arrival time of the word currently presented (the current time when none is
+    waiting): with the inserter `wait_data` set, RX headers carry the exact arrival time of the
+    first word of their frame. When disabled, the gate is transparent.
+    """
+    def __init__(self, time, data_width=64, layout=None, with_csr=True):
+        assert data_width == 64
+        layout = dma_layout(data_width) if layout is None else layout
+        self.sink   = sink   = stream.Endpoint(layout) # i
+        self.source = source = stream.Endpoint(layout) # o
+
+        self.reset     = Signal()   # i
+        self.framed    = Signal()   # i (Inserter headers enabled: pad windows to frame boundaries).
+        self.frame_end = Signal()   # i (Inserter: the next forwarded word ends its frame).
+        self.timestamp = Signal(64) # o
+
+        self.enable  = Signal()   # i (CSR).
+        self.arm     = Signal()   # i (CSR).
+        self.start   = Signal(64) # i (CSR).
+        self.count   = Signal(32) # i (CSR).
+        self.period  = Signal(64) # i (CSR).
+        self.armed   = Signal()   # o (CSR).
+        self.active  = Signal()   # o (CSR).
+        self.windows = Signal(32) # o (CSR).
+
+        if with_csr:
+            self.add_csr()
+
+        # # #
+
+        # Arrival Time.
+        # -------------
+        pending      = Signal()
+        arrival_time = Signal(64)
+        self.sync += [
+            If(sink.valid & sink.ready,
+                pending.eq(0),
+            ).Elif(sink.valid & ~pending,
+                pending.eq(1),
+                arrival_time.eq(time),
+            )
+        ]
+        self.comb += self.timestamp.eq(Mux(pending, arrival_time, time))
+
+        # FSM.
+        # ----
+        next_start  = Signal(64)
+        remaining   = Signal(32)
+        window_done = Signal()
+        self.fsm = fsm = ResetInserter()(FSM(reset_state="IDLE"))
+        self.comb += self.fsm.reset.eq(self.reset | ~self.enable)
+
+        # Idle (transparent when disabled, discarding when enabled and not armed).
+        fsm.act("IDLE",
+            If(~self.enable,
+                sink.connect(source),
+            ).Else(
+                sink.ready.eq(1),
+                If(self.arm,
+                    NextValue(next_start, self.start),
+                    NextState("WAIT"),
+                )
+            )
+        )
+
+        # Wait (discard words until the window start, keeping the first word at/after it).
+        start_reached = Signal()
+        self.comb += start_reached.eq(time >= next_start)
+        fsm.act("WAIT",
+            sink.ready.eq(~start_reached),
+            If(start_reached,
+                NextValue(remaining, self.count),
+                NextState("WINDOW"),
+            )
+        )
+
+        # Window (count == 0: empty window).
+        fsm.act("WINDOW",
+            If(remaining == 0,
+                window_done.eq(1),
+                NextState("NEXT"),
+            ).Else(
+                sink.connect(source),
+                If(source.valid & source.ready,
+                    NextValue(remaining, remaining - 1),
+                    If(remaining == 1,
+                        window_done.eq(1),
+                        If(self.framed & ~self.frame_end,
+                            NextState("PAD"),
+                        ).Else(
+                            NextState("NEXT"),
+                        )
+                    )
+                )
+            )
+        )
+
+        # Pad (zero words up to the frame boundary, discarding the input).
+        fsm.act("PAD",
+            sink.ready.eq(1),
+            source.valid.eq(1),
+            If(source.ready & self.frame_end,
+                NextState("NEXT"),
+            )
+        )
+
+        # Next (periodic windows or done).
+        fsm.act("NEXT",
+            sink.ready.eq(1),
+            If(self.period != 0,
+                NextValue(next_start, next_start + self.period),
+                NextState("WAIT"),
+            ).Else(
+                NextState("IDLE"),
+            )
+        )
+
+        # Status.
+        self.comb += [
+            self.armed.eq(~fsm.ongoing("IDLE")),
+            self.active.eq(fsm.ongoing("WINDOW") | fsm.ongoing("PAD")),
+        ]
+        self.sync += [
+            If(self.reset | ~self.enable,
+                self.windows.eq(0),
+            ).Elif(window_done,
+                self.windows.eq(self.windows + 1),
+            )
+        ]
+
+    def add_csr(self):
+        self._control = CSRStorage(fields=[
+            CSRField("enable", size=1, offset=0, values=[
+                ("``0b0``", "Gate transparent (continuous RX)."),
+                ("``0b1``", "Only armed windows are forwarded."),
+            ]),
+            CSRField("arm", size=1, offset=1, pulse=True, description="Arm the window(s) from start/count/period (when idle)."),
+        ])
+        self._start  = CSRStorage(64, description="First window start (board time, ns).")
+        self._count  = CSRStorage(32, description="Window length in 64-bit words.")
+        self._period = CSRStorage(64, description="Window repeat period (ns), 0 for a single window.")
+        self._status = CSRStatus(fields=[
+            CSRField("armed",  size=1, offset=0, description="Window(s) pending or in progress."),
+            CSRField("active", size=1, offset=1, description="Window in progress."),
+        ])
+        self._windows = CSRStatus(32, description="Completed windows since enable.")
+
+        # # #
+
+        self.comb += [
+            self.enable.eq(self._control.fields.enable),
+            self.arm.eq(self._control.fields.arm),
+            self.start.eq(self._start.storage),
+            self.count.eq(self._count.storage),
+            self.period.eq(self._period.storage),
+            self._status.fields.armed.eq(self.armed),
+            self._status.fields.active.eq(self.active),
+            self._windows.status.eq(self.windows),
+        ]
+
 # TX/RX Header -------------------------------------------------------------------------------------
 
 class TXRXHeader(LiteXModule):
-    def __init__(self, data_width, with_csr=True):
+    def __init__(self, data_width, rx_layout=None, with_csr=True):
         # TX.
-        self.tx = TXHeaderExtractor(data_width, with_csr)
+        self.tx = TXHeaderExtractor(data_width, with_csr=with_csr)
 
         # RX.
-        self.rx = RXHeaderInserter(data_width, with_csr)
+        self.rx = RXHeaderInserter(data_width, layout=rx_layout, with_csr=with_csr)
 
         # CSR.
         if with_csr:
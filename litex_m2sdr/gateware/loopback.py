@@ -15,12 +15,13 @@ from litepcie.common import dma_layout
 # TX/RX Loopback ----------------------------------------------------------------------------------
 
 class TXRXLoopback(LiteXModule):
-    def __init__(self, data_width=64, with_csr=True):
+    def __init__(self, data_width=64, rx_layout=None, with_csr=True):
         assert data_width == 64
+        rx_layout = dma_layout(data_width) if rx_layout is None else rx_layout
         self.tx_sink   = tx_sink   = stream.Endpoint(dma_layout(data_width)) # i
         self.tx_source = tx_source = stream.Endpoint(dma_layout(data_width)) # o
-        self.rx_sink   = rx_sink   = stream.Endpoint(dma_layout(data_width)) # i
-        self.rx_source = rx_source = stream.Endpoint(dma_layout(data_width)) # o
+        self.rx_sink   = rx_sink   = stream.Endpoint(rx_layout)              # i
+        self.rx_source = rx_source = stream.Endpoint(rx_layout)              # o
 
         self.enable = Signal() # i (CSR).
 
@@ -16,9 +16,23 @@ from litex_m2sdr.gateware.cdc import ValueStrobeCDC
 # Clk Measurement ----------------------------------------------------------------------------------
 
 class ClkMeasurement(LiteXModule):
-    def __init__(self, clk, increment=1, with_csr=True):
+    """
+    Clk Measurement.
+
+    Free-running counter of clk with a latched 64-bit snapshot. With with_gate, the counter is also
+    sampled on each gate pulse (sys) and the count of the last complete gate window is published as
+    a frequency in Hz (window of 2^-gate_shift s, so frequency = count << gate_shift) plus its
+    error in ppb against nominal_freq. A window without any count (stopped clock) reads as 0 Hz.
+    """
+    def __init__(self, clk, increment=1, nominal_freq=None, with_gate=False, with_csr=True):
         self.latch = Signal()
         self.value = Signal(64)
+        if with_gate:
+            self.gate         = Signal()         # Gate window boundary, 1-cycle pulse (i).
+            self.gate_restart = Signal()         # Gate config change, discard current window (i).
+            self.gate_shift   = Signal(3)        # Window length: 2^-gate_shift s (i).
+            self.frequency    = Signal(32)       # Frequency of the last complete window, Hz (o).
+            self.error        = Signal((32, True)) # Error vs nominal_freq, ppb, saturated (o).
 
         # # #
 
@@ -45,32 +59,216 @@ class ClkMeasurement(LiteXModule):
             self.value.eq(value_cdc.value_o)
         )
 
+        # Gated Frequency (Optional).
+        if with_gate:
+            self.add_gate(counter, nominal_freq)
+
         # CSR (Optional).
         if with_csr:
-            self.add_csr()
+            self.add_csr(with_gate, nominal_freq)
+
+    def add_gate(self, counter, nominal_freq):
+        # Window Count. The gate pulse reaches the counter domain with a constant latency, so the
+        # difference between two consecutive samples counts the clock over exactly one window.
+        gate_sync = PulseSynchronizer("sys", "counter")
+        self.submodules += gate_sync
+        self.comb += gate_sync.i.eq(self.gate)
+        gate_last = Signal(64)
+        self.sync.counter += If(gate_sync.o, gate_last.eq(counter))
+        self.gate_cdc = gate_cdc = ValueStrobeCDC(32, cd_from="counter", cd_to="sys")
+        self.comb += [
+            gate_cdc.strobe.eq(gate_sync.o),
+            gate_cdc.value.eq(counter - gate_last),
+        ]
+
+        # Window Qualification. After a restart, counts are only accepted once a new gate has been
+        # seen (drops a count still in flight) and the first (partial) window is discarded.
+        armed   = Signal()
+        primed  = Signal()
+        waiting = Signal()
+        update  = Signal()
+        count   = Signal(32)
+        counted = gate_cdc.strobe_o & armed
+        self.sync += [
+            update.eq(0),
+            If(self.gate_restart,
+                armed.eq(0),
+                primed.eq(0),
+                waiting.eq(0),
+            ).Else(
+                If(counted,
+                    waiting.eq(0),
+                    primed.eq(1),
+                    If(primed,
+                        update.eq(1),
+                        count.eq(gate_cdc.value_o),
+                    ),
+                ),
+                If(self.gate,
+                    armed.eq(1),
+                    waiting.eq(1),
+                    # No count during a whole window: clock stopped.
+                    If(waiting & ~counted,
+                        update.eq(1),
+                        count.eq(0),
+                    ),
+                ),
+            ),
+            If(update,
+                self.frequency.eq(count << self.gate_shift),
+            ),
+        ]
 
-    def add_csr(self):
+        # Error (ppb). Constant multiply by 2^32*1e9/nominal_freq, pipelined; settles a few cycles
+        # after each frequency update.
+        if nominal_freq is None:
+            return
+        nominal   = int(nominal_freq)
+        factor    = int(round(2**32*1e9/nominal_freq))
+        diff      = Signal((34, True))
+        product   = Signal((34 + bits_for(factor) + 1, True))
+        error     = Signal((len(product) - 32, True))
+        error_max = 2**31 - 1
+        self.sync += [
+            diff.eq(self.frequency - nominal),
+            product.eq(diff*Constant(factor, (bits_for(factor) + 1, True))),
+            error.eq(product >> 32),
+            If(error > error_max,
+                self.error.eq(error_max),
+            ).Elif(error < -error_max,
+                self.error.eq(-error_max),
+            ).Else(
+                self.error.eq(error),
+            ),
+        ]
+
+    def add_csr(self, with_gate=False, nominal_freq=None):
         self._latch = CSR()
         self._value = CSRStatus(64)
         self.comb += [
             If(self._latch.re, self.latch.eq(1)),
             self._value.status.eq(self.value),
         ]
+        if with_gate:
+            self._frequency = CSRStatus(32, description="Frequency over the last complete gate window (Hz).")
+            self._nominal   = CSRStatus(32, reset=int(nominal_freq or 0),
+                description="Nominal frequency (Hz), 0 when unknown (error not computed)."
+            )
+            self._error     = CSRStatus(32, description="Frequency error vs nominal (ppb, signed).")
+            self.comb += [
+                self._frequency.status.eq(self.frequency),
+                self._error.status.eq(self.error),
+            ]
 
 # Multi Clk Measurement ----------------------------------------------------------------------------
 
 class MultiClkMeasurement(LiteXModule):
-    def __init__(self, clks, with_csr=True, with_latch_all=True):
+    """
+    Multi Clk Measurement.
+
+    One ClkMeasurement per clock. clks values are either a clock or a (clock, nominal_freq) tuple.
+    With sys_clk_freq, a shared gate is generated from the board's own time base: a sys_clk timer
+    (2^-gate_shift s windows, gate_shift 0-6) or, when provided, the PPS pulse (1 s windows), and
+    each clock publishes a gated frequency/error.
+    """
+    GATE_SHIFT_MAX = 6
+
+    def __init__(self, clks, sys_clk_freq=None, pps=None, with_csr=True, with_latch_all=True):
         assert isinstance(clks, dict)
+        with_gate = sys_clk_freq is not None
 
         # Clock Measurement Modules.
         self.clk_modules = {}
         for name, clk in clks.items():
-            self.clk_modules[name] = ClkMeasurement(clk, with_csr=with_csr)
+            nominal_freq = None
+            if isinstance(clk, tuple):
+                clk, nominal_freq = clk
+            self.clk_modules[name] = ClkMeasurement(clk,
+                nominal_freq = nominal_freq,
+                with_gate    = with_gate,
+                with_csr     = with_csr,
+            )
             self.add_module(name=name, module=self.clk_modules[name])
 
+        # Gate (Optional).
+        if with_gate:
+            self.add_gate(sys_clk_freq, pps)
+            if with_csr:
+                self.add_gate_csr()
+
         # Latch All CSR (Optional)
         if with_csr and with_latch_all:
             self.latch_all = CSR()
             for name, mod in self.clk_modules.items():
                 self.comb += If(self.latch_all.re, mod.latch.eq(1))
+
+    def add_gate(self, sys_clk_freq, pps):
+        assert int(sys_clk_freq) % 2**self.GATE_SHIFT_MAX == 0
+        self.gate_source = Signal() # 0: sys_clk timer, 1: PPS (i).
+        self.gate_shift  = Signal(3) # Timer window length: 2^-gate_shift s (i).
+        self.gate        = Signal()  # Gate pulse (o).
+
+        # # #
+
+        # Effective Config (PPS windows are 1s, shift clamped to supported windows).
+        source = Signal()
+        shift  = Signal(3)
+        if pps is not None:
+            self.comb += source.eq(self.gate_source)
+        self.comb += [
+            If(source,
+                shift.eq(0),
+            ).Elif(self.gate_shift > self.GATE_SHIFT_MAX,
+                shift.eq(self.GATE_SHIFT_MAX),
+            ).Else(
+                shift.eq(self.gate_shift),
+            ),
+        ]
+
+        # Restart on config change.
+        config   = Cat(source, shift)
+        config_d = Signal(len(config))
+        restart  = Signal()
+        self.sync += config_d.eq(config)
+        self.comb += restart.eq(config != config_d)
+
+        # Gate Timer.
+        reloads = Array([int(sys_clk_freq)//2**s - 1 for s in range(self.GATE_SHIFT_MAX + 1)])
+        timer   = Signal(max=int(sys_clk_freq))
+        self.sync += [
+            If(restart | (timer == 0),
+                timer.eq(reloads[shift]),
+            ).Else(
+                timer.eq(timer - 1),
+            ),
+        ]
+        self.comb += [
+            If(source,
+                self.gate.eq(pps),
+            ).Else(
+                self.gate.eq(timer == 0),
+            ),
+            If(restart,
+                self.gate.eq(0),
+            ),
+        ]
+
+        for mod in self.clk_modules.values():
+            self.comb += [
+                mod.gate.eq(self.gate),
+                mod.gate_restart.eq(restart),
+                mod.gate_shift.eq(shift),
+            ]
+
+    def add_gate_csr(self):
+        self._gate = CSRStorage(fields=[
+            CSRField("source", size=1, offset=0, values=[
+                ("``0b0``", "sys_clk timer (window of 2^-shift s)."),
+                ("``0b1``", "PPS (1s window)."),
+            ]),
+            CSRField("shift", size=3, offset=4, description=f"Timer window length: 2^-shift s (0-{self.GATE_SHIFT_MAX})."),
+        ])
+        self.comb += [
+            self.gate_source.eq(self._gate.fields.source),
+            self.gate_shift.eq(self._gate.fields.shift),
+        ]
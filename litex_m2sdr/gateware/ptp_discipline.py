@@ -124,6 +124,14 @@ class PTPTimeDiscipline(LiteXModule):
         self.time_lock_losses     = Signal(32)
         self.clear_counters       = Signal()
 
+        # Per-update record (valid on update, the cycle after the servo applied a sample).
+        self.update               = Signal()
+        self.update_error         = Signal((65, True))
+        self.update_local_time    = Signal(64)
+        self.update_rejected      = Signal()
+        self.update_write         = Signal()
+        self.update_adjust        = Signal()
+
         # # #
 
         sample_counter             = Signal(32)
@@ -353,6 +361,7 @@ class PTPTimeDiscipline(LiteXModule):
         self.sync += [
             self.discipline_write.eq(0),
             self.discipline_adjust.eq(0),
+            self.update.eq(sample_pipe7 & self.enable & ~self.clear_counters),
             If(sample_request,
                 sample_counter.eq(0),
             ).Elif(~sample_pipeline_busy & ~sample_pending,
@@ -469,6 +478,17 @@ class PTPTimeDiscipline(LiteXModule):
             )
         ]
 
+        # Update Record.
+        # --------------
+        # error_ns/local_time_d1/coarse_rejected hold until the next sample starts, long after update.
+        self.comb += [
+            self.update_error.eq(error_ns),
+            self.update_local_time.eq(local_time_d1),
+            self.update_rejected.eq(coarse_rejected),
+            self.update_write.eq(self.discipline_write),
+            self.update_adjust.eq(self.discipline_adjust),
+        ]
+
         if with_csr:
             self.add_csr()
 
@@ -605,3 +625,127 @@ class PTPTimeDiscipline(LiteXModule):
             self._time_lock_miss_count.status.eq(self.time_lock_miss_count),
             self._time_lock_losses.status.eq(self.time_lock_losses),
         ]
+
+# PTP Discipline History ---------------------------------------------------------------------------
+
+class PTPDisciplineHistory(LiteXModule):
+    """
+    PTP Discipline History FIFO.
+
+    Records every PTPTimeDiscipline update in a BRAM FIFO so the host can recover the full servo
+    history without having to poll at the update rate. Each entry is read as ENTRY_WORDS 32-bit
+    words from a pop-on-read data CSR (low word first):
+
+    - 0-1: Board time of the sample (ns).
+    - 2-3: Signed PTP minus board-time error (ns, two's complement).
+    - 4  : Applied TimeGenerator increment (Q8.24 ns/tick).
+    - 5  : Flags (see FLAG_*) with the 16-bit update sequence number in bits 16-31.
+
+    The host reads the level and drains level*ENTRY_WORDS words at the data address, with a
+    fixed-address burst over Etherbone or one MMIO read per word over PCIe. Updates arriving while
+    the FIFO is full are dropped and counted; the sequence number still advances so gaps are visible.
+    """
+    ENTRY_WORDS = 6
+
+    FLAG_LOCKED     = 1 << 2
+    FLAG_HOLDOVER   = 1 << 3
+    FLAG_PTP_LOCKED = 1 << 4
+    FLAG_REJECTED   = 1 << 5
+    FLAG_COARSE     = 1 << 6
+    FLAG_PHASE      = 1 << 7
+
+    def __init__(self, discipline, depth=512, with_csr=True):
+        self.clear   = Signal()
+        self.read    = Signal()   # Pop the current data word (i).
+        self.data    = Signal(32) # Current data word, 0 when empty (o).
+        self.level   = Signal(max=depth + 2)
+        self.dropped = Signal(32)
+
+        # # #
+
+        sequence = Signal(16)
+        word     = Signal(max=self.ENTRY_WORDS)
+
+        # FIFO.
+        # -----
+        self.fifo = fifo = ResetInserter()(stream.SyncFIFO([("entry", 32*self.ENTRY_WORDS)], depth, buffered=True))
+        self.comb += [
+            fifo.reset.eq(self.clear),
+            fifo.sink.valid.eq(discipline.update),
+            fifo.sink.entry.eq(Cat(
+                discipline.update_local_time,
+                discipline.update_error[0:64],
+                discipline.discipline_time_inc,
+                discipline.state,
+                discipline.locked,
+                discipline.holdover,
+                discipline.ptp_locked,
+                discipline.update_rejected,
+                discipline.update_write,
+                discipline.update_adjust,
+                Constant(0, 8),
+                sequence,
+            )),
+            self.level.eq(fifo.level),
+        ]
+        self.sync += [
+            If(self.clear,
+                sequence.eq(0),
+                self.dropped.eq(0),
+            ).Elif(discipline.update,
+                sequence.eq(sequence + 1),
+                If(~fifo.sink.ready,
+                    self.dropped.eq(self.dropped + 1),
+                ),
+            ),
+        ]
+
+        # Word Readout.
+        # -------------
+        self.comb += [
+            If(fifo.source.valid,
+                Case(word, {i: self.data.eq(fifo.source.entry[32*i:32*(i + 1)]) for i in range(self.ENTRY_WORDS)}),
+            ),
+            fifo.source.ready.eq(self.read & (word == (self.ENTRY_WORDS - 1))),
+        ]
+        self.sync += [
+            If(self.clear,
+                word.eq(0),
+            ).Elif(self.read & fifo.source.valid,
+                If(word == (self.ENTRY_WORDS - 1),
+                    word.eq(0),
+                ).Else(
+                    word.eq(word + 1),
+                ),
+            ),
+        ]
+
+        if with_csr:
+            self.add_csr(depth)
+
+    def add_csr(self, depth):
+        self._control = CSRStorage(fields=[
+            CSRField("clear", size=1, offset=0, pulse=True, description="Flush the history and clear the sequence/drop counters."),
+        ])
+        self._depth = CSRStatus(32, reset=depth,
+            description="History FIFO depth in entries."
+        )
+        self._level = CSRStatus(32,
+            description="Number of entries available (including a partially read one)."
+        )
+        self._dropped = CSRStatus(32,
+            description="Number of updates dropped while the history was full."
+        )
+        self._data = CSRStatus(32,
+            description="History data word; each read pops one word (6 words per entry, low word first)."
+        )
+        # Reads pop the FIFO: exported as <name>_data_pop_on_read so host tools never poll it.
+        self._data_pop_on_read = CSRConstant(1, name="data_pop_on_read")
+
+        self.comb += [
+            self.clear.eq(self._control.fields.clear),
+            self._level.status.eq(self.level),
+            self._dropped.status.eq(self.dropped),
+            self._data.status.eq(self.data),
+            self.read.eq(self._data.we),
+        ]
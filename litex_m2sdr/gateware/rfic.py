@@ -10,22 +10,54 @@ from litex.gen import *
 
 from litex.soc.interconnect import packet, stream
 
+# Low bits of the RFIC sample count carried with RX words (see AD9361RXSampleCounter).
+RFIC_SAMPLE_COUNT_BITS = 32
+
+
+def _rfic_data_layout(data_width, sample_count_bits=0):
+    layout = [("data", data_width)]
+    if sample_count_bits:
+        layout += [("sample_count", sample_count_bits)]
+    return layout
+
+
+def rfic_rx_layout(data_width=64, sample_count_bits=0):
+    """RX stream layout: dma_layout, plus the `sample_count` of each word when sample_count_bits."""
+    return stream.EndpointDescription(_rfic_data_layout(data_width, sample_count_bits))
+
 
 class RFICDataFramer(LiteXModule):
-    def __init__(self, data_width=32, data_words=32):
-        self.sink = sink = stream.Endpoint([("data", data_width)])
-        self.source = source = stream.Endpoint([("data", data_width)])
+    def __init__(self, data_width=32, data_words=32, sample_count_bits=0):
+        self.sink = sink = stream.Endpoint(_rfic_data_layout(data_width, sample_count_bits))
+        self.source = source = stream.Endpoint(_rfic_data_layout(data_width, sample_count_bits) + [("data_words", 16)])
+
+        self.data_words = Signal(16, reset=data_words) # i (Sampled at the start of each packet).
 
         count = Signal(16)
+        words = Signal(16)
+        words_latched = Signal(16)
         last = Signal()
 
+        # The sample count of the first word is held for the whole packet.
+        if sample_count_bits:
+            sample_count_latched = Signal(sample_count_bits)
+            self.comb += source.sample_count.eq(Mux(count == 0, sink.sample_count, sample_count_latched))
+            self.sync += If(sink.valid & sink.ready & (count == 0),
+                sample_count_latched.eq(sink.sample_count)
+            )
+
         self.comb += [
-            sink.connect(source),
-            last.eq(count == (data_words - 1)),
+            sink.connect(source, omit={"sample_count"}),
+            words.eq(Mux(count == 0, self.data_words, words_latched)),
+            last.eq(count == (words - 1)),
             source.last.eq(last),
+            source.data_words.eq(words),
         ]
 
         self.sync += If(sink.valid & sink.ready,
+            If(count == 0,
+                words_latched.eq(self.data_words)
+            ),
             If(last,
                 count.eq(0)
             ).Else(
@@ -35,23 +67,27 @@ class RFICDataFramer(LiteXModule):
 
 
 class RFICDataPacketizer(LiteXModule):
-    def __init__(self, data_width=32, data_words=256):
-        self.sink = sink = stream.Endpoint([("data", data_width)])
-        self.source = source = stream.Endpoint([("data", data_width), ("data_words", 16)])
+    def __init__(self, data_width=32, data_words=256, max_data_words=None, sample_count_bits=0):
+        if max_data_words is None:
+            max_data_words = data_words
+        self.sink = sink = stream.Endpoint(_rfic_data_layout(data_width, sample_count_bits))
+        self.source = source = stream.Endpoint(_rfic_data_layout(data_width, sample_count_bits) + [("data_words", 16)])
 
-        self.data_framer = RFICDataFramer(data_width=data_width, data_words=data_words)
+        self.data_words = Signal(16, reset=data_words) # i (1 to max_data_words).
+
+        self.data_framer = RFICDataFramer(data_width=data_width, data_words=data_words,
+            sample_count_bits=sample_count_bits)
         self.data_fifo = packet.PacketFIFO(
-            layout=[("data", data_width)],
-            payload_depth=data_words * 2,
+            layout=_rfic_data_layout(data_width, sample_count_bits) + [("data_words", 16)],
+            payload_depth=max_data_words * 2,
             param_depth=None,
             buffered=True,
         )
 
+        self.comb += self.data_framer.data_words.eq(self.data_words)
         self.submodules += stream.Pipeline(
             sink,
             self.data_framer,
             self.data_fifo,
             source,
         )
-        self.comb += source.data_words.eq(data_words)
-
@@ -28,6 +28,12 @@ SATA_HOST_BUFFER_SIZE = 128 * 1024
 # progress and interrupt latency bounded.
 SATA_STREAM_BURST_SECTORS = 4096
 
+# Lossless RX stream compression (see SATAStreamCompressor): frame header magic ("RICE" as a
+# little-endian 32-bit word), default frame length in 64-bit stream beats, escape quotient.
+SATA_COMPRESSION_MAGIC       = 0x45434952
+SATA_COMPRESSION_FRAME_BEATS = 1024
+SATA_COMPRESSION_ESCAPE      = 16
+
 
 # Helpers ------------------------------------------------------------------------------------------
 
@@ -63,6 +69,38 @@ def _sata_word(data):
     return reverse_bytes(data)
 
 
+def _bit_length(module, value):
+    length = Signal(max=len(value) + 1)
+    module.comb += [If(value[i], length.eq(i + 1)) for i in range(len(value))]
+    return length
+
+
+def _rice_code(module, sample, prev, acc):
+    # Delta against the previous lane sample (mod 2^16), zigzag to unsigned, then Rice code with a
+    # parameter derived from the running mean: q ones, a zero, k remainder bits (LSB first), or
+    # SATA_COMPRESSION_ESCAPE ones followed by the raw 16-bit value.
+    delta  = Signal(16)
+    value  = Signal(16)
+    k      = Signal(4)
+    q      = Signal(17)
+    code   = Signal(32)
+    length = Signal(6)
+    module.comb += [
+        delta.eq(sample - prev),
+        value.eq(Cat(0, delta[:15]) ^ Replicate(delta[15], 16)),
+        k.eq(_bit_length(module, acc[5:])),
+        q.eq(value >> k),
+        If(q >= SATA_COMPRESSION_ESCAPE,
+            code.eq(Cat(Replicate(1, SATA_COMPRESSION_ESCAPE), value)),
+            length.eq(SATA_COMPRESSION_ESCAPE + 16),
+        ).Else(
+            code.eq(((Constant(1, 1) << q[:4]) - 1) | ((value & ((Constant(1, 1) << k) - 1)) << (q[:4] + 1))),
+            length.eq(q[:4] + 1 + k),
+        )
+    ]
+    return value, code, length
+
+
 # SATA Host Buffer ---------------------------------------------------------------------------------
 
 class SATAHostBuffer(LiteXModule):
@@ -636,3 +674,229 @@ class M2SDRLiteSATASectors2Stream(LiteXModule):
                 NextState("IDLE")
             )
         )
+
+
+# SATA Stream Compressor ---------------------------------------------------------------------------
+
+class SATAStreamCompressor(LiteXModule):
+    """Lossless compression of the 64-bit RF stream ahead of the SATA Stream2Sectors streamer.
+
+    Each 16-bit lane (I/Q of RX1/RX2) is delta coded against its previous sample and Rice coded
+    with a per-lane parameter tracking the mean residual, so any stream content (sample headers,
+    8-bit or BFP modes) round-trips, with the best ratio on oversampled SC16 captures. The coded
+    bit stream is split in frames of `frame_beats` input words, each starting on a 64-bit word
+    with a header (magic, frame beats, raw flag, sequence) and predictor state reset, so a capture
+    can be decoded from any frame. `scripts/m2sdr_sata_decompress.py` is the bit-exact reference.
+
+    Frames are buffered (2 frames FIFO) while their coded size is computed: a frame that would not
+    shrink is stored uncompressed (raw flag set), so the output never exceeds the input by more
+    than the frame headers.
+
+    Input/output word counters give the achieved compression ratio. When disabled, the pending
+    partial frame is closed and flushed (padded to a word), then the stream is forwarded unchanged.
+    """
+    def __init__(self, frame_beats=SATA_COMPRESSION_FRAME_BEATS, with_csr=True):
+        assert 0 < frame_beats < 2**15
+        self.sink   = sink   = stream.Endpoint([("data", 64)])
+        self.source = source = stream.Endpoint([("data", 64)])
+
+        self.enable       = Signal()   # i (CSR).
+        self.input_words  = Signal(48) # o (CSR).
+        self.output_words = Signal(48) # o (CSR).
+
+        # # #
+
+        code_layout = [(f"code{i}", 32) for i in range(4)] + [(f"length{i}", 6) for i in range(4)]
+        lanes       = [sink.data[16*i:16*(i + 1)] for i in range(4)]
+        bypass      = Signal()
+
+        # Sizer: buffer the frame and compute its coded size, then queue the raw/coded decision.
+        # ------------------------------------------------------------------------------------------
+        self.frames    = frames    = stream.SyncFIFO([("data", 64)], 2*frame_beats, buffered=True)
+        self.decisions = decisions = stream.SyncFIFO([("beats", 16), ("raw", 1)], 4)
+
+        size_beats = Signal(16)
+        size_bits  = Signal(32)
+        size_prev  = [Signal(16) for _ in range(4)]
+        size_acc   = [Signal(20) for _ in range(4)]
+        size_codes = [_rice_code(self, lanes[i], size_prev[i], size_acc[i]) for i in range(4)]
+        size_inp   = Signal()
+        size_beat  = Signal(32)
+        size_close = Signal()
+        self.comb += [
+            size_inp.eq(sink.valid & sink.ready & ~bypass),
+            size_beat.eq(sum(size_codes[i][2] for i in range(4))),
+            frames.sink.valid.eq(sink.valid & ~bypass & self.enable & decisions.sink.ready),
+            frames.sink.data.eq(sink.data),
+            # Close the frame on its last beat, or early (partial frame) when disabled.
+            size_close.eq((size_inp & (size_beats == (frame_beats - 1))) | (~self.enable & (size_beats != 0))),
+            decisions.sink.valid.eq(size_close),
+            decisions.sink.beats.eq(size_beats + size_inp),
+            decisions.sink.raw.eq((size_bits + Mux(size_inp, size_beat, 0)) > ((size_beats + size_inp) << 6)),
+        ]
+        self.sync += [
+            If(size_close & decisions.sink.ready,
+                size_beats.eq(0),
+                size_bits.eq(0),
+                [size_prev[i].eq(0) for i in range(4)],
+                [size_acc[i].eq(0)  for i in range(4)],
+            ).Elif(size_inp,
+                size_beats.eq(size_beats + 1),
+                size_bits.eq(size_bits + size_beat),
+                [size_prev[i].eq(lanes[i]) for i in range(4)],
+                [size_acc[i].eq(size_acc[i] - size_acc[i][4:] + size_codes[i][0]) for i in range(4)],
+            )
+        ]
+
+        # Encoder: frame header once the frame is decided, then 4 lane codes (or the raw word) per beat.
+        # ----------------------------------------------------------------------------------------------
+        self.codes = codes = stream.PipeValid(code_layout + [("flush", 1)])
+
+        header_pending = Signal(reset=1)
+        beat_count     = Signal(16)
+        beat_last      = Signal()
+        sequence       = Signal(16)
+        prev           = [Signal(16) for _ in range(4)]
+        acc            = [Signal(20) for _ in range(4)]
+        frame_lanes    = [frames.source.data[16*i:16*(i + 1)] for i in range(4)]
+        lane_codes     = [_rice_code(self, frame_lanes[i], prev[i], acc[i]) for i in range(4)]
+
+        self.comb += [
+            beat_last.eq(beat_count == (decisions.source.beats - 1)),
+            codes.sink.valid.eq(decisions.source.valid & (header_pending | frames.source.valid)),
+            If(header_pending,
+                codes.sink.code0.eq(SATA_COMPRESSION_MAGIC),
+                codes.sink.code1.eq(Cat(decisions.source.beats[:15], decisions.source.raw, sequence)),
+                codes.sink.length0.eq(32),
+                codes.sink.length1.eq(32),
+            ).Elif(decisions.source.raw,
+                codes.sink.code0.eq(frames.source.data[:32]),
+                codes.sink.code1.eq(frames.source.data[32:]),
+                codes.sink.length0.eq(32),
+                codes.sink.length1.eq(32),
+                codes.sink.flush.eq(beat_last),
+            ).Else(
+                [getattr(codes.sink, f"code{i}").eq(lane_codes[i][1])   for i in range(4)],
+                [getattr(codes.sink, f"length{i}").eq(lane_codes[i][2]) for i in range(4)],
+                codes.sink.flush.eq(beat_last),
+            ),
+            frames.source.ready.eq(decisions.source.valid & ~header_pending & codes.sink.ready),
+            decisions.source.ready.eq(~header_pending & frames.source.valid & codes.sink.ready & beat_last),
+        ]
+        self.sync += [
+            If(codes.sink.valid & codes.sink.ready,
+                If(header_pending,
+                    header_pending.eq(0),
+                    beat_count.eq(0),
+                    sequence.eq(sequence + 1),
+                    [prev[i].eq(0) for i in range(4)],
+                    [acc[i].eq(0)  for i in range(4)],
+                ).Else(
+                    [prev[i].eq(frame_lanes[i]) for i in range(4)],
+                    [acc[i].eq(acc[i] - acc[i][4:] + lane_codes[i][0]) for i in range(4)],
+                    If(beat_last,
+                        header_pending.eq(1),
+                    ).Else(
+                        beat_count.eq(beat_count + 1),
+                    )
+                )
+            )
+        ]
+
+        # Concatenate the 4 lane codes (up to 128 bits).
+        # ----------------------------------------------
+        self.chunks = chunks = stream.PipeValid([("chunk", 128), ("length", 8), ("flush", 1)])
+
+        offset1 = Signal(7)
+        offset2 = Signal(7)
+        self.comb += [
+            offset1.eq(codes.source.length0 + codes.source.length1),
+            offset2.eq(offset1 + codes.source.length2),
+            chunks.sink.valid.eq(codes.source.valid),
+            chunks.sink.chunk.eq(
+                codes.source.code0 |
+                (codes.source.code1 << codes.source.length0) |
+                (codes.source.code2 << offset1) |
+                (codes.source.code3 << offset2)
+            ),
+            chunks.sink.length.eq(offset2 + codes.source.length3),
+            chunks.sink.flush.eq(codes.source.flush),
+            codes.source.ready.eq(chunks.sink.ready),
+        ]
+
+        # Pack chunks into 64-bit words; a frame end pads to the next word.
+        # -----------------------------------------------------------------
+        buffer    = Signal(64 + 128)
+        level     = Signal(8)
+        level_out = Signal(8)
+        level_in  = Signal(8)
+        out       = Signal()
+        inp       = Signal()
+        self.comb += [
+            out.eq((level >= 64) & source.ready),
+            inp.eq(chunks.source.valid & chunks.source.ready),
+            level_out.eq(level - Mux(out, 64, 0)),
+            level_in.eq(level_out + Mux(inp, chunks.source.length, 0)),
+            chunks.source.ready.eq(level_out <= 64),
+        ]
+        self.sync += [
+            buffer.eq(Mux(out, buffer[64:], buffer) | Mux(inp, chunks.source.chunk << level_out, 0)),
+            If(inp & chunks.source.flush,
+                level.eq(Cat(Constant(0, 6), (level_in + 63)[6:8])),
+            ).Else(
+                level.eq(level_in),
+            )
+        ]
+
+        # Output / Bypass (once disabled and every pending frame is flushed).
+        # -------------------------------------------------------------------
+        self.comb += [
+            bypass.eq(~self.enable &
+                (size_beats == 0)     &
+                ~decisions.source.valid &
+                ~frames.source.valid  &
+                ~codes.source.valid   &
+                ~chunks.source.valid  &
+                (level == 0)
+            ),
+            If(~bypass,
+                sink.ready.eq(self.enable & frames.sink.ready & decisions.sink.ready),
+                source.valid.eq(level >= 64),
+                source.data.eq(buffer[:64]),
+            ).Else(
+                sink.connect(source),
+            )
+        ]
+
+        # Statistics.
+        # -----------
+        self.sync += [
+            If(sink.valid & sink.ready,
+                self.input_words.eq(self.input_words + 1),
+            ),
+            If(source.valid & source.ready,
+                self.output_words.eq(self.output_words + 1),
+            ),
+        ]
+
+        if with_csr:
+            self.add_csr()
+
+    def add_csr(self):
+        self._control = CSRStorage(fields=[
+            CSRField("enable", size=1, offset=0, values=[
+                ("``0b0``", "Flush the pending frame, then forward the stream unchanged."),
+                ("``0b1``", "Compress the stream (set before starting a recording)."),
+            ]),
+        ])
+        self._input_words  = CSRStatus(48, description="Stream words received (since last reset).")
+        self._output_words = CSRStatus(48, description="Stream words sent to SATA (since last reset); "
+            "compression ratio is input_words/output_words.")
+
+        # # #
+
+        self.comb += [
+            self.enable.eq(self._control.fields.enable),
+            self._input_words.status.eq(self.input_words),
+            self._output_words.status.eq(self.output_words),
+        ]
@@ -0,0 +1,118 @@
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+
+# Telemetry Snapshot -------------------------------------------------------------------------------
+
+class TelemetrySnapshot(LiteXModule):
+    """
+    Coherent Telemetry Snapshot.
+
+    On a latch strobe (software or PPS), copies the time and a set of status signals into shadow
+    registers in the same sys clock cycle, so that software reads values taken at one instant and
+    can compute rates from hardware time instead of host time.
+
+    Entries:
+    - values       : (name, signal) sys-domain status signals, copied with the time.
+    - counters     : (name, event) sys-domain 1-cycle events, counted by free-running counters
+                     (modulo 2^counter_width) and copied with the time.
+    - measurements : (name, signal) values that need a latch request (e.g. ClkMeasurement): the
+                     request output pulses with the strobe, and the values are copied
+                     capture_delay sys cycles later, once the latched values have crossed back.
+
+    The sequence count increments when a snapshot is complete; strobes are ignored while a snapshot
+    is pending. The snapshot CSRs (sequence, time, then entries in order) are contiguous, so a
+    snapshot is fetched with a single burst read.
+    """
+    def __init__(self, time, values=[], counters=[], measurements=[], counter_width=32,
+        capture_delay=256, with_csr=True):
+        # IOs.
+        self.latch     = Signal()   # i (Software/Gateware latch strobe).
+        self.pps       = Signal()   # i (PPS pulse).
+        self.pps_latch = Signal()   # i (Latch on each PPS pulse).
+        self.request   = Signal()   # o (Latch request to measurements).
+        self.done      = Signal()   # o (Snapshot complete).
+        self.sequence  = Signal(32) # o (Snapshot count).
+        self.time      = Signal(64) # o (Time of the snapshot, in ns).
+
+        # Shadow registers, by entry name.
+        self.entries = {}
+
+        # # #
+
+        names = [name for name, _ in [*values, *counters, *measurements]]
+        assert len(names) == len(set(names))
+
+        # Latch Request / Capture.
+        pending = Signal()
+        delay   = Signal(max=max(capture_delay, 1) + 1)
+        self.comb += self.request.eq((self.latch | (self.pps_latch & self.pps)) & ~pending)
+        self.sync += [
+            self.done.eq(0),
+            If(self.request,
+                pending.eq(1),
+                delay.eq(capture_delay),
+            ).Elif(pending,
+                delay.eq(delay - 1),
+                If(delay == 0,
+                    pending.eq(0),
+                    self.done.eq(1),
+                    self.sequence.eq(self.sequence + 1),
+                )
+            )
+        ]
+
+        # Time / Values (captured on request).
+        self.sync += If(self.request, self.time.eq(time))
+        for name, signal in values:
+            shadow = self.entries[name] = Signal.like(signal, name=f"{name}_shadow")
+            self.sync += If(self.request, shadow.eq(signal))
+
+        # Counters (captured on request).
+        for name, event in counters:
+            count  = Signal(counter_width, name=f"{name}_count")
+            shadow = self.entries[name] = Signal(counter_width, name=f"{name}_shadow")
+            self.sync += [
+                If(event, count.eq(count + 1)),
+                If(self.request, shadow.eq(count)),
+            ]
+
+        # Measurements (captured when the snapshot completes).
+        for name, signal in measurements:
+            shadow = self.entries[name] = Signal.like(signal, name=f"{name}_shadow")
+            self.sync += If(pending & (delay == 0), shadow.eq(signal))
+
+        # CSR (Optional).
+        if with_csr:
+            self.add_csr()
+
+    def add_csr(self):
+        self._control = CSRStorage(fields=[
+            CSRField("latch", size=1, offset=0, pulse=True, description="Take a snapshot."),
+            CSRField("pps_latch", size=1, offset=1, values=[
+                ("``0b0``", "Snapshot on software latch only."),
+                ("``0b1``", "Also take a snapshot on each PPS pulse."),
+            ]),
+        ])
+        self._sequence = CSRStatus(32, description="Snapshot count (increments when a snapshot is complete).")
+        self._time     = CSRStatus(64, description="Time of the snapshot (ns).")
+        self.comb += [
+            If(self._control.fields.latch,     self.latch.eq(1)),
+            If(self._control.fields.pps_latch, self.pps_latch.eq(1)),
+            self._sequence.status.eq(self.sequence),
+            self._time.status.eq(self.time),
+        ]
+        for name, shadow in self.entries.items():
+            # Signed entries are sign-extended to full CSR words.
+            width = len(shadow) if not shadow.signed else 32*((len(shadow) + 31)//32)
+            csr   = CSRStatus(width, name=name, description=f"{name} snapshot value.")
+            setattr(self, f"_{name}", csr)
+            self.comb += csr.status.eq(shadow)
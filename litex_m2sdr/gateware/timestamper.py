@@ -0,0 +1,309 @@
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+from migen import *
+from migen.genlib.cdc import MultiReg
+from migen.genlib.roundrobin import RoundRobin, SP_CE
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+
+# Dual-Edge Sampler --------------------------------------------------------------------------------
+
+class DualEdgeSampler(LiteXModule):
+    """
+    Dual-Edge Sampler.
+
+    Samples an asynchronous input on both edges of a clock domain. `samples` (cd domain) holds the
+    two samples of each cycle, earliest first: bit 0 is taken on the falling edge half a period
+    before bit 1, which halves the quantization step of the event timestamps.
+    """
+    def __init__(self, i, cd="time"):
+        self.samples = Signal(2)
+
+        # # #
+
+        # Inverted Clk Domain (mapped on the flip-flop clock inversion).
+        self.cd_neg = ClockDomain(reset_less=True)
+        self.comb += self.cd_neg.clk.eq(~ClockSignal(cd))
+
+        # Synchronizers: the falling-edge sample gets half a period then two full stages to settle,
+        # the rising-edge sample two full stages; both leave aligned on the same cycle.
+        fall0 = Signal()
+        fall1 = Signal()
+        rise0 = Signal()
+        sync_cd = getattr(self.sync, cd)
+        self.sync.neg += fall0.eq(i)
+        sync_cd += [
+            fall1.eq(fall0),
+            rise0.eq(i),
+            self.samples.eq(Cat(fall1, rise0)),
+        ]
+
+# Clock Marker -------------------------------------------------------------------------------------
+
+class ClockMarker(LiteXModule):
+    """
+    Clock Marker.
+
+    Square wave with a rising edge every `divider` cycles of clk, used to timestamp a reference
+    clock at a rate the event FIFO can absorb (e.g. 1Hz from clk10).
+    """
+    def __init__(self, clk, divider):
+        assert divider >= 2
+        self.marker = Signal()
+
+        # # #
+
+        self.cd_marker = ClockDomain(reset_less=True)
+        self.comb += self.cd_marker.clk.eq(clk)
+
+        counter = Signal(max=divider)
+        self.sync.marker += [
+            If(counter == (divider - 1),
+                counter.eq(0),
+            ).Else(
+                counter.eq(counter + 1),
+            ),
+            self.marker.eq(counter < (divider//2)),
+        ]
+
+# Event Timestamper --------------------------------------------------------------------------------
+
+class EventTimestamper(LiteXModule):
+    """
+    Event Timestamper.
+
+    Latches the board time on the edges of a set of event inputs and queues the timestamps in a
+    BRAM FIFO the host drains in bulk, so phase/latency measurements no longer include the bus
+    latency of software time reads.
+
+    `channels` is a list of (name, samples) with samples a Signal(P) of the input levels sampled in
+    the `cd` domain during one cycle, earliest first (P=1 for plain synchronized inputs, P=2 with
+    DualEdgeSampler). The first transition within the cycle gives a sub-cycle offset of
+    phase*clk_period/P, reported in picoseconds next to the latched time. Fixed input latencies are
+    left to calibration.
+
+    Each entry is read as ENTRY_WORDS 32-bit words from a pop-on-read data CSR (low word first):
+
+    - 0-1: Board time (ns) of the capture cycle.
+    - 2  : Channel index (bits 0-3), rising edge (bit 4), later events of this channel lost while
+           this one was waiting (bit 5) and sub-cycle offset in ps (bits 16-31).
+
+    Channels have rising/falling edge enables; `rising_reset` gives the rising-edge enables at reset
+    (all channels by default). Events are arbitrated round-robin, one per cycle; entries arriving
+    while the FIFO is full are dropped and counted.
+    """
+    ENTRY_WORDS = 3
+
+    def __init__(self, time, channels, clk_period_ns, depth=512, cd="sys", rising_reset=None, with_csr=True):
+        assert 1 <= len(channels) <= 16
+        self.channels = [name for name, _ in channels]
+        n = len(channels)
+        if rising_reset is None:
+            rising_reset = 2**n - 1
+        self.rising_reset = rising_reset
+
+        self.enable  = Signal()
+        self.rising  = Signal(n, reset=rising_reset)
+        self.falling = Signal(n)
+        self.clear   = Signal()
+        self.read    = Signal()   # Pop the current data word (i).
+        self.data    = Signal(32) # Current data word, 0 when empty (o).
+        self.level   = Signal(max=depth + 2)
+        self.dropped = Signal(32)
+
+        # # #
+
+        clk_period_ps = int(round(clk_period_ns*1000))
+        entry_layout  = [("time", 64), ("channel", 4), ("rising", 1), ("lost", 1), ("fine", 16)]
+
+        sync_cd = getattr(self.sync, cd)
+
+        # Config (cd domain).
+        # -------------------
+        enable  = Signal()
+        rising  = Signal(n)
+        falling = Signal(n)
+        if cd == "sys":
+            self.comb += [enable.eq(self.enable), rising.eq(self.rising), falling.eq(self.falling)]
+        else:
+            self.specials += [
+                MultiReg(self.enable,  enable,  cd),
+                MultiReg(self.rising,  rising,  cd),
+                MultiReg(self.falling, falling, cd),
+            ]
+
+        # Clock Domain Crossing (cd -> sys).
+        # ----------------------------------
+        self.cdc = cdc = stream.ClockDomainCrossing(entry_layout, cd_from=cd, cd_to="sys")
+
+        # Edge Detection / Pending Events.
+        # --------------------------------
+        pendings = []
+        payloads = []
+        grants   = Signal(n)
+        for index, (name, samples) in enumerate(channels):
+            phases     = len(samples)
+            fine_step  = clk_period_ps//phases
+            assert (phases - 1)*fine_step < 2**16
+            previous   = Signal()
+            levels     = Cat(previous, samples)
+            rise       = Signal()
+            fall       = Signal()
+            rise_phase = Signal(max=max(phases, 2))
+            fall_phase = Signal(max=max(phases, 2))
+            event      = Signal()
+            event_rise = Signal()
+            event_fine = Signal(16)
+            # Last assignment wins: iterate backwards so the earliest transition is reported.
+            for phase in reversed(range(phases)):
+                self.comb += [
+                    If(~levels[phase] & levels[phase + 1],
+                        rise.eq(1),
+                        rise_phase.eq(phase),
+                    ),
+                    If(levels[phase] & ~levels[phase + 1],
+                        fall.eq(1),
+                        fall_phase.eq(phase),
+                    ),
+                ]
+            use_rise = rise & rising[index]
+            use_fall = fall & falling[index]
+            self.comb += [
+                event.eq(enable & (use_rise | use_fall)),
+                event_rise.eq(use_rise & ~(use_fall & (fall_phase < rise_phase))),
+                event_fine.eq(Mux(event_rise, rise_phase, fall_phase)*fine_step),
+            ]
+
+            pending = Signal()
+            payload = Record(entry_layout)
+            sync_cd += [
+                previous.eq(samples[phases - 1]),
+                If(grants[index],
+                    pending.eq(0),
+                ),
+                If(event,
+                    If(~pending | grants[index],
+                        pending.eq(1),
+                        payload.time.eq(time),
+                        payload.channel.eq(index),
+                        payload.rising.eq(event_rise),
+                        payload.lost.eq(0),
+                        payload.fine.eq(event_fine),
+                    ).Else(
+                        payload.lost.eq(1),
+                    ),
+                ),
+                If(~enable,
+                    pending.eq(0),
+                ),
+            ]
+            pendings.append(pending)
+            payloads.append(payload)
+
+        # Arbitration (round-robin, one event per cycle).
+        # -----------------------------------------------
+        self.arbiter = arbiter = ClockDomainsRenamer(cd)(RoundRobin(n, SP_CE))
+        select = arbiter.grant
+        self.comb += [
+            arbiter.request.eq(Cat(*pendings)),
+            arbiter.ce.eq(~cdc.sink.valid | cdc.sink.ready),
+            cdc.sink.valid.eq(Array(pendings)[select]),
+            Case(select, {index: cdc.sink.payload.eq(payload) for index, payload in enumerate(payloads)}),
+        ]
+        for index in range(n):
+            self.comb += grants[index].eq(cdc.sink.valid & cdc.sink.ready & (select == index))
+
+        # FIFO.
+        # -----
+        self.fifo = fifo = ResetInserter()(stream.SyncFIFO(entry_layout, depth, buffered=True))
+        self.comb += [
+            fifo.reset.eq(self.clear),
+            cdc.source.connect(fifo.sink, omit={"ready"}),
+            cdc.source.ready.eq(1),
+            self.level.eq(fifo.level),
+        ]
+        self.sync += [
+            If(self.clear,
+                self.dropped.eq(0),
+            ).Elif(cdc.source.valid & ~fifo.sink.ready,
+                self.dropped.eq(self.dropped + 1),
+            ),
+        ]
+
+        # Word Readout.
+        # -------------
+        word  = Signal(max=self.ENTRY_WORDS)
+        entry = fifo.source
+        words = [
+            entry.time[0:32],
+            entry.time[32:64],
+            Cat(entry.channel, entry.rising, entry.lost, Constant(0, 10), entry.fine),
+        ]
+        self.comb += [
+            If(entry.valid,
+                Case(word, {i: self.data.eq(w) for i, w in enumerate(words)}),
+            ),
+            entry.ready.eq(self.read & (word == (self.ENTRY_WORDS - 1))),
+        ]
+        self.sync += [
+            If(self.clear,
+                word.eq(0),
+            ).Elif(self.read & entry.valid,
+                If(word == (self.ENTRY_WORDS - 1),
+                    word.eq(0),
+                ).Else(
+                    word.eq(word + 1),
+                ),
+            ),
+        ]
+
+        if with_csr:
+            self.add_csr(n, depth)
+
+    def add_csr(self, n, depth):
+        channels = ", ".join(f"{index}: {name}" for index, name in enumerate(self.channels))
+        self._control = CSRStorage(fields=[
+            CSRField("enable", size=1, offset=0, values=[
+                ("``0b0``", "Event capture disabled."),
+                ("``0b1``", "Timestamp enabled edges of the event inputs."),
+            ]),
+            CSRField("clear", size=1, offset=1, pulse=True, description="Flush the event FIFO and clear the drop counter."),
+        ])
+        self._rising = CSRStorage(n, reset=self.rising_reset,
+            description=f"Per-channel rising-edge capture enables ({channels})."
+        )
+        self._falling = CSRStorage(n,
+            description=f"Per-channel falling-edge capture enables ({channels})."
+        )
+        self._depth = CSRStatus(32, reset=depth,
+            description="Event FIFO depth in entries."
+        )
+        self._level = CSRStatus(32,
+            description="Number of entries available (including a partially read one)."
+        )
+        self._dropped = CSRStatus(32,
+            description="Number of events dropped while the FIFO was full."
+        )
+        self._data = CSRStatus(32,
+            description="Event data word; each read pops one word (3 words per entry, low word first)."
+        )
+        # Mark the data CSR as pop-on-read in csr.csv (CSR snapshots and benchmarks skip it).
+        self._data_pop_on_read = CSRConstant(1, name="data_pop_on_read")
+
+        self.comb += [
+            self.enable.eq(self._control.fields.enable),
+            self.clear.eq(self._control.fields.clear),
+            self.rising.eq(self._rising.storage),
+            self.falling.eq(self._falling.storage),
+            self._level.status.eq(self.level),
+            self._dropped.status.eq(self.dropped),
+            self._data.status.eq(self.data),
+            self.read.eq(self._data.we),
+        ]
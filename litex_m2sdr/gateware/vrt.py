@@ -11,6 +11,7 @@ from migen import *
 from litex.gen import *
 
 from litex.soc.interconnect import stream
+from litex.soc.interconnect.csr import *
 from litex.soc.interconnect.packet import Header, HeaderField, Packetizer
 
 from liteeth.frontend.stream import LiteEthStream2UDPTX
@@ -78,20 +79,45 @@ signal_header_fields = {
 signal_header_length = 20  # bytes (5x32-bit words)
 signal_header = Header(signal_header_fields, length=signal_header_length, swap_field_bytes=True)
 
+# Class ID (2 words) between Stream ID and timestamps: 8-bit pad + 24-bit OUI, then 16-bit
+# Information Class Code + 16-bit Packet Class Code.
+signal_class_header_fields = {
+    **_common_header_fields(),
+    "stream_id":     HeaderField(4,  0, 32),
+    "class_oui":     HeaderField(9,  0, 24),
+    "class_icc":     HeaderField(12, 0, 16),
+    "class_pcc":     HeaderField(14, 0, 16),
+    "timestamp_int": HeaderField(16, 0, 32),
+    "timestamp_fra": HeaderField(20, 0, 64),
+}
+
+signal_class_header_length = 28  # bytes (7x32-bit words)
+signal_class_header = Header(signal_class_header_fields, length=signal_class_header_length, swap_field_bytes=True)
+
+# Trailer (1 word): enables in [31:20], indicators in [19:8].
+VRT_TRAILER_VALID_DATA_ENABLE    = 1 << 30
+VRT_TRAILER_OVER_RANGE_ENABLE    = 1 << 25
+VRT_TRAILER_VALID_DATA_INDICATOR = 1 << 18
+VRT_TRAILER_OVER_RANGE_INDICATOR = 1 << 13
+
+
+def vrt_signal_header(with_class_id=False):
+    return signal_class_header if with_class_id else signal_header
+
 
-def vrt_signal_packet_description(data_width):
+def vrt_signal_packet_description(data_width, header=signal_header):
     return stream.EndpointDescription(
         payload_layout=[("data", data_width)],
-        param_layout=signal_header.get_layout(),
+        param_layout=header.get_layout(),
     )
 
 
-def vrt_signal_packet_user_description(data_width):
+def vrt_signal_packet_user_description(data_width, sample_count_bits=0):
     return stream.EndpointDescription(
         payload_layout=[
             ("data", data_width),
             ("data_words", 16),
-        ],
+        ] + ([("sample_count", sample_count_bits)] if sample_count_bits else []),
         param_layout=[
             ("stream_id", 32),
             ("timestamp_int", 32),
@@ -100,54 +126,438 @@ def vrt_signal_packet_user_description(data_width):
     )
 
 
-class VRTSignalPacketInserter(LiteXModule):
+class VRTTrailerInserter(LiteXModule):
+    """Append a VRT trailer word (valid-data / over-range indicators) after the last payload word.
+
+    `over_range` is accumulated over the whole packet and cleared once the trailer is sent.
+    """
     def __init__(self, data_width=32):
+        assert data_width == 32
+        self.sink   = sink   = stream.Endpoint([("data", data_width)])
+        self.source = source = stream.Endpoint([("data", data_width)])
+
+        self.valid_data = Signal(reset=1) # i
+        self.over_range = Signal()        # i
+
+        # # #
+
+        over_range = Signal()
+        trailer    = Signal(32)
+        self.comb += trailer.eq(
+            VRT_TRAILER_VALID_DATA_ENABLE |
+            VRT_TRAILER_OVER_RANGE_ENABLE |
+            Mux(self.valid_data, VRT_TRAILER_VALID_DATA_INDICATOR, 0) |
+            Mux(over_range | self.over_range, VRT_TRAILER_OVER_RANGE_INDICATOR, 0)
+        )
+
+        self.fsm = fsm = FSM(reset_state="PAYLOAD")
+        fsm.act("PAYLOAD",
+            sink.connect(source, omit={"last"}),
+            If(self.over_range,
+                NextValue(over_range, 1),
+            ),
+            If(sink.valid & sink.ready & sink.last,
+                NextState("TRAILER"),
+            )
+        )
+        fsm.act("TRAILER",
+            source.valid.eq(1),
+            source.last.eq(1),
+            # Big-endian on the wire, like the header fields.
+            source.data.eq(Cat(trailer[24:32], trailer[16:24], trailer[8:16], trailer[0:8])),
+            If(source.ready,
+                NextValue(over_range, 0),
+                NextState("PAYLOAD"),
+            )
+        )
+
+
+class VRTSignalPacketInserter(LiteXModule):
+    def __init__(self, data_width=32, with_class_id=False, with_trailer=False):
         self.sink = sink = stream.Endpoint(vrt_signal_packet_user_description(data_width))
         self.source = source = stream.Endpoint([("data", data_width)])
 
+        self.class_oui  = Signal(24)       # i (Class ID OUI, with_class_id only).
+        self.class_icc  = Signal(16)       # i (Information Class Code, with_class_id only).
+        self.class_pcc  = Signal(16)       # i (Packet Class Code, with_class_id only).
+        self.valid_data = Signal(reset=1)  # i (Trailer Valid Data indicator, with_trailer only).
+        self.over_range = Signal()         # i (Trailer Over-Range indicator, with_trailer only).
+        self.tsf        = Signal(2, reset=VRTTSF.REAL_TIME) # i (REAL_TIME or SAMPLE_COUNT).
+
         packet_count = Signal(4)
 
+        header = vrt_signal_header(with_class_id)
+        header_words  = header.length // 4
+        trailer_words = 1 if with_trailer else 0
+
         self.packetizer = packetizer = Packetizer(
-            sink_description=vrt_signal_packet_description(data_width),
+            sink_description=vrt_signal_packet_description(data_width, header),
             source_description=[("data", data_width)],
-            header=signal_header,
+            header=header,
         )
 
         self.comb += [
             sink.connect(packetizer.sink, omit={"data_words"}),
             packetizer.sink.packet_type.eq(VRTPacketType.SIG_DATA_WITH_STREAM_ID),
-            packetizer.sink.c.eq(VRTBool.DISABLED),
-            packetizer.sink.t.eq(VRTBool.DISABLED),
+            packetizer.sink.c.eq(VRTBool.ENABLED if with_class_id else VRTBool.DISABLED),
+            packetizer.sink.t.eq(VRTBool.ENABLED if with_trailer  else VRTBool.DISABLED),
             packetizer.sink.r.eq(0),
             packetizer.sink.tsi.eq(VRTTSI.UTC),
-            packetizer.sink.tsf.eq(VRTTSF.REAL_TIME),
+            packetizer.sink.tsf.eq(self.tsf),
             packetizer.sink.packet_count.eq(packet_count),
-            packetizer.sink.packet_size.eq(sink.data_words + signal_header_length // 4),
-            packetizer.source.connect(source),
+            packetizer.sink.packet_size.eq(sink.data_words + header_words + trailer_words),
         ]
+        if with_class_id:
+            self.comb += [
+                packetizer.sink.class_oui.eq(self.class_oui),
+                packetizer.sink.class_icc.eq(self.class_icc),
+                packetizer.sink.class_pcc.eq(self.class_pcc),
+            ]
+        if with_trailer:
+            self.trailer = trailer = VRTTrailerInserter(data_width=data_width)
+            self.comb += [
+                trailer.valid_data.eq(self.valid_data),
+                trailer.over_range.eq(self.over_range),
+                packetizer.source.connect(trailer.sink),
+                trailer.source.connect(source),
+            ]
+        else:
+            self.comb += packetizer.source.connect(source)
 
         self.sync += If(source.valid & source.ready & source.last,
             packet_count.eq(packet_count + 1)
         )
 
 
+# VRT Context Packets ------------------------------------------------------------------------------
+
+# IF-Context CIF0 indicators of the fields sent, in packet order (VITA-49.0 7.1.5).
+VRT_CIF0_CHANGE         = 1 << 31
+VRT_CIF0_BANDWIDTH      = 1 << 29
+VRT_CIF0_RF_FREQ        = 1 << 27
+VRT_CIF0_GAIN           = 1 << 23
+VRT_CIF0_SAMPLE_RATE    = 1 << 21
+VRT_CIF0_PAYLOAD_FORMAT = 1 << 15
+
+VRT_CONTEXT_CIF0 = (
+    VRT_CIF0_BANDWIDTH   |
+    VRT_CIF0_RF_FREQ     |
+    VRT_CIF0_GAIN        |
+    VRT_CIF0_SAMPLE_RATE |
+    VRT_CIF0_PAYLOAD_FORMAT
+)
+
+VRT_CONTEXT_PACKET_WORDS = 15  # Header(5) + CIF0(1) + Bandwidth(2) + RF Freq(2) + Gain(1) + Sample Rate(2) + Format(2).
+
+
+def vrt_payload_format(item_bits=16, channels=2):
+    """Data Packet Payload Format field: complex cartesian, signed fixed point, `channels` vector."""
+    word0 = (0b01 << 29) | ((item_bits - 1) << 6) | (item_bits - 1)
+    word1 = channels - 1
+    return (word0 << 32) | word1
+
+
+class VRTContextPacketInserter(LiteXModule):
+    """Interleave VRT IF-Context packets between the signal-data packets of a stream.
+
+    A context packet is sent every `interval` signal packets (0: only on updates), once at start and
+    after each `update` pulse (with the Context Field Change Indicator set), always between two
+    signal packets. Fields (bandwidth, RF reference frequency, gain, sample rate, payload format)
+    are given in VITA-49 fixed-point: Hz with a 20-bit radix, dB with a 7-bit radix.
+    """
+    def __init__(self, data_width=32, interval=64, with_csr=True):
+        assert data_width == 32
+        self.sink   = sink   = stream.Endpoint([("data", data_width)])
+        self.source = source = stream.Endpoint([("data", data_width)])
+
+        self.enable         = Signal(reset=1)           # i (CSR).
+        self.interval       = Signal(16, reset=interval) # i (CSR).
+        self.update         = Signal()                  # i (CSR, pulse).
+        self.stream_id      = Signal(32)                # i.
+        self.tsf            = Signal(2, reset=VRTTSF.REAL_TIME) # i.
+        self.timestamp_int  = Signal(32)                # i.
+        self.timestamp_fra  = Signal(64)                # i.
+        self.bandwidth      = Signal(64)                # i (CSR).
+        self.rf_freq        = Signal(64)                # i (CSR).
+        self.gain           = Signal(32)                # i (CSR).
+        self.sample_rate    = Signal(64)                # i (CSR).
+        self.payload_format = Signal(64, reset=vrt_payload_format()) # i (CSR).
+
+        if with_csr:
+            self.add_csr(interval=interval)
+
+        # # #
+
+        packet_count  = Signal(4)
+        count         = Signal(16, reset=2**16 - 1)
+        in_packet     = Signal()
+        change        = Signal(reset=1)
+        change_sent   = Signal()
+        timestamp_int = Signal(32)
+        timestamp_fra = Signal(64)
+        index         = Signal(4)
+        word          = Signal(32)
+
+        due = Signal()
+        self.comb += due.eq(self.enable & (change | ((self.interval != 0) & (count >= self.interval))))
+
+        self.sync += [
+            If(self.update,
+                change.eq(1),
+            ),
+            If(sink.valid & sink.ready,
+                in_packet.eq(~sink.last),
+                If(sink.last & (count != (2**16 - 1)),
+                    count.eq(count + 1),
+                ),
+            ),
+        ]
+
+        self.comb += Case(index, {
+            0  : word.eq(Cat(Constant(VRT_CONTEXT_PACKET_WORDS, 16), packet_count,
+                    self.tsf, Constant(VRTTSI.UTC, 2), Constant(0, 4),
+                    Constant(VRTPacketType.CONTEXT, 4))),
+            1  : word.eq(self.stream_id),
+            2  : word.eq(timestamp_int),
+            3  : word.eq(timestamp_fra[32:64]),
+            4  : word.eq(timestamp_fra[0:32]),
+            5  : word.eq(VRT_CONTEXT_CIF0 | Mux(change_sent, VRT_CIF0_CHANGE, 0)),
+            6  : word.eq(self.bandwidth[32:64]),
+            7  : word.eq(self.bandwidth[0:32]),
+            8  : word.eq(self.rf_freq[32:64]),
+            9  : word.eq(self.rf_freq[0:32]),
+            10 : word.eq(self.gain),
+            11 : word.eq(self.sample_rate[32:64]),
+            12 : word.eq(self.sample_rate[0:32]),
+            13 : word.eq(self.payload_format[32:64]),
+            "default" : word.eq(self.payload_format[0:32]),
+        })
+
+        self.fsm = fsm = FSM(reset_state="SIGNAL")
+        fsm.act("SIGNAL",
+            If(~in_packet & due,
+                NextValue(timestamp_int, self.timestamp_int),
+                NextValue(timestamp_fra, self.timestamp_fra),
+                NextValue(change_sent, change),
+                NextValue(change, self.update),
+                NextValue(index, 0),
+                NextState("CONTEXT"),
+            ).Else(
+                sink.connect(source),
+            )
+        )
+        fsm.act("CONTEXT",
+            source.valid.eq(1),
+            source.last.eq(index == (VRT_CONTEXT_PACKET_WORDS - 1)),
+            # Big-endian on the wire, like the signal packet header fields.
+            source.data.eq(Cat(word[24:32], word[16:24], word[8:16], word[0:8])),
+            If(self.update,
+                NextValue(change, 1),
+            ),
+            If(source.ready,
+                NextValue(index, index + 1),
+                If(source.last,
+                    NextValue(count, 0),
+                    NextValue(packet_count, packet_count + 1),
+                    NextState("SIGNAL"),
+                )
+            )
+        )
+
+    def add_csr(self, interval):
+        self._control = CSRStorage(fields=[
+            CSRField("enable", size=1, offset=0, reset=1, values=[
+                ("``0b0``", "Disable VRT Context packets."),
+                ("``0b1``", "Enable VRT Context packets."),
+            ]),
+            CSRField("update", size=1, offset=1, pulse=True,
+                description="Context changed: send a Context packet with the Change Indicator set."),
+        ])
+        self._interval       = CSRStorage(16, reset=interval, description="Signal packets between Context packets (0: on update only).")
+        self._bandwidth      = CSRStorage(64, description="Bandwidth (Hz, 20-bit radix).")
+        self._rf_freq        = CSRStorage(64, description="RF Reference Frequency (Hz, 20-bit radix).")
+        self._gain           = CSRStorage(32, description="Gain (Stage 2 [31:16] / Stage 1 [15:0], dB, 7-bit radix).")
+        self._sample_rate    = CSRStorage(64, description="Sample Rate (Hz, 20-bit radix).")
+        self._payload_format = CSRStorage(64, reset=vrt_payload_format(), description="Data Packet Payload Format.")
+
+        # # #
+
+        self.comb += [
+            self.enable.eq(self._control.fields.enable),
+            self.update.eq(self._control.fields.update),
+            self.interval.eq(self._interval.storage),
+            self.bandwidth.eq(self._bandwidth.storage),
+            self.rf_freq.eq(self._rf_freq.storage),
+            self.gain.eq(self._gain.storage),
+            self.sample_rate.eq(self._sample_rate.storage),
+            self.payload_format.eq(self._payload_format.storage),
+        ]
+
+# VRT Signal Packet Streamer -----------------------------------------------------------------------
+
 class VRTSignalPacketStreamer(LiteXModule):
-    def __init__(self, udp_crossbar, ip_address, udp_port, data_width=32, with_csr=True):
-        self.sink = stream.Endpoint(vrt_signal_packet_user_description(data_width))
+    """VRT signal-data UDP streamer.
+
+    Stream ID and payload words per packet are runtime-configurable (CSRs when `with_csr`);
+    `data_words` is an output meant to drive the upstream RFICDataPacketizer and is clamped to
+    `max_data_words`, which sizes the UDP FIFO (a whole packet must fit: raise it for jumbo
+    frames). Class ID and trailer words are build-time options since they change the header layout.
+    With `with_context`, IF-Context packets describing the stream (see VRTContextPacketInserter)
+    are interleaved with the signal packets.
+
+    Timestamps are either REAL_TIME (sink timestamp_int/fra, picoseconds) or SAMPLE_COUNT, where
+    timestamp_fra is the index of the first sample of the packet; `timestamp_mode` sets the
+    default, the `timestamp` CSR switches at runtime. Sample indexes are counted at the RFIC output
+    (see AD9361RXSampleCounter) and travel with the data as the low `sample_count_bits` bits of the
+    sink `sample_count` field (latched on the first word of each packet by RFICDataPacketizer), so
+    samples dropped upstream show up as timestamp gaps. They are extended to 64-bit against the
+    live count (`sample_count_ref`), which must not run more than 2**sample_count_bits samples
+    ahead of the packets, then indexed from the last counter clear (`sample_count_base`): samples
+    received before a clear get negative (two's complement) indexes.
+    """
+    def __init__(self, udp_crossbar, ip_address, udp_port, data_width=32, with_csr=True,
+        stream_id         = 0xdeadbeef,
+        data_words        = 256,
+        max_data_words    = None,
+        with_class_id     = False,
+        with_trailer      = False,
+        with_context      = False,
+        context_interval  = 64,
+        timestamp_mode    = "real-time",
+        sample_count_bits = 32):
+        assert timestamp_mode in ["real-time", "sample-count"]
+        assert 0 < sample_count_bits <= 64
+        if max_data_words is None:
+            max_data_words = max(data_words, 256)
+        assert 1 <= data_words <= max_data_words
+        self.max_data_words = max_data_words
+        self.sink = stream.Endpoint(vrt_signal_packet_user_description(data_width, sample_count_bits))
+
+        self.stream_id              = Signal(32, reset=stream_id)   # i (CSR).
+        self.data_words_req         = Signal(16, reset=data_words)  # i (CSR).
+        self.data_words             = Signal(16)                    # o (To RFICDataPacketizer).
+        self.class_oui              = Signal(24)                    # i (CSR).
+        self.class_icc              = Signal(16)                    # i (CSR).
+        self.class_pcc              = Signal(16)                    # i (CSR).
+        self.valid_data             = Signal(reset=1)               # i.
+        self.over_range             = Signal()                      # i.
+        self.sample_count           = Signal(reset=int(timestamp_mode == "sample-count")) # i (CSR).
+        self.sample_count_ref       = Signal(64)                    # i (Live RFIC sample count).
+        self.sample_count_base      = Signal(64)                    # i (RFIC sample count at the last clear).
+        self.sample_count_clear     = Signal()                      # o (CSR, to the RFIC sample counter).
+        self.sample_count_pps_clear = Signal()                      # o (CSR, to the RFIC sample counter).
+
+        # FIFO must hold a full packet (header + payload + trailer), keep the historical minimum.
+        packet_words = max_data_words + signal_class_header_length // 4 + 1
+        fifo_depth   = max(1024, 1 << (packet_words - 1).bit_length())
 
         vrt_streamer_port = udp_crossbar.get_port(udp_port, dw=data_width, cd="sys")
         self.vrt_streamer = LiteEthStream2UDPTX(
             ip_address=ip_address,
             udp_port=udp_port,
-            fifo_depth=1024,
+            fifo_depth=fifo_depth,
             data_width=data_width,
             with_csr=with_csr,
         )
-        self.vrt_inserter = VRTSignalPacketInserter(data_width=data_width)
+        self.vrt_inserter = VRTSignalPacketInserter(
+            data_width    = data_width,
+            with_class_id = with_class_id,
+            with_trailer  = with_trailer,
+        )
+
+        # Timestamps: REAL_TIME from sink or SAMPLE_COUNT (index of the first sample of the packet).
+        tsf           = Signal(2)
+        timestamp_fra = Signal(64)
+        sample_index  = Signal(64)
+        if sample_count_bits < 64:
+            sample_lag = Signal(sample_count_bits)
+            self.comb += [
+                sample_lag.eq(self.sample_count_ref[:sample_count_bits] - self.sink.sample_count),
+                sample_index.eq(self.sample_count_ref - sample_lag - self.sample_count_base),
+            ]
+        else:
+            self.comb += sample_index.eq(self.sink.sample_count - self.sample_count_base)
+        self.comb += [
+            If(self.sample_count,
+                tsf.eq(VRTTSF.SAMPLE_COUNT),
+                timestamp_fra.eq(sample_index),
+            ).Else(
+                tsf.eq(VRTTSF.REAL_TIME),
+                timestamp_fra.eq(self.sink.timestamp_fra),
+            ),
+            self.vrt_inserter.tsf.eq(tsf),
+            self.vrt_inserter.sink.timestamp_fra.eq(timestamp_fra),
+        ]
+
+        if with_context:
+            self.context = VRTContextPacketInserter(
+                data_width = data_width,
+                interval   = context_interval,
+                with_csr   = with_csr,
+            )
+            self.comb += [
+                self.context.stream_id.eq(self.stream_id),
+                self.context.tsf.eq(tsf),
+                self.context.timestamp_int.eq(self.sink.timestamp_int),
+                self.context.timestamp_fra.eq(timestamp_fra),
+                self.vrt_inserter.source.connect(self.context.sink),
+                self.context.source.connect(self.vrt_streamer.sink),
+            ]
+        else:
+            self.comb += self.vrt_inserter.source.connect(self.vrt_streamer.sink)
+
+        if with_csr:
+            self.add_csr(stream_id=stream_id, data_words=data_words, max_data_words=max_data_words,
+                with_class_id=with_class_id, timestamp_mode=timestamp_mode)
 
         self.comb += [
-            self.sink.connect(self.vrt_inserter.sink),
-            self.vrt_inserter.source.connect(self.vrt_streamer.sink),
+            If(self.data_words_req == 0,
+                self.data_words.eq(1)
+            ).Elif(self.data_words_req > max_data_words,
+                self.data_words.eq(max_data_words)
+            ).Else(
+                self.data_words.eq(self.data_words_req)
+            ),
+            self.sink.connect(self.vrt_inserter.sink, omit={"stream_id", "timestamp_fra", "sample_count"}),
+            self.vrt_inserter.sink.stream_id.eq(self.stream_id),
+            self.vrt_inserter.class_oui.eq(self.class_oui),
+            self.vrt_inserter.class_icc.eq(self.class_icc),
+            self.vrt_inserter.class_pcc.eq(self.class_pcc),
+            self.vrt_inserter.valid_data.eq(self.valid_data),
+            self.vrt_inserter.over_range.eq(self.over_range),
             self.vrt_streamer.source.connect(vrt_streamer_port.sink),
         ]
 
+    def add_csr(self, stream_id, data_words, max_data_words, with_class_id=False, timestamp_mode="real-time"):
+        self._stream_id  = CSRStorage(32, description="VRT Stream ID.", reset=stream_id)
+        self._data_words = CSRStorage(16, description=f"VRT payload 32-bit words per packet (1-{max_data_words}).", reset=data_words)
+        self._timestamp  = CSRStorage(fields=[
+            CSRField("mode", size=1, offset=0, reset=int(timestamp_mode == "sample-count"), values=[
+                ("``0b0``", "TSF=REAL_TIME (picoseconds)."),
+                ("``0b1``", "TSF=SAMPLE_COUNT (index of the first sample of the packet)."),
+            ]),
+            CSRField("clear",     size=1, offset=8, pulse=True, description="Clear the RFIC sample counter now."),
+            CSRField("pps_clear", size=1, offset=9, pulse=True, description="Clear the RFIC sample counter on next PPS."),
+        ])
+        if with_class_id:
+            self._class_oui   = CSRStorage(24, description="VRT Class ID Organizationally Unique Identifier.")
+            self._class_codes = CSRStorage(fields=[
+                CSRField("pcc", size=16, offset=0,  description="VRT Class ID Packet Class Code."),
+                CSRField("icc", size=16, offset=16, description="VRT Class ID Information Class Code."),
+            ])
+
+        # # #
+
+        self.comb += [
+            self.stream_id.eq(self._stream_id.storage),
+            self.data_words_req.eq(self._data_words.storage),
+            self.sample_count.eq(self._timestamp.fields.mode),
+            self.sample_count_clear.eq(self._timestamp.fields.clear),
+            self.sample_count_pps_clear.eq(self._timestamp.fields.pps_clear),
+        ]
+        if with_class_id:
+            self.comb += [
+                self.class_oui.eq(self._class_oui.storage),
+                self.class_pcc.eq(self._class_codes.fields.pcc),
+                self.class_icc.eq(self._class_codes.fields.icc),
+            ]
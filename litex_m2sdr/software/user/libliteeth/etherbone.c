@@ -604,9 +604,12 @@ static uint32_t eb_next_read_counter(struct eb_connection *conn)
 }
 
 /* Build and send one bulk-read request (rcount records, each returning to the
- * matching base_ret_addr tag). Used by both the single-shot and pipelined readers. */
+ * matching base_ret_addr tag). Used by both the single-shot and pipelined readers.
+ * addr_step is the byte increment between reads: 4 for incrementing bursts, 0 to
+ * read the same (FIFO) register count times. */
 static int eb_send_bulk_read_request(struct eb_connection *conn,
                                      uint32_t addr,
+                                     uint32_t addr_step,
                                      size_t count,
                                      uint32_t base_ret_addr)
 {
@@ -621,7 +624,7 @@ static int eb_send_bulk_read_request(struct eb_connection *conn,
     eb_fill_record_header(raw_pkt, 0, (uint8_t)count);
     eb_put_be32(&raw_pkt[EB_ADDR_OFFSET], base_ret_addr);
     for (size_t i = 0; i < count; i++)
-        eb_put_be32(&raw_pkt[EB_DATA_OFFSET + 4 * i], addr + (uint32_t)(4 * i));
+        eb_put_be32(&raw_pkt[EB_DATA_OFFSET + 4 * i], addr + addr_step * (uint32_t)i);
 
     if (eb_send(conn, raw_pkt, len) < 0) {
         fprintf(stderr, "eb_bulk_read: send failed\n");
@@ -630,7 +633,8 @@ static int eb_send_bulk_read_request(struct eb_connection *conn,
     return EB_ERR_OK;
 }
 
-static int eb_read32_bulk_once(struct eb_connection *conn, uint32_t addr, uint32_t *vals, size_t count)
+static int eb_read32_bulk_once(struct eb_connection *conn, uint32_t addr, uint32_t addr_step,
+                               uint32_t *vals, size_t count)
 {
     uint8_t raw_pkt[EB_MIN_PACKET_BYTES + EB_MAX_BURST_WORDS * sizeof(uint32_t)];
     uint32_t base_ret_addr;
@@ -646,7 +650,7 @@ static int eb_read32_bulk_once(struct eb_connection *conn, uint32_t addr, uint32
     if (conn->is_direct)
         eb_drain_direct_rx(conn);
 
-    err = eb_send_bulk_read_request(conn, addr, count, base_ret_addr);
+    err = eb_send_bulk_read_request(conn, addr, addr_step, count, base_ret_addr);
     if (err != EB_ERR_OK)
         return err;
 
@@ -666,7 +670,7 @@ int eb_read32_bulk_checked(struct eb_connection *conn, uint32_t addr, uint32_t *
     int attempts = (conn && conn->is_direct) ? EB_READ_ATTEMPTS : 1;
 
     for (int attempt = 0; attempt < attempts; attempt++) {
-        err = eb_read32_bulk_once(conn, addr, vals, count);
+        err = eb_read32_bulk_once(conn, addr, 4, vals, count);
         if (err == EB_ERR_OK || err == EB_ERR_INTERRUPTED)
             return err;
         if (conn && conn->is_direct)
@@ -676,6 +680,17 @@ int eb_read32_bulk_checked(struct eb_connection *conn, uint32_t addr, uint32_t *
     return eb_fail(conn, err);
 }
 
+/* Read the same register count times in one packet (pop-on-read FIFO drain).
+ * Reads are destructive, so a failed request is never retried. */
+int eb_read32_fifo_checked(struct eb_connection *conn, uint32_t addr, uint32_t *vals, size_t count)
+{
+    int err = eb_read32_bulk_once(conn, addr, 0, vals, count);
+
+    if (err == EB_ERR_OK || err == EB_ERR_INTERRUPTED)
+        return err;
+    return eb_fail(conn, err);
+}
+
 struct eb_pipeline_read {
     uint32_t base_ret_addr;
     size_t offset;
@@ -723,7 +738,7 @@ static int eb_read32_bulk_pipeline_once(struct eb_connection *conn,
                 chunk = burst_words;
             base_ret_addr = eb_next_read_counter(conn);
             rc = eb_send_bulk_read_request(conn,
-                addr + (uint32_t)(4 * sent), chunk, base_ret_addr);
+                addr + (uint32_t)(4 * sent), 4, chunk, base_ret_addr);
             if (rc != EB_ERR_OK)
                 goto out;
 
@@ -89,6 +89,7 @@ int eb_write32_checked(struct eb_connection *conn, uint32_t val, uint32_t addr);
 int eb_read32_bulk_checked(struct eb_connection *conn, uint32_t addr, uint32_t *vals, size_t count);
 int eb_read32_bulk_pipeline_checked(struct eb_connection *conn, uint32_t addr, uint32_t *vals,
                                     size_t count, size_t burst_words, size_t window);
+int eb_read32_fifo_checked(struct eb_connection *conn, uint32_t addr, uint32_t *vals, size_t count);
 int eb_write32_bulk_checked(struct eb_connection *conn, uint32_t addr, const uint32_t *vals, size_t count);
 uint32_t eb_read32(struct eb_connection *conn, uint32_t addr);
 void eb_write32(struct eb_connection *conn, uint32_t val, uint32_t addr);
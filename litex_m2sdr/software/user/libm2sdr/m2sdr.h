@@ -364,6 +364,66 @@ struct m2sdr_ptp_status {
     uint32_t time_lock_losses;
 };
 
+/* One PTP board-time discipline update drained from the hardware history FIFO. */
+struct m2sdr_ptp_history_entry {
+    /* Board time of the discipline sample. */
+    uint64_t local_time_ns;
+    /* Signed PTP time minus local board time for this sample. */
+    int64_t error_ns;
+    /* TimeGenerator fractional increment word after this update. */
+    uint32_t time_inc;
+    uint8_t state;
+    bool time_locked;
+    bool holdover;
+    bool ptp_locked;
+    /* Runtime coarse error rejected by the deglitch filter. */
+    bool rejected;
+    /* Action applied by this update. */
+    bool coarse_step;
+    bool phase_step;
+    /* Wrapping update counter; gaps mean updates were dropped while the FIFO was full. */
+    uint16_t sequence;
+};
+
+/* Event timestamper channels (gateware order; GPIO channels only on --with-gpio builds). */
+enum m2sdr_event_channel {
+    M2SDR_EVENT_PPS_GEN = 0,
+    M2SDR_EVENT_SYNC_IN = 1,
+    M2SDR_EVENT_CLK10   = 2,
+    M2SDR_EVENT_GPIO0   = 3,
+    M2SDR_EVENT_GPIO1   = 4,
+};
+
+/* RX stream consumers (crossbar demux ports). */
+enum m2sdr_rx_consumer {
+    M2SDR_RX_CONSUMER_PCIE = 0,
+    M2SDR_RX_CONSUMER_ETH  = 1,
+    M2SDR_RX_CONSUMER_SATA = 2,
+    M2SDR_RX_CONSUMERS     = 3,
+};
+
+/* One input edge drained from the hardware event timestamper FIFO. */
+struct m2sdr_event_timestamp {
+    /* Board time of the capture cycle. */
+    uint64_t time_ns;
+    /* Sub-cycle offset of the edge within the capture cycle. */
+    uint16_t fine_ps;
+    uint8_t channel;
+    bool rising;
+    /* Later edges of this channel were lost while this one was waiting. */
+    bool lost;
+};
+
+/* TX scheduler frame counters (wrapping). */
+struct m2sdr_tx_scheduler_stats {
+    /* Frames held until their timestamp. */
+    uint32_t early;
+    /* Frames arrived late by at most the configured tolerance (sent immediately). */
+    uint32_t on_time;
+    /* Frames arrived later than that (dropped, or sent when drop_late is false). */
+    uint32_t late;
+};
+
 /* Runtime policy for the PTP-referenced FPGA 10MHz / RFIC clock loop. */
 struct m2sdr_ptp_clock10_config {
     /* Allow the clk10 PI loop to override the MMCM dynamic phase-shift rate. */
@@ -648,6 +708,8 @@ int  m2sdr_reg_read(struct m2sdr_dev *dev, uint32_t addr, uint32_t *val);
 int  m2sdr_reg_write(struct m2sdr_dev *dev, uint32_t addr, uint32_t val);
 int  m2sdr_reg_read_bulk(struct m2sdr_dev *dev, uint32_t addr, uint32_t *vals, size_t count);
 int  m2sdr_reg_write_bulk(struct m2sdr_dev *dev, uint32_t addr, const uint32_t *vals, size_t count);
+/* Read one register count times (fixed-address burst on Etherbone), e.g. a pop-on-read FIFO. */
+int  m2sdr_reg_read_fifo(struct m2sdr_dev *dev, uint32_t addr, uint32_t *vals, size_t count);
 
 /* Copy SATA sectors to/from host memory using the LitePCIe userspace DMA path.
  *
@@ -684,11 +746,51 @@ void *m2sdr_get_handle(struct m2sdr_dev *dev);
 int  m2sdr_set_rx_header(struct m2sdr_dev *dev, bool enable, bool strip_header);
 int  m2sdr_set_tx_header(struct m2sdr_dev *dev, bool enable);
 
+/* TX scheduler: with TX headers enabled, frames whose header timestamp
+ * (meta->timestamp with M2SDR_META_FLAG_HAS_TIME) is non-zero are held until
+ * board time + latency_ns reaches it; untimed frames are sent immediately. */
+int  m2sdr_config_tx_scheduler(struct m2sdr_dev *dev, bool enable, bool drop_late,
+                               uint32_t latency_ns, uint32_t tolerance_ns);
+int  m2sdr_get_tx_scheduler_stats(struct m2sdr_dev *dev, struct m2sdr_tx_scheduler_stats *stats,
+                                  bool clear);
+
+/* Timed RX capture windows: once armed, RX only forwards count_words 64-bit
+ * words starting at board time start_ns, repeated every period_ns (0: single
+ * window). With RX headers enabled, each window is padded to whole DMA
+ * buffers and starts a new buffer whose header timestamp is the arrival time
+ * of its first word. enable=false restores continuous RX. */
+int  m2sdr_config_rx_window(struct m2sdr_dev *dev, bool enable, uint64_t start_ns,
+                            uint32_t count_words, uint64_t period_ns);
+/* armed/active/windows may be NULL. */
+int  m2sdr_get_rx_window_status(struct m2sdr_dev *dev, bool *armed, bool *active,
+                                uint32_t *windows);
+
+/* RX fan-out (--with-rx-fanout builds): with broadcast, RX goes to every
+ * consumer set in enable_mask (bits: 1u << enum m2sdr_rx_consumer) through
+ * its own FIFO; consumers set in drop_mask drop whole frames when their FIFO
+ * is full instead of stalling the others. broadcast=false restores the
+ * single-consumer routing selected by the crossbar demux. Returns
+ * M2SDR_ERR_RANGE when dropping consumers are enabled while RX frames
+ * (header frame_cycles + 2 words) exceed the per-consumer FIFO depth. */
+int  m2sdr_config_rx_fanout(struct m2sdr_dev *dev, bool broadcast, uint32_t enable_mask,
+                            uint32_t drop_mask);
+/* Dropped frames (words when RX headers are disabled) per consumer. */
+int  m2sdr_get_rx_fanout_overflows(struct m2sdr_dev *dev, uint32_t overflows[M2SDR_RX_CONSUMERS],
+                                   bool clear);
+
 /* GPIO helper (4-bit) */
 int  m2sdr_gpio_config(struct m2sdr_dev *dev, bool enable, bool loopback, bool source_csr);
 int  m2sdr_gpio_write(struct m2sdr_dev *dev, uint8_t value, uint8_t oe);
 int  m2sdr_gpio_read(struct m2sdr_dev *dev, uint8_t *value);
 
+/* Event timestamper (masks indexed by enum m2sdr_event_channel) */
+int  m2sdr_config_event_timestamper(struct m2sdr_dev *dev, bool enable, uint32_t rising_mask,
+                                    uint32_t falling_mask);
+/* Drain up to max_events timestamps (oldest first); dropped may be NULL. */
+int  m2sdr_read_event_timestamps(struct m2sdr_dev *dev, struct m2sdr_event_timestamp *events,
+                                 size_t max_events, size_t *count, uint32_t *dropped);
+int  m2sdr_clear_event_timestamps(struct m2sdr_dev *dev);
+
 /* Time */
 int  m2sdr_get_time(struct m2sdr_dev *dev, uint64_t *time_ns);
 int  m2sdr_set_time(struct m2sdr_dev *dev, uint64_t time_ns);
@@ -696,6 +798,10 @@ int  m2sdr_get_ptp_status(struct m2sdr_dev *dev, struct m2sdr_ptp_status *status
 int  m2sdr_get_ptp_discipline_config(struct m2sdr_dev *dev, struct m2sdr_ptp_discipline_config *cfg);
 int  m2sdr_set_ptp_discipline_config(struct m2sdr_dev *dev, const struct m2sdr_ptp_discipline_config *cfg);
 int  m2sdr_clear_ptp_counters(struct m2sdr_dev *dev);
+/* Drain up to max_entries discipline updates (oldest first); dropped may be NULL. */
+int  m2sdr_read_ptp_history(struct m2sdr_dev *dev, struct m2sdr_ptp_history_entry *entries,
+                            size_t max_entries, size_t *count, uint32_t *dropped);
+int  m2sdr_clear_ptp_history(struct m2sdr_dev *dev);
 int  m2sdr_get_ptp_clock10_status(struct m2sdr_dev *dev, struct m2sdr_ptp_clock10_status *status);
 int  m2sdr_get_ptp_clock10_config(struct m2sdr_dev *dev, struct m2sdr_ptp_clock10_config *cfg);
 int  m2sdr_set_ptp_clock10_config(struct m2sdr_dev *dev, const struct m2sdr_ptp_clock10_config *cfg);
@@ -877,6 +877,24 @@ int m2sdr_reg_write_bulk(struct m2sdr_dev *dev, uint32_t addr, const uint32_t *v
     return M2SDR_ERR_OK;
 }
 
+/* Read the same register count times, e.g. to drain a pop-on-read FIFO CSR. */
+int m2sdr_reg_read_fifo(struct m2sdr_dev *dev, uint32_t addr, uint32_t *vals, size_t count)
+{
+    if (!dev || !vals || !dev->ops || !dev->ops->readl)
+        return M2SDR_ERR_INVAL;
+    if (count == 0)
+        return M2SDR_ERR_OK;
+    if (dev->ops->readl_fifo)
+        return dev->ops->readl_fifo(dev, addr, vals, count);
+
+    for (size_t i = 0; i < count; i++) {
+        int rc = dev->ops->readl(dev, addr, &vals[i]);
+        if (rc != M2SDR_ERR_OK)
+            return rc;
+    }
+    return M2SDR_ERR_OK;
+}
+
 int m2sdr_sata_pcie_dma_copy(struct m2sdr_dev *dev,
                              enum m2sdr_sata_dma_direction direction,
                              uint64_t sector,
@@ -1368,6 +1386,119 @@ int m2sdr_clear_ptp_counters(struct m2sdr_dev *dev)
 #endif
 }
 
+#if defined(CSR_PTP_HISTORY_LEVEL_ADDR) && \
+    defined(CSR_PTP_HISTORY_DROPPED_ADDR) && \
+    defined(CSR_PTP_HISTORY_DATA_ADDR)
+#define M2SDR_PTP_HISTORY_ENTRY_WORDS  6
+/* Entries per Etherbone request (a record carries at most 255 reads). */
+#define M2SDR_PTP_HISTORY_BURST_ENTRIES 42
+
+static void m2sdr_decode_ptp_history_entry(const uint32_t *words, struct m2sdr_ptp_history_entry *entry)
+{
+    uint32_t flags = words[5];
+
+    entry->local_time_ns = ((uint64_t)words[1] << 32) | words[0];
+    entry->error_ns      = (int64_t)(((uint64_t)words[3] << 32) | words[2]);
+    entry->time_inc      = words[4];
+    entry->state         = (uint8_t)(flags & 0x3u);
+    entry->time_locked   = (flags >> 2) & 1u;
+    entry->holdover      = (flags >> 3) & 1u;
+    entry->ptp_locked    = (flags >> 4) & 1u;
+    entry->rejected      = (flags >> 5) & 1u;
+    entry->coarse_step   = (flags >> 6) & 1u;
+    entry->phase_step    = (flags >> 7) & 1u;
+    entry->sequence      = (uint16_t)(flags >> 16);
+}
+#endif
+
+/* Drain up to max_entries PTP discipline updates from the hardware history FIFO. */
+int m2sdr_read_ptp_history(struct m2sdr_dev *dev,
+                           struct m2sdr_ptp_history_entry *entries,
+                           size_t max_entries,
+                           size_t *count,
+                           uint32_t *dropped)
+{
+#if defined(CSR_PTP_HISTORY_LEVEL_ADDR) && \
+    defined(CSR_PTP_HISTORY_DROPPED_ADDR) && \
+    defined(CSR_PTP_HISTORY_DATA_ADDR)
+    uint32_t words[M2SDR_PTP_HISTORY_BURST_ENTRIES * M2SDR_PTP_HISTORY_ENTRY_WORDS];
+    bool has_eth_ptp = false;
+    uint32_t level = 0;
+    size_t done = 0;
+    int ret = 0;
+
+    if (!dev || !count || (!entries && max_entries))
+        return M2SDR_ERR_INVAL;
+    *count = 0;
+
+    ret = m2sdr_has_eth_ptp(dev, &has_eth_ptp);
+    if (ret != M2SDR_ERR_OK)
+        return ret;
+    if (!has_eth_ptp)
+        return M2SDR_ERR_UNSUPPORTED;
+
+    if (dropped && m2sdr_reg_read(dev, CSR_PTP_HISTORY_DROPPED_ADDR, dropped) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_read(dev, CSR_PTP_HISTORY_LEVEL_ADDR, &level) != 0)
+        return M2SDR_ERR_IO;
+    if (level > max_entries)
+        level = (uint32_t)max_entries;
+
+    /* Only whole entries present at the level read are popped, so the data word
+     * pointer always stays aligned on an entry boundary. */
+    while (done < level) {
+        size_t chunk = level - done;
+
+        if (chunk > M2SDR_PTP_HISTORY_BURST_ENTRIES)
+            chunk = M2SDR_PTP_HISTORY_BURST_ENTRIES;
+        ret = m2sdr_reg_read_fifo(dev, CSR_PTP_HISTORY_DATA_ADDR, words,
+            chunk * M2SDR_PTP_HISTORY_ENTRY_WORDS);
+        if (ret != M2SDR_ERR_OK)
+            return ret;
+        for (size_t i = 0; i < chunk; i++)
+            m2sdr_decode_ptp_history_entry(&words[i * M2SDR_PTP_HISTORY_ENTRY_WORDS], &entries[done + i]);
+        done += chunk;
+        *count = done;
+    }
+
+    return M2SDR_ERR_OK;
+#else
+    (void)dev;
+    (void)entries;
+    (void)max_entries;
+    (void)dropped;
+    if (count)
+        *count = 0;
+    return M2SDR_ERR_UNSUPPORTED;
+#endif
+}
+
+int m2sdr_clear_ptp_history(struct m2sdr_dev *dev)
+{
+#if defined(CSR_PTP_HISTORY_CONTROL_ADDR) && \
+    defined(CSR_PTP_HISTORY_CONTROL_CLEAR_OFFSET)
+    bool has_eth_ptp = false;
+    int ret = 0;
+
+    if (!dev)
+        return M2SDR_ERR_INVAL;
+
+    ret = m2sdr_has_eth_ptp(dev, &has_eth_ptp);
+    if (ret != M2SDR_ERR_OK)
+        return ret;
+    if (!has_eth_ptp)
+        return M2SDR_ERR_UNSUPPORTED;
+
+    if (m2sdr_reg_write(dev, CSR_PTP_HISTORY_CONTROL_ADDR, 1u << CSR_PTP_HISTORY_CONTROL_CLEAR_OFFSET) != 0)
+        return M2SDR_ERR_IO;
+
+    return M2SDR_ERR_OK;
+#else
+    (void)dev;
+    return M2SDR_ERR_UNSUPPORTED;
+#endif
+}
+
 /* Read the current Ethernet PTP and time-discipline status when available. */
 int m2sdr_get_ptp_status(struct m2sdr_dev *dev, struct m2sdr_ptp_status *status)
 {
@@ -2063,6 +2194,9 @@ int m2sdr_get_agc_count(struct m2sdr_dev *dev, enum m2sdr_agc_detector detector,
 int m2sdr_set_sample_format(struct m2sdr_dev *dev, enum m2sdr_format format)
 {
     uint32_t mode;
+#ifdef CSR_AD9361_BITMODE_ADDR
+    uint32_t value = 0;
+#endif
 
     if (!dev)
         return M2SDR_ERR_INVAL;
@@ -2082,7 +2216,11 @@ int m2sdr_set_sample_format(struct m2sdr_dev *dev, enum m2sdr_format format)
     }
 
 #ifdef CSR_AD9361_BITMODE_ADDR
-    if (m2sdr_reg_write(dev, CSR_AD9361_BITMODE_ADDR, mode) != 0)
+    /* Only touch the mode field: keep options such as per-channel BFP8 exponents. */
+    if (m2sdr_reg_read(dev, CSR_AD9361_BITMODE_ADDR, &value) != 0)
+        return M2SDR_ERR_IO;
+    value = (value & ~0x3u) | mode;
+    if (m2sdr_reg_write(dev, CSR_AD9361_BITMODE_ADDR, value) != 0)
         return M2SDR_ERR_IO;
     return M2SDR_ERR_OK;
 #else
@@ -2218,6 +2356,9 @@ int m2sdr_reset_datapath(struct m2sdr_dev *dev)
     m2sdr_reset_keep_error(m2sdr_set_fpga_prbs_tx(dev, false), &status);
     m2sdr_reset_keep_error(m2sdr_set_rx_header(dev, false, false), &status);
     m2sdr_reset_keep_error(m2sdr_set_tx_header(dev, false), &status);
+    m2sdr_reset_keep_error(m2sdr_config_tx_scheduler(dev, false, true, 0, 0), &status);
+    m2sdr_reset_keep_error(m2sdr_config_rx_window(dev, false, 0, 0, 0), &status);
+    m2sdr_reset_keep_error(m2sdr_config_rx_fanout(dev, false, 0, 0), &status);
     m2sdr_reset_keep_error(m2sdr_set_bitmode(dev, false), &status);
 
     return status;
@@ -2255,6 +2396,198 @@ int m2sdr_set_tx_header(struct m2sdr_dev *dev, bool enable)
     return M2SDR_ERR_OK;
 }
 
+/* Configure the TX scheduler holding timestamped TX frames until their board time. */
+int m2sdr_config_tx_scheduler(struct m2sdr_dev *dev, bool enable, bool drop_late,
+                              uint32_t latency_ns, uint32_t tolerance_ns)
+{
+    if (!dev)
+        return M2SDR_ERR_INVAL;
+
+#ifdef CSR_TX_SCHEDULER_BASE
+    /* Update the policy before (re)enabling scheduling. */
+    if (m2sdr_reg_write(dev, CSR_TX_SCHEDULER_CONTROL_ADDR,
+        (drop_late ? 1u : 0u) << CSR_TX_SCHEDULER_CONTROL_DROP_LATE_OFFSET) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_write(dev, CSR_TX_SCHEDULER_LATENCY_ADDR, latency_ns) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_write(dev, CSR_TX_SCHEDULER_TOLERANCE_ADDR, tolerance_ns) != 0)
+        return M2SDR_ERR_IO;
+    if (enable &&
+        m2sdr_reg_write(dev, CSR_TX_SCHEDULER_CONTROL_ADDR,
+            (1u << CSR_TX_SCHEDULER_CONTROL_ENABLE_OFFSET) |
+            ((drop_late ? 1u : 0u) << CSR_TX_SCHEDULER_CONTROL_DROP_LATE_OFFSET)) != 0)
+        return M2SDR_ERR_IO;
+    return M2SDR_ERR_OK;
+#else
+    (void)enable;
+    (void)drop_late;
+    (void)latency_ns;
+    (void)tolerance_ns;
+    return M2SDR_ERR_UNSUPPORTED;
+#endif
+}
+
+/* Read (and optionally clear) the TX scheduler early/on-time/late frame counters. */
+int m2sdr_get_tx_scheduler_stats(struct m2sdr_dev *dev, struct m2sdr_tx_scheduler_stats *stats,
+                                 bool clear)
+{
+    if (!dev || !stats)
+        return M2SDR_ERR_INVAL;
+
+#ifdef CSR_TX_SCHEDULER_BASE
+    uint32_t control = 0;
+
+    if (m2sdr_reg_read(dev, CSR_TX_SCHEDULER_EARLY_ADDR, &stats->early) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_read(dev, CSR_TX_SCHEDULER_ON_TIME_ADDR, &stats->on_time) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_read(dev, CSR_TX_SCHEDULER_LATE_ADDR, &stats->late) != 0)
+        return M2SDR_ERR_IO;
+    if (clear) {
+        if (m2sdr_reg_read(dev, CSR_TX_SCHEDULER_CONTROL_ADDR, &control) != 0)
+            return M2SDR_ERR_IO;
+        control |= 1u << CSR_TX_SCHEDULER_CONTROL_CLEAR_OFFSET;
+        if (m2sdr_reg_write(dev, CSR_TX_SCHEDULER_CONTROL_ADDR, control) != 0)
+            return M2SDR_ERR_IO;
+    }
+    return M2SDR_ERR_OK;
+#else
+    memset(stats, 0, sizeof(*stats));
+    (void)clear;
+    return M2SDR_ERR_UNSUPPORTED;
+#endif
+}
+
+/* Configure (and arm when enabled) the timed RX capture window gate. */
+int m2sdr_config_rx_window(struct m2sdr_dev *dev, bool enable, uint64_t start_ns,
+                           uint32_t count_words, uint64_t period_ns)
+{
+    if (!dev)
+        return M2SDR_ERR_INVAL;
+
+#ifdef CSR_RX_WINDOW_BASE
+    /* Disabling returns the gate to idle so the new window is armed from scratch. */
+    if (m2sdr_reg_write(dev, CSR_RX_WINDOW_CONTROL_ADDR, 0) != 0)
+        return M2SDR_ERR_IO;
+    if (!enable)
+        return M2SDR_ERR_OK;
+    if (m2sdr_reg_write(dev, CSR_RX_WINDOW_START_ADDR + 0, (uint32_t)(start_ns >> 32)) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_write(dev, CSR_RX_WINDOW_START_ADDR + 4, (uint32_t)(start_ns & 0xffffffffu)) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_write(dev, CSR_RX_WINDOW_COUNT_ADDR, count_words) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_write(dev, CSR_RX_WINDOW_PERIOD_ADDR + 0, (uint32_t)(period_ns >> 32)) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_write(dev, CSR_RX_WINDOW_PERIOD_ADDR + 4, (uint32_t)(period_ns & 0xffffffffu)) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_write(dev, CSR_RX_WINDOW_CONTROL_ADDR,
+        1u << CSR_RX_WINDOW_CONTROL_ENABLE_OFFSET) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_write(dev, CSR_RX_WINDOW_CONTROL_ADDR,
+        (1u << CSR_RX_WINDOW_CONTROL_ENABLE_OFFSET) |
+        (1u << CSR_RX_WINDOW_CONTROL_ARM_OFFSET)) != 0)
+        return M2SDR_ERR_IO;
+    return M2SDR_ERR_OK;
+#else
+    (void)start_ns;
+    (void)count_words;
+    (void)period_ns;
+    return enable ? M2SDR_ERR_UNSUPPORTED : M2SDR_ERR_OK;
+#endif
+}
+
+/* Read the RX capture window gate state and completed window count. */
+int m2sdr_get_rx_window_status(struct m2sdr_dev *dev, bool *armed, bool *active,
+                               uint32_t *windows)
+{
+    if (!dev)
+        return M2SDR_ERR_INVAL;
+
+#ifdef CSR_RX_WINDOW_BASE
+    uint32_t status = 0;
+
+    if (m2sdr_reg_read(dev, CSR_RX_WINDOW_STATUS_ADDR, &status) != 0)
+        return M2SDR_ERR_IO;
+    if (windows && m2sdr_reg_read(dev, CSR_RX_WINDOW_WINDOWS_ADDR, windows) != 0)
+        return M2SDR_ERR_IO;
+    if (armed)
+        *armed = (status >> CSR_RX_WINDOW_STATUS_ARMED_OFFSET) & 1u;
+    if (active)
+        *active = (status >> CSR_RX_WINDOW_STATUS_ACTIVE_OFFSET) & 1u;
+    return M2SDR_ERR_OK;
+#else
+    (void)armed;
+    (void)active;
+    (void)windows;
+    return M2SDR_ERR_UNSUPPORTED;
+#endif
+}
+
+/* Select broadcast or routed RX and the per-consumer enable/drop policy. */
+int m2sdr_config_rx_fanout(struct m2sdr_dev *dev, bool broadcast, uint32_t enable_mask,
+                           uint32_t drop_mask)
+{
+    if (!dev)
+        return M2SDR_ERR_INVAL;
+
+#ifdef CSR_CROSSBAR_DEMUX_CONTROL_ADDR
+    /* Frames larger than the consumer FIFOs can't be admitted whole: the gateware falls back to
+     * word drops, which would hand dropping consumers partial frames. */
+    if (broadcast && (enable_mask & drop_mask)) {
+        uint32_t status = 0;
+
+        if (m2sdr_reg_read(dev, CSR_CROSSBAR_DEMUX_STATUS_ADDR, &status) != 0)
+            return M2SDR_ERR_IO;
+        if ((status >> CSR_CROSSBAR_DEMUX_STATUS_OVERSIZE_OFFSET) & 1u)
+            return M2SDR_ERR_RANGE;
+    }
+    if (m2sdr_reg_write(dev, CSR_CROSSBAR_DEMUX_ENABLE_ADDR, enable_mask) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_write(dev, CSR_CROSSBAR_DEMUX_DROP_ADDR, drop_mask) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_write(dev, CSR_CROSSBAR_DEMUX_CONTROL_ADDR,
+        (broadcast ? 1u : 0u) << CSR_CROSSBAR_DEMUX_CONTROL_BROADCAST_OFFSET) != 0)
+        return M2SDR_ERR_IO;
+    return M2SDR_ERR_OK;
+#else
+    (void)enable_mask;
+    (void)drop_mask;
+    return broadcast ? M2SDR_ERR_UNSUPPORTED : M2SDR_ERR_OK;
+#endif
+}
+
+/* Read (and optionally clear) the RX fan-out per-consumer overflow counters. */
+int m2sdr_get_rx_fanout_overflows(struct m2sdr_dev *dev, uint32_t overflows[M2SDR_RX_CONSUMERS],
+                                  bool clear)
+{
+    if (!dev || !overflows)
+        return M2SDR_ERR_INVAL;
+
+#ifdef CSR_CROSSBAR_DEMUX_CONTROL_ADDR
+    uint32_t control = 0;
+
+    if (m2sdr_reg_read(dev, CSR_CROSSBAR_DEMUX_OVERFLOWS0_ADDR, &overflows[M2SDR_RX_CONSUMER_PCIE]) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_read(dev, CSR_CROSSBAR_DEMUX_OVERFLOWS1_ADDR, &overflows[M2SDR_RX_CONSUMER_ETH]) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_read(dev, CSR_CROSSBAR_DEMUX_OVERFLOWS2_ADDR, &overflows[M2SDR_RX_CONSUMER_SATA]) != 0)
+        return M2SDR_ERR_IO;
+    if (clear) {
+        if (m2sdr_reg_read(dev, CSR_CROSSBAR_DEMUX_CONTROL_ADDR, &control) != 0)
+            return M2SDR_ERR_IO;
+        control |= 1u << CSR_CROSSBAR_DEMUX_CONTROL_CLEAR_OFFSET;
+        if (m2sdr_reg_write(dev, CSR_CROSSBAR_DEMUX_CONTROL_ADDR, control) != 0)
+            return M2SDR_ERR_IO;
+    }
+    return M2SDR_ERR_OK;
+#else
+    memset(overflows, 0, M2SDR_RX_CONSUMERS*sizeof(overflows[0]));
+    (void)clear;
+    return M2SDR_ERR_UNSUPPORTED;
+#endif
+}
+
 /* Configure GPIO ownership, loopback mode, and the data source selection. */
 int m2sdr_gpio_config(struct m2sdr_dev *dev, bool enable, bool loopback, bool source_csr)
 {
@@ -2333,3 +2666,108 @@ int m2sdr_gpio_read(struct m2sdr_dev *dev, uint8_t *value)
     return M2SDR_ERR_UNSUPPORTED;
 #endif
 }
+
+/* Enable edge capture on the event timestamper inputs. */
+int m2sdr_config_event_timestamper(struct m2sdr_dev *dev, bool enable, uint32_t rising_mask,
+                                   uint32_t falling_mask)
+{
+    if (!dev)
+        return M2SDR_ERR_INVAL;
+
+#ifdef CSR_EVENT_TIMESTAMPER_BASE
+    /* Update the edge enables before (re)enabling capture. */
+    if (m2sdr_reg_write(dev, CSR_EVENT_TIMESTAMPER_CONTROL_ADDR, 0) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_write(dev, CSR_EVENT_TIMESTAMPER_RISING_ADDR, rising_mask) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_write(dev, CSR_EVENT_TIMESTAMPER_FALLING_ADDR, falling_mask) != 0)
+        return M2SDR_ERR_IO;
+    if (enable &&
+        m2sdr_reg_write(dev, CSR_EVENT_TIMESTAMPER_CONTROL_ADDR,
+            1u << CSR_EVENT_TIMESTAMPER_CONTROL_ENABLE_OFFSET) != 0)
+        return M2SDR_ERR_IO;
+    return M2SDR_ERR_OK;
+#else
+    (void)enable;
+    (void)rising_mask;
+    (void)falling_mask;
+    return M2SDR_ERR_UNSUPPORTED;
+#endif
+}
+
+#define M2SDR_EVENT_ENTRY_WORDS  3
+/* Entries per Etherbone request (a record carries at most 255 reads). */
+#define M2SDR_EVENT_BURST_ENTRIES 85
+
+/* Drain up to max_events input edge timestamps from the hardware event FIFO. */
+int m2sdr_read_event_timestamps(struct m2sdr_dev *dev, struct m2sdr_event_timestamp *events,
+                                size_t max_events, size_t *count, uint32_t *dropped)
+{
+    if (!dev || !count || (!events && max_events))
+        return M2SDR_ERR_INVAL;
+    *count = 0;
+
+#ifdef CSR_EVENT_TIMESTAMPER_BASE
+    uint32_t words[M2SDR_EVENT_BURST_ENTRIES * M2SDR_EVENT_ENTRY_WORDS];
+    uint32_t level = 0;
+    size_t done = 0;
+    int ret = 0;
+
+    if (dropped && m2sdr_reg_read(dev, CSR_EVENT_TIMESTAMPER_DROPPED_ADDR, dropped) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_read(dev, CSR_EVENT_TIMESTAMPER_LEVEL_ADDR, &level) != 0)
+        return M2SDR_ERR_IO;
+    if (level > max_events)
+        level = (uint32_t)max_events;
+
+    /* Only whole entries present at the level read are popped (see m2sdr_read_ptp_history). */
+    while (done < level) {
+        size_t chunk = level - done;
+
+        if (chunk > M2SDR_EVENT_BURST_ENTRIES)
+            chunk = M2SDR_EVENT_BURST_ENTRIES;
+        ret = m2sdr_reg_read_fifo(dev, CSR_EVENT_TIMESTAMPER_DATA_ADDR, words,
+            chunk * M2SDR_EVENT_ENTRY_WORDS);
+        if (ret != M2SDR_ERR_OK)
+            return ret;
+        for (size_t i = 0; i < chunk; i++) {
+            const uint32_t *w = &words[i * M2SDR_EVENT_ENTRY_WORDS];
+            struct m2sdr_event_timestamp *e = &events[done + i];
+
+            e->time_ns = ((uint64_t)w[1] << 32) | w[0];
+            e->channel = (uint8_t)(w[2] & 0xfu);
+            e->rising  = (w[2] >> 4) & 1u;
+            e->lost    = (w[2] >> 5) & 1u;
+            e->fine_ps = (uint16_t)(w[2] >> 16);
+        }
+        done += chunk;
+        *count = done;
+    }
+    return M2SDR_ERR_OK;
+#else
+    (void)events;
+    (void)max_events;
+    (void)dropped;
+    return M2SDR_ERR_UNSUPPORTED;
+#endif
+}
+
+/* Flush the event FIFO and clear its drop counter, keeping the capture configuration. */
+int m2sdr_clear_event_timestamps(struct m2sdr_dev *dev)
+{
+    if (!dev)
+        return M2SDR_ERR_INVAL;
+
+#ifdef CSR_EVENT_TIMESTAMPER_BASE
+    uint32_t control = 0;
+
+    if (m2sdr_reg_read(dev, CSR_EVENT_TIMESTAMPER_CONTROL_ADDR, &control) != 0)
+        return M2SDR_ERR_IO;
+    control |= 1u << CSR_EVENT_TIMESTAMPER_CONTROL_CLEAR_OFFSET;
+    if (m2sdr_reg_write(dev, CSR_EVENT_TIMESTAMPER_CONTROL_ADDR, control) != 0)
+        return M2SDR_ERR_IO;
+    return M2SDR_ERR_OK;
+#else
+    return M2SDR_ERR_UNSUPPORTED;
+#endif
+}
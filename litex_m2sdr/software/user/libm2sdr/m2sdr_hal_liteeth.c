@@ -82,9 +82,22 @@ static int m2sdr_liteeth_writel_bulk(struct m2sdr_dev *dev, uint32_t addr, const
     return m2sdr_from_eb_error(err);
 }
 
+static int m2sdr_liteeth_readl_fifo(struct m2sdr_dev *dev, uint32_t addr, uint32_t *vals, size_t count)
+{
+    int err;
+
+    if (!dev || !vals || !dev->eb)
+        return M2SDR_ERR_INVAL;
+    pthread_mutex_lock(&dev->reg_lock);
+    err = eb_read32_fifo_checked(dev->eb, addr, vals, count);
+    pthread_mutex_unlock(&dev->reg_lock);
+    return m2sdr_from_eb_error(err);
+}
+
 const struct m2sdr_backend_ops m2sdr_liteeth_backend_ops = {
     .readl       = m2sdr_liteeth_readl,
     .writel      = m2sdr_liteeth_writel,
     .readl_bulk  = m2sdr_liteeth_readl_bulk,
     .writel_bulk = m2sdr_liteeth_writel_bulk,
+    .readl_fifo  = m2sdr_liteeth_readl_fifo,
 };
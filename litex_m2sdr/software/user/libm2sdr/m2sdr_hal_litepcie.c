@@ -41,4 +41,5 @@ const struct m2sdr_backend_ops m2sdr_litepcie_backend_ops = {
     .writel      = m2sdr_litepcie_writel,
     .readl_bulk  = NULL,
     .writel_bulk = NULL,
+    .readl_fifo  = NULL,
 };
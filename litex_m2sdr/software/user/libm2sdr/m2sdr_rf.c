@@ -764,6 +764,58 @@ static int m2sdr_configure_modes(struct m2sdr_dev *dev, struct ad9361_rf_phy *ph
     return M2SDR_ERR_OK;
 }
 
+#ifdef CSR_VRT_STREAMER_CONTEXT_SAMPLE_RATE_ADDR
+/* Write one logical 64-bit CSR value stored as hi/lo 32-bit words (low word commits). */
+static int m2sdr_write_reg_u64(struct m2sdr_dev *dev, uint32_t addr, uint64_t value)
+{
+    if (m2sdr_reg_write(dev, addr + 0, (uint32_t)(value >> 32)) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_write(dev, addr + 4, (uint32_t)value) != 0)
+        return M2SDR_ERR_IO;
+    return M2SDR_ERR_OK;
+}
+#endif
+
+/* Describe the RX stream in the VRT IF-Context packets (when built with --vrt-with-context) so
+ * VRT receivers learn sample rate, frequency, gain and format without reading the board. Values
+ * are VITA-49 fixed point: Hz with a 20-bit radix, dB with a 7-bit radix. */
+static int m2sdr_update_vrt_context(struct m2sdr_dev *dev,
+                                    const struct m2sdr_config *cfg,
+                                    enum m2sdr_channel_layout channel_layout)
+{
+#ifdef CSR_VRT_STREAMER_CONTEXT_SAMPLE_RATE_ADDR
+    enum m2sdr_format format = cfg->sample_format;
+    uint32_t item_bits;
+    uint32_t channels = (channel_layout == M2SDR_CHANNEL_LAYOUT_1T1R) ? 1 : 2;
+    uint64_t payload_format;
+
+    if (cfg->enable_8bit_mode && format == M2SDR_FORMAT_SC16_Q11)
+        format = M2SDR_FORMAT_SC8_Q7;
+    item_bits = (format == M2SDR_FORMAT_SC16_Q11) ? 16 : 8;
+    /* Complex cartesian, signed fixed point, one vector of `channels` items. */
+    payload_format = ((uint64_t)((1u << 29) | ((item_bits - 1) << 6) | (item_bits - 1)) << 32) |
+                     (uint64_t)(channels - 1);
+
+    if (m2sdr_write_reg_u64(dev, CSR_VRT_STREAMER_CONTEXT_SAMPLE_RATE_ADDR, (uint64_t)cfg->sample_rate << 20) != M2SDR_ERR_OK ||
+        m2sdr_write_reg_u64(dev, CSR_VRT_STREAMER_CONTEXT_BANDWIDTH_ADDR,   (uint64_t)cfg->bandwidth   << 20) != M2SDR_ERR_OK ||
+        m2sdr_write_reg_u64(dev, CSR_VRT_STREAMER_CONTEXT_RF_FREQ_ADDR,     (uint64_t)cfg->rx_freq     << 20) != M2SDR_ERR_OK ||
+        m2sdr_write_reg_u64(dev, CSR_VRT_STREAMER_CONTEXT_PAYLOAD_FORMAT_ADDR, payload_format)         != M2SDR_ERR_OK)
+        return M2SDR_ERR_IO;
+    /* Stage 1 gain only (RX1 gain), stage 2 left at 0 dB. */
+    if (m2sdr_reg_write(dev, CSR_VRT_STREAMER_CONTEXT_GAIN_ADDR, (uint32_t)((int32_t)cfg->rx_gain1 * 128) & 0xffff) != 0)
+        return M2SDR_ERR_IO;
+    if (m2sdr_reg_write(dev, CSR_VRT_STREAMER_CONTEXT_CONTROL_ADDR,
+        (1u << CSR_VRT_STREAMER_CONTEXT_CONTROL_ENABLE_OFFSET) |
+        (1u << CSR_VRT_STREAMER_CONTEXT_CONTROL_UPDATE_OFFSET)) != 0)
+        return M2SDR_ERR_IO;
+#else
+    (void)dev;
+    (void)cfg;
+    (void)channel_layout;
+#endif
+    return M2SDR_ERR_OK;
+}
+
 /* Run the optional AD9361 built-in test modes requested by the config. */
 static int m2sdr_write_prbs_tx_ctrl(struct m2sdr_dev *dev, uint32_t value)
 {
@@ -1522,6 +1574,10 @@ int m2sdr_apply_config(struct m2sdr_dev *dev, const struct m2sdr_config *cfg)
             return rc;
     }
 
+    rc = m2sdr_update_vrt_context(dev, cfg, channel_layout);
+    if (rc != M2SDR_ERR_OK)
+        return rc;
+
     m2sdr_store_applied_config(dev, cfg);
     return M2SDR_ERR_OK;
 }
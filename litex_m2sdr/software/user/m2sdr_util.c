@@ -348,7 +348,7 @@ static void ptp_print_status_details(const struct m2sdr_ptp_status *status)
     printf("Time Lock Losses : %" PRIu32 "\n", status->time_lock_losses);
 }
 
-static void ptp_print_status_json(const struct m2sdr_ptp_status *status, time_t refresh_time)
+static void ptp_print_status_json_fields(const struct m2sdr_ptp_status *status, time_t refresh_time)
 {
     char master_ip[32];
     char local_port[48];
@@ -358,7 +358,6 @@ static void ptp_print_status_json(const struct m2sdr_ptp_status *status, time_t
     ptp_format_port_identity(local_port, sizeof(local_port), &status->local_port);
     ptp_format_port_identity(master_port, sizeof(master_port), &status->master_port);
 
-    printf("{");
     printf("\"refresh_time_unix\":%" PRIdMAX, (intmax_t)refresh_time);
     printf(",\"enabled\":%s", status->enabled ? "true" : "false");
     printf(",\"active\":%s", status->active ? "true" : "false");
@@ -388,6 +387,12 @@ static void ptp_print_status_json(const struct m2sdr_ptp_status *status, time_t
     printf(",\"time_lock_misses\":%" PRIu32, status->time_lock_misses);
     printf(",\"time_lock_miss_count\":%" PRIu32, status->time_lock_miss_count);
     printf(",\"time_lock_losses\":%" PRIu32, status->time_lock_losses);
+}
+
+static void ptp_print_status_json(const struct m2sdr_ptp_status *status, time_t refresh_time)
+{
+    printf("{");
+    ptp_print_status_json_fields(status, refresh_time);
     printf("}\n");
 }
 
@@ -440,9 +445,8 @@ static void ptp_clock10_print_status_details(const struct m2sdr_ptp_clock10_stat
     printf("Saturations      : %" PRIu32 "\n", status->saturation_count);
 }
 
-static void ptp_clock10_print_status_json(const struct m2sdr_ptp_clock10_status *status, time_t refresh_time)
+static void ptp_clock10_print_status_json_fields(const struct m2sdr_ptp_clock10_status *status, time_t refresh_time)
 {
-    printf("{");
     printf("\"refresh_time_unix\":%" PRIdMAX, (intmax_t)refresh_time);
     printf(",\"enabled\":%s", status->enabled ? "true" : "false");
     printf(",\"active\":%s", status->active ? "true" : "false");
@@ -465,6 +469,12 @@ static void ptp_clock10_print_status_json(const struct m2sdr_ptp_clock10_status
     printf(",\"lock_loss_count\":%" PRIu32, status->lock_loss_count);
     printf(",\"rate_update_count\":%" PRIu32, status->rate_update_count);
     printf(",\"saturation_count\":%" PRIu32, status->saturation_count);
+}
+
+static void ptp_clock10_print_status_json(const struct m2sdr_ptp_clock10_status *status, time_t refresh_time)
+{
+    printf("{");
+    ptp_clock10_print_status_json_fields(status, refresh_time);
     printf("}\n");
 }
 
@@ -583,6 +593,136 @@ static void ptp_clock10_status(bool watch, double watch_interval, bool json)
     m2sdr_close_dev(conn);
 }
 
+static void ptp_stream(int duration, double interval, bool with_clock10)
+{
+    struct m2sdr_dev *conn = m2sdr_open_dev();
+    double start;
+    double next;
+    uint64_t sample = 0;
+    int ret = 0;
+
+    /* One connection for the whole run: samples are taken on a fixed schedule (no per-sample
+     * process spawn/settle) and emitted as JSON lines, flushed as soon as they are read. */
+    keep_running = 1;
+    signal(SIGINT, intHandler);
+
+    start = monotonic_seconds();
+    next  = start;
+    while (keep_running) {
+        struct m2sdr_ptp_status status;
+        struct m2sdr_ptp_clock10_status clock10;
+        struct timespec now;
+
+        ret = m2sdr_get_ptp_status(conn, &status);
+        if (ret != 0) {
+            fprintf(stderr, "Failed to read PTP status: %s\n", m2sdr_strerror(ret));
+            break;
+        }
+        if (with_clock10) {
+            ret = m2sdr_get_ptp_clock10_status(conn, &clock10);
+            if (ret != 0) {
+                fprintf(stderr, "Failed to read PTP clk10 status: %s\n", m2sdr_strerror(ret));
+                break;
+            }
+        }
+        clock_gettime(CLOCK_REALTIME, &now);
+
+        printf("{\"sample\":%" PRIu64, sample++);
+        printf(",\"host_time_ns\":%" PRIu64, (uint64_t)now.tv_sec * UINT64_C(1000000000) + (uint64_t)now.tv_nsec);
+        printf(",");
+        ptp_print_status_json_fields(&status, now.tv_sec);
+        if (with_clock10) {
+            printf(",\"clock10\":{");
+            ptp_clock10_print_status_json_fields(&clock10, now.tv_sec);
+            printf("}");
+        }
+        printf("}\n");
+        fflush(stdout);
+
+        /* Fixed-rate schedule; skip missed slots instead of bursting to catch up. */
+        next += interval;
+        if ((duration > 0) && (next - start >= duration))
+            break;
+        if (next < monotonic_seconds())
+            next = monotonic_seconds();
+        sleep_seconds(next - monotonic_seconds());
+    }
+
+    m2sdr_close_dev(conn);
+    if (ret != 0)
+        exit(1);
+}
+
+static void ptp_history(int duration, double interval, bool clear)
+{
+    struct m2sdr_dev *conn = m2sdr_open_dev();
+    struct m2sdr_ptp_history_entry entries[256];
+    double start;
+    double next;
+    uint32_t last_dropped = 0;
+    uint16_t expected = 0;
+    bool have_sequence = false;
+    int ret = 0;
+
+    if (clear) {
+        ret = m2sdr_clear_ptp_history(conn);
+        if (ret != 0)
+            ptp_fail_and_close(conn, "Failed to clear PTP history: %s\n", m2sdr_strerror(ret));
+    }
+
+    /* The hardware FIFO records every discipline update; drain it on a relaxed schedule and
+     * emit one JSON line per update. Drops (FIFO full) show up as sequence gaps. */
+    keep_running = 1;
+    signal(SIGINT, intHandler);
+
+    start = monotonic_seconds();
+    next  = start;
+    while (keep_running) {
+        size_t count = 0;
+        uint32_t dropped = 0;
+
+        do {
+            ret = m2sdr_read_ptp_history(conn, entries, sizeof(entries) / sizeof(entries[0]), &count, &dropped);
+            if (ret != 0) {
+                fprintf(stderr, "Failed to read PTP history: %s\n", m2sdr_strerror(ret));
+                break;
+            }
+            for (size_t i = 0; i < count; i++) {
+                const struct m2sdr_ptp_history_entry *e = &entries[i];
+
+                if (have_sequence && (e->sequence != expected))
+                    fprintf(stderr, "PTP history gap: %u update(s) dropped\n", (uint16_t)(e->sequence - expected));
+                expected      = (uint16_t)(e->sequence + 1);
+                have_sequence = true;
+                printf("{\"sequence\":%u,\"local_time_ns\":%" PRIu64 ",\"error_ns\":%" PRId64
+                       ",\"time_inc\":%u,\"state\":\"%s\",\"time_locked\":%s,\"holdover\":%s"
+                       ",\"ptp_locked\":%s,\"rejected\":%s,\"coarse_step\":%s,\"phase_step\":%s}\n",
+                       e->sequence, e->local_time_ns, e->error_ns, e->time_inc, ptp_state_name(e->state),
+                       e->time_locked ? "true" : "false", e->holdover ? "true" : "false",
+                       e->ptp_locked ? "true" : "false", e->rejected ? "true" : "false",
+                       e->coarse_step ? "true" : "false", e->phase_step ? "true" : "false");
+            }
+        } while (count == sizeof(entries) / sizeof(entries[0]));
+        if (ret != 0)
+            break;
+        if (dropped != last_dropped)
+            fprintf(stderr, "PTP history dropped counter: %u\n", dropped);
+        last_dropped = dropped;
+        fflush(stdout);
+
+        next += interval;
+        if ((duration > 0) && (next - start >= duration))
+            break;
+        if (next < monotonic_seconds())
+            next = monotonic_seconds();
+        sleep_seconds(next - monotonic_seconds());
+    }
+
+    m2sdr_close_dev(conn);
+    if (ret != 0)
+        exit(1);
+}
+
 static void ptp_smoke(int duration, double interval, int64_t max_error_ns)
 {
     struct m2sdr_dev *conn = m2sdr_open_dev();
@@ -2092,6 +2232,45 @@ static const char* clk_names[N_CLKS] = {
 #endif
 };
 
+#ifdef CSR_CLK_MEASUREMENT_CLK0_FREQUENCY_ADDR
+/* Gated counters: frequency (Hz) and error (ppb) over windows timed by the board's time base. */
+static const uint32_t frequency_addrs[N_CLKS] =
+{
+    CSR_CLK_MEASUREMENT_CLK0_FREQUENCY_ADDR,
+    CSR_CLK_MEASUREMENT_CLK1_FREQUENCY_ADDR,
+    CSR_CLK_MEASUREMENT_CLK2_FREQUENCY_ADDR,
+    CSR_CLK_MEASUREMENT_CLK3_FREQUENCY_ADDR,
+    CSR_CLK_MEASUREMENT_CLK4_FREQUENCY_ADDR,
+#ifdef CSR_CLK_MEASUREMENT_CLK5_FREQUENCY_ADDR
+    CSR_CLK_MEASUREMENT_CLK5_FREQUENCY_ADDR,
+#endif
+};
+
+static const uint32_t nominal_addrs[N_CLKS] =
+{
+    CSR_CLK_MEASUREMENT_CLK0_NOMINAL_ADDR,
+    CSR_CLK_MEASUREMENT_CLK1_NOMINAL_ADDR,
+    CSR_CLK_MEASUREMENT_CLK2_NOMINAL_ADDR,
+    CSR_CLK_MEASUREMENT_CLK3_NOMINAL_ADDR,
+    CSR_CLK_MEASUREMENT_CLK4_NOMINAL_ADDR,
+#ifdef CSR_CLK_MEASUREMENT_CLK5_NOMINAL_ADDR
+    CSR_CLK_MEASUREMENT_CLK5_NOMINAL_ADDR,
+#endif
+};
+
+static const uint32_t error_addrs[N_CLKS] =
+{
+    CSR_CLK_MEASUREMENT_CLK0_ERROR_ADDR,
+    CSR_CLK_MEASUREMENT_CLK1_ERROR_ADDR,
+    CSR_CLK_MEASUREMENT_CLK2_ERROR_ADDR,
+    CSR_CLK_MEASUREMENT_CLK3_ERROR_ADDR,
+    CSR_CLK_MEASUREMENT_CLK4_ERROR_ADDR,
+#ifdef CSR_CLK_MEASUREMENT_CLK5_ERROR_ADDR
+    CSR_CLK_MEASUREMENT_CLK5_ERROR_ADDR,
+#endif
+};
+#endif
+
 static uint64_t read_64bit_register(void *conn, uint32_t addr)
 {
     uint32_t lower = m2sdr_read32(conn, addr + 4);
@@ -2113,17 +2292,11 @@ static void read_all_clocks(void *conn, uint64_t *values)
     }
 }
 
-static void clk_test(int num_measurements, int delay_between_tests)
+static void clk_test_header(void)
 {
-    struct m2sdr_dev *conn = m2sdr_open_dev();
-
     printf("\e[1m[> Clk Measurement Test:\e[0m\n");
     printf("-------------------------\n");
 
-    uint64_t previous_values[N_CLKS], current_values[N_CLKS];
-    struct timespec start_time, current_time;
-    double elapsed_time;
-
     printf("\e[1m%-8s", "Meas.");
     for (int i = 0; i < N_CLKS; i++) {
         printf("  %-15s", clk_names[i]);
@@ -2134,6 +2307,56 @@ static void clk_test(int num_measurements, int delay_between_tests)
         printf("  ---------------");
     }
     printf("\n");
+}
+
+#ifdef CSR_CLK_MEASUREMENT_CLK0_FREQUENCY_ADDR
+/* Gated windows only publish once complete (e.g. never with a PPS gate and no PPS): fall back to
+ * host timing until the Sys Clk frequency is known. */
+static bool clk_test_gated_available(void)
+{
+    struct m2sdr_dev *conn = m2sdr_open_dev();
+    uint32_t frequency = m2sdr_read32(conn, frequency_addrs[0]);
+
+    m2sdr_close_dev(conn);
+    return frequency != 0;
+}
+
+/* Gated gateware: the frequency is computed in hardware, free of host timing error. */
+static void clk_test_gated(int num_measurements, int delay_between_tests)
+{
+    struct m2sdr_dev *conn = m2sdr_open_dev();
+
+    clk_test_header();
+
+    for (int i = 0; i < num_measurements; i++) {
+        sleep(delay_between_tests);
+
+        printf("%-8d", i + 1);
+        for (int clk_index = 0; clk_index < N_CLKS; clk_index++)
+            printf("  %15.6f", m2sdr_read32(conn, frequency_addrs[clk_index]) / 1e6);
+        printf("\n%-8s", "  (ppm)");
+        for (int clk_index = 0; clk_index < N_CLKS; clk_index++) {
+            if (m2sdr_read32(conn, nominal_addrs[clk_index]) == 0)
+                printf("  %15s", "-");
+            else
+                printf("  %+15.3f", (int32_t)m2sdr_read32(conn, error_addrs[clk_index]) / 1e3);
+        }
+        printf("\n");
+    }
+
+    m2sdr_close_dev(conn);
+}
+#endif
+
+static void clk_test(int num_measurements, int delay_between_tests)
+{
+    struct m2sdr_dev *conn = m2sdr_open_dev();
+
+    uint64_t previous_values[N_CLKS], current_values[N_CLKS];
+    struct timespec start_time, current_time;
+    double elapsed_time;
+
+    clk_test_header();
 
     latch_all_clocks(conn);
     read_all_clocks(conn, previous_values);
@@ -4061,6 +4284,110 @@ static int agc_counter_clear(enum m2sdr_agc_detector detector)
     return 0;
 }
 
+/* Event Timestamper */
+/*-------------------*/
+
+static const char *event_channel_names[] = {
+    [M2SDR_EVENT_PPS_GEN] = "pps_gen",
+    [M2SDR_EVENT_SYNC_IN] = "sync_in",
+    [M2SDR_EVENT_CLK10]   = "clk10",
+    [M2SDR_EVENT_GPIO0]   = "gpio0",
+    [M2SDR_EVENT_GPIO1]   = "gpio1",
+};
+
+static const char *event_channel_name(unsigned channel)
+{
+    if (channel < sizeof(event_channel_names) / sizeof(event_channel_names[0]))
+        return event_channel_names[channel];
+    return "unknown";
+}
+
+/* Parse CHANNEL[:rising|falling|both] into the per-channel edge enable masks. */
+static bool parse_event_spec(const char *text, uint32_t *rising_mask, uint32_t *falling_mask)
+{
+    const char *edge = strchr(text, ':');
+    size_t len = edge ? (size_t)(edge - text) : strlen(text);
+
+    for (unsigned i = 0; i < sizeof(event_channel_names) / sizeof(event_channel_names[0]); i++) {
+        if (strlen(event_channel_names[i]) != len || strncmp(text, event_channel_names[i], len))
+            continue;
+        if (!edge || !strcmp(edge + 1, "rising") || !strcmp(edge + 1, "both"))
+            *rising_mask |= 1u << i;
+        if (edge && (!strcmp(edge + 1, "falling") || !strcmp(edge + 1, "both")))
+            *falling_mask |= 1u << i;
+        return !edge || !strcmp(edge + 1, "rising") || !strcmp(edge + 1, "falling") ||
+               !strcmp(edge + 1, "both");
+    }
+    return false;
+}
+
+static void events_stream(int duration, double interval, uint32_t rising_mask, uint32_t falling_mask)
+{
+    struct m2sdr_dev *conn = m2sdr_open_dev();
+    struct m2sdr_event_timestamp events[256];
+    double start;
+    double next;
+    uint32_t last_dropped = 0;
+    int ret = 0;
+
+    ret = m2sdr_config_event_timestamper(conn, false, rising_mask, falling_mask);
+    if (ret == 0)
+        ret = m2sdr_clear_event_timestamps(conn);
+    if (ret == 0)
+        ret = m2sdr_config_event_timestamper(conn, true, rising_mask, falling_mask);
+    if (ret != 0) {
+        fprintf(stderr, "Failed to configure event timestamper: %s\n", m2sdr_strerror(ret));
+        m2sdr_close_dev(conn);
+        exit(1);
+    }
+
+    /* Edges are timestamped in hardware; drain the FIFO on a relaxed schedule and emit one JSON
+     * line per edge. */
+    keep_running = 1;
+    signal(SIGINT, intHandler);
+
+    start = monotonic_seconds();
+    next  = start;
+    while (keep_running) {
+        size_t count = 0;
+        uint32_t dropped = 0;
+
+        do {
+            ret = m2sdr_read_event_timestamps(conn, events, sizeof(events) / sizeof(events[0]), &count, &dropped);
+            if (ret != 0) {
+                fprintf(stderr, "Failed to read event timestamps: %s\n", m2sdr_strerror(ret));
+                break;
+            }
+            for (size_t i = 0; i < count; i++) {
+                const struct m2sdr_event_timestamp *e = &events[i];
+
+                printf("{\"channel\":\"%s\",\"edge\":\"%s\",\"time_ns\":%" PRIu64
+                       ",\"fine_ps\":%u,\"lost\":%s}\n",
+                       event_channel_name(e->channel), e->rising ? "rising" : "falling",
+                       e->time_ns, e->fine_ps, e->lost ? "true" : "false");
+            }
+        } while (count == sizeof(events) / sizeof(events[0]));
+        if (ret != 0)
+            break;
+        if (dropped != last_dropped)
+            fprintf(stderr, "Event timestamper dropped counter: %u\n", dropped);
+        last_dropped = dropped;
+        fflush(stdout);
+
+        next += interval;
+        if ((duration > 0) && (next - start >= duration))
+            break;
+        if (next < monotonic_seconds())
+            next = monotonic_seconds();
+        sleep_seconds(next - monotonic_seconds());
+    }
+
+    m2sdr_config_event_timestamper(conn, false, rising_mask, falling_mask);
+    m2sdr_close_dev(conn);
+    if (ret != 0)
+        exit(1);
+}
+
 /* Help */
 /*------*/
 
@@ -4110,12 +4437,19 @@ static void help(void)
            "      Configure an AGC counter threshold and clear it. DETECTOR: rx1_low, rx1_high, rx2_low, rx2_high.\n"
            "  agc-clear [DETECTOR|all]\n"
            "      Clear one or all FPGA AGC saturation counters.\n"
+           "  events [CHANNEL[:rising|falling|both]...] [--duration SEC] [--watch-interval SEC]\n"
+           "      Stream hardware edge timestamps as JSON lines (default: pps_gen rising).\n"
+           "      CHANNEL: pps_gen (internal PPS), sync_in (SYNCDBG/external PPS), clk10, gpio0, gpio1.\n"
            "\n"
            "ptp commands:\n"
            "  ptp-status\n"
            "      Show Ethernet PTP lock, identity, and board-time discipline status.\n"
            "  ptp-status --json\n"
            "      Emit one machine-readable JSON status object.\n"
+           "  ptp-stream [clock10] [--duration SEC] [--watch-interval SEC]\n"
+           "      Stream PTP (and clk10) status as JSON lines over one connection (duration 0: until Ctrl-C).\n"
+           "  ptp-history [clear] [--duration SEC] [--watch-interval SEC]\n"
+           "      Drain the hardware discipline history FIFO as JSON lines, one per servo update.\n"
            "  ptp-smoke [--duration SEC] [--watch-interval SEC] [--max-error-ns NS]\n"
            "      Poll PTP lock/error state and fail if the board is not disciplined.\n"
            "  ptp-config\n"
@@ -4391,6 +4725,32 @@ int main(int argc, char **argv)
     /* PTP cmds. */
     else if (cmd_is(cmd, "ptp_status", "ptp-status"))
         ptp_status(ptp_watch, ptp_watch_interval, ptp_json);
+    else if (cmd_is(cmd, "ptp_stream", "ptp-stream")) {
+        bool with_clock10 = false;
+
+        if (optind < argc) {
+            if (strcmp(argv[optind], "clock10") != 0)
+                goto show_help;
+            with_clock10 = true;
+            optind++;
+        }
+        if (optind < argc)
+            goto show_help;
+        ptp_stream(test_duration, ptp_watch_interval, with_clock10);
+    }
+    else if (cmd_is(cmd, "ptp_history", "ptp-history")) {
+        bool clear = false;
+
+        if (optind < argc) {
+            if (strcmp(argv[optind], "clear") != 0)
+                goto show_help;
+            clear = true;
+            optind++;
+        }
+        if (optind < argc)
+            goto show_help;
+        ptp_history(test_duration, ptp_watch_interval, clear);
+    }
     else if (cmd_is(cmd, "ptp_smoke", "ptp-smoke"))
         ptp_smoke(test_duration, ptp_watch_interval, ptp_max_error_ns);
     else if (cmd_is(cmd, "ptp_config", "ptp-config")) {
@@ -4448,6 +4808,20 @@ int main(int argc, char **argv)
             exit(1);
         test_reg_read(offset);
     }
+    else if (cmd_is(cmd, "events", NULL)) {
+        uint32_t rising_mask  = 0;
+        uint32_t falling_mask = 0;
+
+        while (optind < argc) {
+            if (!parse_event_spec(argv[optind++], &rising_mask, &falling_mask)) {
+                fprintf(stderr, "Invalid event channel (expected pps_gen, sync_in, clk10, gpio0 or gpio1 with optional :rising, :falling or :both)\n");
+                exit(1);
+            }
+        }
+        if (!rising_mask && !falling_mask)
+            rising_mask = 1u << M2SDR_EVENT_PPS_GEN;
+        events_stream(test_duration, ptp_watch_interval, rising_mask, falling_mask);
+    }
     else if (cmd_is(cmd, "agc_status", "agc-status")) {
         if (optind < argc)
             goto show_help;
@@ -4520,7 +4894,12 @@ int main(int argc, char **argv)
                 exit(1);
         }
 
-        clk_test(num_measurements, delay_between_tests);
+#ifdef CSR_CLK_MEASUREMENT_CLK0_FREQUENCY_ADDR
+        if (clk_test_gated_available())
+            clk_test_gated(num_measurements, delay_between_tests);
+        else
+#endif
+            clk_test(num_measurements, delay_between_tests);
     }
 
 #ifdef CSR_LEDS_BASE
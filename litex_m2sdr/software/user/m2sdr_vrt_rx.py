@@ -8,11 +8,43 @@
 
 import argparse
 import ipaddress
+import json
+import os
 import socket
 import struct
 import sys
 import time
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+VRT_PACKET_TYPE_SIGNAL  = 0x1
+VRT_PACKET_TYPE_CONTEXT = 0x4
+
+VRT_SIGNAL_HEADER_BYTES     = 20
+VRT_CLASS_ID_BYTES          = 8
+VRT_TRAILER_BYTES           = 4
+VRT_SIGNAL_HEADER_MAX_BYTES = VRT_SIGNAL_HEADER_BYTES + VRT_CLASS_ID_BYTES
+
+# Trailer enable/indicator bits (indicator = enable - 12).
+VRT_TRAILER_VALID_DATA_ENABLE    = 1 << 30
+VRT_TRAILER_OVER_RANGE_ENABLE    = 1 << 25
+VRT_TRAILER_VALID_DATA_INDICATOR = 1 << 18
+VRT_TRAILER_OVER_RANGE_INDICATOR = 1 << 13
+
+
+def decode_vrt_trailer(trailer):
+    """Return (valid_data, over_range) from a trailer word, None for indicators not enabled."""
+    valid_data = over_range = None
+    if trailer & VRT_TRAILER_VALID_DATA_ENABLE:
+        valid_data = bool(trailer & VRT_TRAILER_VALID_DATA_INDICATOR)
+    if trailer & VRT_TRAILER_OVER_RANGE_ENABLE:
+        over_range = bool(trailer & VRT_TRAILER_OVER_RANGE_INDICATOR)
+    return valid_data, over_range
+
 
 def parse_vrt_signal_packet(pkt: bytes):
     if len(pkt) < 20:
@@ -29,9 +61,8 @@ def parse_vrt_signal_packet(pkt: bytes):
 
     if packet_type != 0x1:
         raise ValueError(f"unsupported VRT packet type {packet_type} (expected signal-data-with-stream-id=1)")
-    if c or t:
-        raise ValueError("class-id/trailer VRT packets not supported by this utility")
-    if packet_words < 5:
+    header_bytes = VRT_SIGNAL_HEADER_BYTES + c * VRT_CLASS_ID_BYTES
+    if packet_words * 4 < header_bytes + t * VRT_TRAILER_BYTES:
         raise ValueError("invalid VRT packet size")
 
     expected_len = packet_words * 4
@@ -39,9 +70,18 @@ def parse_vrt_signal_packet(pkt: bytes):
         raise ValueError(f"truncated VRT packet ({len(pkt)} < {expected_len})")
 
     stream_id = struct.unpack(">I", pkt[4:8])[0]
-    timestamp_int = struct.unpack(">I", pkt[8:12])[0]
-    timestamp_fra = struct.unpack(">Q", pkt[12:20])[0]
-    payload = pkt[20:expected_len]
+    class_oui = class_icc = class_pcc = None
+    if c:
+        class_oui = struct.unpack(">I", pkt[8:12])[0] & 0xFFFFFF
+        class_icc, class_pcc = struct.unpack(">HH", pkt[12:16])
+    offset = header_bytes - 12
+    timestamp_int = struct.unpack(">I", pkt[offset:offset + 4])[0]
+    timestamp_fra = struct.unpack(">Q", pkt[offset + 4:offset + 12])[0]
+    trailer = valid_data = over_range = None
+    if t:
+        trailer = struct.unpack(">I", pkt[expected_len - 4:expected_len])[0]
+        valid_data, over_range = decode_vrt_trailer(trailer)
+    payload = pkt[header_bytes:expected_len - t * VRT_TRAILER_BYTES]
 
     return {
         "packet_type": packet_type,
@@ -50,27 +90,990 @@ def parse_vrt_signal_packet(pkt: bytes):
         "packet_count": packet_count,
         "packet_words": packet_words,
         "stream_id": stream_id,
+        "class_oui": class_oui,
+        "class_icc": class_icc,
+        "class_pcc": class_pcc,
         "timestamp_int": timestamp_int,
         "timestamp_fra": timestamp_fra,
+        "trailer": trailer,
+        "valid_data": valid_data,
+        "over_range": over_range,
         "payload": payload,
     }
 
 
-def main():
-    p = argparse.ArgumentParser(description="Receive and decode LiteX-M2SDR VRT RX packets")
-    p.add_argument("--bind-ip", default="0.0.0.0", help="Local bind IP")
-    p.add_argument("--port", type=int, default=4991, help="UDP port")
-    p.add_argument("--group", default=None, help="Optional multicast group to join (e.g. 239.168.1.100)")
-    p.add_argument("--iface-ip", default="0.0.0.0", help="Local interface IP for multicast join")
-    p.add_argument("--count", type=int, default=0, help="Stop after N packets (0 = forever)")
-    p.add_argument("--hexdump-bytes", type=int, default=0, help="Show first N payload bytes as hex")
-    p.add_argument("--payload-out", default=None, help="Append raw payload bytes to file")
-    p.add_argument("--channels", type=int, default=2, choices=[1, 2], help="Expected Soapy channel count for sample estimate")
-    p.add_argument("--bytes-per-complex", type=int, default=2, choices=[2, 4], help="Expected bytes per complex sample per channel (8-bit=2, 16-bit=4)")
-    args = p.parse_args()
+# Bulk Parsing -------------------------------------------------------------------------------------
+
+def vrt_signal_header_dtype():
+    # Big-endian, packed: matches the 5-word signal-data-with-stream-ID header byte for byte.
+    return np.dtype([
+        ("common",        ">u4"),
+        ("stream_id",     ">u4"),
+        ("timestamp_int", ">u4"),
+        ("timestamp_fra", ">u8"),
+    ])
+
+
+def vrt_signal_class_header_dtype():
+    # Same header with the 2-word Class ID between Stream ID and timestamps (C=1).
+    return np.dtype([
+        ("common",        ">u4"),
+        ("stream_id",     ">u4"),
+        ("class_oui",     ">u4"),
+        ("class_icc",     ">u2"),
+        ("class_pcc",     ">u2"),
+        ("timestamp_int", ">u4"),
+        ("timestamp_fra", ">u8"),
+    ])
+
+
+def parse_vrt_signal_headers(ring, lengths):
+    """Decode the headers of a batch of packets held in the rows of a 2-D uint8 ring.
+
+    Returns a dict of NumPy arrays (one entry per packet) plus a `valid` mask applying the same
+    checks as parse_vrt_signal_packet (`context` marks IF-Context packets, decoded separately
+    by VRTContextTable). Packets with and without Class ID/trailer can be mixed:
+    `header_bytes`/`payload_bytes` locate each payload, `trailer` is 0 when absent. Header
+    fields are read through views aliasing the ring, no packet bytes are copied.
+    """
+    count   = len(lengths)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    headers = ring[:count, :VRT_SIGNAL_HEADER_BYTES].view(vrt_signal_header_dtype())[:, 0]
+    common  = headers["common"].astype(np.uint32)
+
+    packet_type  = (common >> 28) & 0xF
+    c            = (common >> 27) & 0x1
+    t            = (common >> 26) & 0x1
+    packet_words = (common & 0xFFFF).astype(np.int64)
+    header_bytes = VRT_SIGNAL_HEADER_BYTES + c.astype(np.int64) * VRT_CLASS_ID_BYTES
+    packet_bytes = packet_words * 4
+
+    valid  = lengths >= VRT_SIGNAL_HEADER_BYTES
+    valid &= packet_type == VRT_PACKET_TYPE_SIGNAL
+    valid &= packet_bytes >= header_bytes + t * VRT_TRAILER_BYTES
+    valid &= lengths >= packet_bytes
+
+    timestamp_int = headers["timestamp_int"].astype(np.uint32)
+    timestamp_fra = headers["timestamp_fra"].astype(np.uint64)
+    class_oui     = np.zeros(count, dtype=np.uint32)
+    class_icc     = np.zeros(count, dtype=np.uint16)
+    class_pcc     = np.zeros(count, dtype=np.uint16)
+    if c.any() and ring.shape[1] >= VRT_SIGNAL_HEADER_MAX_BYTES:
+        classed = ring[:count, :VRT_SIGNAL_HEADER_MAX_BYTES].view(vrt_signal_class_header_dtype())[:, 0]
+        sel = c == 1
+        timestamp_int[sel] = classed["timestamp_int"][sel]
+        timestamp_fra[sel] = classed["timestamp_fra"][sel]
+        class_oui[sel]     = classed["class_oui"][sel] & 0xFFFFFF
+        class_icc[sel]     = classed["class_icc"][sel]
+        class_pcc[sel]     = classed["class_pcc"][sel]
+    else:
+        valid &= c == 0
+
+    trailer = np.zeros(count, dtype=np.uint32)
+    for i in np.flatnonzero(valid & (t == 1)):
+        end = int(packet_bytes[i])
+        trailer[i] = int.from_bytes(ring[i, end - 4:end].tobytes(), "big")
+
+    return {
+        "packet_type":   packet_type,
+        "context":       (packet_type == VRT_PACKET_TYPE_CONTEXT) & (lengths >= packet_bytes),
+        "tsi_type":      (common >> 22) & 0x3,
+        "tsf_type":      (common >> 20) & 0x3,
+        "packet_count":  (common >> 16) & 0xF,
+        "packet_words":  packet_words,
+        "header_bytes":  header_bytes,
+        "payload_bytes": packet_bytes - header_bytes - t * VRT_TRAILER_BYTES,
+        "stream_id":     headers["stream_id"],
+        "class_oui":     class_oui,
+        "class_icc":     class_icc,
+        "class_pcc":     class_pcc,
+        "timestamp_int": timestamp_int,
+        "timestamp_fra": timestamp_fra,
+        "trailer":       trailer,
+        "valid":         valid,
+    }
+
+
+def vrt_payload(view, headers, i):
+    """Return the payload of packet `i` of a parsed batch (excludes Class ID and trailer words)."""
+    start = int(headers["header_bytes"][i])
+    return view[start:start + int(headers["payload_bytes"][i])]
+
+
+# Context Packets ----------------------------------------------------------------------------------
+
+# IF-Context CIF0 fields up to the Data Packet Payload Format: (indicator bit, name, 32-bit words),
+# in packet order. Fields after it (GPS/INS/ephemeris/lists) are not decoded.
+VRT_CIF0_CHANGE = 1 << 31
+VRT_CIF0_FIELDS = [
+    (30, "reference_point",            1),
+    (29, "bandwidth",                  2),
+    (28, "if_ref_freq",                2),
+    (27, "rf_freq",                    2),
+    (26, "rf_freq_offset",             2),
+    (25, "if_band_offset",             2),
+    (24, "reference_level",            1),
+    (23, "gain",                       1),
+    (22, "over_range_count",           1),
+    (21, "sample_rate",                2),
+    (20, "timestamp_adjustment",       2),
+    (19, "timestamp_calibration_time", 1),
+    (18, "temperature",                1),
+    (17, "device_id",                  2),
+    (16, "state_event",                1),
+    (15, "payload_format",             2),
+]
+
+
+def _fixed_point(value, bits, radix):
+    if value & (1 << (bits - 1)):
+        value -= 1 << bits
+    return value / (1 << radix)
+
+
+def parse_vrt_context_packet(pkt: bytes):
+    """Decode an IF-Context packet (frequencies/rates in Hz, gains in dB, None when absent)."""
+    if len(pkt) < 8:
+        raise ValueError("packet too short for VRT context header")
+
+    common = struct.unpack(">I", pkt[0:4])[0]
+    packet_type  = (common >> 28) & 0xF
+    c            = (common >> 27) & 0x1
+    tsi_type     = (common >> 22) & 0x3
+    tsf_type     = (common >> 20) & 0x3
+    packet_words = common & 0xFFFF
+    if packet_type != VRT_PACKET_TYPE_CONTEXT:
+        raise ValueError(f"unsupported VRT packet type {packet_type} (expected context=4)")
+    if len(pkt) < packet_words * 4:
+        raise ValueError(f"truncated VRT packet ({len(pkt)} < {packet_words * 4})")
+
+    words  = struct.unpack(f">{packet_words}I", pkt[:packet_words * 4])
+    offset = 2 + 2 * c
+    timestamp_int = timestamp_fra = None
+    if tsi_type:
+        timestamp_int = words[offset]
+        offset += 1
+    if tsf_type:
+        timestamp_fra = (words[offset] << 32) | words[offset + 1]
+        offset += 2
+    if offset >= packet_words:
+        raise ValueError("VRT context packet without CIF0")
+    cif0    = words[offset]
+    offset += 1
+
+    fields = {}
+    for bit, name, size in VRT_CIF0_FIELDS:
+        if cif0 & (1 << bit):
+            if offset + size > packet_words:
+                raise ValueError(f"VRT context packet truncated in {name} field")
+            value = 0
+            for word in words[offset:offset + size]:
+                value = (value << 32) | word
+            fields[name] = value
+            offset += size
+
+    ctx = {
+        "packet_count"      : (common >> 16) & 0xF,
+        "stream_id"         : words[1],
+        "tsi_type"          : tsi_type,
+        "tsf_type"          : tsf_type,
+        "timestamp_int"     : timestamp_int,
+        "timestamp_fra"     : timestamp_fra,
+        "change"            : bool(cif0 & VRT_CIF0_CHANGE),
+        "cif0"              : cif0,
+        "bandwidth"         : None,
+        "rf_freq"           : None,
+        "gain"              : None,
+        "sample_rate"       : None,
+        "item_bits"         : None,
+        "channels"          : None,
+        "bytes_per_complex" : None,
+    }
+    for name in ["bandwidth", "rf_freq", "sample_rate"]:
+        if name in fields:
+            ctx[name] = _fixed_point(fields[name], 64, 20)
+    if "gain" in fields:
+        ctx["gain"] = (_fixed_point(fields["gain"] & 0xFFFF, 16, 7), _fixed_point(fields["gain"] >> 16, 16, 7))
+    if "payload_format" in fields:
+        fmt_word0 = fields["payload_format"] >> 32
+        ctx["item_bits"] = (fmt_word0 & 0x3F) + 1
+        ctx["channels"]  = (fields["payload_format"] & 0xFFFF) + 1
+        if (fmt_word0 >> 29) & 0x3 == 0b01 and ctx["item_bits"] % 8 == 0:  # Complex cartesian.
+            ctx["bytes_per_complex"] = 2 * ctx["item_bits"] // 8
+    return ctx
+
+
+class VRTContextTable:
+    """Latest IF-Context of each stream, keyed like the stream (stream ID, or (addr, stream ID))."""
+    def __init__(self):
+        self.contexts = {}
+        self.latest   = None
+        self.packets  = 0
+
+    def update(self, headers, count, views, addrs=None):
+        """Decode the context packets of a parsed batch; return the keys that were updated."""
+        updated = []
+        for i in np.flatnonzero(headers["context"][:count]).tolist():
+            try:
+                ctx = parse_vrt_context_packet(bytes(views[i][:int(headers["packet_words"][i]) * 4]))
+            except ValueError:
+                continue
+            key = ctx["stream_id"] if addrs is None else (tuple(addrs[i]), ctx["stream_id"])
+            self.contexts[key] = self.latest = ctx
+            self.packets += 1
+            updated.append(key)
+        return updated
+
+    def get(self, key):
+        return self.contexts.get(key)
+
+
+def format_context(ctx):
+    items = [f"sid=0x{ctx['stream_id']:08x}"]
+    if ctx["sample_rate"] is not None:
+        items.append(f"rate={ctx['sample_rate'] / 1e6:.6f}MS/s")
+    if ctx["rf_freq"] is not None:
+        items.append(f"freq={ctx['rf_freq'] / 1e6:.6f}MHz")
+    if ctx["bandwidth"] is not None:
+        items.append(f"bw={ctx['bandwidth'] / 1e6:.3f}MHz")
+    if ctx["gain"] is not None:
+        items.append(f"gain={ctx['gain'][0]:.1f}dB")
+    if ctx["item_bits"] is not None:
+        items.append(f"format={ctx['item_bits']}bit x{ctx['channels']}")
+    if ctx["change"]:
+        items.append("changed")
+    return " ".join(items)
+
+
+def packet_count_losses(packet_counts, last_pc=None):
+    """Return (lost packets, last packet count) from a run of 4-bit VRT packet counters.
+
+    Each step of the modulo-16 counter is expected to be +1; a step of n counts n - 1 lost
+    packets. Losses of 16 or more packets in a row alias and cannot be seen from the counter.
+    """
+    packet_counts = np.asarray(packet_counts, dtype=np.int64)
+    if len(packet_counts) == 0:
+        return 0, last_pc
+    if last_pc is not None:
+        packet_counts = np.concatenate([[last_pc], packet_counts])
+    gaps = (np.diff(packet_counts) - 1) & 0xF
+    return int(gaps.sum()), int(packet_counts[-1])
+
+# Batched Receiver ---------------------------------------------------------------------------------
+
+class VRTBatchReceiver:
+    """Receive UDP datagrams into a preallocated ring of fixed-size slots.
+
+    The first datagram of a batch is awaited (with timeout), the rest of the batch is drained
+    without blocking so one call returns everything the kernel already queued, up to `batch`
+    packets.
+    """
+    def __init__(self, sock, batch=64, slot_bytes=9000):
+        self.sock    = sock
+        self.batch   = batch
+        self.ring    = np.zeros((batch, slot_bytes), dtype=np.uint8)
+        self.views   = [memoryview(self.ring[i]) for i in range(batch)]
+        self.lengths = np.zeros(batch, dtype=np.int64)
+        self.addrs   = [None] * batch
+
+    def receive(self, timeout=None):
+        self.sock.settimeout(timeout)
+        try:
+            nbytes, addr = self.sock.recvfrom_into(self.views[0])
+        except socket.timeout:
+            return 0
+        self.lengths[0] = nbytes
+        self.addrs[0]   = addr
+        count = 1
+        self.sock.settimeout(0.0)
+        while count < self.batch:
+            try:
+                nbytes, addr = self.sock.recvfrom_into(self.views[count])
+            except (BlockingIOError, InterruptedError):
+                break
+            self.lengths[count] = nbytes
+            self.addrs[count]   = addr
+            count += 1
+        return count
+
+    def packets(self, count):
+        return [self.views[i][:int(self.lengths[i])] for i in range(count)]
+
+    def payloads(self, headers, count):
+        return [
+            vrt_payload(self.views[i], headers, i)
+            for i in range(count) if headers["valid"][i]
+        ]
+
+
+def write_payloads(fd, buffers):
+    """Write all buffers with as few writev() calls as possible (handles partial writes)."""
+    buffers = [b for b in buffers if len(b)]
+    while buffers:
+        written = os.writev(fd, buffers[:1024]) # IOV_MAX.
+        while buffers and written >= len(buffers[0]):
+            written -= len(buffers[0])
+            buffers.pop(0)
+        if written:
+            buffers[0] = buffers[0][written:]
+
+# Aggregated Stats ---------------------------------------------------------------------------------
+
+class VRTRateStats:
+    """Aggregate packet/byte/loss counters and report them once per interval."""
+    def __init__(self, interval=1.0, bytes_per_sample=4, now=None):
+        self.interval         = interval
+        self.bytes_per_sample = bytes_per_sample
+        self.packets          = 0
+        self.payload_bytes    = 0
+        self.drops            = 0
+        self.lost             = 0
+        self.total_packets    = 0
+        self.total_lost       = 0
+        self.last_pc          = None
+        self.last_report      = time.monotonic() if now is None else now
+
+    def update(self, headers, count):
+        valid = headers["valid"][:count]
+        self.drops += int(count - valid.sum() - headers["context"][:count].sum())
+        if not valid.any():
+            return
+        lost, self.last_pc = packet_count_losses(headers["packet_count"][:count][valid], self.last_pc)
+        payload_bytes = int(headers["payload_bytes"][:count][valid].sum())
+        self.lost          += lost
+        self.total_lost    += lost
+        self.packets       += int(valid.sum())
+        self.total_packets += int(valid.sum())
+        self.payload_bytes += payload_bytes
+
+    def report(self, now=None):
+        now     = time.monotonic() if now is None else now
+        elapsed = now - self.last_report
+        if elapsed < self.interval:
+            return None
+        expected  = self.packets + self.lost
+        loss_rate = (self.lost / expected) if expected else 0.0
+        line = (
+            f"pkts={self.packets} rate={self.packets / elapsed:.0f} pkt/s "
+            f"payload={self.payload_bytes * 8 / elapsed / 1e6:.1f} Mb/s "
+            f"samples~{self.payload_bytes / self.bytes_per_sample / elapsed / 1e6:.3f} MS/s "
+            f"lost={self.lost} loss={100.0 * loss_rate:.3f}% drops={self.drops} "
+            f"total={self.total_packets} total_lost={self.total_lost}"
+        )
+        self.packets       = 0
+        self.payload_bytes = 0
+        self.drops         = 0
+        self.lost          = 0
+        self.last_report   = now
+        return line
+
+
+# Stream Analyzer ----------------------------------------------------------------------------------
+
+VRT_TSF_SAMPLE_COUNT = 0x1
+VRT_TSF_REAL_TIME    = 0x2
+
+
+def vrt_timestamp_ticks(tsf_type, timestamp_int, timestamp_fra):
+    """Return timestamps as int64 ticks: samples for TSF=SAMPLE_COUNT, ns for TSF=REAL_TIME."""
+    tsf_type      = np.asarray(tsf_type)
+    timestamp_int = np.asarray(timestamp_int, dtype=np.int64)
+    timestamp_fra = np.asarray(timestamp_fra, dtype=np.uint64)
+    real_time     = timestamp_int * 1_000_000_000 + (timestamp_fra // 1000).astype(np.int64)
+    return np.where(tsf_type == VRT_TSF_SAMPLE_COUNT, timestamp_fra.astype(np.int64), real_time)
+
+
+class VRTStreamAnalyzer:
+    """Track loss, reorders and timestamp continuity of one VRT signal stream.
+
+    Packets are fed in batches of NumPy arrays (packet counts, timestamp ticks, payload bytes).
+    Every packet is expected `period` ticks after the previous one, where the period follows from
+    the samples per packet (RFICDataPacketizer data_words) and the sample rate; when it is not
+    given it is learned from the first packets with a +1 packet-count step. Timestamps are then
+    used to count losses beyond the 16-packet alias of the 4-bit packet counter, and the residual
+    of each timestamp step against the expected period feeds a jitter histogram. A timestamp step
+    disagreeing with the packet counter is reported as a timestamp jump and the counter is trusted.
+    """
+    def __init__(self, period=None, jitter_bin=100, jitter_bins=32):
+        self.period      = period
+        self.jitter_bin  = jitter_bin
+        self.jitter_bins = jitter_bins
+        self.last_pc     = None
+        self.last_ts     = None
+        self.total       = self._counters()
+        self.window      = self._counters()
+
+    def _counters(self):
+        return {
+            "packets"         : 0,
+            "lost"            : 0,
+            "reordered"       : 0,
+            "duplicates"      : 0,
+            "timestamp_jumps" : 0,
+            "max_gap"         : 0,
+            "payload_bytes"   : 0,
+            "jitter_min"      : None,
+            "jitter_max"      : None,
+            "jitter_sq_sum"   : 0.0,
+            "jitter_count"    : 0,
+            "jitter_hist"     : np.zeros(2 * self.jitter_bins + 1, dtype=np.int64),
+        }
+
+    def _learn_period(self, pc, ts):
+        steps = np.diff(ts)[((np.diff(pc) & 0xF) == 1) & (np.diff(ts) > 0)]
+        if len(steps):
+            self.period = float(np.median(steps))
+
+    def _accumulate(self, counters, lost, reordered, duplicates, jumps, max_gap, residuals, payload_bytes, packets):
+        counters["packets"]         += packets
+        counters["lost"]            += lost
+        counters["reordered"]       += reordered
+        counters["duplicates"]      += duplicates
+        counters["timestamp_jumps"] += jumps
+        counters["max_gap"]          = max(counters["max_gap"], max_gap)
+        counters["payload_bytes"]   += payload_bytes
+        if len(residuals):
+            rmin, rmax = float(residuals.min()), float(residuals.max())
+            counters["jitter_min"]     = rmin if counters["jitter_min"] is None else min(counters["jitter_min"], rmin)
+            counters["jitter_max"]     = rmax if counters["jitter_max"] is None else max(counters["jitter_max"], rmax)
+            counters["jitter_sq_sum"] += float(np.sum(residuals * residuals))
+            counters["jitter_count"]  += len(residuals)
+            bins = np.clip(np.rint(residuals / self.jitter_bin), -self.jitter_bins, self.jitter_bins).astype(np.int64)
+            counters["jitter_hist"]   += np.bincount(bins + self.jitter_bins, minlength=2 * self.jitter_bins + 1)
+
+    def update(self, packet_counts, timestamps, payload_bytes):
+        pc = np.asarray(packet_counts, dtype=np.int64)
+        ts = np.asarray(timestamps,    dtype=np.int64)
+        nbytes = int(np.sum(payload_bytes))
+        if len(pc) == 0:
+            return
+        if self.period is None:
+            self._learn_period(pc if self.last_pc is None else np.concatenate([[self.last_pc], pc]),
+                               ts if self.last_ts is None else np.concatenate([[self.last_ts], ts]))
+
+        if self.last_pc is None:
+            self.last_pc, self.last_ts = int(pc[0]), int(ts[0])
+            self._record(0, 0, 0, 0, 0, np.zeros(0), nbytes, 1)
+            pc, ts, nbytes = pc[1:], ts[1:], 0
+            if len(pc) == 0:
+                return
+
+        # Compare every packet against the most recent in-order packet before it: a late packet
+        # then shows up as a negative step and does not distort the steps that follow it.
+        all_pc   = np.concatenate([[self.last_pc], pc])
+        all_ts   = np.concatenate([[self.last_ts], ts])
+        in_order = ts >= np.maximum.accumulate(all_ts)[:-1]
+        ref      = np.maximum.accumulate(np.where(np.concatenate([[True], in_order]), np.arange(len(all_ts)), 0))[:-1]
+        ref_pc   = all_pc[ref]
+        ref_ts   = all_ts[ref]
+        pc_step  = (pc - ref_pc) & 0xF
+
+        reorder   = ~in_order
+        duplicate = in_order & (ts == ref_ts) & (pc_step == 0)
+        forward   = in_order & ~duplicate
+
+        if self.period:
+            ts_step = np.rint((ts - ref_ts) / self.period).astype(np.int64)
+            jump    = forward & ((ts_step & 0xF) != pc_step)
+            gaps    = np.where(jump, pc_step - 1, ts_step - 1)
+            smooth  = forward & ~jump
+            residuals = ((ts - ref_ts) - ts_step * self.period)[smooth]
+        else:
+            jump      = np.zeros(len(pc), dtype=bool)
+            gaps      = pc_step - 1
+            residuals = np.zeros(0)
+
+        gaps      = np.where(forward, np.maximum(gaps, 0), 0)
+        reordered = int(reorder.sum())
+        # A late packet was already counted as lost when the packet after the hole arrived.
+        lost      = int(gaps.sum()) - reordered
+        max_gap   = int(gaps.max())
+
+        self._record(lost, reordered, int(duplicate.sum()), int(jump.sum()), max_gap, residuals, nbytes, len(pc))
+
+        last = np.flatnonzero(in_order)
+        if len(last):
+            self.last_pc, self.last_ts = int(pc[last[-1]]), int(ts[last[-1]])
+
+    def _record(self, *args):
+        for counters in [self.window, self.total]:
+            self._accumulate(counters, *args)
+
+    def summary(self, counters=None):
+        c = self.total if counters is None else counters
+        expected = c["packets"] + max(c["lost"], 0) - c["duplicates"]
+        rms = (c["jitter_sq_sum"] / c["jitter_count"]) ** 0.5 if c["jitter_count"] else None
+        return {
+            "packets"         : c["packets"],
+            "lost"            : c["lost"],
+            "loss_rate"       : (max(c["lost"], 0) / expected) if expected > 0 else 0.0,
+            "max_gap"         : c["max_gap"],
+            "reordered"       : c["reordered"],
+            "duplicates"      : c["duplicates"],
+            "timestamp_jumps" : c["timestamp_jumps"],
+            "payload_bytes"   : c["payload_bytes"],
+            "period"          : self.period,
+            "jitter_min"      : c["jitter_min"],
+            "jitter_max"      : c["jitter_max"],
+            "jitter_rms"      : rms,
+            "jitter_bin"      : self.jitter_bin,
+            "jitter_hist"     : c["jitter_hist"].tolist(),
+        }
+
+    def roll(self):
+        """Return the summary of the current window and start a new one."""
+        summary = self.summary(self.window)
+        self.window = self._counters()
+        return summary
+
+
+def format_analysis(summary, prefix=""):
+    line = (
+        f"{prefix}pkts={summary['packets']} lost={summary['lost']} "
+        f"loss={100.0 * summary['loss_rate']:.4f}% max_gap={summary['max_gap']} "
+        f"reorder={summary['reordered']} dup={summary['duplicates']} "
+        f"ts_jumps={summary['timestamp_jumps']}"
+    )
+    if summary["jitter_rms"] is not None:
+        line += (
+            f" jitter[min/max/rms]={summary['jitter_min']:.0f}/{summary['jitter_max']:.0f}/"
+            f"{summary['jitter_rms']:.1f}"
+        )
+    return line
+
+
+def format_jitter_histogram(summary, width=40):
+    hist = summary["jitter_hist"]
+    bins = len(hist) // 2
+    peak = max(hist) if any(hist) else 1
+    lines = []
+    for i, count in enumerate(hist):
+        if not count:
+            continue
+        center = (i - bins) * summary["jitter_bin"]
+        edge   = "<=" if i == 0 else (">=" if i == len(hist) - 1 else "  ")
+        lines.append(f"  {edge}{center:+10.0f} | {'#' * max(1, round(width * count / peak)):<{width}} {count}")
+    return "\n".join(lines)
+
+# Offline Sources ----------------------------------------------------------------------------------
 
+def iter_vrt_packet_file(path):
+    """Yield raw VRT packets from a file of back-to-back packets (as written by --packets-out)."""
+    with open(path, "rb") as f:
+        while True:
+            common = f.read(4)
+            if len(common) < 4:
+                return
+            words = struct.unpack(">I", common)[0] & 0xFFFF
+            if words < 1:
+                raise ValueError(f"{path}: invalid VRT packet size 0")
+            body = f.read(words * 4 - 4)
+            if len(body) < words * 4 - 4:
+                return
+            yield common + body
+
+
+def iter_pcap_udp_payloads(path, port=None):
+    """Yield ((src_ip, src_port), payload) for the IPv4/UDP datagrams of a classic pcap file."""
+    with open(path, "rb") as f:
+        global_header = f.read(24)
+        if len(global_header) < 24:
+            raise ValueError(f"{path}: not a pcap file")
+        magic = global_header[:4]
+        if magic in (b"\xd4\xc3\xb2\xa1", b"\x4d\x3c\xb2\xa1"):
+            endian = "<"
+        elif magic in (b"\xa1\xb2\xc3\xd4", b"\xa1\xb2\x3c\x4d"):
+            endian = ">"
+        else:
+            raise ValueError(f"{path}: unsupported capture format (only classic pcap is supported)")
+        linktype = struct.unpack(endian + "I", global_header[20:24])[0] & 0xFFFF
+        while True:
+            record = f.read(16)
+            if len(record) < 16:
+                return
+            incl_len = struct.unpack(endian + "I", record[8:12])[0]
+            frame = f.read(incl_len)
+            if len(frame) < incl_len:
+                return
+            datagram = _pcap_udp_datagram(frame, linktype, port)
+            if datagram is not None:
+                yield datagram
+
+
+def _pcap_udp_datagram(frame, linktype, port):
+    if linktype == 1:     # Ethernet.
+        offset, ethertype = 14, struct.unpack(">H", frame[12:14])[0]
+        while ethertype in (0x8100, 0x88a8) and len(frame) >= offset + 4: # VLAN tags.
+            ethertype = struct.unpack(">H", frame[offset + 2:offset + 4])[0]
+            offset += 4
+    elif linktype == 113: # Linux cooked capture.
+        offset, ethertype = 16, struct.unpack(">H", frame[14:16])[0]
+    elif linktype in (101, 228): # Raw IPv4.
+        offset, ethertype = 0, 0x0800
+    else:
+        raise ValueError(f"unsupported pcap link type {linktype}")
+    if ethertype != 0x0800 or len(frame) < offset + 20:
+        return None
+    ihl   = (frame[offset] & 0xF) * 4
+    proto = frame[offset + 9]
+    frag  = struct.unpack(">H", frame[offset + 6:offset + 8])[0] & 0x3FFF
+    if proto != 17 or frag:
+        return None
+    udp = offset + ihl
+    src_port, dst_port, udp_len = struct.unpack(">HHH", frame[udp:udp + 6])
+    if port is not None and dst_port != port:
+        return None
+    src_ip = socket.inet_ntoa(frame[offset + 12:offset + 16])
+    return (src_ip, src_port), frame[udp + 8:udp + udp_len]
+
+
+def iter_packet_batches(packets, batch=1024, slot_bytes=9000):
+    """Group an iterable of raw packets into (ring, lengths, count) batches for bulk parsing."""
+    ring    = np.zeros((batch, slot_bytes), dtype=np.uint8)
+    lengths = np.zeros(batch, dtype=np.int64)
+    count   = 0
+    for pkt in packets:
+        n = min(len(pkt), slot_bytes)
+        ring[count, :n] = np.frombuffer(pkt, dtype=np.uint8, count=n)
+        lengths[count]  = len(pkt)
+        count += 1
+        if count == batch:
+            yield ring, lengths, count
+            count = 0
+    if count:
+        yield ring, lengths, count
+
+
+def analyze_headers(analyzer, headers, count):
+    valid = headers["valid"][:count]
+    if not valid.any():
+        return
+    ticks = vrt_timestamp_ticks(headers["tsf_type"][:count][valid],
+        headers["timestamp_int"][:count][valid], headers["timestamp_fra"][:count][valid])
+    payload_bytes = headers["payload_bytes"][:count][valid]
+    analyzer.update(headers["packet_count"][:count][valid], ticks, payload_bytes)
+
+
+def analysis_period(args, tsf_type=VRT_TSF_REAL_TIME, payload_bytes=None, context=None):
+    """Expected ticks between packets (ns or samples), None when it must be learned.
+
+    A stream context (parse_vrt_context_packet) provides the sample format and, unless given on the
+    command line, the sample rate.
+    """
+    if payload_bytes is None:
+        return None
+    channels, bytes_per_complex, sample_rate = args.channels, args.bytes_per_complex, args.sample_rate
+    if context is not None:
+        channels          = context["channels"] or channels
+        bytes_per_complex = context["bytes_per_complex"] or bytes_per_complex
+        sample_rate       = sample_rate or context["sample_rate"]
+    samples = payload_bytes / (channels * bytes_per_complex)
+    if tsf_type == VRT_TSF_SAMPLE_COUNT:
+        return samples
+    if sample_rate:
+        return samples * 1e9 / sample_rate
+    return None
+
+
+# Stream Demultiplexer -----------------------------------------------------------------------------
+
+def stream_name(key):
+    (ip, port), stream_id = key
+    return f"{ip.replace(':', '_')}_{port}_{stream_id:08x}"
+
+
+class RawFileSink:
+    """Append payloads of one stream to a raw file."""
+    def __init__(self, path):
+        self.path = path
+        self.fd   = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def write(self, buffers, timestamp=None):
+        write_payloads(self.fd, buffers)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class SigMFSink(RawFileSink):
+    """Write payloads of one stream as a SigMF recording (.sigmf-data + .sigmf-meta on close)."""
+    def __init__(self, base, datatype="ci8", sample_rate=None, num_channels=2, center_freq=None, key=None):
+        RawFileSink.__init__(self, base + ".sigmf-data")
+        self.base         = base
+        self.datatype     = datatype
+        self.sample_rate  = sample_rate
+        self.num_channels = num_channels
+        self.center_freq  = center_freq
+        self.key          = key
+        self.datetime     = None
+
+    def write(self, buffers, timestamp=None):
+        if self.datetime is None and timestamp is not None:
+            tsf_type, timestamp_int, timestamp_fra = timestamp
+            if tsf_type == VRT_TSF_REAL_TIME:
+                frac = f"{timestamp_fra // 1000:09d}"
+                self.datetime = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(timestamp_int)) + f".{frac}Z"
+        RawFileSink.write(self, buffers)
+
+    def apply_context(self, ctx):
+        """Take sample format/rate and frequency from the stream context (command line values win)."""
+        if ctx["bytes_per_complex"] in (2, 4):
+            self.datatype = "ci8" if ctx["bytes_per_complex"] == 2 else "ci16_le"
+        self.num_channels = ctx["channels"] or self.num_channels
+        self.sample_rate  = self.sample_rate or ctx["sample_rate"]
+        if self.center_freq is None:
+            self.center_freq = ctx["rf_freq"]
+
+    def close(self):
+        RawFileSink.close(self)
+        glob = {
+            "core:version"  : "1.2.6",
+            "core:datatype" : self.datatype,
+            "core:dataset"  : os.path.basename(self.base + ".sigmf-data"),
+            "core:recorder" : "m2sdr_vrt_rx",
+            "core:num_channels": self.num_channels,
+        }
+        if self.sample_rate:
+            glob["core:sample_rate"] = self.sample_rate
+        if self.key is not None:
+            (ip, port), stream_id = self.key
+            glob["m2sdr:transport"]     = "vrt"
+            glob["m2sdr:vrt_source"]    = f"{ip}:{port}"
+            glob["m2sdr:vrt_stream_id"] = stream_id
+        capture = {"core:sample_start": 0}
+        if self.center_freq is not None:
+            capture["core:frequency"] = self.center_freq
+        if self.datetime is not None:
+            capture["core:datetime"] = self.datetime
+        with open(self.base + ".sigmf-meta", "w") as f:
+            json.dump({"global": glob, "captures": [capture], "annotations": []}, f, indent=4)
+            f.write("\n")
+
+
+class RingBufferSink:
+    """Keep the most recent `capacity` payload bytes of one stream in memory."""
+    def __init__(self, capacity):
+        self.buffer = bytearray(capacity)
+        self.offset = 0
+        self.total  = 0
+
+    def write(self, buffers, timestamp=None):
+        capacity = len(self.buffer)
+        for buf in buffers:
+            self.total += len(buf)
+            buf   = memoryview(buf)[-capacity:]
+            n     = len(buf)
+            first = min(n, capacity - self.offset)
+            self.buffer[self.offset:self.offset + first] = buf[:first]
+            self.buffer[:n - first] = buf[first:]
+            self.offset = (self.offset + n) % capacity
+
+    def read(self):
+        """Return the buffered bytes, oldest first."""
+        if self.total < len(self.buffer):
+            return bytes(self.buffer[:self.offset])
+        return bytes(self.buffer[self.offset:] + self.buffer[:self.offset])
+
+    def close(self):
+        pass
+
+
+class NullSink:
+    def write(self, buffers, timestamp=None):
+        pass
+
+    def close(self):
+        pass
+
+
+class SinkFactory:
+    """Create one sink per stream key; plain attributes only so it can be sent to worker processes."""
+    def __init__(self, kind="raw", directory=".", datatype="ci8", sample_rate=None, num_channels=2,
+        center_freq=None, ring_bytes=1 << 24):
+        self.kind         = kind
+        self.directory    = directory
+        self.datatype     = datatype
+        self.sample_rate  = sample_rate
+        self.num_channels = num_channels
+        self.center_freq  = center_freq
+        self.ring_bytes   = ring_bytes
+
+    def __call__(self, key):
+        base = os.path.join(self.directory, stream_name(key))
+        if self.kind == "raw":
+            return RawFileSink(base + ".bin")
+        if self.kind == "sigmf":
+            return SigMFSink(base, self.datatype, self.sample_rate, self.num_channels, self.center_freq, key)
+        if self.kind == "ring":
+            return RingBufferSink(self.ring_bytes)
+        if self.kind == "null":
+            return NullSink()
+        raise ValueError(f"unknown sink kind {self.kind!r}")
+
+
+class StreamTable:
+    """Per-stream sinks and analyzers; lives in the process (or worker) that owns the streams."""
+    def __init__(self, factory, analyzer_factory=None):
+        self.factory          = factory
+        self.analyzer_factory = analyzer_factory
+        self.streams          = {}
+
+    def write(self, key, chunk):
+        state = self.streams.get(key)
+        if state is None:
+            state = self.streams[key] = {
+                "sink"     : self.factory(key),
+                "analyzer" : self.analyzer_factory(chunk) if self.analyzer_factory else None,
+                "packets"  : 0,
+                "bytes"    : 0,
+                "context"  : None,
+            }
+        context = chunk.get("context")
+        if context is not None and context != state["context"]:
+            state["context"] = context
+            if hasattr(state["sink"], "apply_context"):
+                state["sink"].apply_context(context)
+            if state["analyzer"] is not None:
+                state["analyzer"].period = self.analyzer_factory.period(chunk) or state["analyzer"].period
+        blob   = memoryview(chunk["payload"])
+        bounds = np.concatenate([[0], np.cumsum(chunk["lengths"])])
+        state["sink"].write([blob[bounds[i]:bounds[i + 1]] for i in range(len(chunk["lengths"]))],
+            timestamp=chunk["timestamp"])
+        if state["analyzer"] is not None:
+            state["analyzer"].update(chunk["packet_count"], chunk["ticks"], chunk["lengths"])
+        state["packets"] += len(chunk["lengths"])
+        state["bytes"]   += len(blob)
+
+    def close(self):
+        summaries = {}
+        for key, state in self.streams.items():
+            state["sink"].close()
+            summaries[key] = {
+                "packets"  : state["packets"],
+                "bytes"    : state["bytes"],
+                "analysis" : state["analyzer"].summary() if state["analyzer"] is not None else None,
+            }
+        return summaries
+
+
+class StreamAnalyzerFactory:
+    """Create a VRTStreamAnalyzer from the first chunk of a stream (picklable)."""
+    def __init__(self, channels=2, bytes_per_complex=2, sample_rate=None, jitter_bin=100.0):
+        self.channels          = channels
+        self.bytes_per_complex = bytes_per_complex
+        self.sample_rate       = sample_rate
+        self.jitter_bin        = jitter_bin
+
+    def period(self, chunk):
+        return analysis_period(self, tsf_type=chunk["timestamp"][0], payload_bytes=int(chunk["lengths"][0]),
+            context=chunk.get("context"))
+
+    def __call__(self, chunk):
+        return VRTStreamAnalyzer(period=self.period(chunk), jitter_bin=self.jitter_bin)
+
+
+def _demux_worker(queue, results, factory, analyzer_factory):
+    table = StreamTable(factory, analyzer_factory)
+    while True:
+        item = queue.get()
+        if item is None:
+            break
+        for key, chunk in item:
+            table.write(key, chunk)
+    results.put(table.close())
+
+
+class VRTDemultiplexer:
+    """Split VRT signal packets by (source address, stream ID) into per-stream sinks.
+
+    With `workers=0` the streams are handled in the calling process (and sinks such as
+    RingBufferSink stay reachable through `table`). Otherwise each new stream is pinned to one of
+    `workers` processes, in arrival order, so several boards multicasting to one host spread across
+    cores while each stream keeps its packet order. Batches are sent to workers as one payload
+    blob per stream, not per packet. IF-Context packets are decoded here and the latest context of
+    each stream travels with its chunks (SigMF metadata, analyzer period).
+    """
+    def __init__(self, factory, workers=0, analyzer_factory=None, queue_depth=64):
+        self.workers  = workers
+        self.assigned = {}
+        self.contexts = VRTContextTable()
+        if workers:
+            import multiprocessing
+            self.results = multiprocessing.Queue()
+            self.queues  = [multiprocessing.Queue(maxsize=queue_depth) for _ in range(workers)]
+            self.procs   = [
+                multiprocessing.Process(target=_demux_worker, args=(q, self.results, factory, analyzer_factory), daemon=True)
+                for q in self.queues
+            ]
+            for proc in self.procs:
+                proc.start()
+            self.table = None
+        else:
+            self.table = StreamTable(factory, analyzer_factory)
+
+    def dispatch(self, headers, count, addrs, views):
+        self.contexts.update(headers, count, views, addrs)
+        valid = np.flatnonzero(headers["valid"][:count])
+        if not len(valid):
+            return
+        groups = {}
+        stream_ids = headers["stream_id"][valid].tolist()
+        for i, stream_id in zip(valid.tolist(), stream_ids):
+            groups.setdefault((tuple(addrs[i]), stream_id), []).append(i)
+
+        ticks = vrt_timestamp_ticks(headers["tsf_type"][:count], headers["timestamp_int"][:count], headers["timestamp_fra"][:count])
+        per_worker = {}
+        for key, indexes in groups.items():
+            first = indexes[0]
+            lengths = headers["payload_bytes"][indexes]
+            chunk = {
+                "payload"      : b"".join(vrt_payload(views[i], headers, i) for i in indexes),
+                "lengths"      : lengths,
+                "packet_count" : headers["packet_count"][indexes],
+                "ticks"        : ticks[indexes],
+                "timestamp"    : (int(headers["tsf_type"][first]), int(headers["timestamp_int"][first]), int(headers["timestamp_fra"][first])),
+                "context"      : self.contexts.get(key),
+            }
+            if self.table is not None:
+                self.table.write(key, chunk)
+            else:
+                worker = self.assigned.setdefault(key, len(self.assigned) % self.workers)
+                per_worker.setdefault(worker, []).append((key, chunk))
+        for worker, items in per_worker.items():
+            self.queues[worker].put(items)
+
+    def close(self):
+        """Flush and close every sink; return {key: {packets, bytes, analysis}}."""
+        if self.table is not None:
+            return self.table.close()
+        for q in self.queues:
+            q.put(None)
+        summaries = {}
+        for _ in self.procs:
+            summaries.update(self.results.get())
+        for proc in self.procs:
+            proc.join()
+        return summaries
+
+
+def format_demux_summary(summaries):
+    lines = []
+    for key in sorted(summaries, key=stream_name):
+        summary = summaries[key]
+        line = f"{stream_name(key)}: pkts={summary['packets']} bytes={summary['bytes']}"
+        if summary["analysis"] is not None:
+            line += " " + format_analysis(summary["analysis"])
+        lines.append(line)
+    return "\n".join(lines)
+
+
+# Receive Loops ------------------------------------------------------------------------------------
+
+def open_socket(args):
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if args.rcvbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, args.rcvbuf)
     sock.bind((args.bind_ip, args.port))
 
     if args.group:
@@ -79,15 +1082,27 @@ def main():
             raise SystemExit(f"{args.group} is not multicast")
         mreq = socket.inet_aton(args.group) + socket.inet_aton(args.iface_ip)
         sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
+    return sock
+
 
+def run_verbose(sock, args):
     fout = open(args.payload_out, "ab") if args.payload_out else None
 
     try:
         seen = 0
         last_pc = None
+        context = None
         while True:
             pkt, addr = sock.recvfrom(65535)
             ts_local = time.time()
+            if len(pkt) >= 4 and (pkt[0] >> 4) == VRT_PACKET_TYPE_CONTEXT:
+                try:
+                    context = parse_vrt_context_packet(pkt)
+                except ValueError as e:
+                    print(f"[drop] {addr[0]}:{addr[1]} len={len(pkt)} err={e}", file=sys.stderr)
+                    continue
+                print(f"ctx from {addr[0]}:{addr[1]} pc={context['packet_count']:x} {format_context(context)}")
+                continue
             try:
                 v = parse_vrt_signal_packet(pkt)
             except Exception as e:
@@ -95,10 +1110,18 @@ def main():
                 continue
 
             payload = v["payload"]
-            samples = len(payload) // (args.channels * args.bytes_per_complex)
+            channels, bytes_per_complex = args.channels, args.bytes_per_complex
+            if context is not None and context["bytes_per_complex"]:
+                channels, bytes_per_complex = context["channels"], context["bytes_per_complex"]
+            samples = len(payload) // (channels * bytes_per_complex)
             ts_ns = v["timestamp_int"] * 1_000_000_000 + (v["timestamp_fra"] // 1000)
             pc_gap = None if last_pc is None else ((v["packet_count"] - last_pc) & 0xF)
             last_pc = v["packet_count"]
+            extra = ""
+            if v["class_oui"] is not None:
+                extra += f" class={v['class_oui']:06x}:{v['class_icc']:04x}:{v['class_pcc']:04x}"
+            if v["trailer"] is not None:
+                extra += f" valid={int(bool(v['valid_data']))} over_range={int(bool(v['over_range']))}"
 
             print(
                 f"pkt#{seen:06d} from {addr[0]}:{addr[1]} "
@@ -108,7 +1131,7 @@ def main():
                 f"words={v['packet_words']} payload={len(payload)}B "
                 f"samples~{samples} "
                 f"tsi={v['tsi_type']} tsf={v['tsf_type']} "
-                f"vrt_ns={ts_ns} local={ts_local:.6f}"
+                f"vrt_ns={ts_ns} local={ts_local:.6f}{extra}"
             )
 
             if args.hexdump_bytes > 0:
@@ -125,9 +1148,192 @@ def main():
     finally:
         if fout:
             fout.close()
+
+
+class AnalysisSink:
+    """Feed parsed batches to a VRTStreamAnalyzer created on the first valid packet.
+
+    When the stream carries IF-Context packets, the expected packet period follows the sample
+    rate/format they announce, also across changes.
+    """
+    def __init__(self, args):
+        self.args     = args
+        self.analyzer = None
+        self.contexts = VRTContextTable()
+        self.first    = None
+
+    def _period(self):
+        tsf_type, payload_bytes = self.first
+        return analysis_period(self.args, tsf_type=tsf_type, payload_bytes=payload_bytes, context=self.contexts.latest)
+
+    def update(self, headers, count, views=None):
+        if views is not None and self.contexts.update(headers, count, views) and self.analyzer is not None:
+            self.analyzer.period = self._period() or self.analyzer.period
+        if self.analyzer is None:
+            valid = np.flatnonzero(headers["valid"][:count])
+            if not len(valid):
+                return
+            first      = valid[0]
+            self.first = (int(headers["tsf_type"][first]), int(headers["payload_bytes"][first]))
+            self.analyzer = VRTStreamAnalyzer(period=self._period(), jitter_bin=self.args.jitter_bin)
+        analyze_headers(self.analyzer, headers, count)
+
+    def report(self, final=False):
+        if self.analyzer is None:
+            return None
+        if final:
+            summary = self.analyzer.summary()
+            if self.args.json:
+                return json.dumps(summary)
+            return format_analysis(summary, prefix="[total] ") + "\n" + format_jitter_histogram(summary)
+        summary = self.analyzer.roll()
+        return json.dumps(summary) if self.args.json else format_analysis(summary, prefix="[window] ")
+
+
+def make_demultiplexer(args):
+    os.makedirs(args.demux, exist_ok=True)
+    factory = SinkFactory(
+        kind         = args.sink,
+        directory    = args.demux,
+        datatype     = "ci8" if args.bytes_per_complex == 2 else "ci16_le",
+        sample_rate  = args.sample_rate,
+        num_channels = args.channels,
+        center_freq  = args.center_freq,
+    )
+    analyzer_factory = None
+    if args.analyze:
+        analyzer_factory = StreamAnalyzerFactory(args.channels, args.bytes_per_complex, args.sample_rate, args.jitter_bin)
+    return VRTDemultiplexer(factory, workers=args.workers, analyzer_factory=analyzer_factory)
+
+
+def run_high_rate(sock, args):
+    if np is None:
+        raise SystemExit("--high-rate/--analyze require numpy")
+
+    receiver = VRTBatchReceiver(sock, batch=args.batch, slot_bytes=args.slot_bytes)
+    stats    = VRTRateStats(interval=args.stats_interval, bytes_per_sample=args.channels * args.bytes_per_complex)
+    analysis = AnalysisSink(args) if args.analyze and not args.demux else None
+    demux    = make_demultiplexer(args) if args.demux else None
+    flags    = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+    fd       = os.open(args.payload_out, flags, 0o644) if args.payload_out else None
+    pkt_fd   = os.open(args.packets_out, flags, 0o644) if args.packets_out else None
+
+    try:
+        seen = 0
+        while True:
+            count = receiver.receive(timeout=args.stats_interval)
+            if count:
+                headers = parse_vrt_signal_headers(receiver.ring, receiver.lengths[:count])
+                stats.update(headers, count)
+                if analysis is not None:
+                    analysis.update(headers, count, receiver.views)
+                if demux is not None:
+                    demux.dispatch(headers, count, receiver.addrs, receiver.views)
+                if fd is not None:
+                    write_payloads(fd, receiver.payloads(headers, count))
+                if pkt_fd is not None:
+                    write_payloads(pkt_fd, receiver.packets(count))
+                seen += count
+            line = stats.report()
+            if line is not None:
+                print(line, flush=True)
+                if analysis is not None and analysis.analyzer is not None:
+                    print(analysis.report(), flush=True)
+            if args.count and seen >= args.count:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if fd is not None:
+            os.close(fd)
+        if pkt_fd is not None:
+            os.close(pkt_fd)
+        if analysis is not None and analysis.analyzer is not None:
+            print(analysis.report(final=True), flush=True)
+        if demux is not None:
+            print(format_demux_summary(demux.close()), flush=True)
+
+
+def run_offline(args):
+    if np is None:
+        raise SystemExit("offline analysis requires numpy")
+
+    if args.pcap:
+        packets = (pkt for _, pkt in iter_pcap_udp_payloads(args.pcap, port=args.pcap_port))
+    else:
+        packets = iter_vrt_packet_file(args.vrt_file)
+
+    analysis = AnalysisSink(args)
+    drops    = 0
+    for ring, lengths, count in iter_packet_batches(packets, batch=args.batch, slot_bytes=args.slot_bytes):
+        headers = parse_vrt_signal_headers(ring, lengths[:count])
+        drops  += int(count - headers["valid"].sum() - headers["context"].sum())
+        analysis.update(headers, count, ring)
+    if analysis.analyzer is None:
+        raise SystemExit("no valid VRT signal packets found")
+    print(analysis.report(final=True))
+    if analysis.contexts.latest is not None and not args.json:
+        print(f"context: {format_context(analysis.contexts.latest)}")
+    if drops and not args.json:
+        print(f"invalid/non-signal packets skipped: {drops}")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Receive and decode LiteX-M2SDR VRT RX packets")
+    p.add_argument("--bind-ip", default="0.0.0.0", help="Local bind IP")
+    p.add_argument("--port", type=int, default=4991, help="UDP port")
+    p.add_argument("--group", default=None, help="Optional multicast group to join (e.g. 239.168.1.100)")
+    p.add_argument("--iface-ip", default="0.0.0.0", help="Local interface IP for multicast join")
+    p.add_argument("--count", type=int, default=0, help="Stop after N packets (0 = forever)")
+    p.add_argument("--hexdump-bytes", type=int, default=0, help="Show first N payload bytes as hex")
+    p.add_argument("--payload-out", default=None, help="Append raw payload bytes to file")
+    p.add_argument("--channels", type=int, default=2, choices=[1, 2], help="Expected Soapy channel count for sample estimate")
+    p.add_argument("--bytes-per-complex", type=int, default=2, choices=[2, 4], help="Expected bytes per complex sample per channel (8-bit=2, 16-bit=4)")
+    p.add_argument("--high-rate", action="store_true", help="Batched receive/parse/write with periodic aggregated stats instead of per-packet prints (requires numpy)")
+    p.add_argument("--batch", type=int, default=64, help="High-rate mode: max packets received/parsed per batch")
+    p.add_argument("--slot-bytes", type=int, default=9000, help="High-rate mode: ring slot size (>= largest datagram, 9000 covers jumbo frames)")
+    p.add_argument("--stats-interval", type=float, default=1.0, help="High-rate mode: stats report interval in seconds")
+    p.add_argument("--rcvbuf", type=int, default=0, help="Socket receive buffer size in bytes (0 = system default)")
+    p.add_argument("--packets-out", default=None, help="High-rate mode: append whole VRT packets (headers included) to file for offline analysis")
+    p.add_argument("--analyze", action="store_true", help="Track loss/reorders/timestamp continuity (implies --high-rate, requires numpy)")
+    p.add_argument("--sample-rate", type=float, default=None, help="Analysis: RF sample rate in Hz, sets the expected TSF=REAL_TIME step (learned from the stream when omitted)")
+    p.add_argument("--jitter-bin", type=float, default=100.0, help="Analysis: jitter histogram bin width (ns for REAL_TIME, samples for SAMPLE_COUNT)")
+    p.add_argument("--json", action="store_true", help="Analysis: emit reports as JSON lines")
+    p.add_argument("--pcap", default=None, help="Analyze a classic pcap capture offline instead of receiving")
+    p.add_argument("--pcap-port", type=int, default=None, help="Offline pcap: only keep UDP datagrams to this port")
+    p.add_argument("--vrt-file", default=None, help="Analyze a --packets-out capture offline instead of receiving")
+    p.add_argument("--demux", default=None, metavar="DIR", help="Split packets by source address and stream ID into one sink per stream under DIR (implies --high-rate)")
+    p.add_argument("--sink", default="raw", choices=["raw", "sigmf", "null"], help="Demux: per-stream sink type")
+    p.add_argument("--workers", type=int, default=0, help="Demux: worker processes handling the streams (0 = in-process)")
+    p.add_argument("--center-freq", type=float, default=None, help="Demux: center frequency in Hz recorded in SigMF metadata")
+    args = p.parse_args()
+
+    if args.batch <= 0 or args.batch > 1024:
+        p.error("--batch must be in 1..1024")
+    if args.slot_bytes < VRT_SIGNAL_HEADER_MAX_BYTES:
+        p.error(f"--slot-bytes must be >= {VRT_SIGNAL_HEADER_MAX_BYTES}")
+    if args.stats_interval <= 0:
+        p.error("--stats-interval must be positive")
+    if args.jitter_bin <= 0:
+        p.error("--jitter-bin must be positive")
+    if args.pcap and args.vrt_file:
+        p.error("--pcap and --vrt-file are mutually exclusive")
+    if args.workers < 0:
+        p.error("--workers must be non-negative")
+
+    if args.pcap or args.vrt_file:
+        run_offline(args)
+        return
+
+    sock = open_socket(args)
+    try:
+        if args.high_rate or args.analyze or args.demux:
+            run_high_rate(sock, args)
+        else:
+            run_verbose(sock, args)
+    finally:
         sock.close()
 
 
 if __name__ == "__main__":
     main()
-
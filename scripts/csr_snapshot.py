@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Bulk CSR snapshots over a RemoteClient (Etherbone/PCIe bridge).
+
+Reading `bus.regs` one register at a time costs one bridge round trip per CSR. CSRSnapshot groups
+the requested registers into contiguous address ranges and reads each range with one burst
+(Etherbone read record), then splits the words back into register values. Registers are organized
+in named groups that can be disabled (e.g. closed dashboard panels) or decimated to a lower rate.
+"""
+
+import time
+
+# Constants ----------------------------------------------------------------------------------------
+
+MAX_BURST_WORDS = 255 # Etherbone read records carry an 8-bit read count.
+MAX_GAP_WORDS   = 16  # Unmapped words a burst may read through to merge two ranges.
+
+# Registers whose reads pop a hardware FIFO are marked by the gateware with a `<reg>_pop_on_read`
+# constant (csr.csv), declared next to the CSR itself.
+POP_ON_READ_SUFFIX = "_pop_on_read"
+
+# Burst Planning -----------------------------------------------------------------------------------
+
+def pop_on_read_regs(bus):
+    """Names of the registers of `bus` whose reads pop a hardware FIFO."""
+    constants = getattr(getattr(bus, "constants", None), "d", {})
+    return {name[:-len(POP_ON_READ_SUFFIX)] for name, value in constants.items()
+        if name.endswith(POP_ON_READ_SUFFIX) and value}
+
+
+def readable(reg, pop_on_read=()):
+    return reg.mode in ["rw", "ro"] and reg.name not in pop_on_read
+
+
+def plan_bursts(regs, all_regs=None, max_burst=MAX_BURST_WORDS, max_gap=MAX_GAP_WORDS, word_bytes=4, pop_on_read=()):
+    """Group registers into burst reads.
+
+    Returns a list of (addr, words, [(reg, word_offset), ...]). Two registers share a burst when the
+    words between them are unmapped (holes read back as 0) and no more than `max_gap`; a gap covering
+    any other register in `all_regs` always splits the burst, since status registers may have read
+    side effects. A register is never split across bursts, and registers named in `pop_on_read` are
+    never read.
+    """
+    regs      = sorted({reg.name: reg for reg in regs if readable(reg, pop_on_read)}.values(), key=lambda r: r.addr)
+    all_regs  = sorted(all_regs if all_regs is not None else regs, key=lambda r: r.addr)
+    occupied  = [(reg.addr, reg.addr + reg.length*word_bytes) for reg in all_regs]
+    bursts    = []
+
+    def gap_is_hole(start, end):
+        return not any(lo < end and hi > start for lo, hi in occupied)
+
+    for reg in regs:
+        if bursts:
+            addr, words, members = bursts[-1]
+            end  = addr + words*word_bytes
+            gap  = (reg.addr - end) // word_bytes
+            size = (reg.addr - addr) // word_bytes + reg.length
+            if 0 <= gap <= max_gap and size <= max_burst and gap_is_hole(end, reg.addr):
+                members.append((reg, (reg.addr - addr) // word_bytes))
+                bursts[-1] = (addr, size, members)
+                continue
+        bursts.append((reg.addr, reg.length, [(reg, 0)]))
+    return bursts
+
+
+def unpack_burst(datas, members):
+    """Rebuild register values from burst words (MSB word first, as CSRRegister.read)."""
+    values = {}
+    for reg, offset in members:
+        value = 0
+        for data in datas[offset:offset + reg.length]:
+            value = (value << reg.data_width) | data
+        values[reg.name] = value
+    return values
+
+# Filters ------------------------------------------------------------------------------------------
+
+def csr_filter_match(name, filter_str):
+    """Match a CSR name against a dashboard filter ("inc1,inc2,-exc"), like ImGui text filters."""
+    terms    = [t.strip().lower() for t in filter_str.split(",") if t.strip()]
+    includes = [t for t in terms if not t.startswith("-")]
+    excludes = [t[1:] for t in terms if t.startswith("-") and len(t) > 1]
+    name     = name.lower()
+    if any(t in name for t in excludes):
+        return False
+    return (not includes) or any(t in name for t in includes)
+
+# CSR Snapshot -------------------------------------------------------------------------------------
+
+class CSRSnapshot:
+    """
+    Burst reader for named groups of CSRs.
+
+    Each call to update() is one tick: enabled groups whose period divides the tick count are read
+    (all together, as one burst plan) and the cached values of the other groups are kept.
+
+    Pop-on-read registers are dropped from groups, except from the dedicated groups added with
+    `pop_on_read=True` (whose owner consumes every value read).
+    """
+    def __init__(self, bus, max_burst=MAX_BURST_WORDS, max_gap=MAX_GAP_WORDS):
+        self.bus         = bus
+        self.max_burst   = max_burst
+        self.max_gap     = max_gap
+        self.all_regs    = list(bus.regs.__dict__.values())
+        self.pop_on_read = pop_on_read_regs(bus)
+        self.groups    = {}
+        self.values    = {}
+        self.tick      = 0
+        self._plans    = {}
+
+        # Statistics.
+        self.bursts = 0
+        self.words  = 0
+
+    def add_group(self, name, regs, period=1, enabled=True, pop_on_read=False):
+        """Add a group of registers (CSRRegister objects or names) read every `period` ticks."""
+        self.groups[name] = {"regs": [], "period": max(1, int(period)), "enabled": enabled, "pop_on_read": pop_on_read}
+        self.set_registers(name, regs)
+
+    def set_registers(self, name, regs):
+        regs    = [getattr(self.bus.regs, reg) if isinstance(reg, str) else reg for reg in regs]
+        exclude = () if self.groups[name]["pop_on_read"] else self.pop_on_read
+        self.groups[name]["regs"] = [reg for reg in regs if readable(reg, exclude)]
+
+    def set_enabled(self, name, enabled):
+        self.groups[name]["enabled"] = bool(enabled)
+
+    def set_period(self, name, period):
+        self.groups[name]["period"] = max(1, int(period))
+
+    def due(self):
+        """Groups read by the next update()."""
+        return [name for name, group in self.groups.items()
+            if group["enabled"] and (self.tick % group["period"]) == 0]
+
+    def plan(self, names):
+        key = tuple(sorted({reg.name for name in names for reg in self.groups[name]["regs"]}))
+        if key not in self._plans:
+            regs = [getattr(self.bus.regs, reg) for reg in key]
+            self._plans[key] = plan_bursts(regs, self.all_regs, self.max_burst, self.max_gap)
+        return self._plans[key]
+
+    def update(self):
+        """Read due groups; returns the names of the groups refreshed by this tick."""
+        names = self.due()
+        for addr, words, members in self.plan(names):
+            datas = self.bus.read(addr, length=words)
+            if isinstance(datas, int):
+                datas = [datas]
+            self.values.update(unpack_burst(datas, members))
+            self.bursts += 1
+            self.words  += words
+        self.tick += 1
+        return names
+
+    def get(self, name, default=0):
+        return self.values.get(name, default)
+
+# Benchmark ----------------------------------------------------------------------------------------
+
+def measure_refresh(fn, iterations=100):
+    """Return refresh rate (Hz) of `fn` averaged over `iterations` calls."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed if elapsed > 0 else float("inf")
+
+
+def benchmark(bus, iterations=100):
+    """Compare per-register reads of all CSRs with one snapshot of all CSRs (pop-on-read excluded)."""
+    regs     = [reg for reg in bus.regs.__dict__.values() if readable(reg, pop_on_read_regs(bus))]
+    snapshot = CSRSnapshot(bus)
+    snapshot.add_group("all", regs)
+
+    def per_register():
+        for reg in regs:
+            reg.read()
+
+    return {
+        "registers"       : len(regs),
+        "bursts"          : len(snapshot.plan(["all"])),
+        "per_register_hz" : measure_refresh(per_register,    iterations),
+        "snapshot_hz"     : measure_refresh(snapshot.update, iterations),
+    }
@@ -10,10 +10,21 @@ import csv
 import math
 import os
 import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 Q11_SCALE = 2048
 
+# BFP mantissa widths and default payload words per block, as built by AD9361RXBitMode (BFP8 mode
+# and the configurable-width BFP mode). Each block also carries one 64-bit header word.
+BFP_MANTISSA_BITS  = [4, 6, 8, 12]
+BFP_PAYLOAD_WORDS  = {4: 127, 6: 126, 8: 127, 12: 126}
+
 
 def clamp(value, lo, hi):
     return max(lo, min(hi, value))
@@ -71,18 +82,34 @@ def bfp_exponent(max_abs, mantissa_bits, source_bits=12):
     return exponent
 
 
-def quantize_bfp(samples, mantissa_bits, block_components):
-    decoded = []
+def bfp_decode_block(block, exponent, mantissa_bits):
     mantissa_min = -(1 << (mantissa_bits - 1))
     mantissa_max = (1 << (mantissa_bits - 1)) - 1
+    return [clamp(round_shift_signed(sample, exponent), mantissa_min, mantissa_max) << exponent for sample in block]
 
+
+def quantize_bfp(samples, mantissa_bits, block_components):
+    decoded = []
     q11_samples = [q11_from_float(sample) for sample in samples]
     for offset in range(0, len(q11_samples), block_components):
         block = q11_samples[offset:offset + block_components]
         exponent = bfp_exponent(max(abs(sample) for sample in block), mantissa_bits)
-        for sample in block:
-            mantissa = clamp(round_shift_signed(sample, exponent), mantissa_min, mantissa_max)
-            decoded.append(mantissa << exponent)
+        decoded += bfp_decode_block(block, exponent, mantissa_bits)
+    return decoded
+
+
+def quantize_bfp_channels(channels, mantissa_bits, block_components, per_channel=True):
+    # RFIC beats carry both channels, so a shared exponent covers the same block of every channel;
+    # with per-channel exponents (BFP8 header version 3) each channel is its own BFP stream.
+    if per_channel:
+        return [quantize_bfp(samples, mantissa_bits, block_components) for samples in channels]
+    q11_channels = [[q11_from_float(sample) for sample in samples] for samples in channels]
+    decoded = [[] for _ in channels]
+    for offset in range(0, len(q11_channels[0]), block_components):
+        blocks = [q11_samples[offset:offset + block_components] for q11_samples in q11_channels]
+        exponent = bfp_exponent(max(abs(sample) for block in blocks for sample in block), mantissa_bits)
+        for block, channel_decoded in zip(blocks, decoded):
+            channel_decoded += bfp_decode_block(block, exponent, mantissa_bits)
     return decoded
 
 
@@ -107,42 +134,206 @@ def snr_db(reference, decoded_q11):
     return 10.0 * math.log10(signal_power / noise_power)
 
 
+# NumPy Engine -------------------------------------------------------------------------------------
+#
+# Array versions of the reference quantizers above. They operate on the last axis, so a whole
+# amplitude sweep can be passed as one 2-D (amplitudes x samples) array, and are bit-exact with the
+# scalar reference path (and so with AD9361RXBitMode): Python's round() and np.rint() both round
+# half to even, and NumPy right shifts on signed integers are arithmetic (floor) shifts.
+
+
+def require_numpy():
+    if np is None:
+        raise SystemExit("The NumPy engine requires numpy; install it or use --engine=reference.")
+
+
+def q11_from_float_np(values):
+    return np.clip(np.rint(np.asarray(values, dtype=np.float64) * Q11_SCALE), -2048, 2047).astype(np.int64)
+
+
+def arithmetic_shift_right_np(values, shift):
+    values = np.asarray(values, dtype=np.int64)
+    shift  = np.asarray(shift,  dtype=np.int64)
+    mask   = (np.int64(1) << shift) - 1
+    return np.where(values >= 0, values >> shift, -((-values + mask) >> shift))
+
+
+def round_shift_signed_np(values, shift):
+    values = np.asarray(values, dtype=np.int64)
+    shift  = np.asarray(shift,  dtype=np.int64)
+    half   = (np.int64(1) << shift) >> 1
+    offset = np.where(values < 0, np.maximum(half - 1, 0), half)
+    return (values + offset) >> shift
+
+
+def quantize_sc16_np(samples):
+    return q11_from_float_np(samples)
+
+
+def quantize_sc8_trunc_np(samples):
+    q11 = q11_from_float_np(samples)
+    return np.clip(arithmetic_shift_right_np(q11, 4), -128, 127) << 4
+
+
+def quantize_sc8_round_np(samples):
+    q11 = q11_from_float_np(samples)
+    return np.clip(round_shift_signed_np(q11, 4), -128, 127) << 4
+
+
+def bfp_exponent_np(max_abs, mantissa_bits, source_bits=12):
+    # The thresholds grow with the exponent, so the number of exceeded thresholds is the exponent.
+    max_abs      = np.asarray(max_abs, dtype=np.int64)
+    max_mantissa = (1 << (mantissa_bits - 1)) - 1
+    exponent     = np.zeros(max_abs.shape, dtype=np.int64)
+    for shift in range(source_bits - mantissa_bits):
+        exponent += max_abs > (max_mantissa << shift)
+    return exponent
+
+
+def bfp_blocks_np(q11_samples, block_components):
+    q11_samples = np.asarray(q11_samples, dtype=np.int64)
+    count       = q11_samples.shape[-1]
+    blocks      = -(-count // block_components)
+    padding     = blocks * block_components - count
+    # Zero padding does not change the peak of the last (partial) block.
+    padded      = np.pad(q11_samples, [(0, 0)] * (q11_samples.ndim - 1) + [(0, padding)])
+    return padded.reshape(q11_samples.shape[:-1] + (blocks, block_components))
+
+
+def bfp_encode_q11_np(q11_samples, mantissa_bits, block_components, exponents=None):
+    q11_samples  = np.asarray(q11_samples, dtype=np.int64)
+    padded       = bfp_blocks_np(q11_samples, block_components)
+    if exponents is None:
+        exponents = bfp_exponent_np(np.abs(padded).max(axis=-1), mantissa_bits)
+    mantissa_min = -(1 << (mantissa_bits - 1))
+    mantissa_max = (1 << (mantissa_bits - 1)) - 1
+    mantissas    = np.clip(round_shift_signed_np(padded, np.asarray(exponents)[..., None]), mantissa_min, mantissa_max)
+    return mantissas.reshape(q11_samples.shape[:-1] + (-1,))[..., :q11_samples.shape[-1]], exponents
+
+
+def bfp_decode_q11_np(mantissas, exponents, block_components):
+    mantissas = np.asarray(mantissas, dtype=np.int64)
+    shifts    = np.repeat(np.asarray(exponents, dtype=np.int64), block_components, axis=-1)
+    return mantissas << shifts[..., :mantissas.shape[-1]]
+
+
+def quantize_bfp_np(samples, mantissa_bits, block_components):
+    mantissas, exponents = bfp_encode_q11_np(q11_from_float_np(samples), mantissa_bits, block_components)
+    return bfp_decode_q11_np(mantissas, exponents, block_components)
+
+
+def quantize_bfp_channels_np(channels, mantissa_bits, block_components, per_channel=True):
+    q11 = np.stack([q11_from_float_np(samples) for samples in channels])
+    exponents = None
+    if not per_channel:
+        peaks     = np.abs(bfp_blocks_np(q11, block_components)).max(axis=-1).max(axis=0)
+        exponents = bfp_exponent_np(peaks, mantissa_bits)
+    mantissas, exponents = bfp_encode_q11_np(q11, mantissa_bits, block_components, exponents)
+    return bfp_decode_q11_np(mantissas, exponents, block_components)
+
+
+def sine_samples_np(amplitudes_dbfs, count, cycles):
+    amplitudes = 10 ** (np.asarray(amplitudes_dbfs, dtype=np.float64) / 20.0)
+    phase      = (2.0 * np.pi * cycles * np.arange(count)) / count
+    return amplitudes[..., None] * np.sin(phase)
+
+
+def snr_db_np(reference, decoded_q11):
+    reference    = np.asarray(reference, dtype=np.float64)
+    error        = reference - np.asarray(decoded_q11, dtype=np.float64) / Q11_SCALE
+    signal_power = np.sum(reference * reference, axis=-1)
+    noise_power  = np.sum(error * error, axis=-1)
+    with np.errstate(divide="ignore"):
+        return np.where(noise_power == 0, np.inf, 10.0 * np.log10(signal_power / noise_power))
+
+
 def bfp_bytes_per_complex(mantissa_bits, block_complex_samples, header_bytes, channels):
     payload_bytes = 2.0 * mantissa_bits / 8.0
     return payload_bytes + header_bytes / (block_complex_samples * channels)
 
 
-def format_rows(args):
-    amplitudes = args.amplitudes
-    cycles = args.cycles
-    count = args.samples
-    block_components = args.block_complex_samples * 2
-
-    formats = [
-        ("SC16/Q11", 4.0, lambda samples: quantize_sc16(samples)),
-        ("SC8 trunc", 2.0, lambda samples: quantize_sc8_trunc(samples)),
-        ("SC8 rounded", 2.0, lambda samples: quantize_sc8_round(samples)),
-        (
-            "BFP8",
-            bfp_bytes_per_complex(8, args.block_complex_samples, args.header_bytes, args.channels),
-            lambda samples: quantize_bfp(samples, 8, block_components),
-        ),
+def bfp_block_complex_samples(mantissa_bits, payload_words=None):
+    # One RFIC beat (2 channels x I/Q) is 4 mantissas, so a block covers one sample per beat.
+    if payload_words is None:
+        payload_words = BFP_PAYLOAD_WORDS[mantissa_bits]
+    return (payload_words * 64) // (4 * mantissa_bits)
+
+
+def bfp_format_spec(args, mantissa_bits):
+    block_complex_samples = getattr(args, "block_complex_samples", None)
+    if block_complex_samples is None:
+        block_complex_samples = bfp_block_complex_samples(mantissa_bits)
+    block_components = block_complex_samples * 2
+    return (
+        f"BFP{mantissa_bits}",
+        bfp_bytes_per_complex(mantissa_bits, block_complex_samples, args.header_bytes, args.channels),
+        lambda samples: quantize_bfp(samples, mantissa_bits, block_components),
+        lambda samples: quantize_bfp_np(samples, mantissa_bits, block_components),
+    )
+
+
+def format_specs(args):
+    specs = [
+        ("SC16/Q11",    4.0,        quantize_sc16,       quantize_sc16_np),
+        ("SC8 trunc",   2.0,        quantize_sc8_trunc,  quantize_sc8_trunc_np),
+        ("SC8 rounded", 2.0,        quantize_sc8_round,  quantize_sc8_round_np),
     ]
+    for mantissa_bits in getattr(args, "bfp_bits", None) or BFP_MANTISSA_BITS:
+        specs.append(bfp_format_spec(args, mantissa_bits))
+    return specs
 
-    rows = []
+
+def resolve_engine(args):
+    engine = getattr(args, "engine", None)
+    if engine is None:
+        engine = "reference" if np is None else "numpy"
+    if engine == "numpy":
+        require_numpy()
+    return engine
+
+
+def format_snrs_reference(args, formats):
     references = {
-        amplitude: sine_samples(amplitude, count, cycles)
-        for amplitude in amplitudes
+        amplitude: sine_samples(amplitude, args.samples, args.cycles)
+        for amplitude in args.amplitudes
     }
+    return [
+        [snr_db(references[amplitude], quantizer(references[amplitude])) for amplitude in args.amplitudes]
+        for _, _, quantizer, _ in formats
+    ]
+
+
+def format_snrs_numpy(args, formats):
+    # One (amplitudes x samples) array per format: the whole sweep is quantized in one pass.
+    references = sine_samples_np(args.amplitudes, args.samples, args.cycles)
+    return [
+        [float(snr) for snr in snr_db_np(references, quantizer(references))]
+        for _, _, _, quantizer in formats
+    ]
+
+
+def format_rows(args):
+    amplitudes = args.amplitudes
+    formats    = format_specs(args)
+
+    if resolve_engine(args) == "numpy":
+        snrs = format_snrs_numpy(args, formats)
+    else:
+        snrs = format_snrs_reference(args, formats)
+
+    return snr_rows(formats, snrs, amplitudes)
 
-    for name, bytes_per_complex, quantizer in formats:
+
+def snr_rows(formats, snrs, amplitudes):
+    # Losses are relative to the first format (SC16/Q11).
+    rows = []
+    for (name, bytes_per_complex, _, _), format_snrs in zip(formats, snrs):
         row = {
             "format": name,
             "bytes_per_complex": bytes_per_complex,
         }
-        for amplitude in amplitudes:
-            reference = references[amplitude]
-            row[f"snr_{amplitude:g}dbfs"] = snr_db(reference, quantizer(reference))
+        for amplitude, snr in zip(amplitudes, format_snrs):
+            row[f"snr_{amplitude:g}dbfs"] = snr
         rows.append(row)
 
     baseline = {
@@ -157,6 +348,111 @@ def format_rows(args):
     return rows
 
 
+# Unbalanced Channels ------------------------------------------------------------------------------
+#
+# Two-channel stream with one channel held at a strong level and the other swept; rows report the
+# weak channel, where a BFP exponent shared between RX1 and RX2 costs dynamic range.
+
+
+def unbalanced_specs(args):
+    block_complex_samples = getattr(args, "block_complex_samples", None) or bfp_block_complex_samples(8)
+    block_components      = block_complex_samples * 2
+    bfp8_bytes            = bfp_bytes_per_complex(8, block_complex_samples, args.header_bytes, args.channels)
+    return [
+        (
+            "SC16/Q11",
+            4.0,
+            lambda channels: [quantize_sc16(samples) for samples in channels],
+            lambda channels: [quantize_sc16_np(samples) for samples in channels],
+        ),
+        (
+            "SC8 rounded",
+            2.0,
+            lambda channels: [quantize_sc8_round(samples) for samples in channels],
+            lambda channels: [quantize_sc8_round_np(samples) for samples in channels],
+        ),
+        (
+            "BFP8 shared",
+            bfp8_bytes,
+            lambda channels: quantize_bfp_channels(channels, 8, block_components, per_channel=False),
+            lambda channels: quantize_bfp_channels_np(channels, 8, block_components, per_channel=False),
+        ),
+        (
+            "BFP8 per-channel",
+            bfp8_bytes,
+            lambda channels: quantize_bfp_channels(channels, 8, block_components, per_channel=True),
+            lambda channels: quantize_bfp_channels_np(channels, 8, block_components, per_channel=True),
+        ),
+    ]
+
+
+def unbalanced_rows(args):
+    amplitudes  = args.amplitudes
+    strong_dbfs = getattr(args, "strong_dbfs", 0.0)
+    # Different tone on the strong channel so quantization errors do not correlate.
+    strong_cycles = args.cycles * 1.5
+    formats = unbalanced_specs(args)
+
+    if resolve_engine(args) == "numpy":
+        weak   = sine_samples_np(amplitudes, args.samples, args.cycles)
+        strong = np.broadcast_to(sine_samples_np([strong_dbfs], args.samples, strong_cycles), weak.shape)
+        snrs = [
+            [float(snr) for snr in snr_db_np(weak, quantizer([strong, weak])[1])]
+            for _, _, _, quantizer in formats
+        ]
+    else:
+        strong = sine_samples(strong_dbfs, args.samples, strong_cycles)
+        weak   = {amplitude: sine_samples(amplitude, args.samples, args.cycles) for amplitude in amplitudes}
+        snrs = [
+            [snr_db(weak[amplitude], quantizer([strong, weak[amplitude]])[1]) for amplitude in amplitudes]
+            for _, _, quantizer, _ in formats
+        ]
+
+    return snr_rows(formats, snrs, amplitudes)
+
+
+def benchmark_engines(args, repeat=3):
+    # Time both engines on the same sweep and check the NumPy quantizers against the reference
+    # ones on identical inputs, so the comparison covers correctness as well as speed.
+    require_numpy()
+    formats    = format_specs(args)
+    references = sine_samples_np(args.amplitudes, args.samples, args.cycles)
+
+    mismatches = []
+    for name, _, reference_quantizer, numpy_quantizer in formats:
+        decoded = numpy_quantizer(references)
+        for amplitude, samples, numpy_decoded in zip(args.amplitudes, references, decoded):
+            if reference_quantizer(samples.tolist()) != numpy_decoded.tolist():
+                mismatches.append(f"{name} @ {amplitude:g} dBFS")
+
+    timings = {}
+    for engine, run in [("reference", format_snrs_reference), ("numpy", format_snrs_numpy)]:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(args, formats)
+            best = min(best, time.perf_counter() - start)
+        timings[engine] = best
+
+    return {
+        "reference_s" : timings["reference"],
+        "numpy_s"     : timings["numpy"],
+        "speedup"     : timings["reference"] / timings["numpy"] if timings["numpy"] > 0 else float("inf"),
+        "mismatches"  : mismatches,
+    }
+
+
+def print_benchmark(result, args):
+    print(f"Samples x amplitudes : {args.samples} x {len(args.amplitudes)}")
+    print(f"Reference engine     : {result['reference_s'] * 1e3:.1f} ms")
+    print(f"NumPy engine         : {result['numpy_s'] * 1e3:.1f} ms")
+    print(f"Speedup              : {result['speedup']:.1f}x")
+    if result["mismatches"]:
+        print("Bit-exact            : NO (" + ", ".join(result["mismatches"]) + ")")
+    else:
+        print("Bit-exact            : yes")
+
+
 def print_markdown(rows, amplitudes):
     headers = ["Format", "B/complex"]
     headers += [f"SNR {amplitude:g} dBFS" for amplitude in amplitudes]
@@ -199,7 +495,12 @@ def plot_rows(rows, amplitudes, output_path):
         "SC16/Q11": "#4c78a8",
         "SC8 trunc": "#f58518",
         "SC8 rounded": "#54a24b",
+        "BFP4": "#e45756",
+        "BFP6": "#eeca3b",
         "BFP8": "#b279a2",
+        "BFP12": "#72b7b2",
+        "BFP8 shared": "#b279a2",
+        "BFP8 per-channel": "#9d755d",
     }
 
     fig = plt.figure(figsize=(13.5, 7.2), constrained_layout=True)
@@ -269,8 +570,16 @@ def main():
     parser.add_argument(
         "--block-complex-samples",
         type=int,
-        default=254,
-        help="Complex samples covered by one BFP exponent/header.",
+        default=None,
+        help="Complex samples covered by one BFP exponent/header (default: hardware block per width, 254 for BFP8).",
+    )
+    parser.add_argument(
+        "--bfp-bits",
+        type=int,
+        nargs="+",
+        choices=BFP_MANTISSA_BITS,
+        default=BFP_MANTISSA_BITS,
+        help="BFP mantissa widths to evaluate.",
     )
     parser.add_argument(
         "--header-bytes",
@@ -279,20 +588,39 @@ def main():
         help="BFP metadata/header bytes per block.",
     )
     parser.add_argument("--channels", type=int, default=2, help="Channels sharing one BFP block header.")
+    parser.add_argument(
+        "--engine",
+        choices=["numpy", "reference"],
+        help="Quantization engine (default: numpy when available, else the pure-Python reference).",
+    )
+    parser.add_argument(
+        "--unbalanced",
+        action="store_true",
+        help="Report the weak channel of a two-channel stream (BFP8 shared vs per-channel exponents).",
+    )
+    parser.add_argument("--strong-dbfs", type=float, default=0.0, help="Strong channel level with --unbalanced.")
+    parser.add_argument("--benchmark", action="store_true", help="Compare reference/NumPy engines (speed and bit-exactness).")
     parser.add_argument("--csv", action="store_true", help="Emit CSV instead of Markdown.")
     parser.add_argument("--plot", help="Write a PNG/SVG/PDF plot of compression and SNR loss.")
     args = parser.parse_args()
 
     if args.samples <= 0:
         parser.error("--samples must be positive")
-    if args.block_complex_samples <= 0:
+    if args.block_complex_samples is not None and args.block_complex_samples <= 0:
         parser.error("--block-complex-samples must be positive")
     if args.header_bytes < 0:
         parser.error("--header-bytes must be non-negative")
     if args.channels <= 0:
         parser.error("--channels must be positive")
 
-    rows = format_rows(args)
+    if args.benchmark:
+        result = benchmark_engines(args)
+        print_benchmark(result, args)
+        if result["mismatches"]:
+            sys.exit(1)
+        return
+
+    rows = unbalanced_rows(args) if args.unbalanced else format_rows(args)
     if args.csv:
         print_csv(rows, args.amplitudes)
     else:
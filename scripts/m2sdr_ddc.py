@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""
+Configure the optional RX digital down-converter (--with-rx-ddc builds).
+
+Computes the NCO increments, the CIC gain shift and a CIC compensation FIR for the requested
+decimation and writes them through the ad9361_rx_ddc CSRs. The output sample rate is
+sample_rate/decimation (/2 with the FIR).
+"""
+
+import math
+import argparse
+
+import numpy as np
+
+# Constants ----------------------------------------------------------------------------------------
+
+COEF_BITS  = 18
+COEF_SHIFT = 16
+
+CONTROL_ENABLE_OFFSET     = 0
+CONTROL_FIR_ENABLE_OFFSET = 1
+CIC_SHIFT_OFFSET          = 16
+COEF_CHANNEL_OFFSET       = 16
+
+# Design Helpers -----------------------------------------------------------------------------------
+
+def nco_increment(freq, sample_rate):
+    """NCO phase increment moving an input tone at freq (Hz, signed) to DC."""
+    return int(round(freq/sample_rate*2**32)) & 0xffffffff
+
+
+def cic_shift(stages, decimation):
+    """Smallest output shift keeping the CIC gain (decimation^stages) at or below unity."""
+    return math.ceil(stages*math.log2(decimation)) if decimation > 1 else 0
+
+
+def cic_response(f, stages, decimation):
+    """Normalized CIC magnitude response at f (cycles per CIC output sample)."""
+    return np.abs(np.sinc(f)/np.sinc(f/decimation))**stages
+
+
+def cic_compensation_fir(taps, stages, decimation, passband=0.2, stopband=0.3, grid=2048):
+    """
+    Least-squares linear-phase FIR compensating the CIC droop up to passband and rejecting above
+    stopband (both in cycles per CIC output sample; the FIR then decimates by 2). The residual CIC
+    gain left by the power-of-two shift is folded in, so the chain has unity DC gain. Returns
+    signed Q16 coefficients.
+    """
+    f       = np.linspace(0, 0.5, grid)
+    gain    = 2**cic_shift(stages, decimation)/decimation**stages
+    desired = np.where(f <= passband, gain/cic_response(f, stages, decimation), 0.0)
+    weight  = np.where((f <= passband) | (f >= stopband), 1.0, 0.0)
+    n       = np.arange(taps) - (taps - 1)/2
+    basis   = np.cos(2*np.pi*np.outer(f, n))
+    h, *_   = np.linalg.lstsq(basis*weight[:, None], desired*weight, rcond=None)
+    h      *= gain/np.sum(h) # Exact DC gain.
+    q       = np.round(h*2**COEF_SHIFT)
+    return np.clip(q, -2**(COEF_BITS - 1), 2**(COEF_BITS - 1) - 1).astype(int).tolist()
+
+# DDC Driver ---------------------------------------------------------------------------------------
+
+class DDCDriver:
+    """Driver for the ad9361_rx_ddc CSRs."""
+    def __init__(self, bus, name="ad9361_rx_ddc"):
+        self.bus  = bus
+        self.regs = {reg: getattr(bus.regs, f"{name}_{reg}") for reg in
+            ["control", "nco_a", "nco_b", "cic", "fir_coef_index", "fir_coef", "info", "overflows"]}
+        info = self.regs["info"].read()
+        self.cic_stages         = (info >>  0) & 0xf
+        self.cic_max_decimation = (info >>  4) & 0xfff
+        self.fir_taps           = (info >> 16) & 0xffff
+
+    def disable(self):
+        self.regs["control"].write(0)
+
+    def configure(self, sample_rate, freqs, decimation, with_fir=True):
+        assert 1 <= decimation <= self.cic_max_decimation
+        self.disable()
+        self.regs["nco_a"].write(nco_increment(freqs[0], sample_rate))
+        self.regs["nco_b"].write(nco_increment(freqs[1], sample_rate))
+        self.regs["cic"].write(decimation | (cic_shift(self.cic_stages, decimation) << CIC_SHIFT_OFFSET))
+        if with_fir:
+            coefs = cic_compensation_fir(self.fir_taps, self.cic_stages, decimation)
+            for channel in range(2):
+                for index, coef in enumerate(coefs):
+                    self.regs["fir_coef_index"].write(index | (channel << COEF_CHANNEL_OFFSET))
+                    self.regs["fir_coef"].write(coef & (2**COEF_BITS - 1))
+        self.regs["control"].write((1 << CONTROL_ENABLE_OFFSET) | (int(with_fir) << CONTROL_FIR_ENABLE_OFFSET))
+        return sample_rate/decimation/(2 if with_fir else 1)
+
+    def overflows(self):
+        return self.regs["overflows"].read()
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Configure the LiteX-M2SDR RX DDC.")
+    parser.add_argument("--host",        default="localhost",    help="litex_server host.")
+    parser.add_argument("--port",        default=1234, type=int, help="litex_server port.")
+    parser.add_argument("--sample-rate", default=30.72e6, type=float, help="RFIC sample rate (Hz).")
+    parser.add_argument("--freq-a",      default=0.0, type=float, help="RX1 offset frequency to bring to DC (Hz).")
+    parser.add_argument("--freq-b",      default=0.0, type=float, help="RX2 offset frequency to bring to DC (Hz).")
+    parser.add_argument("--decimation",  default=8,   type=int,   help="CIC decimation ratio.")
+    parser.add_argument("--no-fir",      action="store_true",     help="Bypass the compensation FIR (no /2).")
+    parser.add_argument("--disable",     action="store_true",     help="Disable the DDC (full-rate pass-through).")
+    args = parser.parse_args()
+
+    from litex import RemoteClient
+
+    bus = RemoteClient(host=args.host, port=args.port)
+    bus.open()
+    ddc = DDCDriver(bus)
+    if args.disable:
+        ddc.disable()
+        print("DDC disabled.")
+    else:
+        rate = ddc.configure(args.sample_rate, (args.freq_a, args.freq_b), args.decimation, with_fir=not args.no_fir)
+        print(f"DDC enabled: output rate {rate/1e6:.6f} MSPS.")
+    bus.close()
+
+if __name__ == "__main__":
+    main()
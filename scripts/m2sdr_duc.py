@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""
+Configure the optional TX digital up-converter (--with-tx-duc builds).
+
+Computes the NCO increments and the CIC gain shift for the requested interpolation and writes them
+through the ad9361_tx_duc CSRs. The host sample rate becomes sample_rate/interpolation (/2 with the
+half-band).
+"""
+
+import math
+import argparse
+
+from m2sdr_ddc import nco_increment
+
+# Constants ----------------------------------------------------------------------------------------
+
+CONTROL_ENABLE_OFFSET    = 0
+CONTROL_HB_ENABLE_OFFSET = 1
+CIC_SHIFT_OFFSET         = 16
+
+# Design Helpers -----------------------------------------------------------------------------------
+
+def cic_shift(stages, interpolation):
+    """Smallest output shift keeping the CIC gain (interpolation^(stages - 1)) at or below unity."""
+    return math.ceil((stages - 1)*math.log2(interpolation)) if interpolation > 1 else 0
+
+# DUC Driver ---------------------------------------------------------------------------------------
+
+class DUCDriver:
+    """Driver for the ad9361_tx_duc CSRs."""
+    def __init__(self, bus, name="ad9361_tx_duc"):
+        self.bus  = bus
+        self.regs = {reg: getattr(bus.regs, f"{name}_{reg}") for reg in
+            ["control", "nco_a", "nco_b", "cic", "info"]}
+        info = self.regs["info"].read()
+        self.cic_stages            = (info >> 0) & 0xf
+        self.cic_max_interpolation = (info >> 4) & 0xfff
+
+    def disable(self):
+        self.regs["control"].write(0)
+
+    def configure(self, sample_rate, freqs, interpolation, with_hb=True):
+        assert 1 <= interpolation <= self.cic_max_interpolation
+        self.disable()
+        self.regs["nco_a"].write(nco_increment(freqs[0], sample_rate))
+        self.regs["nco_b"].write(nco_increment(freqs[1], sample_rate))
+        self.regs["cic"].write(interpolation | (cic_shift(self.cic_stages, interpolation) << CIC_SHIFT_OFFSET))
+        self.regs["control"].write((1 << CONTROL_ENABLE_OFFSET) | (int(with_hb) << CONTROL_HB_ENABLE_OFFSET))
+        return sample_rate/interpolation/(2 if with_hb else 1)
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Configure the LiteX-M2SDR TX DUC.")
+    parser.add_argument("--host",          default="localhost",    help="litex_server host.")
+    parser.add_argument("--port",          default=1234, type=int, help="litex_server port.")
+    parser.add_argument("--sample-rate",   default=30.72e6, type=float, help="RFIC sample rate (Hz).")
+    parser.add_argument("--freq-a",        default=0.0, type=float, help="TX1 frequency offset the host baseband is moved to (Hz).")
+    parser.add_argument("--freq-b",        default=0.0, type=float, help="TX2 frequency offset the host baseband is moved to (Hz).")
+    parser.add_argument("--interpolation", default=8,   type=int,   help="CIC interpolation ratio.")
+    parser.add_argument("--no-hb",         action="store_true",     help="Bypass the half-band (no x2).")
+    parser.add_argument("--disable",       action="store_true",     help="Disable the DUC (full-rate pass-through).")
+    args = parser.parse_args()
+
+    from litex import RemoteClient
+
+    bus = RemoteClient(host=args.host, port=args.port)
+    bus.open()
+    duc = DUCDriver(bus)
+    if args.disable:
+        duc.disable()
+        print("DUC disabled.")
+    else:
+        rate = duc.configure(args.sample_rate, (args.freq_a, args.freq_b), args.interpolation, with_hb=not args.no_hb)
+        print(f"DUC enabled: host sample rate {rate/1e6:.6f} MSPS.")
+    bus.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Headless M2SDR telemetry exporter (Prometheus/OpenMetrics).
+
+Polls one or more boards (each through its litex_server/RemoteClient) with the script drivers
+(ClkDriver, XADCDriver, AGCDriver, TimeDriver, HeaderDriver) and serves the last values on
+`/metrics` in OpenMetrics text format. A bounded history ring of the last polls is served as JSON
+on `/history`.
+
+Boards are polled concurrently from one asyncio loop; the (blocking) CSR accesses of each poll run
+in a thread pool, so a slow or unreachable board does not delay the others.
+"""
+
+import os
+import time
+import json
+import asyncio
+import argparse
+import collections
+import concurrent.futures
+
+from litex import RemoteClient
+
+from test_clks   import ClkDriver, CLOCKS
+from test_xadc   import XADCDriver
+from test_agc    import AGCDriver
+from test_time   import TimeDriver
+from test_header import HeaderDriver
+
+# Constants ----------------------------------------------------------------------------------------
+
+AGC_INSTANCES = ["rx1_low", "rx1_high", "rx2_low", "rx2_high"]
+
+# Metric families: name -> (type, unit, help).
+METRICS = {
+    "m2sdr_up"                       : ("gauge", "",        "Board reachable on the last poll."),
+    "m2sdr_poll_duration_seconds"    : ("gauge", "seconds", "Duration of the last poll."),
+    "m2sdr_xadc_temperature_celsius" : ("gauge", "celsius", "FPGA die temperature."),
+    "m2sdr_xadc_supply_volts"        : ("gauge", "volts",   "FPGA supply voltage."),
+    "m2sdr_clock_frequency_hertz"    : ("gauge", "hertz",   "Measured clock frequency."),
+    "m2sdr_clock_error_ppm"          : ("gauge", "",        "Measured clock error vs nominal (gated gateware)."),
+    "m2sdr_agc_saturation_count"     : ("gauge", "",        "AGC saturation event count."),
+    "m2sdr_time_seconds"             : ("gauge", "seconds", "Board time generator value."),
+    "m2sdr_header_timestamp_seconds" : ("gauge", "seconds", "Last TX/RX header timestamp."),
+}
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def parse_board(spec, default_port=1234):
+    """Parse a NAME=HOST[:PORT] board specification."""
+    name, _, address = spec.partition("=")
+    if not name or not address:
+        raise ValueError(f"Invalid board specification {spec!r} (expected NAME=HOST[:PORT]).")
+    host, _, port = address.partition(":")
+    return name, host, int(port) if port else default_port
+
+
+def format_labels(labels):
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace("\"", "\\\"")
+    return ",".join(f"{key}=\"{escape(value)}\"" for key, value in sorted(labels.items()))
+
+
+def render_openmetrics(samples):
+    """Render {board: [(metric, labels, value), ...]} as OpenMetrics text."""
+    families = collections.OrderedDict((metric, []) for metric in METRICS)
+    for board, board_samples in sorted(samples.items()):
+        for metric, labels, value in board_samples:
+            families[metric].append(({"board": board, **labels}, value))
+    lines = []
+    for metric, entries in families.items():
+        if not entries:
+            continue
+        kind, unit, description = METRICS[metric]
+        lines.append(f"# TYPE {metric} {kind}")
+        if unit:
+            lines.append(f"# UNIT {metric} {unit}")
+        lines.append(f"# HELP {metric} {description}")
+        for labels, value in entries:
+            lines.append(f"{metric}{{{format_labels(labels)}}} {float(value)!r}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+# Board Collector ----------------------------------------------------------------------------------
+
+class BoardCollector:
+    """
+    Poll one board with the script drivers.
+
+    collect() is blocking (CSR accesses) and returns a list of (metric, labels, value) samples. Only
+    the drivers of the features present in the loaded gateware are created.
+    """
+    def __init__(self, bus):
+        self.bus = bus
+        regs     = bus.regs
+        self.xadc = XADCDriver(bus) if hasattr(regs, "xadc_temperature") else None
+        self.time = TimeDriver(bus, "time_gen") if hasattr(regs, "time_gen_read_time") else None
+        self.clks = {clk: ClkDriver(bus, clk, desc) for clk, desc in CLOCKS.items()
+            if hasattr(regs, f"clk_measurement_{clk}_value")}
+        self.agcs = {inst: AGCDriver(bus, name=f"ad9361_agc_count_{inst}") for inst in AGC_INSTANCES
+            if hasattr(regs, f"ad9361_agc_count_{inst}_status")}
+        self.header = HeaderDriver(bus, "header") if hasattr(regs, "header_last_tx_header") else None
+
+    def collect(self):
+        samples = []
+        if self.xadc is not None:
+            samples.append(("m2sdr_xadc_temperature_celsius", {}, self.xadc.get_temp()))
+            for supply, getter in [
+                ("vccint",  self.xadc.get_vccint),
+                ("vccaux",  self.xadc.get_vccaux),
+                ("vccbram", self.xadc.get_vccbram)]:
+                samples.append(("m2sdr_xadc_supply_volts", {"supply": supply}, getter()))
+        for clk, driver in self.clks.items():
+            frequency = driver.update() * 1e6
+            samples.append(("m2sdr_clock_frequency_hertz", {"clock": clk, "description": driver.description.strip()}, frequency))
+            error = driver.error_ppm()
+            if error is not None:
+                samples.append(("m2sdr_clock_error_ppm", {"clock": clk, "description": driver.description.strip()}, error))
+        for inst, driver in self.agcs.items():
+            samples.append(("m2sdr_agc_saturation_count", {"channel": inst}, driver.read_count()))
+        if self.time is not None:
+            samples.append(("m2sdr_time_seconds", {}, self.time.read_ns() / 1e9))
+        if self.header is not None:
+            samples.append(("m2sdr_header_timestamp_seconds", {"direction": "tx"}, self.header.last_tx_timestamp.read() / 1e9))
+            samples.append(("m2sdr_header_timestamp_seconds", {"direction": "rx"}, self.header.last_rx_timestamp.read() / 1e9))
+        return samples
+
+
+def open_board(host, port, csr_csv):
+    bus = RemoteClient(host=host, port=port, csr_csv=csr_csv)
+    bus.open()
+    return BoardCollector(bus)
+
+# Exporter -----------------------------------------------------------------------------------------
+
+class Exporter:
+    """
+    Poll boards on a schedule and keep their last samples and a bounded history ring.
+
+    `boards` maps board names to zero-argument callables returning a collector (an object with a
+    blocking collect() method and a `bus`); a collector raising on collect() is closed and reopened
+    on the next poll.
+    """
+    def __init__(self, boards, interval=1.0, history=600, max_workers=32):
+        self.boards   = boards
+        self.interval = interval
+        self.samples  = {name: [("m2sdr_up", {}, 0)] for name in boards}
+        self.history  = collections.deque(maxlen=history)
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+    def record(self, name, samples, timestamp):
+        self.samples[name] = samples
+        self.history.append({
+            "timestamp" : timestamp,
+            "board"     : name,
+            "samples"   : [{"metric": metric, "labels": labels, "value": value} for metric, labels, value in samples],
+        })
+
+    async def poll_board(self, name, polls=None):
+        loop      = asyncio.get_running_loop()
+        collector = None
+        count     = 0
+        while polls is None or count < polls:
+            start = time.monotonic()
+            try:
+                if collector is None:
+                    collector = await loop.run_in_executor(self.executor, self.boards[name])
+                samples = await loop.run_in_executor(self.executor, collector.collect)
+                samples = [("m2sdr_up", {}, 1), *samples]
+            except Exception:
+                if collector is not None:
+                    try:
+                        collector.bus.close()
+                    except Exception:
+                        pass
+                collector = None
+                samples   = [("m2sdr_up", {}, 0)]
+            samples.append(("m2sdr_poll_duration_seconds", {}, time.monotonic() - start))
+            self.record(name, samples, time.time())
+            count += 1
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - start)))
+
+    def history_json(self, board=None):
+        return json.dumps([entry for entry in self.history if board in [None, entry["board"]]])
+
+    async def handle_http(self, reader, writer):
+        try:
+            request = (await reader.readline()).decode("latin-1").split()
+            while (await reader.readline()) not in [b"\r\n", b"\n", b""]:
+                pass
+            path, _, query = (request[1] if len(request) > 1 else "/").partition("?")
+            params = dict(param.partition("=")[::2] for param in query.split("&") if param)
+            if path == "/metrics":
+                status, content_type, body = "200 OK", OPENMETRICS_CONTENT_TYPE, render_openmetrics(self.samples)
+            elif path == "/history":
+                status, content_type, body = "200 OK", "application/json", self.history_json(params.get("board"))
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", "Not Found\n"
+            body = body.encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=9361):
+        server = await asyncio.start_server(self.handle_http, host, port)
+        async with server:
+            await asyncio.gather(server.serve_forever(), *[self.poll_board(name) for name in self.boards])
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    default_csr_csv = os.path.join(os.path.dirname(__file__), "csr.csv")
+    parser = argparse.ArgumentParser(
+        description="LiteX M2SDR headless telemetry exporter (Prometheus/OpenMetrics).",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--board", action="append", default=[], metavar="NAME=HOST[:PORT]",
+        help="Board to poll through its litex_server (repeat for several boards)")
+    parser.add_argument("--csr-csv",     default=default_csr_csv,   help="CSR configuration file")
+    parser.add_argument("--interval",    default=1.0, type=float,   help="Poll interval (seconds)")
+    parser.add_argument("--history",     default=600, type=int,     help="History ring depth (polls, all boards)")
+    parser.add_argument("--listen",      default="127.0.0.1",       help="HTTP listen address")
+    parser.add_argument("--listen-port", default=9361, type=int,    help="HTTP listen port")
+    parser.add_argument("--max-workers", default=32,  type=int,     help="Concurrent CSR polls")
+    args = parser.parse_args()
+
+    boards = {}
+    for spec in args.board or ["m2sdr=localhost:1234"]:
+        name, host, port = parse_board(spec)
+        boards[name] = lambda host=host, port=port: open_board(host, port, args.csr_csv)
+
+    exporter = Exporter(boards, interval=args.interval, history=args.history, max_workers=args.max_workers)
+    try:
+        asyncio.run(exporter.serve(args.listen, args.listen_port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,14 @@
 import argparse
 import csv
 import json
+import math
+import os
 import shlex
 import statistics
 import subprocess
 import sys
 import time
+from collections import deque
 from pathlib import Path
 
 
@@ -43,6 +46,42 @@ CLOCK10_COUNTERS = (
     "saturation_count",
 )
 ETHERBONE_PROCESS_SETTLE_SECONDS = 0.05
+STATS_PERCENTILES = (50, 95, 99)
+STATS_EXACT_LIMIT = 10000
+STABILITY_MAX_M = 10000
+MAX_FAILURE_MESSAGES = 100
+PTP_CSV_FIELDS = (
+    "refresh_time_unix",
+    "host_time_ns",
+    "state_name",
+    "ptp_locked",
+    "time_locked",
+    "holdover",
+    "last_error_ns",
+    "ptp_lock_losses",
+    "time_lock_misses",
+    "time_lock_miss_count",
+    "time_lock_losses",
+)
+CLOCK10_CSV_FIELDS = (
+    "refresh_time_unix",
+    "host_time_ns",
+    "enabled",
+    "active",
+    "reference_locked",
+    "clock_locked",
+    "holdover",
+    "aligned",
+    "rate_limited",
+    "last_error_ns",
+    "last_error_ticks",
+    "last_rate",
+    "sample_count",
+    "missing_count",
+    "lock_loss_count",
+    "rate_update_count",
+    "saturation_count",
+)
 
 
 class CheckError(RuntimeError):
@@ -112,6 +151,102 @@ def read_clock10_status(args):
         raise CheckError(f"m2sdr_util returned invalid PTP clk10 JSON: {e}\n{proc.stdout}") from e
 
 
+class PTPStatusSession:
+    """Persistent `m2sdr_util ptp-stream` session.
+
+    One utility process (and one Etherbone/PCIe connection) samples PTP and optional clk10 status
+    on a fixed schedule and streams one JSON line per sample, so soaks can run at tens to hundreds
+    of Hz without per-sample process spawn and Etherbone settle delays.
+    """
+
+    def __init__(self, args, with_clock10=False):
+        extra = ["--watch-interval", str(args.interval), "--duration", str(args.duration), "ptp-stream"]
+        if with_clock10:
+            extra.append("clock10")
+        self.cmd = util_cmd(args, *extra)
+        self.proc = subprocess.Popen(
+            self.cmd,
+            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=1,
+        )
+
+    def __iter__(self):
+        """Yield (ptp_status, clock10_status or None) as the utility emits them."""
+        for line in self.proc.stdout:
+            if not line.strip():
+                continue
+            try:
+                status = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise CheckError(f"m2sdr_util ptp-stream returned invalid JSON: {e}\n{line}") from e
+            yield status, status.pop("clock10", None)
+
+    def close(self, check=True):
+        if self.proc.poll() is None and not check:
+            self.proc.terminate()
+        try:
+            _, stderr = self.proc.communicate(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            _, stderr = self.proc.communicate()
+        if check and self.proc.returncode != 0:
+            rendered = " ".join(shlex.quote(str(part)) for part in self.cmd)
+            raise CheckError(f"{rendered} failed with exit code {self.proc.returncode}\nstderr:\n{stderr}")
+
+
+class SampleStreamWriter:
+    """Write samples to disk as they arrive.
+
+    CSV rows go to `csv_path` (and the `*.clock10.csv` sidecar), raw samples go to a JSON lines
+    file next to the JSON report, so a long soak keeps its data even if it is interrupted.
+    """
+
+    def __init__(self, csv_path=None, json_path=None):
+        self.files = []
+        self.csv = None
+        self.clock10_csv = None
+        self.jsonl = None
+        self.csv_path = csv_path
+        self.jsonl_path = raw_samples_path(json_path) if json_path else None
+        if self.jsonl_path:
+            self.jsonl = self._open(self.jsonl_path)
+
+    def _open(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        f = path.open("w", newline="", encoding="utf-8")
+        self.files.append(f)
+        return f
+
+    def _csv_writer(self, path, fields):
+        writer = csv.DictWriter(self._open(path), fieldnames=fields, lineterminator="\n", extrasaction="ignore")
+        writer.writeheader()
+        return writer
+
+    def write(self, status, clock10_status=None):
+        if self.csv_path:
+            if self.csv is None:
+                self.csv = self._csv_writer(self.csv_path, PTP_CSV_FIELDS)
+            self.csv.writerow({field: status.get(field) for field in PTP_CSV_FIELDS})
+            if clock10_status is not None:
+                if self.clock10_csv is None:
+                    self.clock10_csv = self._csv_writer(clock10_csv_path(self.csv_path), CLOCK10_CSV_FIELDS)
+                self.clock10_csv.writerow({field: clock10_status.get(field) for field in CLOCK10_CSV_FIELDS})
+        if self.jsonl:
+            sample = {"ptp": status}
+            if clock10_status is not None:
+                sample["clock10"] = clock10_status
+            self.jsonl.write(json.dumps(sample, sort_keys=True) + "\n")
+        for f in self.files:
+            f.flush()
+
+    def close(self):
+        for f in self.files:
+            f.close()
+        self.files = []
+
+
 def counter_delta(newer, older):
     return (int(newer) - int(older)) & 0xffffffff
 
@@ -171,29 +306,282 @@ def numeric_stats(values):
     }
 
 
-def sample_quality(samples, max_error_ns):
+class P2Quantile:
+    """P-square streaming quantile estimator (Jain & Chlamtac): five markers, O(1) memory."""
+
+    def __init__(self, quantile):
+        self.quantile = quantile
+        self.heights = []
+        self.positions = []
+        self.desired = []
+        self.increments = [0.0, quantile / 2.0, quantile, (1.0 + quantile) / 2.0, 1.0]
+
+    def seed(self, ordered):
+        """Initialize the markers from the order statistics of a sorted list (at least 5 values)."""
+        count = len(ordered)
+        self.desired = [1.0 + (count - 1) * increment for increment in self.increments]
+        positions = [int(round(desired)) for desired in self.desired]
+        for i in range(1, 4):
+            positions[i] = min(max(positions[i], positions[i - 1] + 1), count - (4 - i))
+        self.positions = positions
+        self.heights = [float(ordered[position - 1]) for position in positions]
+        return self
+
+    def add(self, value):
+        heights = self.heights
+        positions = self.positions
+        if len(heights) < 5:
+            heights.append(float(value))
+            if len(heights) == 5:
+                self.seed(sorted(heights))
+            return
+        if value < heights[0]:
+            heights[0] = float(value)
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = float(value)
+            cell = 3
+        else:
+            cell = next(i for i in range(4) if heights[i] <= value < heights[i + 1])
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+        for i in range(1, 4):
+            delta = self.desired[i] - positions[i]
+            if (delta >= 1 and positions[i + 1] - positions[i] > 1) or (delta <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if delta > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i, step):
+        q = self.heights
+        n = self.positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self):
+        if len(self.heights) < 5:
+            return percentile(self.heights, self.quantile * 100.0)
+        return self.heights[2]
+
+
+class StreamingStats:
+    """Bounded-memory numeric_stats(): Welford mean/variance, min/max and percentiles.
+
+    Percentiles are exact (same interpolation as percentile()) while at most `exact_limit` values
+    have been added; beyond that the values are dropped and P-square sketches seeded from them
+    take over.
+    """
+
+    def __init__(self, exact_limit=STATS_EXACT_LIMIT):
+        self.exact_limit = max(exact_limit, 5)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.exact = []
+        self.sketches = None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if self.sketches is not None:
+            for sketch in self.sketches.values():
+                sketch.add(value)
+            return
+        self.exact.append(value)
+        if len(self.exact) > self.exact_limit:
+            ordered = sorted(self.exact)
+            self.sketches = {percent: P2Quantile(percent / 100.0).seed(ordered) for percent in STATS_PERCENTILES}
+            self.exact = None
+
+    def percentile(self, percent):
+        if self.sketches is not None:
+            return self.sketches[percent].value()
+        return percentile(self.exact, percent)
+
+    def summary(self):
+        if not self.count:
+            return numeric_stats([])
+        return {
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "mean": float(self.mean),
+            "stdev": math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+def tau_ladder(max_m):
+    """1-2-5 ladder of averaging factors (in samples) up to max_m."""
+    ladder = []
+    decade = 1
+    while True:
+        for step in (1, 2, 5):
+            if step * decade > max_m:
+                return ladder
+            ladder.append(step * decade)
+        decade *= 10
+
+
+class StabilityStats:
+    """Streaming overlapping Allan deviation and time deviation of a time-error series.
+
+    Samples are time errors (ns) taken every tau0 seconds. For each averaging factor m of the 1-2-5
+    ladder, the second differences x[i+2m] - 2x[i+m] + x[i] are accumulated (overlapping ADEV),
+    along with their moving sums over m terms (MDEV, TDEV = tau * MDEV / sqrt(3)). Memory is
+    O(max_m).
+    """
+
+    def __init__(self, tau0, max_m=STABILITY_MAX_M):
+        self.tau0 = tau0
+        self.ladder = tau_ladder(max_m)
+        self.size = 3 * self.ladder[-1] + 1
+        self.history = [0.0] * self.size
+        self.count = 0
+        # Per m: [adev sum, adev terms, mdev sum, mdev terms, moving window, window sum].
+        self.terms = {m: [0.0, 0, 0.0, 0, deque(), 0.0] for m in self.ladder}
+
+    def add(self, value):
+        index = self.count
+        self.history[index % self.size] = float(value)
+        self.count += 1
+        for m in self.ladder:
+            if index < 2 * m:
+                break
+            terms = self.terms[m]
+            diff = value - 2.0 * self.history[(index - m) % self.size] + self.history[(index - 2 * m) % self.size]
+            terms[0] += diff * diff
+            terms[1] += 1
+            window = terms[4]
+            window.append(diff)
+            terms[5] += diff
+            if len(window) > m:
+                terms[5] -= window.popleft()
+            if len(window) == m:
+                terms[2] += terms[5] * terms[5]
+                terms[3] += 1
+
+    def report(self):
+        rows = []
+        for m in self.ladder:
+            adev_sum, adev_terms, mdev_sum, mdev_terms, _, _ = self.terms[m]
+            if not adev_terms:
+                break
+            tau = m * self.tau0
+            rows.append({
+                "tau_s": tau,
+                "m": m,
+                "adev": math.sqrt(adev_sum / (2.0 * adev_terms)) / (tau * 1e9),
+                "tdev_ns": math.sqrt(mdev_sum / (6.0 * m * m * mdev_terms)) if mdev_terms else None,
+                "count": adev_terms,
+            })
+        return rows
+
+
+class StatusSeries:
+    """Incremental summary of a status sample series (bounded memory, for long soaks)."""
+
+    def __init__(self, error_fn, tau0=None, quality_fn=None):
+        self.error_fn = error_fn
+        self.quality_fn = quality_fn
+        self.count = 0
+        self.first = None
+        self.last = None
+        self.signed = StreamingStats()
+        self.absolute = StreamingStats()
+        self.stability = StabilityStats(tau0) if tau0 else None
+        self.quality = {}
+
+    @classmethod
+    def from_samples(cls, samples, error_fn, tau0=None, quality_fn=None):
+        series = cls(error_fn, tau0, quality_fn)
+        for sample in samples:
+            series.add(sample)
+        return series
+
+    def add(self, sample):
+        error = self.error_fn(sample)
+        self.count += 1
+        if self.first is None:
+            self.first = sample
+        self.last = sample
+        self.signed.add(error)
+        self.absolute.add(abs(error))
+        if self.stability is not None:
+            self.stability.add(error)
+        if self.quality_fn is not None:
+            for name, flag in self.quality_fn(sample).items():
+                self.quality[name] = self.quality.get(name, 0) + int(flag)
+
+    def samples_summary(self):
+        return {
+            "count": self.count,
+            "first_refresh_time_unix": self.first.get("refresh_time_unix"),
+            "last_refresh_time_unix": self.last.get("refresh_time_unix"),
+        }
+
+    def error_summary(self):
+        return {
+            "signed": self.signed.summary(),
+            "absolute": self.absolute.summary(),
+            "last": self.error_fn(self.last),
+        }
+
+
+def ptp_series(max_error_ns, tau0=None):
+    return StatusSeries(signed_error_ns, tau0, lambda sample: sample_quality_flags(sample, max_error_ns))
+
+
+def clock10_error_ns(status):
+    return int(status.get("last_error_ns", 0))
+
+
+def sample_quality_flags(sample, max_error_ns):
     return {
-        "ptp_unlocked_count": sum(not sample.get("ptp_locked", False) for sample in samples),
-        "time_unlocked_count": sum(not sample.get("time_locked", False) for sample in samples),
-        "holdover_count": sum(sample.get("holdover", False) for sample in samples),
-        "over_error_limit_count": sum(abs_error_ns(sample) > max_error_ns for sample in samples),
+        "ptp_unlocked_count": not sample.get("ptp_locked", False),
+        "time_unlocked_count": not sample.get("time_locked", False),
+        "holdover_count": sample.get("holdover", False),
+        "over_error_limit_count": abs_error_ns(sample) > max_error_ns,
     }
 
 
-def calibration_error_samples(samples, max_error_ns):
+def sample_quality(samples, max_error_ns):
+    quality = dict.fromkeys(sample_quality_flags({"last_error_ns": 0}, max_error_ns), 0)
+    for sample in samples:
+        for name, flag in sample_quality_flags(sample, max_error_ns).items():
+            quality[name] += int(flag)
+    return quality
+
+
+def calibration_sample_ok(sample, max_error_ns):
     # Calibration bias should use only samples where both the PTP source and
     # local TimeGenerator are locked; outliers would bake transient loss into
     # the suggested static compensation.
-    return [
-        signed_error_ns(sample)
-        for sample in samples
-        if (
-            sample.get("ptp_locked", False)
-            and sample.get("time_locked", False)
-            and not sample.get("holdover", False)
-            and abs_error_ns(sample) <= max_error_ns
-        )
-    ]
+    return (
+        sample.get("ptp_locked", False)
+        and sample.get("time_locked", False)
+        and not sample.get("holdover", False)
+        and abs_error_ns(sample) <= max_error_ns
+    )
+
+
+def calibration_error_samples(samples, max_error_ns):
+    return [signed_error_ns(sample) for sample in samples if calibration_sample_ok(sample, max_error_ns)]
 
 
 def evaluate_clock10_status(status, require_lock=False):
@@ -210,17 +598,13 @@ def evaluate_clock10_status(status, require_lock=False):
 def clock10_report(first, samples):
     if not samples:
         return None
-    last = samples[-1]
+    # Long soaks pass a StatusSeries; short runs pass the sample list.
+    series = samples if isinstance(samples, StatusSeries) else StatusSeries.from_samples(samples, clock10_error_ns)
+    last = series.last
     # Keep clk10 discipline metrics separate from board-time metrics; the two
     # loops share the PTP reference but have independent lock and rate counters.
-    signed_errors = [int(sample.get("last_error_ns", 0)) for sample in samples]
-    abs_errors = [abs(value) for value in signed_errors]
-    return {
-        "samples": {
-            "count": len(samples),
-            "first_refresh_time_unix": samples[0].get("refresh_time_unix"),
-            "last_refresh_time_unix": last.get("refresh_time_unix"),
-        },
+    report = {
+        "samples": series.samples_summary(),
         "lock": {
             "enabled": last.get("enabled", False),
             "active": last.get("active", False),
@@ -230,14 +614,13 @@ def clock10_report(first, samples):
             "aligned": last.get("aligned", False),
             "rate_limited": last.get("rate_limited", False),
         },
-        "error_ns": {
-            "signed": numeric_stats(signed_errors),
-            "absolute": numeric_stats(abs_errors),
-            "last": signed_errors[-1],
-        },
+        "error_ns": series.error_summary(),
         "counter_deltas": optional_counter_deltas(first, last, CLOCK10_COUNTERS),
         "status": last,
     }
+    if series.stability is not None:
+        report["stability"] = series.stability.report()
+    return report
 
 
 def evaluate_status(status, max_error_ns):
@@ -340,9 +723,10 @@ def run_board_smoke(args):
 
 
 def build_report(command, args, first, samples, discipline_deltas, tcpdump_seen, failures, extra=None, clock10=None):
-    last = samples[-1]
-    signed_errors = [signed_error_ns(sample) for sample in samples]
-    abs_errors = [abs(value) for value in signed_errors]
+    # Long soaks pass a StatusSeries; short runs pass the sample list.
+    series = samples if isinstance(samples, StatusSeries) else StatusSeries.from_samples(
+        samples, signed_error_ns, quality_fn=lambda sample: sample_quality_flags(sample, args.max_error_ns))
+    last = series.last
     report = {
         "command": command,
         "target": {
@@ -354,11 +738,7 @@ def build_report(command, args, first, samples, discipline_deltas, tcpdump_seen,
         "limits": {
             "max_error_ns": args.max_error_ns,
         },
-        "samples": {
-            "count": len(samples),
-            "first_refresh_time_unix": samples[0].get("refresh_time_unix"),
-            "last_refresh_time_unix": last.get("refresh_time_unix"),
-        },
+        "samples": series.samples_summary(),
         "lock": {
             "enabled": last["enabled"],
             "active": last["active"],
@@ -372,12 +752,8 @@ def build_report(command, args, first, samples, discipline_deltas, tcpdump_seen,
             "ip": last["master_ip"],
             "port": last["master_port"]["identity"],
         },
-        "error_ns": {
-            "signed": numeric_stats(signed_errors),
-            "absolute": numeric_stats(abs_errors),
-            "last": signed_error_ns(last),
-        },
-        "sample_quality": sample_quality(samples, args.max_error_ns),
+        "error_ns": series.error_summary(),
+        "sample_quality": series.quality,
         "counter_deltas": {
             "discipline": discipline_deltas,
         },
@@ -386,6 +762,8 @@ def build_report(command, args, first, samples, discipline_deltas, tcpdump_seen,
         "failures": sorted(set(failures)),
         "status": last,
     }
+    if series.stability is not None:
+        report["stability"] = series.stability.report()
     if clock10 is not None:
         report["clock10"] = clock10
     if extra:
@@ -393,14 +771,27 @@ def build_report(command, args, first, samples, discipline_deltas, tcpdump_seen,
     return report
 
 
+def raw_samples_path(path):
+    return path.with_name(path.stem + ".samples.jsonl")
+
+
+def clock10_csv_path(path):
+    # Use a sidecar CSV so existing PTP time-discipline analysis keeps a stable schema.
+    return path.with_name(path.stem + ".clock10" + path.suffix)
+
+
 def write_json_report(path, report, samples, clock10_samples=None):
     if not path:
         return
     path.parent.mkdir(parents=True, exist_ok=True)
     payload = dict(report)
-    payload["raw_samples"] = samples
-    if clock10_samples is not None:
-        payload["raw_clock10_samples"] = clock10_samples
+    if samples is None:
+        # Samples were streamed to a JSON lines file during the run.
+        payload["raw_samples_path"] = str(raw_samples_path(path))
+    else:
+        payload["raw_samples"] = samples
+        if clock10_samples is not None:
+            payload["raw_clock10_samples"] = clock10_samples
     path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
 
 
@@ -408,18 +799,7 @@ def write_csv_samples(path, samples):
     if not path:
         return
     path.parent.mkdir(parents=True, exist_ok=True)
-    fields = [
-        "refresh_time_unix",
-        "state_name",
-        "ptp_locked",
-        "time_locked",
-        "holdover",
-        "last_error_ns",
-        "ptp_lock_losses",
-        "time_lock_misses",
-        "time_lock_miss_count",
-        "time_lock_losses",
-    ]
+    fields = PTP_CSV_FIELDS
     with path.open("w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=fields, lineterminator="\n")
         writer.writeheader()
@@ -430,26 +810,8 @@ def write_csv_samples(path, samples):
 def write_clock10_csv_samples(path, samples):
     if not path or not samples:
         return
-    # Use a sidecar CSV so existing PTP time-discipline analysis keeps a stable schema.
-    clock10_path = path.with_name(path.stem + ".clock10" + path.suffix)
-    fields = [
-        "refresh_time_unix",
-        "enabled",
-        "active",
-        "reference_locked",
-        "clock_locked",
-        "holdover",
-        "aligned",
-        "rate_limited",
-        "last_error_ns",
-        "last_error_ticks",
-        "last_rate",
-        "sample_count",
-        "missing_count",
-        "lock_loss_count",
-        "rate_update_count",
-        "saturation_count",
-    ]
+    clock10_path = clock10_csv_path(path)
+    fields = CLOCK10_CSV_FIELDS
     with clock10_path.open("w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=fields, lineterminator="\n")
         writer.writeheader()
@@ -494,52 +856,189 @@ def smoke(args):
         raise CheckError("; ".join(failures))
 
 
-def soak(args):
-    if args.duration <= 0:
-        raise CheckError("soak duration must be greater than 0")
-    if args.interval <= 0:
-        raise CheckError("soak interval must be greater than 0")
-
-    first = read_ptp_status(args)
-    clock10_first = read_clock10_status(args) if args.with_clock10 else None
-    samples = []
-    clock10_samples = []
-    failures = []
+def poll_samples(args):
+    """Yield (status, clock10_status) every --interval, one m2sdr_util process per read."""
     deadline = time.monotonic() + args.duration
-
     while True:
         status = read_ptp_status(args)
-        samples.append(status)
-        failures.extend(evaluate_status(status, args.max_error_ns))
-        if args.with_clock10:
-            clock10_status = read_clock10_status(args)
-            clock10_samples.append(clock10_status)
-            failures.extend(evaluate_clock10_status(clock10_status, args.require_clock10_lock))
+        clock10_status = read_clock10_status(args) if args.with_clock10 else None
+        yield status, clock10_status
         if time.monotonic() >= deadline:
             break
         time.sleep(args.interval)
 
-    last = samples[-1]
-    counter_failures, discipline_deltas = evaluate_counter_deltas(first, last)
+
+class SoakState:
+    """Running soak/calibration state.
+
+    Reports are computed incrementally (StatusSeries) so long soaks use bounded memory; raw sample
+    lists are only kept without --session, where they are written at the end of the run. Repeated
+    failure messages are deduplicated and the number of distinct messages is capped.
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self.first = None
+        self.clock10_first = None
+        self.ptp = ptp_series(args.max_error_ns, args.interval)
+        self.clock10 = StatusSeries(clock10_error_ns, args.interval) if args.with_clock10 else None
+        self.calibration = StreamingStats()
+        self.samples = None if args.session else []
+        self.clock10_samples = None if args.session or not args.with_clock10 else []
+        self.failure_counts = {}
+        self.suppressed_failures = 0
+
+    def add_failures(self, failures):
+        for failure in failures:
+            if failure in self.failure_counts or len(self.failure_counts) < MAX_FAILURE_MESSAGES:
+                self.failure_counts[failure] = self.failure_counts.get(failure, 0) + 1
+            else:
+                self.suppressed_failures += 1
+
+    @property
+    def failures(self):
+        failures = list(self.failure_counts)
+        if self.suppressed_failures:
+            failures.append(f"{self.suppressed_failures} further failure(s) not recorded")
+        return failures
+
+    def add(self, status, clock10_status):
+        if self.first is None:
+            self.first, self.clock10_first = status, clock10_status
+        self.ptp.add(status)
+        if calibration_sample_ok(status, self.args.max_error_ns):
+            self.calibration.add(signed_error_ns(status))
+        self.add_failures(evaluate_status(status, self.args.max_error_ns))
+        if self.samples is not None:
+            self.samples.append(status)
+        if self.clock10 is not None:
+            self.clock10.add(clock10_status)
+            self.add_failures(evaluate_clock10_status(clock10_status, self.args.require_clock10_lock))
+            if self.clock10_samples is not None:
+                self.clock10_samples.append(clock10_status)
+
+
+def checkpoint_path(path):
+    return path.with_name(path.stem + ".checkpoint" + path.suffix)
+
+
+def write_checkpoint(path, report):
+    """Atomically write the in-progress report, so a crashed run keeps its statistics."""
+    if not path:
+        return
+    path = checkpoint_path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def collect_samples(args, checkpoint=None):
+    """Run the soak/calibration sampling loop and return its SoakState.
+
+    With --session, samples come from one persistent ptp-stream session (the first streamed sample
+    is the reference) and are written to --csv-out/--json-out as they arrive. `checkpoint(state)`
+    is called every --checkpoint-interval seconds.
+    """
+    state = SoakState(args)
+    if args.session:
+        writer = SampleStreamWriter(args.csv_out, args.json_out)
+        source = PTPStatusSession(args, with_clock10=args.with_clock10)
+    else:
+        state.first = read_ptp_status(args)
+        state.clock10_first = read_clock10_status(args) if args.with_clock10 else None
+        writer = None
+        source = None
+
+    next_checkpoint = time.monotonic() + args.checkpoint_interval
+    try:
+        for status, clock10_status in (source if source else poll_samples(args)):
+            state.add(status, clock10_status)
+            if writer:
+                writer.write(status, clock10_status)
+            if checkpoint and args.checkpoint_interval > 0 and time.monotonic() >= next_checkpoint:
+                checkpoint(state)
+                next_checkpoint += args.checkpoint_interval
+    except BaseException:
+        if source:
+            source.close(check=False)
+        raise
+    else:
+        if source:
+            source.close()
+    finally:
+        if writer:
+            writer.close()
+
+    if not state.ptp.count:
+        raise CheckError("no PTP status samples received")
+    return state
+
+
+def write_outputs(args, report, state):
+    if args.json_out:
+        # The final report supersedes the in-progress checkpoint.
+        checkpoint_path(args.json_out).unlink(missing_ok=True)
+    if args.session:
+        # CSV rows and raw samples were streamed during the run.
+        write_json_report(args.json_out, report, None)
+        return
+    write_json_report(args.json_out, report, state.samples, state.clock10_samples)
+    write_csv_samples(args.csv_out, state.samples)
+    write_clock10_csv_samples(args.csv_out, state.clock10_samples)
+
+
+def soak_report(command, args, state, extra=None, extra_failures=()):
+    failures = state.failures
+    counter_failures, discipline_deltas = evaluate_counter_deltas(state.first, state.ptp.last)
     failures.extend(counter_failures)
-    report = build_report(
-        "soak",
+    failures.extend(extra_failures)
+    return build_report(
+        command,
         args,
-        first,
-        samples,
+        state.first,
+        state.ptp,
         discipline_deltas,
         None,
         failures,
-        clock10=clock10_report(clock10_first, clock10_samples) if args.with_clock10 else None,
+        extra=extra,
+        clock10=clock10_report(state.clock10_first, state.clock10) if state.clock10 is not None else None,
     )
-    write_json_report(args.json_out, report, samples, clock10_samples)
-    write_csv_samples(args.csv_out, samples)
-    write_clock10_csv_samples(args.csv_out, clock10_samples)
+
+
+def calibration_extra(args, state):
+    """Return the calibration report section and its failures."""
+    reference_offset = args.reference_offset_ns if args.reference_offset_ns is not None else 0.0
+    observed_bias = state.calibration.percentile(50)
+    suggested_compensation = None if observed_bias is None else reference_offset - observed_bias
+    failures = [] if state.calibration.count else ["no locked in-limit samples for calibration"]
+    return {
+        "calibration": {
+            "samples_used": state.calibration.count,
+            "reference_offset_ns": reference_offset,
+            "observed_signed_error_median_ns": observed_bias,
+            "suggested_compensation_ns": suggested_compensation,
+            "external_reference_required": args.reference_offset_ns is None,
+        },
+    }, failures
+
+
+def soak(args):
+    if args.duration <= 0:
+        raise CheckError("soak duration must be greater than 0")
+    if args.interval <= 0:
+        raise CheckError("soak interval must be greater than 0")
+
+    def checkpoint(state):
+        write_checkpoint(args.json_out, soak_report("soak", args, state))
+
+    state = collect_samples(args, checkpoint if args.json_out else None)
+    report = soak_report("soak", args, state)
+    write_outputs(args, report, state)
     print_summary(report)
 
-    if failures:
-        unique_failures = sorted(set(failures))
-        raise CheckError("; ".join(unique_failures))
+    if report["failures"]:
+        raise CheckError("; ".join(report["failures"]))
 
 
 def calibrate(args):
@@ -548,66 +1047,22 @@ def calibrate(args):
     if args.interval <= 0:
         raise CheckError("calibration interval must be greater than 0")
 
-    first = read_ptp_status(args)
-    clock10_first = read_clock10_status(args) if args.with_clock10 else None
-    samples = []
-    clock10_samples = []
-    failures = []
-    deadline = time.monotonic() + args.duration
+    def checkpoint(state):
+        write_checkpoint(args.json_out, soak_report("calibrate", args, state, *calibration_extra(args, state)))
 
-    while True:
-        status = read_ptp_status(args)
-        samples.append(status)
-        failures.extend(evaluate_status(status, args.max_error_ns))
-        if args.with_clock10:
-            clock10_status = read_clock10_status(args)
-            clock10_samples.append(clock10_status)
-            failures.extend(evaluate_clock10_status(clock10_status, args.require_clock10_lock))
-        if time.monotonic() >= deadline:
-            break
-        time.sleep(args.interval)
-
-    last = samples[-1]
-    counter_failures, discipline_deltas = evaluate_counter_deltas(first, last)
-    failures.extend(counter_failures)
-
-    signed_errors = calibration_error_samples(samples, args.max_error_ns)
-    reference_offset = args.reference_offset_ns if args.reference_offset_ns is not None else 0.0
-    observed_bias = percentile(signed_errors, 50)
-    suggested_compensation = None if observed_bias is None else reference_offset - observed_bias
-    if not signed_errors:
-        failures.append("no locked in-limit samples for calibration")
-    extra = {
-        "calibration": {
-            "samples_used": len(signed_errors),
-            "reference_offset_ns": reference_offset,
-            "observed_signed_error_median_ns": observed_bias,
-            "suggested_compensation_ns": suggested_compensation,
-            "external_reference_required": args.reference_offset_ns is None,
-        },
-    }
-    report = build_report(
-        "calibrate",
-        args,
-        first,
-        samples,
-        discipline_deltas,
-        None,
-        failures,
-        extra=extra,
-        clock10=clock10_report(clock10_first, clock10_samples) if args.with_clock10 else None,
-    )
-    write_json_report(args.json_out, report, samples, clock10_samples)
-    write_csv_samples(args.csv_out, samples)
-    write_clock10_csv_samples(args.csv_out, clock10_samples)
+    state = collect_samples(args, checkpoint if args.json_out else None)
+    report = soak_report("calibrate", args, state, *calibration_extra(args, state))
+    write_outputs(args, report, state)
     print_summary(report)
+    calibration = report["calibration"]
+    observed_bias = calibration["observed_signed_error_median_ns"]
     print("Calibration")
     print("-----------")
-    print(f"Samples Used     : {len(signed_errors)}")
-    print(f"Reference Offset : {reference_offset:.1f} ns")
+    print(f"Samples Used     : {calibration['samples_used']}")
+    print(f"Reference Offset : {calibration['reference_offset_ns']:.1f} ns")
     if observed_bias is not None:
         print(f"Median Error     : {observed_bias:.1f} ns")
-        print(f"Suggested Comp.  : {suggested_compensation:.1f} ns")
+        print(f"Suggested Comp.  : {calibration['suggested_compensation_ns']:.1f} ns")
     else:
         print("Median Error     : n/a")
         print("Suggested Comp.  : n/a")
@@ -617,9 +1072,47 @@ def calibrate(args):
             "this is residual servo bias, not an absolute PHY/PPS calibration."
         )
 
-    if failures:
-        unique_failures = sorted(set(failures))
-        raise CheckError("; ".join(unique_failures))
+    if report["failures"]:
+        raise CheckError("; ".join(report["failures"]))
+
+
+def analyze(args):
+    # NumPy is only needed for offline analysis.
+    import m2sdr_ptp_stability as stability
+
+    paths = []
+    for path in args.csv:
+        paths.append(("ptp", path))
+        sidecar = clock10_csv_path(path)
+        if sidecar.exists() and sidecar not in args.csv:
+            paths.append(("clock10", sidecar))
+
+    report = {"command": "analyze", "series": []}
+    for kind, path in paths:
+        try:
+            values, times = stability.read_csv_series(path, args.column)
+        except (OSError, ValueError) as e:
+            raise CheckError(str(e))
+        tau0 = args.tau0 if args.tau0 is not None else stability.estimate_tau0(times)
+        if tau0 is None:
+            raise CheckError(f"{path}: cannot infer the sample period, use --tau0")
+        rows = stability.analyze(values, tau0)
+        report["series"].append({"kind": kind, "path": str(path), "count": len(values), "tau0_s": tau0, "stability": rows})
+
+        print(f"{kind}: {path} ({len(values)} samples, tau0={tau0:g} s)")
+        print(f"{'Tau (s)':>12} {'ADEV':>12} {'MDEV':>12} {'TDEV (ns)':>12} {'MTIE (ns)':>12}")
+        for row in rows:
+            print(
+                f"{row['tau_s']:12g} {row['adev']:12.3e} {row['mdev']:12.3e} "
+                f"{row['tdev_ns']:12.3f} {row['mtie_ns']:12.1f}"
+            )
+        if not rows:
+            print("  not enough samples")
+
+    if args.json_out:
+        args.json_out.parent.mkdir(parents=True, exist_ok=True)
+        args.json_out.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return report
 
 
 def print_summary(report):
@@ -706,7 +1199,18 @@ def add_common_args(parser):
     parser.add_argument("--tcpdump-timeout", type=int,   default=12,                   help="tcpdump timeout in seconds")
     parser.add_argument("--json-out",        type=Path,  default=None,                 help="write full JSON report and raw samples")
     parser.add_argument("--csv-out",         type=Path,  default=None,                 help="write sampled status rows as CSV")
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=60.0,
+        help="soak/calibrate: rewrite the in-progress report to <json-out stem>.checkpoint.json every N seconds (0 disables)",
+    )
     parser.add_argument("--with-clock10",    action="store_true",                     help="also sample/report ptp-clock10-status")
+    parser.add_argument(
+        "--session",
+        action="store_true",
+        help="soak/calibrate: sample through one persistent m2sdr_util ptp-stream session and stream CSV/JSON samples to disk",
+    )
     parser.add_argument(
         "--require-clock10-lock",
         action="store_true",
@@ -743,6 +1247,16 @@ def main():
     )
     calibrate_parser.set_defaults(func=calibrate)
 
+    analyze_parser = subparsers.add_parser(
+        "analyze",
+        help="ADEV/MDEV/TDEV/MTIE of saved soak/calibrate CSVs (and their clock10 sidecars)",
+    )
+    analyze_parser.add_argument("csv",        type=Path,  nargs="+",                    help="CSV files written with --csv-out")
+    analyze_parser.add_argument("--column",   default="last_error_ns",                  help="time-error column (ns)")
+    analyze_parser.add_argument("--tau0",     type=float, default=None,                 help="sample period in seconds (default: from host_time_ns/refresh_time_unix)")
+    analyze_parser.add_argument("--json-out", type=Path,  default=None,                 help="write the stability tables as JSON")
+    analyze_parser.set_defaults(func=analyze)
+
     args = parser.parse_args()
 
     try:
@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Offline PTP servo simulator and gain-tuning harness.
+
+TimeServoModel and Clock10ServoModel are sample-level, bit-accurate models of the servo arithmetic
+and state machines of PTPTimeDiscipline and PTPClock10Discipline: fed with the same samples they
+produce the same time increments, phase trims, rate commands, lock states and counters as the
+gateware (cross-checked against the Migen simulations in test/test_ptp_discipline.py and
+test/test_clock_discipline.py).
+
+The closed-loop simulators wrap the models with a simple plant (TimeGenerator in Q8.24 with a
+free-running oscillator offset/random walk for the time servo; a 1PPS marker steered by MMCM fine
+phase steps for the clk10 servo), driven by synthetic or recorded PTP noise traces, and report
+lock time, steady-state error and ADEV. search() evaluates gain settings (grid or random sampling)
+in a process pool.
+"""
+
+import math
+import json
+import random
+import argparse
+import itertools
+import concurrent.futures
+
+import numpy as np
+
+from m2sdr_ptp_stability import adev, read_csv_series
+
+# Constants ----------------------------------------------------------------------------------------
+
+MASK32 = (1 << 32) - 1
+MASK64 = (1 << 64) - 1
+
+# PTPTimeDiscipline: a sample takes update_cycles + 9 sys cycles (probe, 8-stage pipeline).
+TIME_SERVO_SAMPLE_CYCLES = 9
+
+# Knob defaults (gateware reset values; update_cycles defaults to sys_clk_freq // 64).
+TIME_SERVO_DEFAULTS = {
+    "update_cycles"    : None,
+    "coarse_threshold" : 100_000,
+    "phase_threshold"  : 128,
+    "lock_window"      : 4_096,
+    "unlock_misses"    : 64,
+    "coarse_confirm"   : 0,
+    "phase_step_shift" : 2,
+    "phase_step_max"   : 4_096,
+    "trim_limit"       : 200_000,
+    "p_gain"           : 8,
+    "holdover"         : True,
+}
+
+# Knob defaults (gateware reset values; update_cycles defaults to sys_clk_freq // 5MHz and the lock
+# window to 50us of sys ticks).
+CLOCK10_SERVO_DEFAULTS = {
+    "update_cycles" : None,
+    "p_gain"        : 0x00040000,
+    "i_gain"        : 0x00010000,
+    "rate_limit"    : 0x7fffffff,
+    "lock_window"   : None,
+    "invert"        : False,
+    "holdover"      : True,
+}
+
+SCENARIO_DEFAULTS = {
+    "duration"          : 60.0,    # Simulated time (s).
+    "freq_offset_ppb"   : 5_000.0, # Local oscillator frequency offset.
+    "freq_walk_ppb"     : 0.0,     # Oscillator frequency random walk (ppb/sqrt(s)).
+    "noise_ns"          : 20.0,    # PTP time / reference jitter (ns RMS), when no trace is given.
+    "initial_offset_ns" : 0.0,     # clk10 servo: marker phase after the initial alignment (ns).
+    "start_time_ns"     : 1_000_000_000_000,
+    "trace"             : None,    # Recorded PTP noise (ns per sample), repeated as needed.
+    "dropouts"          : [],      # [(start_s, end_s), ...] intervals without PTP lock/reference.
+    "seed"              : 0,
+}
+
+ADEV_TAUS = (1.0, 10.0, 100.0)
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def to_signed(value, bits):
+    value &= (1 << bits) - 1
+    return value - (1 << bits) if value & (1 << (bits - 1)) else value
+
+
+def clamp(value, limit):
+    return max(-limit, min(limit, value))
+
+
+def merge_config(defaults, config, **resolved):
+    unknown = set(config or {}) - set(defaults)
+    if unknown:
+        raise ValueError(f"Unknown servo knob(s): {', '.join(sorted(unknown))}.")
+    merged = dict(defaults, **(config or {}))
+    for name, value in resolved.items():
+        if merged[name] is None:
+            merged[name] = value
+    return merged
+
+# Time Servo Model ---------------------------------------------------------------------------------
+
+class TimeServoModel:
+    """
+    Sample-level model of PTPTimeDiscipline (enabled).
+
+    sample(ptp_time_ns, local_time_ns, ptp_locked) runs one servo sample and returns the action
+    applied to the TimeGenerator: {"write": time or None, "adjust": signed ns or None,
+    "time_inc": Q8.24 increment}. Attributes mirror the gateware status signals.
+    """
+    STATE_ACQUIRE  = 1
+    STATE_LOCKED   = 2
+    STATE_HOLDOVER = 3
+
+    SECOND_STEP_MIN_NS = 999_000_000
+    SECOND_STEP_MAX_NS = 1_001_000_000
+
+    def __init__(self, nominal_time_inc, **config):
+        self.config           = merge_config(TIME_SERVO_DEFAULTS, config, update_cycles=1)
+        self.nominal_time_inc = nominal_time_inc
+        self.time_inc         = nominal_time_inc
+        self.integral_trim    = 0
+        self.ever_locked      = False
+        self.prev_ptp_locked  = False
+        self.prev_time_locked = False
+        self.locked           = False
+        self.holdover         = False
+        self.state            = self.STATE_ACQUIRE
+        self.last_error       = 0
+        self.last_ptp_time    = 0
+        self.last_local_time  = 0
+        self.coarse_steps         = 0
+        self.phase_steps          = 0
+        self.rate_updates         = 0
+        self.ptp_lock_losses      = 0
+        self.time_lock_misses     = 0
+        self.time_lock_miss_count = 0
+        self.time_lock_losses     = 0
+
+    def sample(self, ptp_time_ns, local_time_ns, ptp_locked=True):
+        c          = self.config
+        trim_limit = c["trim_limit"] & MASK32
+        ptp_time_ns   &= MASK64
+        local_time_ns &= MASK64
+
+        # Error / policy (pipeline stages 3-5).
+        error         = ptp_time_ns - local_time_ns
+        error_abs     = abs(error)
+        phase_shifted = error_abs >> (c["phase_step_shift"] & 0x3f)
+        trim_sum      = self.integral_trim + error*(c["p_gain"] & 0xffff)
+        integral_sum  = self.integral_trim + error
+
+        unlock_miss_limit      = max(c["unlock_misses"], 1) - 1
+        runtime_coarse_enabled = c["coarse_confirm"] != 0
+        coarse_confirm_limit   = max(c["coarse_confirm"], 1) - 1
+        coarse_error           = error_abs >= c["coarse_threshold"]
+        in_lock_window         = error_abs <= c["lock_window"]
+        runtime_coarse         = self.locked and self.ever_locked and coarse_error
+        whole_second_step      = runtime_coarse and (self.SECOND_STEP_MIN_NS <= error_abs <= self.SECOND_STEP_MAX_NS)
+        coarse_countable       = runtime_coarse_enabled and not whole_second_step
+        coarse_allowed         = coarse_countable and (self.time_lock_miss_count >= coarse_confirm_limit)
+
+        if not ptp_locked or not self.ever_locked:
+            next_locked = False
+        elif coarse_error:
+            next_locked = self.locked
+        elif in_lock_window:
+            next_locked = True
+        else:
+            next_locked = self.locked and (self.time_lock_miss_count < unlock_miss_limit)
+        coarse_rejected = runtime_coarse and not coarse_allowed
+        coarse_needed   = (not self.ever_locked) or (coarse_error and (not self.locked or coarse_allowed))
+        phase_needed    = error_abs >= c["phase_threshold"]
+
+        # Step / trim clamping (stage 6).
+        if error_abs == 0:
+            phase_step = 0
+        elif phase_shifted == 0:
+            phase_step = 1
+        else:
+            phase_step = min(phase_shifted, c["phase_step_max"])
+        trim_term     = to_signed(clamp(trim_sum,     trim_limit), 32)
+        integral_next = to_signed(clamp(integral_sum, trim_limit), 32)
+
+        # State / actions (stage 7).
+        action     = {"write": None, "adjust": None}
+        was_locked = self.locked
+        if self.prev_ptp_locked and not ptp_locked:
+            self.ptp_lock_losses += 1
+        if self.prev_time_locked and not next_locked:
+            self.time_lock_losses += 1
+        self.prev_ptp_locked  = ptp_locked
+        self.prev_time_locked = next_locked
+        if not coarse_rejected:
+            self.last_error      = error
+            self.last_ptp_time   = ptp_time_ns
+            self.last_local_time = local_time_ns
+        if ptp_locked:
+            self.holdover    = False
+            self.locked      = next_locked
+            self.state       = self.STATE_LOCKED if next_locked else self.STATE_ACQUIRE
+            self.ever_locked = True
+            if coarse_rejected:
+                self.time_lock_misses += 1
+                self.time_lock_miss_count = self.time_lock_miss_count + 1 if coarse_countable else 0
+            elif coarse_needed:
+                action["write"]           = ptp_time_ns
+                self.time_inc             = self.nominal_time_inc
+                self.coarse_steps        += 1
+                self.time_lock_miss_count = 0
+                self.integral_trim        = 0
+            else:
+                if phase_needed:
+                    action["adjust"]  = -phase_step if error < 0 else phase_step
+                    self.phase_steps += 1
+                self.integral_trim = integral_next
+                self.time_inc      = (self.nominal_time_inc + trim_term) & MASK32
+                self.rate_updates += 1
+                if in_lock_window:
+                    self.time_lock_miss_count = 0
+                elif was_locked and next_locked:
+                    self.time_lock_misses     += 1
+                    self.time_lock_miss_count += 1
+                else:
+                    self.time_lock_miss_count = 0
+        else:
+            self.locked               = False
+            self.time_lock_miss_count = 0
+            if c["holdover"] and self.ever_locked:
+                self.holdover = True
+                self.state    = self.STATE_HOLDOVER
+            else:
+                self.holdover      = False
+                self.state         = self.STATE_ACQUIRE
+                self.time_inc      = self.nominal_time_inc
+                self.integral_trim = 0
+        action["time_inc"] = self.time_inc
+        return action
+
+# Clock10 Servo Model ------------------------------------------------------------------------------
+
+class Clock10ServoModel:
+    """
+    Sample-level model of the PTPClock10Discipline PI loop (enabled, after the initial alignment).
+
+    sample(error_ticks, reference_live) runs one phase-detector sample (clk10 marker minus PTP
+    reference, in sys ticks) through the PI pipeline and returns the signed Q0.32 MMCM fine-step
+    rate command (last_rate). Attributes mirror the gateware status signals.
+    """
+    def __init__(self, **config):
+        self.config            = merge_config(CLOCK10_SERVO_DEFAULTS, config, update_cycles=1, lock_window=1)
+        self.rate_integral     = 0
+        self.last_rate         = 0
+        self.last_error_ticks  = 0
+        self.rate_limited      = False
+        self.locked            = False
+        self.ever_locked       = False
+        self.prev_locked       = False
+        self.sample_count      = 0
+        self.lock_loss_count   = 0
+        self.rate_update_count = 0
+        self.saturation_count  = 0
+
+    def sample(self, error_ticks, reference_live=True):
+        c          = self.config
+        rate_limit = c["rate_limit"] & MASK32
+        error_ticks = to_signed(error_ticks, 32)
+        error_abs   = abs(error_ticks) & MASK32
+        in_window   = error_abs <= max(c["lock_window"], 1)
+
+        # Phase detector sample.
+        self.sample_count    += 1
+        self.last_error_ticks = error_ticks
+        self.locked           = in_window and reference_live
+        self.ever_locked      = self.ever_locked or self.locked
+        if self.prev_locked and not in_window:
+            self.lock_loss_count += 1
+        self.prev_locked = self.locked
+        holdover = c["holdover"] and self.ever_locked and not reference_live
+
+        # PI stages 0/1: gain products, clamped to the rate limit.
+        def magnitude(gain):
+            product = (error_abs*(gain & MASK32)) & MASK64
+            over    = (product >> 32) != 0 or (product & MASK32) > rate_limit
+            return (rate_limit if over else product & MASK32), over
+        p_magnitude, p_over = magnitude(c["p_gain"])
+        i_magnitude, i_over = magnitude(c["i_gain"])
+        negative = (error_ticks > 0) ^ bool(c["invert"])
+        p_delta  = -p_magnitude if negative else p_magnitude
+        i_delta  = -i_magnitude if negative else i_magnitude
+
+        # PI stage 2: integrate / apply.
+        integral = clamp(self.rate_integral + i_delta, rate_limit)
+        command  = clamp(integral + p_delta, rate_limit)
+        self.rate_limited = p_over or i_over
+        if self.rate_limited:
+            self.saturation_count += 1
+        if reference_live:
+            self.rate_update_count += 1
+            self.rate_integral = to_signed(integral, 33)
+            self.last_rate     = to_signed(command,  32)
+        elif not holdover:
+            self.rate_integral = 0
+            self.last_rate     = 0
+        return self.last_rate
+
+# Closed-Loop Simulation ---------------------------------------------------------------------------
+
+def scenario_noise(scenario, count, rng):
+    trace = scenario["trace"]
+    if trace is not None and len(trace):
+        return np.resize(np.asarray(trace, dtype=np.float64), count)
+    return rng.normal(0.0, scenario["noise_ns"], count)
+
+
+def scenario_locked(scenario, times):
+    locked = np.ones(len(times), dtype=bool)
+    for start, end in scenario["dropouts"]:
+        locked &= ~((times >= start) & (times < end))
+    return locked
+
+
+def loop_metrics(errors, locked, period):
+    """Lock time, steady-state error and ADEV of a closed-loop error series (ns)."""
+    unlocked = np.flatnonzero(~locked)
+    lock_index = 0 if not len(unlocked) else int(unlocked[-1]) + 1
+    locked_at_end = lock_index < len(errors)
+    settled = errors[lock_index:] if locked_at_end else errors[len(errors)//2:]
+    metrics = {
+        "samples"          : len(errors),
+        "period_s"         : period,
+        "locked_at_end"    : bool(locked_at_end),
+        "lock_time_s"      : lock_index*period if locked_at_end else None,
+        "mean_error_ns"    : float(np.mean(settled)),
+        "rms_error_ns"     : float(np.sqrt(np.mean(settled**2))),
+        "p99_abs_error_ns" : float(np.percentile(np.abs(settled), 99)),
+        "max_abs_error_ns" : float(np.max(np.abs(settled))),
+        "adev"             : {},
+    }
+    for tau in ADEV_TAUS:
+        m = int(round(tau/period))
+        if m >= 1 and 2*m < len(settled):
+            metrics["adev"][f"{tau:g}"] = float(adev(settled, period, [m])[0])
+    return metrics
+
+
+def simulate_time_servo(config=None, scenario=None, sys_clk_freq=100e6, time_clk_freq=100e6, with_trace=False):
+    """Closed-loop PTPTimeDiscipline + TimeGenerator simulation; returns loop metrics.
+
+    The TimeGenerator accumulates the servo Q8.24 increment on each tick of a time clock with the
+    scenario frequency offset/walk; PTP samples are true time plus noise. Servo actions are applied
+    at the sample instant (pipeline/CDC latency is not modelled).
+    """
+    scenario = merge_config(SCENARIO_DEFAULTS, scenario)
+    nominal  = int(round((1e9/time_clk_freq)*(1 << 24)))
+    servo    = TimeServoModel(nominal, **merge_config(TIME_SERVO_DEFAULTS, config,
+        update_cycles=max(1, int(sys_clk_freq//64))))
+    period   = (max(servo.config["update_cycles"], 1) + TIME_SERVO_SAMPLE_CYCLES)/sys_clk_freq
+    count    = max(1, int(scenario["duration"]/period))
+
+    rng    = np.random.default_rng(scenario["seed"])
+    times  = np.arange(count)*period
+    noise  = scenario_noise(scenario, count, rng)
+    ptp_ok = scenario_locked(scenario, times)
+    walk   = np.cumsum(rng.normal(0.0, scenario["freq_walk_ppb"]*math.sqrt(period), count))
+    ticks  = period*time_clk_freq*(1 + (scenario["freq_offset_ppb"] + walk)*1e-9)
+
+    errors = np.empty(count)
+    locked = np.empty(count, dtype=bool)
+    acc    = 0   # TimeGenerator time/fraction (Q8.24 ns).
+    phase  = 0.0 # Fractional time-clock ticks.
+    for k in range(count):
+        true_time  = scenario["start_time_ns"] + k*period*1e9
+        local_time = acc >> 24
+        action     = servo.sample(int(round(true_time + noise[k])), local_time, bool(ptp_ok[k]))
+        errors[k]  = true_time - local_time
+        locked[k]  = servo.locked
+        if action["write"] is not None:
+            acc = action["write"] << 24
+        if action["adjust"] is not None:
+            acc = max(0, acc + (action["adjust"] << 24))
+        phase += ticks[k]
+        n      = int(phase)
+        phase -= n
+        acc    = (acc + n*servo.time_inc) & ((1 << 88) - 1)
+
+    metrics = loop_metrics(errors, locked, period)
+    metrics.update(coarse_steps=servo.coarse_steps, phase_steps=servo.phase_steps,
+        time_lock_losses=servo.time_lock_losses)
+    if with_trace:
+        metrics["trace"] = errors.tolist()
+    return metrics
+
+
+def simulate_clock10_servo(config=None, scenario=None, sys_clk_freq=100e6, step_ps=1000/56, with_trace=False):
+    """Closed-loop PTPClock10Discipline + MMCMPhaseDiscipline simulation; returns loop metrics.
+
+    One phase sample per PPS: the marker phase (ns, after the initial alignment) drifts with the
+    scenario frequency offset and moves by one MMCM fine step (step_ps) per Q0.32 rate-accumulator
+    carry; positive steps delay the marker. The detector quantizes phase plus noise to sys ticks.
+    """
+    scenario = merge_config(SCENARIO_DEFAULTS, scenario)
+    servo    = Clock10ServoModel(**merge_config(CLOCK10_SERVO_DEFAULTS, config,
+        update_cycles = max(1, int(sys_clk_freq//5_000_000)),
+        lock_window   = max(1, int(sys_clk_freq*50e-6))))
+    period   = 1.0
+    count    = max(1, int(scenario["duration"]/period))
+    tick_ns  = 1e9/sys_clk_freq
+    updates  = int(sys_clk_freq//max(servo.config["update_cycles"], 1))
+
+    rng    = np.random.default_rng(scenario["seed"])
+    times  = np.arange(count)*period
+    noise  = scenario_noise(scenario, count, rng)
+    ref_ok = scenario_locked(scenario, times)
+    walk   = np.cumsum(rng.normal(0.0, scenario["freq_walk_ppb"]*math.sqrt(period), count))
+    drift  = (scenario["freq_offset_ppb"] + walk)*period
+
+    errors = np.empty(count)
+    locked = np.empty(count, dtype=bool)
+    phase  = scenario["initial_offset_ns"]
+    acc    = 0 # MMCMPhaseDiscipline Q0.32 accumulator.
+    for k in range(count):
+        rate      = servo.sample(int(math.floor((phase + noise[k])/tick_ns)), bool(ref_ok[k]))
+        errors[k] = phase
+        locked[k] = servo.locked
+        total     = acc + updates*abs(rate)
+        acc       = total & MASK32
+        steps     = total >> 32
+        phase    += drift[k] + (steps if rate > 0 else -steps)*step_ps/1000
+
+    metrics = loop_metrics(errors, locked, period)
+    metrics.update(saturation_count=servo.saturation_count, lock_loss_count=servo.lock_loss_count)
+    if with_trace:
+        metrics["trace"] = errors.tolist()
+    return metrics
+
+
+SIMULATORS = {
+    "time"    : (simulate_time_servo,    TIME_SERVO_DEFAULTS),
+    "clock10" : (simulate_clock10_servo, CLOCK10_SERVO_DEFAULTS),
+}
+
+# Gain Search --------------------------------------------------------------------------------------
+
+def grid_configs(space):
+    """All combinations of {knob: [values]}."""
+    names = sorted(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_configs(space, count, seed=0):
+    """`count` random draws from {knob: [values]} (without repeats when the grid is smaller)."""
+    rng     = random.Random(seed)
+    configs = grid_configs(space)
+    if count >= len(configs):
+        return configs
+    return rng.sample(configs, count)
+
+
+def rank_key(result):
+    metrics = result["metrics"]
+    lock    = metrics["lock_time_s"]
+    return (not metrics["locked_at_end"], metrics["rms_error_ns"], math.inf if lock is None else lock)
+
+
+def _evaluate(job):
+    kind, config, scenario, options = job
+    simulate, _ = SIMULATORS[kind]
+    return {"config": config, "metrics": simulate(config, scenario, **options)}
+
+
+def search(kind, configs, scenario=None, workers=None, **options):
+    """Simulate each gain setting in a process pool; results are sorted best first (locked, RMS
+    steady-state error, lock time)."""
+    jobs = [(kind, config, scenario, options) for config in configs]
+    if workers == 1:
+        results = [_evaluate(job) for job in jobs]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_evaluate, jobs))
+    return sorted(results, key=rank_key)
+
+# Main ---------------------------------------------------------------------------------------------
+
+def parse_value(value):
+    if value.lower() in ["true", "false"]:
+        return value.lower() == "true"
+    try:
+        return int(value, 0)
+    except ValueError:
+        return float(value)
+
+
+def parse_knobs(specs, multiple=False):
+    knobs = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if not values:
+            raise ValueError(f"Invalid knob specification {spec!r} (expected NAME=VALUE[,VALUE...]).")
+        values = [parse_value(value) for value in values.split(",")]
+        knobs[name] = values if multiple else values[0]
+    return knobs
+
+
+def format_result(result):
+    metrics = result["metrics"]
+    lock    = metrics["lock_time_s"]
+    adevs   = " ".join(f"adev({tau}s)={value:.2e}" for tau, value in metrics["adev"].items())
+    return (f"{json.dumps(result['config'], sort_keys=True)}: "
+        f"lock={'n/a' if lock is None else f'{lock:.3f}s'} "
+        f"rms={metrics['rms_error_ns']:.1f}ns p99={metrics['p99_abs_error_ns']:.1f}ns {adevs}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Offline PTP servo simulator and gain search.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("servo", choices=sorted(SIMULATORS),                    help="Servo to simulate")
+    parser.add_argument("--duration",          default=60.0,   type=float,    help="Simulated time (s)")
+    parser.add_argument("--freq-offset-ppb",   default=5000.0, type=float,    help="Oscillator frequency offset (ppb)")
+    parser.add_argument("--freq-walk-ppb",     default=0.0,    type=float,    help="Oscillator frequency random walk (ppb/sqrt(s))")
+    parser.add_argument("--noise-ns",          default=20.0,   type=float,    help="PTP/reference jitter (ns RMS)")
+    parser.add_argument("--initial-offset-ns", default=0.0,    type=float,    help="clk10: marker phase after alignment (ns)")
+    parser.add_argument("--trace",             default=None,                  help="CSV with a recorded noise trace (ns per sample)")
+    parser.add_argument("--trace-column",      default="last_error_ns",       help="Trace CSV column")
+    parser.add_argument("--seed",              default=0,      type=int,      help="Random seed")
+    parser.add_argument("--sys-clk-freq",      default=100e6,  type=float,    help="System clock frequency (Hz)")
+    parser.add_argument("--set",    action="append", default=[], metavar="KNOB=VALUE",      help="Fixed servo knob")
+    parser.add_argument("--grid",   action="append", default=[], metavar="KNOB=V1,V2,...",  help="Searched servo knob values")
+    parser.add_argument("--random",            default=0,      type=int,      help="Evaluate N random grid points instead of the full grid")
+    parser.add_argument("--workers",           default=None,   type=int,      help="Worker processes (default: CPU count)")
+    parser.add_argument("--top",               default=10,     type=int,      help="Results to print")
+    parser.add_argument("--json-out",          default=None,                  help="Write all results as JSON")
+    args = parser.parse_args()
+
+    scenario = {
+        "duration"          : args.duration,
+        "freq_offset_ppb"   : args.freq_offset_ppb,
+        "freq_walk_ppb"     : args.freq_walk_ppb,
+        "noise_ns"          : args.noise_ns,
+        "initial_offset_ns" : args.initial_offset_ns,
+        "seed"              : args.seed,
+    }
+    if args.trace:
+        scenario["trace"] = read_csv_series(args.trace, args.trace_column)[0].tolist()
+
+    fixed = parse_knobs(args.set)
+    space = parse_knobs(args.grid, multiple=True)
+    configs = random_configs(space, args.random, args.seed) if args.random else grid_configs(space)
+    configs = [dict(fixed, **config) for config in configs]
+
+    results = search(args.servo, configs, scenario, workers=args.workers, sys_clk_freq=args.sys_clk_freq)
+    for result in results[:args.top]:
+        print(format_result(result))
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Time-stability analysis of PTP discipline error series (ADEV, MDEV, TDEV, MTIE).
+
+The input is a time-error series x (ns) sampled every tau0 seconds, such as the `last_error_ns`
+column of the CSVs written by `m2sdr_ptp_check.py soak/calibrate` (PTPTimeDiscipline) and their
+`*.clock10.csv` sidecar (PTPClock10Discipline). All estimators are overlapping and vectorized
+with NumPy:
+
+- ADEV/MDEV/TDEV use second differences and cumulative sums, O(N) per tau.
+- MTIE uses sliding-window min/max built by doubling, O(N log(max window)) for the whole ladder.
+
+The estimators assume uniform sampling; gaps in the series are not interpolated.
+"""
+
+import csv
+import math
+
+import numpy as np
+
+
+def m_ladder(count):
+    """1-2-5 ladder of averaging factors with at least one MDEV/TDEV term (3m < count)."""
+    ladder = []
+    decade = 1
+    while True:
+        for step in (1, 2, 5):
+            m = step * decade
+            if 3 * m >= count:
+                return ladder
+            ladder.append(m)
+        decade *= 10
+
+
+def second_differences(x, m):
+    return x[2 * m:] - 2.0 * x[m:-m] + x[:-2 * m]
+
+
+def adev(x, tau0, ms):
+    """Overlapping Allan deviation (fractional frequency) for each averaging factor of ms."""
+    x = np.asarray(x, dtype=np.float64) * 1e-9
+    return np.array([
+        math.sqrt(np.mean(second_differences(x, m) ** 2) / 2.0) / (m * tau0) for m in ms
+    ])
+
+
+def _mvar_terms(x, m):
+    # Moving sums over m of the second differences, from block sums of x:
+    # sum_{i=j}^{j+m-1} (x[i+2m] - 2x[i+m] + x[i]) = B[j+2m] - 2B[j+m] + B[j].
+    cumsum = np.concatenate(([0.0], np.cumsum(x)))
+    blocks = cumsum[m:] - cumsum[:-m]
+    return second_differences(blocks, m)
+
+
+def mdev(x, tau0, ms):
+    """Modified Allan deviation (fractional frequency) for each averaging factor of ms."""
+    x = np.asarray(x, dtype=np.float64) * 1e-9
+    return np.array([
+        math.sqrt(np.mean(_mvar_terms(x, m) ** 2) / (2.0 * m * m)) / (m * tau0) for m in ms
+    ])
+
+
+def tdev(x, ms):
+    """Time deviation (units of x) for each averaging factor of ms: TDEV = tau * MDEV / sqrt(3)."""
+    x = np.asarray(x, dtype=np.float64)
+    return np.array([
+        math.sqrt(np.mean(_mvar_terms(x, m) ** 2) / (6.0 * m * m)) for m in ms
+    ])
+
+
+def mtie(x, ms):
+    """Maximum time interval error (units of x) over observation windows of m*tau0 (m+1 points)."""
+    x = np.asarray(x, dtype=np.float64)
+    result = {}
+    # Running max/min over windows of `width` points, doubled until the next window fits.
+    width = 1
+    maxs = mins = x
+    for m in sorted(ms):
+        window = m + 1
+        if window > len(x):
+            break
+        while 2 * width <= window:
+            maxs = np.maximum(maxs[:-width], maxs[width:])
+            mins = np.minimum(mins[:-width], mins[width:])
+            width *= 2
+        # Two overlapping power-of-two windows cover the m+1 points.
+        shift = window - width
+        window_max = np.maximum(maxs[:len(maxs) - shift], maxs[shift:])
+        window_min = np.minimum(mins[:len(mins) - shift], mins[shift:])
+        result[m] = float(np.max(window_max - window_min))
+    return np.array([result[m] for m in ms])
+
+
+def analyze(x, tau0, ms=None):
+    """Return the stability table of a time-error series (ns) as a list of per-tau rows."""
+    x = np.asarray(x, dtype=np.float64)
+    ms = m_ladder(len(x)) if ms is None else list(ms)
+    if not ms:
+        return []
+    columns = zip(ms, adev(x, tau0, ms), mdev(x, tau0, ms), tdev(x, ms), mtie(x, ms))
+    return [
+        {
+            "tau_s": m * tau0,
+            "m": m,
+            "adev": float(a),
+            "mdev": float(md),
+            "tdev_ns": float(t),
+            "mtie_ns": float(mt),
+        }
+        for m, a, md, t, mt in columns
+    ]
+
+
+def read_csv_series(path, column="last_error_ns"):
+    """Read a time-error column and the sample times (s) from a soak CSV; rows without a value are skipped.
+
+    Sample times come from `host_time_ns` (--session soaks) when present, else `refresh_time_unix`.
+    """
+    values = []
+    times = []
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if column not in header:
+            raise ValueError(f"{path}: no {column!r} column")
+        index = header.index(column)
+        time_column, time_scale = next(
+            ((name, scale) for name, scale in (("host_time_ns", 1e-9), ("refresh_time_unix", 1.0)) if name in header),
+            (None, None),
+        )
+        time_index = header.index(time_column) if time_column else None
+        for row in reader:
+            if index >= len(row) or row[index] == "":
+                continue
+            values.append(float(row[index]))
+            if time_index is not None and time_index < len(row) and row[time_index] != "":
+                times.append(float(row[time_index]) * time_scale)
+    times = np.array(times) if len(times) == len(values) else None
+    return np.array(values, dtype=np.float64), times
+
+
+def estimate_tau0(times):
+    """Median sample period (s) of a time column, or None when it cannot be estimated."""
+    if times is None or len(times) < 2:
+        return None
+    period = float(np.median(np.diff(times)))
+    return period if period > 0 else None
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Reference codec for SATA RX stream compression (SATAStreamCompressor).
+
+The gateware codes each 64-bit stream word as four 16-bit lanes. Per lane, the sample is delta
+coded against the previous one (mod 2^16), zigzag mapped to unsigned and Rice coded with
+k = bit_length(acc >> 5), where acc tracks 16x the mean coded value
+(acc += value - (acc >> 4)). A code is q = value >> k ones, a zero and the k low bits of value,
+or ESCAPE ones followed by the raw 16-bit value when q >= ESCAPE. Bits are packed LSB first into
+little-endian 64-bit words.
+
+Frames of `frame_beats` input words start on a word boundary with a header word
+(magic, frame beats, raw flag, sequence) and reset predictors; the last code of a frame is padded
+to the next word. A frame whose codes would take more words than its input is stored raw instead
+(raw flag set, header followed by the input words). Decoding the file of a compressed recording
+gives back the raw stream words.
+"""
+
+import argparse
+import struct
+import sys
+
+MAGIC       = 0x45434952 # "RICE" as a little-endian 32-bit word.
+FRAME_BEATS = 1024
+RAW_FLAG    = 1 << 15 # Header frame beats field: frame stored uncompressed.
+ESCAPE      = 16
+LANES       = 4
+
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def zigzag(delta):
+    delta &= 0xffff
+    return ((delta << 1) ^ (0xffff if delta & 0x8000 else 0)) & 0xffff
+
+
+def unzigzag(value):
+    return (value >> 1) ^ (0xffff if value & 1 else 0)
+
+
+def rice_k(acc):
+    return (acc >> 5).bit_length()
+
+
+def update_acc(acc, value):
+    return (acc - (acc >> 4) + value) & 0xfffff
+
+
+def compression_ratio(input_words, output_words):
+    """Ratio from the sata_rx_compressor input_words/output_words CSRs."""
+    return input_words / output_words if output_words else 0.0
+
+
+# Encoder ------------------------------------------------------------------------------------------
+
+class _BitWriter:
+    def __init__(self):
+        self.words = []
+        self.bits  = 0
+        self.nbits = 0
+
+    def write(self, value, length):
+        self.bits  |= value << self.nbits
+        self.nbits += length
+        while self.nbits >= 64:
+            self.words.append(self.bits & ((1 << 64) - 1))
+            self.bits  >>= 64
+            self.nbits  -= 64
+
+    def align(self):
+        if self.nbits:
+            self.write(0, 64 - self.nbits)
+
+
+def encode_frame(words):
+    """Rice code the words of one frame; returns the padded 64-bit words."""
+    writer = _BitWriter()
+    prev   = [0] * LANES
+    acc    = [0] * LANES
+    for word in words:
+        for lane in range(LANES):
+            sample = (word >> (16 * lane)) & 0xffff
+            value  = zigzag(sample - prev[lane])
+            k      = rice_k(acc[lane])
+            q      = value >> k
+            if q >= ESCAPE:
+                writer.write((1 << ESCAPE) - 1, ESCAPE)
+                writer.write(value, 16)
+            else:
+                writer.write((1 << q) - 1, q + 1)
+                writer.write(value & ((1 << k) - 1), k)
+            prev[lane] = sample
+            acc[lane]  = update_acc(acc[lane], value)
+    writer.align()
+    return writer.words
+
+
+def encode_words(words, frame_beats=FRAME_BEATS):
+    """Compress 64-bit stream words, as SATAStreamCompressor does; returns 64-bit words.
+
+    A trailing partial frame is closed with its actual length, as the gateware does when disabled.
+    """
+    out = []
+    for sequence, start in enumerate(range(0, len(words), frame_beats)):
+        frame = words[start:start + frame_beats]
+        coded = encode_frame(frame)
+        raw   = len(coded) > len(frame)
+        out.append(MAGIC | ((len(frame) | (RAW_FLAG if raw else 0)) << 32) | ((sequence & 0xffff) << 48))
+        out.extend(frame if raw else coded)
+    return out
+
+
+# Decoder ------------------------------------------------------------------------------------------
+
+class _BitReader:
+    def __init__(self, words, pos=0):
+        self.source = words
+        self.pos    = pos # Next word to load.
+        self.bits   = 0
+        self.nbits  = 0
+
+    def _fill(self, length):
+        while self.nbits < length:
+            if self.pos >= len(self.source):
+                raise EOFError
+            self.bits  |= self.source[self.pos] << self.nbits
+            self.nbits += 64
+            self.pos   += 1
+
+    def read(self, length):
+        self._fill(length)
+        value = self.bits & ((1 << length) - 1)
+        self.bits  >>= length
+        self.nbits  -= length
+        return value
+
+    def ones(self, limit):
+        count = 0
+        while count < limit and self.read(1):
+            count += 1
+        return count
+
+
+def decode_words(words, stats=None):
+    """Decompress 64-bit words back into the raw stream words.
+
+    Words that do not start a frame are skipped until the next header (counted in
+    stats["skipped_words"]); a truncated last frame is decoded up to its last complete beat.
+    """
+    if stats is None:
+        stats = {}
+    stats.update(frames=0, raw_frames=0, skipped_words=0, truncated=False)
+    out = []
+    pos = 0
+    while pos < len(words):
+        header = words[pos]
+        if header & 0xffffffff != MAGIC or not (header >> 32) & (RAW_FLAG - 1):
+            stats["skipped_words"] += 1
+            pos += 1
+            continue
+        frame_beats = (header >> 32) & (RAW_FLAG - 1)
+        if (header >> 32) & RAW_FLAG:
+            frame = words[pos + 1:pos + 1 + frame_beats]
+            out.extend(frame)
+            if len(frame) < frame_beats:
+                stats["truncated"] = True
+                break
+            stats["frames"]     += 1
+            stats["raw_frames"] += 1
+            pos += 1 + frame_beats
+            continue
+        reader = _BitReader(words, pos + 1)
+        prev   = [0] * LANES
+        acc    = [0] * LANES
+        try:
+            for _ in range(frame_beats):
+                word = 0
+                for lane in range(LANES):
+                    k = rice_k(acc[lane])
+                    q = reader.ones(ESCAPE)
+                    if q == ESCAPE:
+                        value = reader.read(16)
+                    else:
+                        value = (q << k) | reader.read(k)
+                    sample = (prev[lane] + unzigzag(value)) & 0xffff
+                    word  |= sample << (16 * lane)
+                    prev[lane] = sample
+                    acc[lane]  = update_acc(acc[lane], value)
+                out.append(word)
+        except EOFError:
+            stats["truncated"] = True
+            break
+        stats["frames"] += 1
+        pos = reader.pos
+    return out
+
+
+# File I/O -----------------------------------------------------------------------------------------
+
+def read_words(data):
+    count = len(data) // 8
+    return list(struct.unpack(f"<{count}Q", data[:count * 8]))
+
+
+def write_words(words):
+    return struct.pack(f"<{len(words)}Q", *words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decompress a SATA recording made with the RX stream compressor.")
+    parser.add_argument("input",  help="Compressed capture (as read back from the SATA disk).")
+    parser.add_argument("output", nargs="?", help="Raw stream output file (omit to only report stats).")
+    parser.add_argument("--encode", action="store_true", help="Compress a raw stream file instead (reference encoder).")
+    parser.add_argument("--frame-beats", type=int, default=FRAME_BEATS, help="Frame length for --encode.")
+    args = parser.parse_args()
+
+    with open(args.input, "rb") as f:
+        words = read_words(f.read())
+
+    if args.encode:
+        result = encode_words(words, args.frame_beats)
+        ratio  = compression_ratio(len(words), len(result))
+        print(f"Encoded {len(words)} words into {len(result)} words (ratio {ratio:.3f}).", file=sys.stderr)
+    else:
+        stats  = {}
+        result = decode_words(words, stats)
+        ratio  = compression_ratio(len(result), len(words))
+        print(f"Decoded {stats['frames']} frames ({stats['raw_frames']} raw), {len(result)} words (ratio {ratio:.3f}).", file=sys.stderr)
+        if stats["skipped_words"]:
+            print(f"Skipped {stats['skipped_words']} words outside frames.", file=sys.stderr)
+        if stats["truncated"]:
+            print("Last frame truncated.", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "wb") as f:
+            f.write(write_words(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Coherent telemetry snapshots (TelemetrySnapshot gateware).
+
+A latch (software or PPS) copies the hardware time and all telemetry entries in the same clock
+cycle; the telemetry CSRs are contiguous and fetched with one burst read. Rates are computed from
+the difference of two snapshots over the hardware time difference, not host time.
+
+The telemetry CSRs are only present on gateware built with --with-telemetry.
+"""
+
+import time
+import argparse
+
+from litex import RemoteClient
+
+from csr_snapshot import CSRSnapshot
+
+# Constants ----------------------------------------------------------------------------------------
+
+PREFIX = "telemetry_"
+
+# Entries holding signed values (two's complement over the CSR width).
+SIGNED_ENTRIES = {"ptp_last_error"}
+
+# Entries holding free-running/monotonic counts (modulo the CSR width): reported as rates.
+RATE_SUFFIXES = ("_beats", "_value", "_progress")
+RATE_PREFIXES = ("agc_",)
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def to_signed(value, bits):
+    return value - (1 << bits) if value & (1 << (bits - 1)) else value
+
+
+def is_rate(name):
+    return name.endswith(RATE_SUFFIXES) or name.startswith(RATE_PREFIXES)
+
+
+def rates(prev, curr):
+    """Per-second rates of the counter entries between two snapshots (hardware time base)."""
+    dt = (curr["time"] - prev["time"]) / 1e9
+    if dt <= 0:
+        return {}
+    result = {}
+    for name, value in curr["entries"].items():
+        if is_rate(name) and name in prev["entries"]:
+            delta = (value - prev["entries"][name]) % (1 << curr["widths"][name])
+            result[name] = delta / dt
+    return result
+
+# Telemetry Driver ---------------------------------------------------------------------------------
+
+class TelemetryDriver:
+    """
+    Driver for the TelemetrySnapshot core.
+
+    snapshot() latches (unless PPS latching is used), waits for the sequence count to change and
+    reads all telemetry registers with one burst. A snapshot taken by PPS while reading is detected
+    with a second sequence read and the burst is retried.
+    """
+    def __init__(self, bus, pps_latch=False):
+        self.bus     = bus
+        self.control = getattr(bus.regs, f"{PREFIX}control")
+        self.regs    = [reg for name, reg in bus.regs.__dict__.items()
+            if name.startswith(PREFIX) and reg is not self.control]
+        self.widths  = {reg.name[len(PREFIX):]: reg.length*reg.data_width for reg in self.regs}
+        self.reader  = CSRSnapshot(bus)
+        self.reader.add_group("telemetry", self.regs)
+        self.sequence_reg = getattr(bus.regs, f"{PREFIX}sequence")
+        self.set_pps_latch(pps_latch)
+        self.sequence = self.sequence_reg.read()
+
+    def set_pps_latch(self, enable):
+        self.pps_latch = enable
+        self.control.write(int(enable) << 1)
+
+    def latch(self):
+        self.control.write((int(self.pps_latch) << 1) | 1)
+
+    def read(self):
+        self.reader.update()
+        return {reg.name[len(PREFIX):]: self.reader.get(reg.name) for reg in self.regs}
+
+    def snapshot(self, timeout=2.0):
+        """Return {"sequence", "time", "entries", "widths"} for the next snapshot."""
+        if not self.pps_latch:
+            self.latch()
+        deadline = time.time() + timeout
+        while True:
+            values = self.read()
+            if values["sequence"] != self.sequence and self.sequence_reg.read() == values["sequence"]:
+                break
+            if time.time() > deadline:
+                raise TimeoutError("Telemetry snapshot not completed.")
+        self.sequence = values.pop("sequence")
+        snapshot_time = values.pop("time")
+        for name in SIGNED_ENTRIES & set(values):
+            values[name] = to_signed(values[name], self.widths[name])
+        return {"sequence": self.sequence, "time": snapshot_time, "entries": values, "widths": self.widths}
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="M2SDR coherent telemetry monitor.")
+    parser.add_argument("--csr-csv",  default="csr.csv",           help="CSR definition file")
+    parser.add_argument("--host",     default="localhost",         help="Host ip address")
+    parser.add_argument("--port",     default=1234, type=int,      help="Host bind port")
+    parser.add_argument("--num",      default=10,   type=int,      help="Number of snapshots")
+    parser.add_argument("--interval", default=1.0,  type=float,    help="Delay between software snapshots (seconds)")
+    parser.add_argument("--pps",      action="store_true",         help="Use PPS-latched snapshots")
+    args = parser.parse_args()
+
+    bus = RemoteClient(host=args.host, port=args.port, csr_csv=args.csr_csv)
+    bus.open()
+
+    if not hasattr(bus.regs, f"{PREFIX}control"):
+        bus.close()
+        raise SystemExit("No telemetry CSRs: rebuild the gateware with --with-telemetry.")
+
+    driver = TelemetryDriver(bus, pps_latch=args.pps)
+    prev   = driver.snapshot()
+    for _ in range(args.num):
+        if not args.pps:
+            time.sleep(args.interval)
+        curr = driver.snapshot()
+        curr_rates = rates(prev, curr)
+        print(f"Snapshot {curr['sequence']} @ {curr['time']/1e9:.9f}s")
+        for name, value in sorted(curr["entries"].items()):
+            rate = curr_rates.get(name)
+            extra = f" ({rate:.3f}/s)" if rate is not None else ""
+            print(f"  {name:>20}: {value}{extra}")
+        prev = curr
+
+    driver.set_pps_latch(False)
+    bus.close()
+
+if __name__ == "__main__":
+    main()
@@ -28,8 +28,10 @@ class ClkDriver:
     """
     Driver for a clock measurement.
 
-    This driver latches the clock counter, reads its value, and computes the frequency (in MHz)
-    based on the elapsed time and the counter delta.
+    With gated gateware, the frequency (in MHz) and ppm error are read from the hardware gated
+    counter, timed by the board's own time base. Otherwise the driver latches the clock counter,
+    reads its value, and computes the frequency based on the host elapsed time and the counter
+    delta.
     """
     def __init__(self, bus, clk_key, description):
         self.bus         = bus
@@ -37,6 +39,9 @@ class ClkDriver:
         self.description = description
         self.latch_reg   = getattr(self.bus.regs, f"clk_measurement_{clk_key}_latch")
         self.value_reg   = getattr(self.bus.regs, f"clk_measurement_{clk_key}_value")
+        self.freq_reg    = getattr(self.bus.regs, f"clk_measurement_{clk_key}_frequency", None)
+        self.nominal_reg = getattr(self.bus.regs, f"clk_measurement_{clk_key}_nominal",   None)
+        self.error_reg   = getattr(self.bus.regs, f"clk_measurement_{clk_key}_error",     None)
 
         # Initialize by latching and reading the first value.
         self.latch()
@@ -58,6 +63,8 @@ class ClkDriver:
         Returns:
             float: Frequency in MHz.
         """
+        if self.freq_reg is not None:
+            return self.freq_reg.read() / 1e6
         self.latch()
         current_value   = self.read()
         current_time    = time.time()
@@ -68,11 +75,37 @@ class ClkDriver:
         self.prev_time  = current_time
         return frequency
 
+    def error_ppm(self):
+        """
+        Read the hardware frequency error against the nominal frequency.
+
+        Returns:
+            float: Error in ppm, or None without gated measurement or nominal frequency.
+        """
+        if self.error_reg is None or self.nominal_reg.read() == 0:
+            return None
+        error = self.error_reg.read()
+        if error & (1 << 31):
+            error -= 1 << 32
+        return error / 1e3
+
+# Gate Configuration -------------------------------------------------------------------------------
+
+GATE_SOURCES = {"timer": 0, "pps": 1}
+
+def configure_gate(bus, source="timer", shift=0):
+    """Select the gated measurement window: sys_clk timer (2^-shift s) or PPS (1 s)."""
+    if not hasattr(bus.regs, "clk_measurement_gate"):
+        return False
+    bus.regs.clk_measurement_gate.write(GATE_SOURCES[source] | (shift << 4))
+    return True
+
 # Test Frequency -----------------------------------------------------------------------------------
 
-def test_frequency(num_measurements=10, delay_between_tests=1.0):
+def test_frequency(num_measurements=10, delay_between_tests=1.0, gate="timer", gate_shift=0):
     bus = RemoteClient()
     bus.open()
+    configure_gate(bus, source=gate, shift=gate_shift)
 
     # Create a ClkDriver for each clock present in the loaded gateware.
     available_clocks = {
@@ -85,8 +118,10 @@ def test_frequency(num_measurements=10, delay_between_tests=1.0):
     for meas in range(num_measurements):
         time.sleep(delay_between_tests)
         for clk, driver in clk_drivers.items():
-            freq = driver.update()
-            print(f"Measurement {meas+1}, {driver.description:>{max_name_len}}: Frequency: {freq:.2f} MHz")
+            freq  = driver.update()
+            error = driver.error_ppm()
+            error = "" if error is None else f" ({error:+.3f} ppm)"
+            print(f"Measurement {meas+1}, {driver.description:>{max_name_len}}: Frequency: {freq:.6f} MHz{error}")
 
     bus.close()
 
@@ -96,9 +131,16 @@ def main():
     parser = argparse.ArgumentParser(description="Frequency Measurement Script")
     parser.add_argument("--num",   default=10,  type=int,   help="Number of measurements")
     parser.add_argument("--delay", default=1.0, type=float, help="Delay between measurements (seconds)")
+    parser.add_argument("--gate",  default="timer", choices=list(GATE_SOURCES), help="Gated measurement window source.")
+    parser.add_argument("--gate-shift", default=0, type=int, choices=range(7), help="Timer window length: 2^-shift s.")
     args = parser.parse_args()
 
-    test_frequency(num_measurements=args.num, delay_between_tests=args.delay)
+    test_frequency(
+        num_measurements    = args.num,
+        delay_between_tests = args.delay,
+        gate                = args.gate,
+        gate_shift          = args.gate_shift,
+    )
 
 if __name__ == "__main__":
     main()
@@ -15,16 +15,46 @@ import os
 from litex import RemoteClient
 
 from test_clks   import ClkDriver, CLOCKS
-from test_xadc   import XADCDriver
-from test_header import HeaderDriver
+from test_xadc   import xadc_temp, xadc_voltage
 from test_time   import TimeDriver, unix_to_datetime
 from test_agc    import AGCDriver, default_agc_threshold
 
+from csr_snapshot import CSRSnapshot, csr_filter_match, benchmark
+
 # Constants ----------------------------------------------------------------------------------------
 
 XADC_WINDOW_DURATION = 10
 DASHBOARD_SETTINGS_PATH = os.path.expanduser("~/.litex_m2sdr_dashboard.json")
 
+# Snapshot groups: panels displaying them (a group is only read when one of them is visible) and
+# decimation (read every N refresh ticks) for slow-changing values.
+SNAPSHOT_GROUPS = {
+    # Group        Panels                                          Period
+    "registers" : (["win_registers"],                               5),
+    "dma"       : (["win_status", "win_dmas", "win_overview"],      1),
+    "headers"   : (["win_dmas"],                                    1),
+    "ltssm"     : (["win_status"],                                  1),
+    "agc"       : (["win_status", "win_rf_agc", "win_overview"],    1),
+    "xadc"      : (["win_status", "win_xadc"],                      5),
+    "clks"      : (["win_clks_time", "win_overview"],               10),
+    "time"      : (["win_clks_time"],                               1),
+}
+
+# Groups dedicated to pop-on-read registers (every value read is consumed by its panel).
+POP_ON_READ_GROUPS = ["ltssm"]
+
+DMA_REGS = [
+    "pcie_dma0_writer_enable", "pcie_dma0_writer_table_level", "pcie_dma0_writer_table_loop_status",
+    "pcie_dma0_reader_enable", "pcie_dma0_reader_table_level", "pcie_dma0_reader_table_loop_status",
+    "pcie_dma0_loopback_enable", "pcie_dma0_synchronizer_bypass", "pcie_dma0_synchronizer_enable",
+]
+XADC_REGS = {
+    "temp"    : "xadc_temperature",
+    "vccint"  : "xadc_vccint",
+    "vccaux"  : "xadc_vccaux",
+    "vccbram" : "xadc_vccbram",
+}
+
 PCIE_LTSSM = {
     0x00: "Detect Quiet",
     0x02: "Detect Active",
@@ -112,6 +142,8 @@ def run_gui(host="localhost", csr_csv="csr.csv", port=1234):
     with_header_reg = hasattr(bus.regs, "header_last_tx_header")
     with_time       = hasattr(bus.regs, "time_gen_read_time")
     with_ltssm      = hasattr(bus.regs, "pcie_phy_phy_ltssm_tracer_history")
+    # Optional cores may be absent (ex telemetry_* CSRs, only on --with-telemetry builds): they only
+    # show up in the Registers panel when built.
 
     # Initialize ClkDriver if available.
     if with_clks:
@@ -123,16 +155,6 @@ def run_gui(host="localhost", csr_csv="csr.csv", port=1234):
     else:
         clk_drivers = None
 
-    # Initialize XADCDriver if available.
-    if with_xadc:
-        xadc_driver = XADCDriver(bus)
-    else:
-        xadc_driver = None
-
-    # Initialize DMA Header driver if available.
-    if with_header_reg:
-        header_driver = HeaderDriver(bus, "header")
-
     # Initialize TimeDriver if available.
     if with_time:
         time_driver = TimeDriver(bus, "time_gen")
@@ -167,6 +189,8 @@ def run_gui(host="localhost", csr_csv="csr.csv", port=1234):
     ui_state = {
         "refresh": refresh_default,
         "freeze_plots": freeze_default,
+        "csr_filter": "",
+        "visible": set(default_window_pos),
     }
     clear_counters_event = threading.Event()
 
@@ -216,6 +240,7 @@ def run_gui(host="localhost", csr_csv="csr.csv", port=1234):
         dashboard_settings["windows"] = {}
         for tag, pos in default_window_pos.items():
             if dpg.does_item_exist(tag):
+                dpg.configure_item(tag, show=True)
                 dpg.set_item_pos(tag, list(pos))
                 if tag in default_window_size:
                     dpg.set_item_width(tag, int(default_window_size[tag][0]))
@@ -261,6 +286,8 @@ def run_gui(host="localhost", csr_csv="csr.csv", port=1234):
         dpg.add_text("Control/Status")
         def filter_callback(sender, filter_str):
             dpg.set_value("csr_filter", filter_str)
+            with ui_state_lock:
+                ui_state["csr_filter"] = filter_str
         dpg.add_input_text(label="CSR Filter (inc, -exc)", callback=filter_callback)
         dpg.add_text("CSR Registers:")
         with dpg.filter_set(tag="csr_filter"):
@@ -530,87 +557,107 @@ def run_gui(host="localhost", csr_csv="csr.csv", port=1234):
     snapshot_lock = threading.Lock()
     shared_snapshot = {"error": None}
 
+    # CSR snapshot engine: one burst plan per refresh tick, per-panel groups.
+    csr_snapshot = CSRSnapshot(bus)
+    csr_regs     = [reg for reg in bus.regs.__dict__.values() if reg.mode in ["rw", "ro"]]
+    group_regs   = {
+        "registers" : csr_regs,
+        "dma"       : DMA_REGS if hasattr(bus.regs, "pcie_dma0_writer_enable") else [],
+        "headers"   : [f"header_last_{n}" for n in ["tx_header", "rx_header", "tx_timestamp", "rx_timestamp"]] if with_header_reg else [],
+        "ltssm"     : ["pcie_phy_phy_ltssm_tracer_history"] if with_ltssm else [],
+        "agc"       : [f"ad9361_agc_count_{inst}_status" for inst in rf_agc_instances],
+        "xadc"      : list(XADC_REGS.values()) if with_xadc else [],
+        "clks"      : [], # Latched by ClkDriver.
+        "time"      : [], # Latched by TimeDriver.
+    }
+    for group, (panels, period) in SNAPSHOT_GROUPS.items():
+        csr_snapshot.add_group(group, group_regs[group], period=period, pop_on_read=group in POP_ON_READ_GROUPS)
+
     def collect_snapshot():
         nonlocal writer_prev_loops, writer_prev_time
         nonlocal reader_prev_loops, reader_prev_time
 
-        last_refresh = None
-        local_xadc = {}
+        last_filter  = None
+        xadc_history = {name: [] for name in XADC_REGS}
+        snap_cache   = {"clks": {}, "time": None, "xadc_kpi": None}
 
         while not stop_event.is_set():
+            tick_start = time.time()
+            with ui_state_lock:
+                refresh    = ui_state["refresh"]
+                csr_filter = ui_state["csr_filter"]
+                visible    = set(ui_state["visible"])
             try:
-                with ui_state_lock:
-                    refresh = ui_state["refresh"]
-
-                if with_xadc and xadc_driver and (last_refresh is None or abs(refresh - last_refresh) > 1e-9):
-                    xadc_points = max(2, int(XADC_WINDOW_DURATION / refresh))
-                    local_xadc = {
-                        "temp":    xadc_driver.gen_data("temp", n=xadc_points),
-                        "vccint":  xadc_driver.gen_data("vccint", n=xadc_points),
-                        "vccaux":  xadc_driver.gen_data("vccaux", n=xadc_points),
-                        "vccbram": xadc_driver.gen_data("vccbram", n=xadc_points),
-                    }
-                    last_refresh = refresh
+                # Only read groups displayed by a visible panel, and registers passing the filter.
+                for group, (panels, period) in SNAPSHOT_GROUPS.items():
+                    csr_snapshot.set_enabled(group, any(panel in visible for panel in panels))
+                if csr_filter != last_filter:
+                    csr_snapshot.set_registers("registers",
+                        [reg for reg in csr_regs if csr_filter_match(reg.name, csr_filter)])
+                    last_filter = csr_filter
 
-                now = time.time()
-                snap = {
+                if clear_counters_event.is_set():
+                    for inst in rf_agc_instances:
+                        agc_drivers[inst].clear()
+                    clear_counters_event.clear()
+
+                now   = time.time()
+                due   = csr_snapshot.update()
+                value = csr_snapshot.get
+                snap  = {
                     "error": None,
                     "collected_at": now,
                     "board_name": board_name,
                     "csr": {},
                     "xadc": {},
-                    "xadc_kpi": None,
-                    "clks": {},
-                    "time": None,
+                    "xadc_kpi": snap_cache["xadc_kpi"],
+                    "clks": snap_cache["clks"],
+                    "time": snap_cache["time"],
                     "headers": None,
                     "dma": None,
                     "pcie": None,
                     "agc": {},
                 }
 
-                if clear_counters_event.is_set():
-                    for inst in rf_agc_instances:
-                        agc_drivers[inst].clear()
-                    clear_counters_event.clear()
-
                 # Snapshot CSR registers.
-                for name, reg in bus.regs.__dict__.items():
-                    snap["csr"][name] = reg.read()
+                if "registers" in due:
+                    for reg in csr_snapshot.groups["registers"]["regs"]:
+                        snap["csr"][reg.name] = value(reg.name)
 
                 # Snapshot XADC data.
-                if with_xadc and xadc_driver:
+                if with_xadc and "xadc" in due:
                     relative_now = now - start_time
-                    for name, gen_data in local_xadc.items():
-                        datay    = next(gen_data)
-                        n_points = len(datay)
-                        datax    = [relative_now - (n_points - 1 - i) * refresh for i in range(n_points)]
-                        snap["xadc"][name] = [datax, datay[::-1]]
-                    snap["xadc_kpi"] = {
-                        "temp": xadc_driver.get_temp(),
-                        "vccint": xadc_driver.get_vccint(),
-                        "vccaux": xadc_driver.get_vccaux(),
-                        "vccbram": xadc_driver.get_vccbram(),
-                    }
+                    for name, reg in XADC_REGS.items():
+                        raw    = value(reg)
+                        sample = xadc_temp(raw) if name == "temp" else xadc_voltage(raw)
+                        history = xadc_history[name]
+                        history.append((relative_now, sample))
+                        while history[0][0] < relative_now - XADC_WINDOW_DURATION:
+                            history.pop(0)
+                    snap_cache["xadc_kpi"] = {name: history[-1][1] for name, history in xadc_history.items()}
+                    snap["xadc_kpi"]       = snap_cache["xadc_kpi"]
+                    snap["xadc"] = {name: [[t for t, _ in h], [v for _, v in h]] for name, h in xadc_history.items()}
 
                 # Snapshot clocks.
-                if with_clks and clk_drivers:
-                    for clk, driver in clk_drivers.items():
-                        snap["clks"][clk] = driver.update()
+                if with_clks and clk_drivers and "clks" in due:
+                    snap_cache["clks"] = {clk: driver.update() for clk, driver in clk_drivers.items()}
+                    snap["clks"]       = snap_cache["clks"]
 
                 # Snapshot time.
-                if with_time and time_driver:
+                if with_time and time_driver and "time" in due:
                     current_time_ns = time_driver.read_ns()
-                    snap["time"] = {
+                    snap_cache["time"] = {
                         "ns": current_time_ns,
                         "str": unix_to_datetime(current_time_ns),
                     }
+                    snap["time"] = snap_cache["time"]
 
                 # Snapshot headers.
-                if with_header_reg:
-                    tx_header    = header_driver.last_tx_header.read()
-                    rx_header    = header_driver.last_rx_header.read()
-                    tx_timestamp = header_driver.last_tx_timestamp.read()
-                    rx_timestamp = header_driver.last_rx_timestamp.read()
+                if with_header_reg and "headers" in due:
+                    tx_header    = value("header_last_tx_header")
+                    rx_header    = value("header_last_rx_header")
+                    tx_timestamp = value("header_last_tx_timestamp")
+                    rx_timestamp = value("header_last_rx_timestamp")
                     snap["headers"] = {
                         "tx_header": tx_header,
                         "rx_header": rx_header,
@@ -621,12 +668,12 @@ def run_gui(host="localhost", csr_csv="csr.csv", port=1234):
                     }
 
                 # Snapshot DMA info.
-                if hasattr(bus.regs, "pcie_dma0_writer_enable"):
-                    writer_enable = bus.regs.pcie_dma0_writer_enable.read()
-                    writer_table_level = bus.regs.pcie_dma0_writer_table_level.read()
+                if group_regs["dma"] and "dma" in due:
+                    writer_enable = value("pcie_dma0_writer_enable")
+                    writer_table_level = value("pcie_dma0_writer_table_level")
                     loops_w = (writer_table_level >> 16) & 0xFFFF
                     count_w = writer_table_level & 0xFFFF
-                    writer_loop_status = bus.regs.pcie_dma0_writer_table_loop_status.read()
+                    writer_loop_status = value("pcie_dma0_writer_table_loop_status")
                     loops_ws = (writer_loop_status >> 16) & 0xFFFF
                     count_ws = writer_loop_status & 0xFFFF
 
@@ -638,11 +685,11 @@ def run_gui(host="localhost", csr_csv="csr.csv", port=1234):
                     writer_prev_loops = loops_ws
                     writer_prev_time = now
 
-                    reader_enable = bus.regs.pcie_dma0_reader_enable.read()
-                    reader_table_level = bus.regs.pcie_dma0_reader_table_level.read()
+                    reader_enable = value("pcie_dma0_reader_enable")
+                    reader_table_level = value("pcie_dma0_reader_table_level")
                     loops_r = (reader_table_level >> 16) & 0xFFFF
                     count_r = reader_table_level & 0xFFFF
-                    reader_loop_status = bus.regs.pcie_dma0_reader_table_loop_status.read()
+                    reader_loop_status = value("pcie_dma0_reader_table_loop_status")
                     loops_rs = (reader_loop_status >> 16) & 0xFFFF
                     count_rs = reader_loop_status & 0xFFFF
 
@@ -663,13 +710,13 @@ def run_gui(host="localhost", csr_csv="csr.csv", port=1234):
                         "reader_loop_status": (loops_rs, count_rs),
                         "writer_speed": writer_speed,
                         "reader_speed": reader_speed,
-                        "loopback_enable": bus.regs.pcie_dma0_loopback_enable.read(),
-                        "sync_bypass": bus.regs.pcie_dma0_synchronizer_bypass.read(),
-                        "sync_enable": bus.regs.pcie_dma0_synchronizer_enable.read(),
+                        "loopback_enable": value("pcie_dma0_loopback_enable"),
+                        "sync_bypass": value("pcie_dma0_synchronizer_bypass"),
+                        "sync_enable": value("pcie_dma0_synchronizer_enable"),
                     }
 
-                if with_ltssm:
-                    ltssm = bus.regs.pcie_phy_phy_ltssm_tracer_history.read()
+                if with_ltssm and "ltssm" in due:
+                    ltssm = value("pcie_phy_phy_ltssm_tracer_history")
                     ltssm_new = (ltssm >> 0) & 0x3F
                     ltssm_old = (ltssm >> 6) & 0x3F
                     overflow = (ltssm >> 30) & 0x1
@@ -684,20 +731,27 @@ def run_gui(host="localhost", csr_csv="csr.csv", port=1234):
                     }
 
                 # Snapshot AGC.
-                for inst in rf_agc_instances:
-                    count = agc_drivers[inst].read_count()
-                    snap["agc"][inst] = count
-                    if agc_auto_clear.get(inst, False):
-                        agc_drivers[inst].clear()
+                if "agc" in due:
+                    for inst in rf_agc_instances:
+                        snap["agc"][inst] = value(f"ad9361_agc_count_{inst}_status")
+                        if agc_auto_clear.get(inst, False):
+                            agc_drivers[inst].clear()
 
+                snap["read_ms"] = (time.time() - tick_start) * 1000.0
                 with snapshot_lock:
+                    # Keep last values of panels not refreshed by this tick.
+                    for key in ["csr", "headers", "dma", "pcie", "agc"]:
+                        if not snap[key] and shared_snapshot.get(key):
+                            snap[key] = shared_snapshot[key]
+                    if not snap["xadc"]:
+                        snap["xadc"] = shared_snapshot.get("xadc", {})
                     shared_snapshot.clear()
                     shared_snapshot.update(snap)
             except Exception as e:
                 with snapshot_lock:
                     shared_snapshot.clear()
                     shared_snapshot.update({"error": str(e)})
-            time.sleep(refresh)
+            time.sleep(max(0.0, refresh - (time.time() - tick_start)))
 
     timer_thread = threading.Thread(target=collect_snapshot, daemon=True)
     timer_thread.start()
@@ -717,8 +771,10 @@ def run_gui(host="localhost", csr_csv="csr.csv", port=1234):
         while dpg.is_dearpygui_running():
             with snapshot_lock:
                 snap = copy.deepcopy(shared_snapshot)
+            visible = {tag for tag in default_window_pos if dpg.does_item_exist(tag) and dpg.is_item_visible(tag)}
             with ui_state_lock:
                 freeze_plots = ui_state["freeze_plots"]
+                ui_state["visible"] = visible
 
             if snap.get("error"):
                 dpg.set_value("status_error_text", f"Error: {snap['error']}")
@@ -757,7 +813,7 @@ def run_gui(host="localhost", csr_csv="csr.csv", port=1234):
                 dpg.set_value("kpi_board", f"Board: {snap.get('board_name', '--')}")
                 dpg.set_value("kpi_uptime", f"Uptime: {time.time() - start_time:8.1f} s")
                 age_ms = (time.time() - snap.get("collected_at", time.time())) * 1000.0
-                dpg.set_value("kpi_data_age", f"Data Age: {age_ms:5.1f} ms")
+                dpg.set_value("kpi_data_age", f"Data Age: {age_ms:5.1f} ms (CSR Read: {snap.get('read_ms', 0.0):5.1f} ms)")
 
                 if snap.get("pcie"):
                     p = snap["pcie"]
@@ -875,6 +931,17 @@ def run_gui(host="localhost", csr_csv="csr.csv", port=1234):
     dpg.destroy_context()
     bus.close()
 
+# Benchmark ----------------------------------------------------------------------------------------
+
+def run_benchmark(host="localhost", csr_csv="csr.csv", port=1234, iterations=100):
+    bus = RemoteClient(host=host, csr_csv=csr_csv, port=port)
+    bus.open()
+    r = benchmark(bus, iterations=iterations)
+    bus.close()
+    print(f"{r['registers']} CSRs, {r['bursts']} bursts per snapshot.")
+    print(f"Per-register reads: {r['per_register_hz']:8.1f} Hz")
+    print(f"Bulk snapshot:      {r['snapshot_hz']:8.1f} Hz ({r['snapshot_hz']/r['per_register_hz']:.1f}x)")
+
 # Run ----------------------------------------------------------------------------------------------
 def main():
     default_csr_csv = os.path.join(os.path.dirname(__file__), "csr.csv")
@@ -885,9 +952,14 @@ def main():
     parser.add_argument("--csr-csv", default=default_csr_csv, help="CSR configuration file")
     parser.add_argument("--host", default="localhost", help="Host IP address")
     parser.add_argument("--port", default="1234", help="Host bind port")
+    parser.add_argument("--benchmark", type=int, default=0, metavar="N",
+        help="Measure per-register vs bulk snapshot refresh rate of all CSRs over N iterations (no GUI)")
     args = parser.parse_args()
 
-    run_gui(host=args.host, csr_csv=args.csr_csv, port=int(args.port))
+    if args.benchmark:
+        run_benchmark(host=args.host, csr_csv=args.csr_csv, port=int(args.port), iterations=args.benchmark)
+    else:
+        run_gui(host=args.host, csr_csv=args.csr_csv, port=int(args.port))
 
 if __name__ == "__main__":
     main()
@@ -5,6 +5,16 @@ import os
 
 from litex import RemoteClient
 
+# XADC Conversions ---------------------------------------------------------------------------------
+
+def xadc_temp(raw):
+    """Convert a raw XADC temperature value to °C."""
+    return raw * 503.975 / 4096 - 273.15
+
+def xadc_voltage(raw):
+    """Convert a raw XADC supply value to V."""
+    return raw * 3 / 4096
+
 # XADC Driver --------------------------------------------------------------------------------------
 
 class XADCDriver:
@@ -16,23 +26,19 @@ class XADCDriver:
 
     def get_temp(self):
         """Return the temperature in °C."""
-        raw = self.bus.regs.xadc_temperature.read()
-        return raw * 503.975 / 4096 - 273.15
+        return xadc_temp(self.bus.regs.xadc_temperature.read())
 
     def get_vccint(self):
         """Return the VCCINT voltage in V."""
-        raw = self.bus.regs.xadc_vccint.read()
-        return raw * 3 / 4096
+        return xadc_voltage(self.bus.regs.xadc_vccint.read())
 
     def get_vccaux(self):
         """Return the VCCAUX voltage in V."""
-        raw = self.bus.regs.xadc_vccaux.read()
-        return raw * 3 / 4096
+        return xadc_voltage(self.bus.regs.xadc_vccaux.read())
 
     def get_vccbram(self):
         """Return the VCCBRAM voltage in V."""
-        raw = self.bus.regs.xadc_vccbram.read()
-        return raw * 3 / 4096
+        return xadc_voltage(self.bus.regs.xadc_vccbram.read())
 
     def gen_data(self, channel, n):
         """
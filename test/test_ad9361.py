@@ -5,19 +5,33 @@
 # Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
 # SPDX-License-Identifier: BSD-2-Clause
 
+import importlib.util
+import random
+from pathlib import Path
+
 from migen import *
 from migen.sim import passive
-import random
+
+import pytest
 
 from litex.gen.sim import run_simulation
 
 from litex_m2sdr.gateware.ad9361.bitmode import (
     AD9361RXBitMode,
+    AD9361RXSampleCounter,
     AD9361TXBitMode,
+    BFP8_CHANNEL_HEADER_VERSION,
     BFP8_HEADER_MAGIC,
+    BFP_HEADER_VERSION,
+    bfp_samples_per_channel,
 )
 from litex_m2sdr.gateware.ad9361.prbs import AD9361PRBSChecker, AD9361PRBSGenerator
 
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "evaluate_sample_formats.py"
+spec = importlib.util.spec_from_file_location("evaluate_sample_formats", SCRIPT)
+fmt = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(fmt)
+
 # AD9361 BitMode Tests ----------------------------------------------------------------------------
 
 
@@ -309,6 +323,315 @@ def test_ad9361_tx_bitmode_bfp8_header_and_payload_expansion():
         (0x08000FF007F007F0, 1),
     ]
 
+def test_ad9361_rx_bitmode_bfp8_matches_numpy_model():
+    """Verify RX BFP8 exponents/mantissas are bit-exact with the NumPy evaluator engine."""
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(0x0BF8)
+    blocks = 6
+    # Mix full-scale, mid-level and small blocks so every exponent path is exercised.
+    scales = [2048, 1024, 512, 256, 128, 64]
+    q11 = np.concatenate([
+        rng.integers(-scale, scale, 8) for scale in scales
+    ])
+    dut = AD9361RXBitMode(bfp8_payload_words=1)
+    out = []
+
+    def pack_word(samples):
+        word = 0
+        for i, sample in enumerate(samples):
+            value = int(sample) & 0xfff
+            word |= (value | (0xf000 if value & 0x800 else 0)) << (16 * i)
+        return word
+
+    def gen():
+        yield dut.mode.eq(2)
+        yield dut.source.ready.eq(1)
+        for beat in range(2 * blocks):
+            yield dut.sink.valid.eq(1)
+            yield dut.sink.data.eq(pack_word(q11[beat*4:(beat + 1)*4]))
+            yield
+            while not (yield dut.sink.ready):
+                yield
+        yield dut.sink.valid.eq(0)
+        for _ in range(16):
+            yield
+
+    @passive
+    def mon():
+        while True:
+            if (yield dut.source.valid) and (yield dut.source.ready):
+                out.append((yield dut.source.data))
+            yield
+
+    run_simulation(dut, [gen(), mon()])
+
+    mantissas, exponents = fmt.bfp_encode_q11_np(q11, 8, 8)
+    assert len(out) == 2 * blocks
+    for block in range(blocks):
+        header, payload = out[2*block:2*block + 2]
+        assert (header >> 32) & 0xf == exponents[block]
+        decoded = [(payload >> (8 * i)) & 0xff for i in range(8)]
+        decoded = [value - 256 if value & 0x80 else value for value in decoded]
+        assert decoded == mantissas[block*8:(block + 1)*8].tolist()
+
+
+def test_ad9361_bitmode_bfp8_per_channel_exponents_match_model_and_round_trip():
+    """Verify RX BFP8 per-channel exponents match the model and TX decodes version-3 headers."""
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(0x0BFC)
+    blocks = 4
+    # RX1 (lanes 0/1) near full scale, RX2 (lanes 2/3) small, then swapped and balanced blocks.
+    levels = [(2048, 16), (8, 2048), (300, 300), (0, 100)]
+    beats = []
+    for level_a, level_b in levels:
+        for _ in range(2):
+            beats.append([
+                int(rng.integers(-level_a, level_a)) if level_a else 0,
+                int(rng.integers(-level_a, level_a)) if level_a else 0,
+                int(rng.integers(-level_b, level_b)),
+                int(rng.integers(-level_b, level_b)),
+            ])
+
+    rx = AD9361RXBitMode(bfp8_payload_words=1)
+    tx = AD9361TXBitMode(bfp8_payload_words=1)
+    dut = Module()
+    dut.submodules += rx, tx
+    dut.comb += rx.source.connect(tx.sink)
+    rx_out = []
+    tx_out = []
+
+    def pack_word(samples):
+        word = 0
+        for i, sample in enumerate(samples):
+            value = int(sample) & 0xfff
+            word |= (value | (0xf000 if value & 0x800 else 0)) << (16 * i)
+        return word
+
+    def gen():
+        yield rx.mode.eq(2)
+        yield tx.mode.eq(2)
+        yield rx.bfp8_channel_exponents.eq(1)
+        yield tx.source.ready.eq(1)
+        for beat in beats:
+            yield rx.sink.valid.eq(1)
+            yield rx.sink.data.eq(pack_word(beat))
+            yield
+            while not (yield rx.sink.ready):
+                yield
+        yield rx.sink.valid.eq(0)
+        for _ in range(16):
+            yield
+
+    @passive
+    def mon():
+        while True:
+            if (yield rx.source.valid) and (yield rx.source.ready):
+                rx_out.append((yield rx.source.data))
+            if (yield tx.source.valid) and (yield tx.source.ready):
+                tx_out.append((yield tx.source.data))
+            yield
+
+    run_simulation(dut, [gen(), mon()])
+
+    # Per channel, a block is the I/Q components of that channel over the block's beats.
+    channel_a = np.array([beat[0:2] for beat in beats]).reshape(-1)
+    channel_b = np.array([beat[2:4] for beat in beats]).reshape(-1)
+    mantissas_a, exponents_a = fmt.bfp_encode_q11_np(channel_a, 8, 4)
+    mantissas_b, exponents_b = fmt.bfp_encode_q11_np(channel_b, 8, 4)
+
+    assert len(rx_out) == 2 * blocks
+    for block in range(blocks):
+        header, payload = rx_out[2*block:2*block + 2]
+        assert header & 0xffffffff == BFP8_HEADER_MAGIC
+        assert (header >> 32) & 0xf == exponents_a[block]
+        assert (header >> 36) & 0xf == exponents_b[block]
+        assert (header >> 56) & 0xff == BFP8_CHANNEL_HEADER_VERSION
+        decoded = [(payload >> (8 * i)) & 0xff for i in range(8)]
+        decoded = [value - 256 if value & 0x80 else value for value in decoded]
+        assert decoded[0:2] + decoded[4:6] == mantissas_a[block*4:(block + 1)*4].tolist()
+        assert decoded[2:4] + decoded[6:8] == mantissas_b[block*4:(block + 1)*4].tolist()
+    assert exponents_a[0] == 4 and exponents_b[0] == 0
+
+    decoded_a = fmt.bfp_decode_q11_np(mantissas_a, exponents_a, 4).tolist()
+    decoded_b = fmt.bfp_decode_q11_np(mantissas_b, exponents_b, 4).tolist()
+    lanes = []
+    for data in tx_out:
+        value = [(data >> (16 * i)) & 0xfff for i in range(4)]
+        lanes.append([v - 0x1000 if v & 0x800 else v for v in value])
+    assert [lane[0:2] for lane in lanes] == [decoded_a[2*i:2*i + 2] for i in range(2 * blocks)]
+    assert [lane[2:4] for lane in lanes] == [decoded_b[2*i:2*i + 2] for i in range(2 * blocks)]
+
+
+@pytest.mark.parametrize("bits, payload_words", [(4, 1), (6, 3), (12, 3)])
+def test_ad9361_bitmode_bfp_widths_match_numpy_model_and_round_trip(bits, payload_words):
+    """Verify RX BFP4/6/12 blocks are bit-exact with the model and TX expands them back."""
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(0x0BF0 + bits)
+    beats  = bfp_samples_per_channel(bits, payload_words)
+    scales = [2048, 512, 64, 8]
+    q11 = np.concatenate([rng.integers(-scale, scale, 4 * beats) for scale in scales])
+    blocks = len(scales)
+
+    rx = AD9361RXBitMode(bfp_bits=bits, bfp_payload_words=payload_words)
+    tx = AD9361TXBitMode(bfp_bits=bits, bfp_payload_words=payload_words)
+    dut = Module()
+    dut.submodules += rx, tx
+    dut.comb += rx.source.connect(tx.sink)
+    rx_out = []
+    tx_out = []
+
+    def pack_word(samples):
+        word = 0
+        for i, sample in enumerate(samples):
+            value = int(sample) & 0xfff
+            word |= (value | (0xf000 if value & 0x800 else 0)) << (16 * i)
+        return word
+
+    def gen():
+        yield rx.mode.eq(3)
+        yield tx.mode.eq(3)
+        yield tx.source.ready.eq(1)
+        for beat in range(blocks * beats):
+            yield rx.sink.valid.eq(1)
+            yield rx.sink.data.eq(pack_word(q11[beat*4:(beat + 1)*4]))
+            yield
+            while not (yield rx.sink.ready):
+                yield
+        yield rx.sink.valid.eq(0)
+        for _ in range(8 * beats):
+            yield
+
+    @passive
+    def mon():
+        while True:
+            if (yield rx.source.valid) and (yield rx.source.ready):
+                rx_out.append((yield rx.source.data))
+            if (yield tx.source.valid) and (yield tx.source.ready):
+                tx_out.append(((yield tx.source.data), (yield tx.source.last)))
+            yield
+
+    run_simulation(dut, [gen(), mon()])
+
+    mantissas, exponents = fmt.bfp_encode_q11_np(q11, bits, 4 * beats)
+    assert len(rx_out) == blocks * (1 + payload_words)
+    for block in range(blocks):
+        header  = rx_out[block*(1 + payload_words)]
+        payload = rx_out[block*(1 + payload_words) + 1:(block + 1)*(1 + payload_words)]
+        assert header & 0xffffffff == BFP8_HEADER_MAGIC
+        assert (header >> 32) & 0xf == exponents[block]
+        assert (header >> 36) & 0xf == bits
+        assert (header >> 40) & 0xff == payload_words
+        assert (header >> 48) & 0xff == block
+        assert (header >> 56) & 0xff == BFP_HEADER_VERSION
+        bitstream = sum(word << (64 * i) for i, word in enumerate(payload))
+        decoded = [(bitstream >> (bits * i)) & ((1 << bits) - 1) for i in range(4 * beats)]
+        decoded = [value - (1 << bits) if value >> (bits - 1) else value for value in decoded]
+        assert decoded == mantissas[block*4*beats:(block + 1)*4*beats].tolist()
+
+    expected = fmt.bfp_decode_q11_np(mantissas, exponents, 4 * beats).tolist()
+    lanes = []
+    for data, _ in tx_out:
+        for i in range(4):
+            value = (data >> (16 * i)) & 0xfff
+            lanes.append(value - 0x1000 if value & 0x800 else value)
+    assert lanes == expected
+    assert [last for _, last in tx_out] == ([0] * (beats - 1) + [1]) * blocks
+
+
+@pytest.mark.parametrize("mode, bits, payload_words", [(0, None, None), (1, None, None), (2, None, 4),
+    (3, 4, 1), (3, 6, 3), (3, 12, 3)])
+def test_ad9361_rx_sample_counter_counts_bitmode_instants(mode, bits, payload_words):
+    """Verify the RX sample counter counts every sample instant, whatever the RX BitMode packing."""
+    if mode == 2:
+        rx = AD9361RXBitMode(bfp8_payload_words=payload_words)
+        instants = 4 * payload_words * 2
+    elif mode == 3:
+        rx = AD9361RXBitMode(bfp_bits=bits, bfp_payload_words=payload_words)
+        instants = 4 * bfp_samples_per_channel(bits, payload_words)
+    else:
+        rx = AD9361RXBitMode()
+        instants = 64
+    counter = AD9361RXSampleCounter(bfp_bits=bits)
+    dut = Module()
+    dut.submodules += rx, counter
+    dut.comb += [
+        counter.ce.eq(rx.source.valid & rx.source.ready),
+        counter.first.eq(rx.source.first),
+        counter.mode.eq(rx.mode),
+    ]
+    counts = []
+
+    def gen():
+        yield rx.mode.eq(mode)
+        yield rx.source.ready.eq(1)
+        for beat in range(instants):
+            yield rx.sink.valid.eq(1)
+            yield rx.sink.data.eq(random.getrandbits(64) & 0x07ff07ff07ff07ff)
+            yield
+            while not (yield rx.sink.ready):
+                yield
+        yield rx.sink.valid.eq(0)
+        for _ in range(16 * instants):
+            yield
+        counts.append((yield counter.count))
+
+    run_simulation(dut, gen())
+
+    assert counts == [instants]
+
+
+def test_ad9361_rx_sample_counter_beat_indexes_and_clears():
+    """Verify each beat gets the index of its first instant, re-based now or on the next PPS."""
+    dut = AD9361RXSampleCounter(bfp_bits=6)
+    counts = []
+
+    def beats(mode, firsts):
+        yield dut.mode.eq(mode)
+        for first in firsts:
+            yield dut.ce.eq(1)
+            yield dut.first.eq(first)
+            yield
+        yield dut.ce.eq(0)
+        yield dut.first.eq(0)
+        yield
+
+    def pulse(signal):
+        yield signal.eq(1)
+        yield
+        yield signal.eq(0)
+        yield
+
+    def gen():
+        yield from beats(0, [0, 0])       # 16-bit: 1 instant per beat.
+        yield from beats(1, [0, 0])       # 8-bit: 2 instants per beat.
+        yield from beats(2, [1, 0])       # BFP8: header, then 2 instants per beat.
+        yield from beats(3, [1, 0, 0, 0]) # BFP6: 24-bit instants split across 64-bit words.
+        yield dut.one_channel.eq(1)
+        yield from beats(0, [0])          # 1R1T: 2 instants of one channel per beat.
+        yield from beats(3, [1, 0, 0, 0]) # 1R1T BFP6: 12-bit instants.
+        yield dut.one_channel.eq(0)
+        yield from pulse(dut.pps_clear)
+        yield from beats(0, [0])          # Armed, no PPS yet: still counting.
+        yield from pulse(dut.pps)
+        yield from beats(0, [0])          # Cleared on PPS.
+        yield from pulse(dut.pps)
+        yield from beats(0, [0])          # Disarmed: next PPS does not clear.
+        yield from pulse(dut.clear)
+        yield
+        counts.append(((yield dut.count) - (yield dut.base)) % 2**64)
+
+    @passive
+    def mon():
+        while True:
+            if (yield dut.ce):
+                counts.append(((yield dut.count) - (yield dut.base)) % 2**64)
+            yield
+
+    run_simulation(dut, [gen(), mon()])
+
+    assert counts == [0, 1, 2, 4, 6, 6, 8, 8, 10, 13, 16, 18, 18, 23, 28, 34, 0, 1, 0]
+
+
 # AD9361 PRBS Tests -------------------------------------------------------------------------------
 
 
@@ -65,6 +65,14 @@ def test_main_exposes_base_soc_optional_args(monkeypatch):
             "--sys-clk-freq=100000000",
             "--without-jtagbone",
             "--with-rfic-oversampling",
+            "--rfic-bfp-bits=6",
+            "--with-rx-ddc",
+            "--with-tx-duc",
+            "--with-rx-fanout",
+            "--with-tx-scheduler",
+            "--with-rx-window",
+            "--with-event-timestamper",
+            "--with-telemetry",
         ],
     )
 
@@ -74,7 +82,15 @@ def test_main_exposes_base_soc_optional_args(monkeypatch):
     assert captured["kwargs"]["sys_clk_freq"] == 100000000
     assert captured["kwargs"]["with_jtagbone"] is False
     assert captured["kwargs"]["with_rfic_oversampling"] is True
-    assert captured["build_name"] == "litex_m2sdr_baseboard_sysclk_100000000_rfic_oversampling_no_jtagbone"
+    assert captured["kwargs"]["rfic_bfp_bits"] == 6
+    assert captured["kwargs"]["with_rx_ddc"] is True
+    assert captured["kwargs"]["with_tx_duc"] is True
+    assert captured["kwargs"]["with_rx_fanout"] is True
+    assert captured["kwargs"]["with_tx_scheduler"] is True
+    assert captured["kwargs"]["with_rx_window"] is True
+    assert captured["kwargs"]["with_event_timestamper"] is True
+    assert captured["kwargs"]["with_telemetry"] is True
+    assert captured["build_name"] == "litex_m2sdr_baseboard_sysclk_100000000_telemetry_events_rfic_oversampling_bfp6_ddc_duc_fanout_tx_scheduler_rx_window_no_jtagbone"
     assert captured["output_dir"].endswith(captured["build_name"])
     assert captured["csr_csv"] == "scripts/csr.csv"
     assert captured["run"] is False
@@ -161,11 +177,59 @@ def test_main_accepts_ethernet_sata_source_build(monkeypatch):
     assert captured["kwargs"]["with_pcie"] is False
     assert captured["kwargs"]["with_eth"] is True
     assert captured["kwargs"]["with_sata"] is True
+    assert captured["kwargs"]["with_sata_compression"] is False
     assert captured["build_name"] == "litex_m2sdr_baseboard_eth_sata"
     assert captured["output_dir"].endswith(captured["build_name"])
     assert captured["run"] is False
 
 
+def test_main_passes_vrt_stream_id(monkeypatch):
+    soc_mod = _load_soc_module()
+    captured = {}
+
+    class FakeSoC:
+        def __init__(self, **kwargs):
+            captured["kwargs"] = kwargs
+
+    class FakeBuilder:
+        def __init__(self, soc, **kwargs):
+            self.gateware_dir = "build/fake/gateware"
+
+        def build(self, build_name, run):
+            captured["build_name"] = build_name
+
+    monkeypatch.setattr(soc_mod, "BaseSoC", FakeSoC)
+    monkeypatch.setattr(soc_mod, "Builder", FakeBuilder)
+    monkeypatch.setattr(soc_mod, "generate_litepcie_software", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "litex_m2sdr.py",
+            "--variant=baseboard",
+            "--with-eth",
+            "--with-eth-vrt",
+            "--vrt-stream-id=0x4d320001",
+            "--vrt-max-data-words=2040",
+            "--vrt-with-trailer",
+            "--vrt-with-context",
+            "--vrt-timestamp=sample-count",
+        ],
+    )
+
+    soc_mod.main()
+
+    assert captured["kwargs"]["with_eth_vrt"] is True
+    assert captured["kwargs"]["vrt_stream_id"] == 0x4d320001
+    assert captured["kwargs"]["vrt_data_words"] == 256
+    assert captured["kwargs"]["vrt_max_data_words"] == 2040
+    assert captured["kwargs"]["vrt_with_class_id"] is False
+    assert captured["kwargs"]["vrt_with_trailer"] is True
+    assert captured["kwargs"]["vrt_with_context"] is True
+    assert captured["kwargs"]["vrt_timestamp"] == "sample-count"
+    assert captured["build_name"] == "litex_m2sdr_baseboard_eth_vrt"
+
+
 def test_main_wr_status_uses_lazy_wr_integration(monkeypatch):
     soc_mod = _load_soc_module()
     captured = {}
@@ -203,6 +267,56 @@ def test_main_wr_status_uses_lazy_wr_integration(monkeypatch):
     assert captured["prepare_kwargs"]["with_white_rabbit"] is False
 
 
+def test_main_passes_ptp_history(monkeypatch):
+    soc_mod = _load_soc_module()
+    captured = {}
+
+    class FakeSoC:
+        def __init__(self, **kwargs):
+            captured["kwargs"] = kwargs
+
+    class FakeBuilder:
+        def __init__(self, soc, **kwargs):
+            self.gateware_dir = "build/fake/gateware"
+
+        def build(self, build_name, run):
+            captured["build_name"] = build_name
+
+    monkeypatch.setattr(soc_mod, "BaseSoC", FakeSoC)
+    monkeypatch.setattr(soc_mod, "Builder", FakeBuilder)
+    monkeypatch.setattr(soc_mod, "generate_litepcie_software", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "litex_m2sdr.py",
+            "--variant=baseboard",
+            "--with-eth",
+            "--with-eth-ptp",
+            "--with-ptp-history",
+        ],
+    )
+
+    soc_mod.main()
+
+    assert captured["kwargs"]["with_eth_ptp"] is True
+    assert captured["kwargs"]["with_ptp_history"] is True
+    assert captured["build_name"] == "litex_m2sdr_baseboard_eth_ptp_history"
+
+
+def test_base_soc_rejects_ptp_history_without_eth_ptp():
+    soc_mod = _load_soc_module()
+
+    with pytest.raises(ValueError, match="requires --with-eth-ptp"):
+        soc_mod.BaseSoC(
+            variant="baseboard",
+            with_pcie=False,
+            with_eth=True,
+            with_ptp_history=True,
+            with_jtagbone=False,
+        )
+
+
 def test_base_soc_rejects_pcie_eth_sata_triple_use():
     soc_mod = _load_soc_module()
 
@@ -315,3 +315,83 @@ def test_ptp_clock10_manual_align_waits_for_reference_edge():
     assert seen["initial_align_count"] == 1
     assert seen["after_manual_request"] == 1
     assert seen["after_reference"] == 2
+
+
+def _load_servo_sim():
+    import importlib.util
+    import sys
+    from pathlib import Path
+
+    scripts = Path(__file__).resolve().parents[1] / "scripts"
+    sys.path.insert(0, str(scripts))
+    spec = importlib.util.spec_from_file_location("m2sdr_ptp_servo_sim", scripts / "m2sdr_ptp_servo_sim.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_CLOCK10_MODEL_STATUS = (
+    "last_error_ticks", "last_rate", "rate_limited", "locked", "sample_count", "lock_loss_count",
+    "rate_update_count", "saturation_count",
+)
+
+
+def test_ptp_clock10_discipline_matches_offline_servo_model():
+    servo_sim = _load_servo_sim()
+    reference_pulse = Signal()
+    reference_valid = Signal()
+    dut = PTPClock10Discipline(
+        sys_clk_freq    = 8,
+        clk10           = ClockSignal("clk10_mon"),
+        reference_pulse = reference_pulse,
+        reference_valid = reference_valid,
+        clk10_freq      = 1,
+        with_csr        = False,
+    )
+    config = {
+        "p_gain":      0x10000000,
+        "i_gain":      0x04000000,
+        "rate_limit":  0x48000000,
+        "lock_window": 2,
+    }
+    model = servo_sim.Clock10ServoModel(**config)
+    mismatches = []
+
+    def gen():
+        yield dut.enable.eq(1)
+        yield dut.p_gain_cfg.eq(config["p_gain"])
+        yield dut.i_gain_cfg.eq(config["i_gain"])
+        yield dut.rate_limit_cfg.eq(config["rate_limit"])
+        yield dut.lock_window_ticks_cfg.eq(config["lock_window"])
+        yield dut.half_period_ticks_cfg.eq(6)
+        yield reference_valid.eq(1)
+
+        # Reference edges at varying phases against the clk10 marker (first edge aligns it);
+        # one sample taken without a live reference (holdover).
+        for index, delay in enumerate([3, 12, 14, 17, 11, 19, 13, 16, 12, 18, 15, 12]):
+            live = index != 8
+            yield reference_valid.eq(live)
+            for _ in range(delay):
+                yield
+            samples = (yield dut.sample_count)
+            yield reference_pulse.eq(1)
+            yield
+            yield reference_pulse.eq(0)
+            for _ in range(10):
+                yield
+            if (yield dut.sample_count) == samples:
+                continue
+            model.sample((yield dut.last_error_ticks), live)
+            expected = {name: int(getattr(model, name)) for name in _CLOCK10_MODEL_STATUS}
+            actual = {}
+            for name in _CLOCK10_MODEL_STATUS:
+                actual[name] = (yield getattr(dut, name))
+            if actual != expected:
+                mismatches.append((index, actual, expected))
+        yield reference_valid.eq(1)
+
+    run_simulation(dut, gen(), clocks={"sys": 10, "clk10_mon": 100})
+
+    assert model.sample_count >= 6
+    assert model.saturation_count > 0
+    assert mismatches == []
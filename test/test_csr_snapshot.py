@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+
+from litex.tools.remote.csr_builder import CSRRegister
+
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+spec = importlib.util.spec_from_file_location("csr_snapshot", SCRIPTS / "csr_snapshot.py")
+snapshot_mod = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(snapshot_mod)
+
+
+class FakeBus:
+    """RemoteClient stand-in: word memory, per-call read log, csr.csv constants."""
+    def __init__(self, layout, constants=None):
+        self.mem       = {}
+        self.reads     = []
+        self.constants = SimpleNamespace(d=constants or {})
+        regs = {}
+        for name, addr, length, mode in layout:
+            regs[name] = CSRRegister(self.read, self.write, name, addr, length, 32, mode)
+            for i in range(length):
+                self.mem[addr + 4*i] = (addr + 4*i) * 0x10001 & 0xffffffff
+        self.regs = SimpleNamespace(**regs)
+
+    def read(self, addr, length=None, burst="incr"):
+        self.reads.append((addr, length))
+        datas = [self.mem.get(addr + 4*i, 0) for i in range(1 if length is None else length)]
+        return datas[0] if length is None else datas
+
+    def write(self, addr, datas):
+        for i, data in enumerate(datas):
+            self.mem[addr + 4*i] = data
+
+
+LAYOUT = [
+    ("a_ctrl",   0x0000, 1, "rw"),
+    ("a_value",  0x0004, 2, "ro"),
+    ("a_cmd",    0x000c, 1, "wo"),
+    ("a_status", 0x0010, 1, "ro"),
+    ("b_ctrl",   0x0800, 1, "rw"),
+    ("b_wide",   0x0808, 3, "ro"), # 1-word hole at 0x0804.
+    ("c_fifo",   0x1000, 1, "ro"),
+    ("c_level",  0x1004, 1, "ro"),
+]
+
+
+def test_plan_bursts_merges_contiguous_ranges_and_skips_unreadable():
+    bus    = FakeBus(LAYOUT)
+    regs   = list(bus.regs.__dict__.values())
+    bursts = snapshot_mod.plan_bursts(regs, regs)
+
+    assert [(addr, words) for addr, words, _ in bursts] == [(0x0000, 3), (0x0010, 1), (0x0800, 5), (0x1000, 2)]
+    assert "a_cmd" not in {reg.name for _, _, members in bursts for reg, _ in members}
+
+
+def test_plan_bursts_never_reads_through_unrequested_registers():
+    bus    = FakeBus(LAYOUT)
+    regs   = list(bus.regs.__dict__.values())
+    bursts = snapshot_mod.plan_bursts([bus.regs.c_fifo, bus.regs.a_ctrl, bus.regs.a_status], regs)
+
+    # a_value lies between a_ctrl and a_status: split, even though the gap is small.
+    assert [(addr, words) for addr, words, _ in bursts] == [(0x0000, 1), (0x0010, 1), (0x1000, 1)]
+
+
+POP_ON_READ_LAYOUT = [
+    ("ptp_history_level",                 0x2000, 1, "ro"),
+    ("ptp_history_dropped",               0x2004, 1, "ro"),
+    ("ptp_history_data",                  0x2008, 1, "ro"),
+    ("pcie_phy_phy_ltssm_tracer_history", 0x2800, 1, "ro"),
+    ("pcie_phy_phy_link_status",          0x2804, 1, "ro"),
+]
+
+POP_ON_READ_CONSTANTS = {
+    "ptp_history_data_pop_on_read"                  : 1,
+    "pcie_phy_phy_ltssm_tracer_history_pop_on_read" : 1,
+    "ptp_history_depth"                             : 16, # Unrelated constant.
+}
+
+
+def test_pop_on_read_registers_come_from_gateware_constants():
+    bus = FakeBus(POP_ON_READ_LAYOUT, POP_ON_READ_CONSTANTS)
+
+    assert snapshot_mod.pop_on_read_regs(bus) == {"ptp_history_data", "pcie_phy_phy_ltssm_tracer_history"}
+    assert snapshot_mod.pop_on_read_regs(FakeBus(POP_ON_READ_LAYOUT)) == set()
+
+
+def test_plan_bursts_never_reads_pop_on_read_registers():
+    bus    = FakeBus(POP_ON_READ_LAYOUT[:3])
+    regs   = list(bus.regs.__dict__.values())
+    bursts = snapshot_mod.plan_bursts(regs, regs, pop_on_read={"ptp_history_data"})
+
+    assert [(addr, words) for addr, words, _ in bursts] == [(0x2000, 2)]
+
+
+def test_snapshot_reads_pop_on_read_registers_only_in_dedicated_groups():
+    bus      = FakeBus(POP_ON_READ_LAYOUT, POP_ON_READ_CONSTANTS)
+    regs     = list(bus.regs.__dict__.values())
+    snapshot = snapshot_mod.CSRSnapshot(bus)
+    snapshot.add_group("registers", regs)
+    snapshot.add_group("ltssm", ["pcie_phy_phy_ltssm_tracer_history"], period=2, pop_on_read=True)
+
+    assert {reg.name for reg in snapshot.groups["registers"]["regs"]} == {
+        "ptp_history_level", "ptp_history_dropped", "pcie_phy_phy_link_status"}
+
+    # Tick 0 reads both groups, tick 1 only the generic one: the tracer is popped once.
+    snapshot.update()
+    snapshot.update()
+    read_words = [addr + 4*i for addr, words in bus.reads for i in range(words)]
+    assert 0x2008 not in read_words
+    assert read_words.count(0x2800) == 1
+    assert snapshot.get("pcie_phy_phy_ltssm_tracer_history") == bus.regs.pcie_phy_phy_ltssm_tracer_history.read()
+
+
+def test_benchmark_never_reads_pop_on_read_registers():
+    bus = FakeBus(POP_ON_READ_LAYOUT, POP_ON_READ_CONSTANTS)
+
+    r = snapshot_mod.benchmark(bus, iterations=2)
+
+    read_words = {addr + 4*i for addr, words in bus.reads for i in range(1 if words is None else words)}
+    assert r["registers"] == 3
+    assert not read_words & {0x2008, 0x2800}
+
+
+def test_plan_bursts_respects_max_burst_and_max_gap():
+    bus  = FakeBus(LAYOUT)
+    regs = list(bus.regs.__dict__.values())
+
+    assert [(a, w) for a, w, _ in snapshot_mod.plan_bursts(regs, regs, max_gap=0)][2:4] == [(0x0800, 1), (0x0808, 3)]
+    assert [(a, w) for a, w, _ in snapshot_mod.plan_bursts(regs, regs, max_burst=2)][:2] == [(0x0000, 1), (0x0004, 2)]
+
+
+def test_snapshot_values_match_register_reads():
+    bus = FakeBus(LAYOUT)
+    snapshot = snapshot_mod.CSRSnapshot(bus)
+    snapshot.add_group("all", list(bus.regs.__dict__.values()))
+
+    snapshot.update()
+
+    for name, reg in bus.regs.__dict__.items():
+        if reg.mode != "wo":
+            assert snapshot.get(name) == reg.read()
+    assert snapshot.bursts == 4
+
+
+def test_snapshot_decimates_and_disables_groups():
+    bus = FakeBus(LAYOUT)
+    snapshot = snapshot_mod.CSRSnapshot(bus)
+    snapshot.add_group("fast", ["c_level"])
+    snapshot.add_group("slow", ["b_wide"], period=4)
+    snapshot.add_group("hidden", ["a_status"], enabled=False)
+
+    due = [snapshot.update() for _ in range(8)]
+
+    assert due == [["fast", "slow"], ["fast"], ["fast"], ["fast"], ["fast", "slow"], ["fast"], ["fast"], ["fast"]]
+    assert bus.reads.count((0x0808, 3)) == 2
+    assert all(addr != 0x0010 for addr, _ in bus.reads)
+
+    bus.mem[0x1004] = 0x1234
+    snapshot.set_enabled("fast", False)
+    assert snapshot.update() == ["slow"]
+    assert snapshot.get("c_level") != 0x1234
+
+
+def test_snapshot_reduces_bridge_round_trips():
+    # 10 CSR banks (0x800 apart) of 16 contiguous registers.
+    layout = [(f"bank{b}_r{i}", 0x800*b + 4*i, 1, "ro") for b in range(10) for i in range(16)]
+    bus    = FakeBus(layout)
+
+    for reg in bus.regs.__dict__.values():
+        reg.read()
+    per_register = len(bus.reads)
+    bus.reads.clear()
+
+    snapshot = snapshot_mod.CSRSnapshot(bus)
+    snapshot.add_group("all", list(bus.regs.__dict__.values()))
+    snapshot.update()
+
+    assert per_register == 160
+    assert len(bus.reads) == 10
+
+
+def test_csr_filter_matches_imgui_syntax():
+    match = snapshot_mod.csr_filter_match
+
+    assert match("pcie_dma0_writer_enable", "")
+    assert match("pcie_dma0_writer_enable", "DMA, xadc")
+    assert not match("pcie_dma0_writer_enable", "dma,-writer")
+    assert not match("xadc_temperature", "dma")
+    assert match("xadc_temperature", "-dma")
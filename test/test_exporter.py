@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import asyncio
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+from litex.tools.remote.csr_builder import CSRRegister
+
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+
+
+def _load_exporter():
+    # The exporter imports the scripts/test_*.py drivers by module name; keep them apart from the
+    # test/test_*.py modules of the same name.
+    drivers = ["test_clks", "test_xadc", "test_agc", "test_time", "test_header"]
+    saved   = {name: sys.modules.pop(name) for name in drivers if name in sys.modules}
+    sys.path.insert(0, str(SCRIPTS))
+    try:
+        spec   = importlib.util.spec_from_file_location("m2sdr_exporter", SCRIPTS / "m2sdr_exporter.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(str(SCRIPTS))
+        for name in drivers:
+            sys.modules.pop(name, None)
+        sys.modules.update(saved)
+    return module
+
+
+exporter_mod = _load_exporter()
+
+
+class FakeBus:
+    def __init__(self, layout):
+        self.mem = {}
+        regs = {}
+        for name, addr, length, value in layout:
+            regs[name] = CSRRegister(self.read, self.write, name, addr, length, 32, "rw")
+            self.mem[addr + 4*(length - 1)] = value
+        self.regs   = SimpleNamespace(**regs)
+        self.closed = False
+
+    def read(self, addr, length=None, burst="incr"):
+        datas = [self.mem.get(addr + 4*i, 0) for i in range(1 if length is None else length)]
+        return datas[0] if length is None else datas
+
+    def write(self, addr, datas):
+        for i, data in enumerate(datas):
+            self.mem[addr + 4*i] = data
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCollector:
+    def __init__(self, samples=None, fail=False):
+        self.bus     = FakeBus([])
+        self.samples = samples or []
+        self.fail    = fail
+
+    def collect(self):
+        if self.fail:
+            raise ConnectionError
+        return self.samples
+
+
+def test_render_openmetrics_groups_families_and_terminates():
+    text = exporter_mod.render_openmetrics({
+        "b1" : [("m2sdr_up", {}, 1), ("m2sdr_xadc_supply_volts", {"supply": "vccint"}, 0.99)],
+        "b0" : [("m2sdr_up", {}, 0)],
+    })
+    lines = text.splitlines()
+
+    assert lines[:4] == [
+        "# TYPE m2sdr_up gauge",
+        "# HELP m2sdr_up Board reachable on the last poll.",
+        'm2sdr_up{board="b0"} 0.0',
+        'm2sdr_up{board="b1"} 1.0',
+    ]
+    assert "# UNIT m2sdr_xadc_supply_volts volts" in lines
+    assert 'm2sdr_xadc_supply_volts{board="b1",supply="vccint"} 0.99' in lines
+    assert lines[-1] == "# EOF"
+    assert exporter_mod.parse_board("rack3=10.0.0.3:1235") == ("rack3", "10.0.0.3", 1235)
+
+
+def test_board_collector_reads_available_drivers():
+    bus = FakeBus([
+        ("xadc_temperature",            0x000, 1, 2500),
+        ("xadc_vccint",                 0x004, 1, 1365),
+        ("xadc_vccaux",                 0x008, 1, 2458),
+        ("xadc_vccbram",                0x00c, 1, 1365),
+        ("ad9361_agc_count_rx1_low_control", 0x100, 1, 0),
+        ("ad9361_agc_count_rx1_low_status",  0x104, 1, 42),
+        ("time_gen_control",            0x200, 1, 0),
+        ("time_gen_read_time",          0x204, 2, 3_000_000_000),
+    ])
+    samples = exporter_mod.BoardCollector(bus).collect()
+    values  = {(metric, tuple(sorted(labels.items()))): value for metric, labels, value in samples}
+
+    assert abs(values[("m2sdr_xadc_temperature_celsius", ())] - (2500*503.975/4096 - 273.15)) < 1e-9
+    assert values[("m2sdr_xadc_supply_volts", (("supply", "vccaux"),))] == 2458*3/4096
+    assert values[("m2sdr_agc_saturation_count", (("channel", "rx1_low"),))] == 42
+    assert values[("m2sdr_time_seconds", ())] == 3.0
+    assert not any(metric == "m2sdr_clock_frequency_hertz" for metric, _, _ in samples)
+
+
+
+def test_board_collector_reads_gated_clock_frequency_and_error():
+    bus = FakeBus([
+        ("clk_measurement_clk5_latch",     0x300, 1, 0),
+        ("clk_measurement_clk5_value",     0x304, 2, 0),
+        ("clk_measurement_clk5_frequency", 0x30c, 1, 10_000_012),
+        ("clk_measurement_clk5_nominal",   0x310, 1, 10_000_000),
+        ("clk_measurement_clk5_error",     0x314, 1, (-1200) & 0xffffffff),
+        ("clk_measurement_clk3_latch",     0x400, 1, 0),
+        ("clk_measurement_clk3_value",     0x404, 2, 0),
+        ("clk_measurement_clk3_frequency", 0x40c, 1, 61_440_000),
+        ("clk_measurement_clk3_nominal",   0x410, 1, 0),
+        ("clk_measurement_clk3_error",     0x414, 1, 0),
+    ])
+    samples = exporter_mod.BoardCollector(bus).collect()
+    values  = {(metric, dict(labels)["clock"]): value for metric, labels, value in samples}
+
+    assert values[("m2sdr_clock_frequency_hertz", "clk5")] == 10_000_012
+    assert values[("m2sdr_clock_error_ppm", "clk5")] == -1.2
+    assert values[("m2sdr_clock_frequency_hertz", "clk3")] == 61_440_000
+    assert ("m2sdr_clock_error_ppm", "clk3") not in values # No nominal frequency.
+
+def test_exporter_polls_boards_concurrently_and_bounds_history():
+    opened = {"good": 0, "bad": 0}
+
+    def good():
+        opened["good"] += 1
+        return FakeCollector([("m2sdr_time_seconds", {}, 1.5)])
+
+    def bad():
+        opened["bad"] += 1
+        return FakeCollector(fail=True)
+
+    exporter = exporter_mod.Exporter({"good": good, "bad": bad}, interval=0.001, history=5)
+
+    async def run():
+        await asyncio.gather(exporter.poll_board("good", polls=4), exporter.poll_board("bad", polls=4))
+    asyncio.run(run())
+
+    assert opened == {"good": 1, "bad": 4} # Failing boards are reopened on each poll.
+    assert exporter.samples["good"][:2] == [("m2sdr_up", {}, 1), ("m2sdr_time_seconds", {}, 1.5)]
+    assert exporter.samples["bad"][0]   == ("m2sdr_up", {}, 0)
+    assert len(exporter.history) == 5
+    assert all(entry["board"] == "good" for entry in json.loads(exporter.history_json("good")))
+
+
+def test_exporter_serves_metrics_and_history_over_http():
+    exporter = exporter_mod.Exporter({"b0": lambda: FakeCollector()}, history=4)
+    exporter.record("b0", [("m2sdr_up", {}, 1)], 123.0)
+
+    async def get(port, path):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        header, _, body = response.decode().partition("\r\n\r\n")
+        return header, body
+
+    async def run():
+        server = await asyncio.start_server(exporter.handle_http, "127.0.0.1", 0)
+        port   = server.sockets[0].getsockname()[1]
+        async with server:
+            return await get(port, "/metrics"), await get(port, "/history?board=b0"), await get(port, "/")
+    metrics, history, missing = asyncio.run(run())
+
+    assert "application/openmetrics-text" in metrics[0]
+    assert metrics[1].endswith("# EOF\n")
+    assert json.loads(history[1])[0]["timestamp"] == 123.0
+    assert missing[0].startswith("HTTP/1.1 404")
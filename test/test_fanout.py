@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import random
+
+from migen import *
+from migen.sim import passive
+
+from litex.gen.sim import run_simulation
+
+from litepcie.common import dma_layout
+
+from litex_m2sdr.gateware.fanout import RXFanout
+
+# RX Fan-Out Tests ---------------------------------------------------------------------------------
+
+def _run_fanout(frames, frame_words, broadcast, sel=0, enable=0b111, drop=0b000, ready_prob=(1.0, 1.0, 1.0), fifo_depth=8):
+    """Send frames (lists of words, first/last delimited); return the frames received and the overflow
+    counter of each consumer."""
+    random.seed(0)
+    dut = RXFanout(dma_layout(64), n=3, fifo_depth=fifo_depth)
+    out       = [[] for _ in range(3)]
+    overflows = []
+
+    def gen():
+        yield dut.sel.eq(sel)
+        yield dut.broadcast.eq(broadcast)
+        yield dut.enable.eq(enable)
+        yield dut.drop.eq(drop)
+        yield dut.frame_words.eq(frame_words)
+        yield
+        for frame in frames:
+            for i, word in enumerate(frame):
+                yield dut.sink.valid.eq(1)
+                yield dut.sink.first.eq(i == 0)
+                yield dut.sink.last.eq(i == len(frame) - 1)
+                yield dut.sink.data.eq(word)
+                yield
+                while not (yield dut.sink.ready):
+                    yield
+        yield dut.sink.valid.eq(0)
+        for _ in range(256):
+            yield
+        for i in range(3):
+            overflows.append((yield dut.overflows[i]))
+
+    def consumer(i):
+        @passive
+        def _consumer():
+            source = getattr(dut, f"source{i}")
+            while True:
+                if (yield source.valid) and (yield source.ready):
+                    if (yield source.first) or not out[i]:
+                        out[i].append([])
+                    out[i][-1].append((yield source.data))
+                yield source.ready.eq(random.random() < ready_prob[i])
+                yield
+        return _consumer()
+
+    run_simulation(dut, [gen()] + [consumer(i) for i in range(3)])
+    return out, overflows
+
+
+def _frames(count, words):
+    return [[0x100*n + i for i in range(words)] for n in range(count)]
+
+
+def test_rx_fanout_routed_mode_behaves_as_demultiplexer():
+    frames = _frames(6, 4)
+    out, _ = _run_fanout(frames, frame_words=4, broadcast=0, sel=1, ready_prob=(1.0, 0.3, 1.0))
+    assert out == [[], frames, []]
+
+
+def test_rx_fanout_broadcast_isolates_slow_dropping_consumer():
+    # Consumer 0: backpressure (slow), 1: drop (very slow), 2: drop (fast).
+    frames         = _frames(24, 4)
+    out, overflows = _run_fanout(frames, frame_words=4, broadcast=1, drop=0b110, ready_prob=(0.6, 0.05, 1.0))
+
+    # Backpressured and fast consumers get every frame.
+    assert out[0] == frames
+    assert out[2] == frames
+    assert overflows[0] == overflows[2] == 0
+
+    # The slow dropping consumer only gets complete frames, in order, and counts the others.
+    indexes = [frames.index(frame) for frame in out[1]]
+    assert 0 < len(indexes) < len(frames)
+    assert indexes == sorted(set(indexes))
+    assert overflows[1] == len(frames) - len(indexes)
+
+
+def test_rx_fanout_broadcast_unframed_drops_words():
+    # Consumer 0: backpressure, 1: disabled, 2: drop (slow).
+    frames         = [[n] for n in range(40)]
+    out, overflows = _run_fanout(frames, frame_words=0, broadcast=1, enable=0b101, drop=0b100, ready_prob=(1.0, 1.0, 0.2))
+    words          = sum(out[2], [])
+    assert out[0] == frames
+    assert out[1] == []
+    assert 0 < len(words) < len(frames)
+    assert words == sorted(words)
+    assert overflows[2] == len(frames) - len(words)
+
+
+def test_rx_fanout_broadcast_oversize_frames_fall_back_to_word_drops():
+    # Frames larger than the FIFOs can never be admitted whole: dropping consumers get words.
+    # Consumer 0: backpressure, 1: drop (fast), 2: drop (slow).
+    frames         = _frames(8, 12)
+    out, overflows = _run_fanout(frames, frame_words=12, broadcast=1, drop=0b110, ready_prob=(1.0, 1.0, 0.2))
+    words          = sum(out[2], [])
+    assert out[0] == frames
+    assert out[1] == frames
+    assert overflows[1] == 0
+    assert 0 < len(words) < len(sum(frames, []))
+    assert words == sorted(words)
+    assert overflows[2] == len(sum(frames, [])) - len(words)
+
+
+def test_rx_fanout_flags_oversize_frames():
+    dut    = RXFanout(dma_layout(64), n=3, fifo_depth=8)
+    status = {}
+
+    def gen():
+        for frame_words in [0, 8, 9]:
+            yield dut.frame_words.eq(frame_words)
+            yield
+            status[frame_words] = ((yield dut.framed), (yield dut.oversize))
+
+    run_simulation(dut, gen())
+    assert status == {0: (0, 0), 8: (1, 0), 9: (0, 1)}
@@ -11,7 +11,7 @@ import random
 
 from litex.gen.sim import run_simulation
 
-from litex_m2sdr.gateware.header import HeaderInserterExtractor
+from litex_m2sdr.gateware.header import HeaderInserterExtractor, TXScheduler, RXWindowGate
 
 # Header Inserter/Extractor Tests -----------------------------------------------------------------
 
@@ -355,3 +355,262 @@ def test_header_extractor_header_disabled_passthrough():
     assert [w for w, _, _ in out] == [0x20, 0x21, 0x22, 0x23]
     assert [f for _, f, _ in out] == [0, 0, 0, 0]
     assert [l for _, _, l in out] == [0, 0, 0, 1]
+
+
+# TX Scheduler Tests -------------------------------------------------------------------------------
+
+class _SchedulerDUT(Module):
+    def __init__(self, time_init=0):
+        self.time = Signal(64, reset=time_init)
+        self.submodules.extractor = HeaderInserterExtractor(mode="extractor", data_width=64, with_csr=False)
+        self.submodules.scheduler = TXScheduler(time=self.time, with_csr=False)
+        self.comb += [
+            self.extractor.source.connect(self.scheduler.sink),
+            self.scheduler.timestamp.eq(self.extractor.timestamp),
+            self.scheduler.header_enable.eq(self.extractor.header_enable),
+        ]
+        self.sync += self.time.eq(self.time + 10)
+
+
+def _run_scheduler(timestamps, time_init=0, drop_late=1, tolerance=0, latency=0):
+    """Send one 2-word frame per timestamp; return the (time, data) of each scheduler output."""
+    dut = _SchedulerDUT(time_init)
+    out = []
+
+    def gen():
+        yield dut.extractor.enable.eq(1)
+        yield dut.extractor.header_enable.eq(1)
+        yield dut.extractor.frame_cycles.eq(2)
+        yield dut.scheduler.enable.eq(1)
+        yield dut.scheduler.drop_late.eq(drop_late)
+        yield dut.scheduler.tolerance.eq(tolerance)
+        yield dut.scheduler.latency.eq(latency)
+        yield dut.scheduler.source.ready.eq(1)
+        for n, timestamp in enumerate(timestamps):
+            for i, word in enumerate([0x5aa5_5aa5_5aa5_5aa5, timestamp, 0x100*n + 0, 0x100*n + 1]):
+                yield dut.extractor.sink.valid.eq(1)
+                yield dut.extractor.sink.first.eq(i == 0)
+                yield dut.extractor.sink.data.eq(word)
+                yield
+                while not (yield dut.extractor.sink.ready):
+                    yield
+            yield dut.extractor.sink.valid.eq(0)
+        for _ in range(16):
+            yield
+
+    @passive
+    def mon():
+        while True:
+            if (yield dut.scheduler.source.valid) and (yield dut.scheduler.source.ready):
+                out.append(((yield dut.time), (yield dut.scheduler.source.data)))
+            yield
+
+    run_simulation(dut, [gen(), mon()])
+    return out
+
+
+def test_tx_scheduler_holds_early_frames_and_drops_late_ones():
+    """Untimed frames pass, early frames wait for their time, late frames are dropped."""
+    out = _run_scheduler([0, 3000, 100, 0], latency=200)
+    assert [d for _, d in out] == [0x000, 0x001, 0x100, 0x101, 0x300, 0x301]
+    # The early frame leaves once time + latency reaches its timestamp (one cycle decision).
+    release = out[2][0]
+    assert 3000 - 200 <= release <= 3000 - 200 + 3*10
+    # The untimed frame following the dropped one is not delayed.
+    assert out[4][0] > release
+
+
+def test_tx_scheduler_counters_and_late_policy():
+    """On-time tolerance and send-late policy, with the frame counters."""
+    counters = {}
+    dut = _SchedulerDUT(time_init=10_000)
+
+    def gen():
+        yield dut.extractor.enable.eq(1)
+        yield dut.extractor.header_enable.eq(1)
+        yield dut.extractor.frame_cycles.eq(1)
+        yield dut.scheduler.enable.eq(1)
+        yield dut.scheduler.drop_late.eq(0)
+        yield dut.scheduler.tolerance.eq(1000)
+        yield dut.scheduler.source.ready.eq(1)
+        # Late (far beyond tolerance, still sent), on-time (within tolerance), early.
+        for timestamp in [1, 10_000, 20_000]:
+            for i, word in enumerate([0x5aa5_5aa5_5aa5_5aa5, timestamp, 0xcafe]):
+                yield dut.extractor.sink.valid.eq(1)
+                yield dut.extractor.sink.first.eq(i == 0)
+                yield dut.extractor.sink.data.eq(word)
+                yield
+                while not (yield dut.extractor.sink.ready):
+                    yield
+            yield dut.extractor.sink.valid.eq(0)
+        for _ in range(16):
+            yield
+        counters["early"]   = (yield dut.scheduler.early)
+        counters["on_time"] = (yield dut.scheduler.on_time)
+        counters["late"]    = (yield dut.scheduler.late)
+        yield dut.scheduler.clear.eq(1)
+        yield
+        yield dut.scheduler.clear.eq(0)
+        yield
+        counters["late_after_clear"] = (yield dut.scheduler.late)
+
+    run_simulation(dut, gen())
+    assert counters == {"early": 1, "on_time": 1, "late": 1, "late_after_clear": 0}
+
+
+# RX Window Gate Tests -----------------------------------------------------------------------------
+
+class _WindowDUT(Module):
+    def __init__(self, frame_cycles):
+        self.time = Signal(64)
+        self.submodules.gate     = RXWindowGate(time=self.time, with_csr=False)
+        self.submodules.inserter = HeaderInserterExtractor(mode="inserter", data_width=64, with_csr=False)
+        self.comb += [
+            self.gate.source.connect(self.inserter.sink),
+            self.gate.framed.eq(self.inserter.header_enable),
+            self.gate.frame_end.eq(self.inserter.frame_end),
+            self.inserter.frame_cycles.eq(frame_cycles),
+            self.inserter.timestamp.eq(self.gate.timestamp),
+            self.inserter.wait_data.eq(self.gate.enable),
+        ]
+        self.sync += self.time.eq(self.time + 10)
+
+
+def test_rx_window_gate_emits_periodic_padded_windows_with_exact_timestamps():
+    """Only the armed windows are forwarded, padded to frames, with first-word arrival timestamps."""
+    dut  = _WindowDUT(frame_cycles=4)
+    out  = []
+    seen = {}
+
+    def gen():
+        yield dut.inserter.enable.eq(1)
+        yield dut.inserter.header_enable.eq(1)
+        yield dut.inserter.header.eq(0x5aa5)
+        yield dut.inserter.source.ready.eq(1)
+        yield dut.gate.enable.eq(1)
+        yield dut.gate.start.eq(1000)
+        yield dut.gate.count.eq(6)
+        yield dut.gate.period.eq(1500)
+        yield dut.gate.arm.eq(1)
+        yield
+        yield dut.gate.arm.eq(0)
+        # One word every 3 cycles carrying its arrival time (the write applies on the next cycle).
+        while (yield dut.time) < 4500:
+            yield dut.gate.sink.valid.eq(1)
+            yield dut.gate.sink.data.eq((yield dut.time) + 10)
+            yield
+            while not (yield dut.gate.sink.ready):
+                yield
+            yield dut.gate.sink.valid.eq(0)
+            yield
+            yield
+        seen["windows"] = (yield dut.gate.windows)
+
+    @passive
+    def mon():
+        while True:
+            if (yield dut.inserter.source.valid) and (yield dut.inserter.source.ready):
+                out.append((yield dut.inserter.source.data))
+            yield
+
+    run_simulation(dut, [gen(), mon()])
+
+    # Three windows (start 1000, 2500, 4000) of 6 words + 2 padding words, 4-word frames.
+    frames = [out[i:i + 6] for i in range(0, len(out), 6)]
+    assert len(frames) == 6
+    assert all(frame[0] == 0x5aa5 for frame in frames)
+    for window, start in enumerate([1000, 2500, 4000]):
+        first, second = frames[2*window], frames[2*window + 1]
+        words = first[2:] + second[2:]
+        assert start <= words[0] < start + 30
+        assert words[6:] == [0, 0]
+        assert all(b > a for a, b in zip(words[:5], words[1:6]))
+        # Header timestamps are the arrival times of the first word of each frame.
+        assert first[1] == words[0]
+        assert second[1] == words[4]
+    assert seen["windows"] == 3
+
+
+def _run_window(dut, steps, until):
+    """Feed one word every 3 cycles (data = arrival time) while running the steps generator."""
+    out  = []
+    seen = {}
+
+    def gen():
+        yield dut.inserter.enable.eq(1)
+        yield dut.inserter.header_enable.eq(1)
+        yield dut.inserter.header.eq(0x5aa5)
+        yield dut.inserter.source.ready.eq(1)
+        yield from steps()
+        while (yield dut.time) < until:
+            yield dut.gate.sink.valid.eq(1)
+            yield dut.gate.sink.data.eq((yield dut.time) + 10)
+            yield
+            while not (yield dut.gate.sink.ready):
+                yield
+            yield dut.gate.sink.valid.eq(0)
+            yield
+            yield
+        seen["windows"] = (yield dut.gate.windows)
+
+    @passive
+    def mon():
+        while True:
+            if (yield dut.inserter.source.valid) and (yield dut.inserter.source.ready):
+                out.append((yield dut.inserter.source.data))
+            yield
+
+    run_simulation(dut, [gen(), mon()])
+    return out, seen["windows"]
+
+
+def test_rx_window_gate_empty_window_forwards_nothing():
+    dut = _WindowDUT(frame_cycles=4)
+
+    def steps():
+        yield dut.gate.enable.eq(1)
+        yield dut.gate.start.eq(500)
+        yield dut.gate.count.eq(0)
+        yield dut.gate.arm.eq(1)
+        yield
+        yield dut.gate.arm.eq(0)
+
+    out, windows = _run_window(dut, steps, until=1500)
+    assert out == []
+    assert windows == 1
+
+
+def test_rx_window_gate_padding_follows_inserter_restart():
+    """Windows still start a new frame after the inserter restarted mid-frame."""
+    dut = _WindowDUT(frame_cycles=4)
+
+    def steps():
+        # Gate transparent: 2 words leave the inserter mid-frame.
+        for n in range(2):
+            yield dut.gate.sink.valid.eq(1)
+            yield dut.gate.sink.data.eq(n)
+            yield
+            while not (yield dut.gate.sink.ready):
+                yield
+        yield dut.gate.sink.valid.eq(0)
+        # Inserter restart (frame position back to 0), then one window.
+        yield dut.inserter.enable.eq(0)
+        yield
+        yield dut.inserter.enable.eq(1)
+        yield dut.gate.enable.eq(1)
+        yield dut.gate.start.eq(1000)
+        yield dut.gate.count.eq(3)
+        yield dut.gate.arm.eq(1)
+        yield
+        yield dut.gate.arm.eq(0)
+
+    out, windows = _run_window(dut, steps, until=2000)
+    # Partial frame before the restart, then one full frame: header, timestamp, 3 words, 1 pad.
+    assert out[:4] == [0x5aa5, out[1], 0, 1]
+    frame = out[4:]
+    assert len(frame) == 6
+    assert frame[0] == 0x5aa5
+    assert 1000 <= frame[2] < 1030
+    assert frame[1] == frame[2]
+    assert frame[5] == 0
+    assert windows == 1
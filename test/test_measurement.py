@@ -61,3 +61,49 @@ def test_multi_clk_measurement_optionally_exposes_shared_latch():
     assert hasattr(dut, "latch_all")
     assert hasattr(dut.clk_modules["sys_clk"], "_latch")
     assert hasattr(dut.clk_modules["sys_clk"], "_value")
+
+
+
+def _run_gated(nominal_freq, shift=0, source=0, pps_period=None, timeout=4000):
+    # 640 sys cycles per "second"; the counter clock runs 2.5x faster than sys (1600 "Hz").
+    pps = Signal()
+    dut = MultiClkMeasurement(
+        clks           = {"meas": (ClockSignal("counter"), nominal_freq)},
+        sys_clk_freq   = 640,
+        pps            = pps,
+        with_csr       = False,
+        with_latch_all = False,
+    )
+    mod = dut.clk_modules["meas"]
+    samples = []
+
+    def gen():
+        yield dut.gate_shift.eq(shift)
+        yield dut.gate_source.eq(source)
+        for cycle in range(timeout):
+            if pps_period is not None:
+                yield pps.eq(cycle % pps_period == pps_period - 1)
+            if (yield mod.frequency):
+                for _ in range(8): # Error pipeline.
+                    yield
+                samples.append(((yield mod.frequency), (yield mod.error)))
+                return
+            yield
+
+    run_simulation(dut, gen(), clocks={"sys": 10, "counter": 4})
+    return samples[0]
+
+
+def test_gated_clk_measurement_publishes_frequency_and_ppb_error():
+    """Verify the gated counter reports Hz over sys_clk-timed windows and the error vs nominal."""
+    assert _run_gated(nominal_freq=1600) == (1600, 0)
+
+    # Shorter window (2^-2 s): count scaled back to Hz.
+    frequency, error = _run_gated(nominal_freq=1620, shift=2)
+    assert frequency == 1600
+    assert abs(error - (-20/1620*1e9)) <= 1
+
+
+def test_gated_clk_measurement_can_use_pps_gate():
+    """Verify PPS-gated windows (here 320 sys cycles) are measured as 1s windows."""
+    assert _run_gated(nominal_freq=800, source=1, pps_period=320) == (800, 0)
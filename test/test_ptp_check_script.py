@@ -328,3 +328,155 @@ def test_build_report_contains_discipline_deltas():
     assert report["sample_quality"]["over_error_limit_count"] == 0
     assert report["counter_deltas"]["discipline"]["coarse_steps"] == 2
     assert report["counter_deltas"]["discipline"]["time_lock_misses"] == 1
+
+
+def _fake_stream_util(tmp_path, samples, exit_code=0):
+    # Stand-in for `m2sdr_util ... ptp-stream [clock10]`: replay JSON lines, record the arguments.
+    lines = tmp_path / "stream.jsonl"
+    lines.write_text("".join(json.dumps(sample) + "\n" for sample in samples))
+    util = tmp_path / "m2sdr_util"
+    util.write_text(
+        "#!/bin/sh\n"
+        f"echo \"$@\" > {tmp_path / 'args.txt'}\n"
+        f"cat {lines}\n"
+        "echo 'stream stopped' >&2\n"
+        f"exit {exit_code}\n"
+    )
+    util.chmod(0o755)
+    return util
+
+
+def _session_args(tmp_path, util, **overrides):
+    class Args:
+        m2sdr_util = util
+        device = None
+        ip = "192.168.1.50"
+        port = 1234
+        iface = None
+        duration = 2
+        interval = 0.01
+        max_error_ns = 1000
+        with_clock10 = True
+        require_clock10_lock = False
+        session = True
+        checkpoint_interval = 60.0
+        json_out = tmp_path / "out" / "soak.json"
+        csv_out = tmp_path / "out" / "soak.csv"
+
+    for name, value in overrides.items():
+        setattr(Args, name, value)
+    return Args
+
+
+def test_soak_session_streams_samples_from_one_util_process(tmp_path):
+    ptp_check = _load_ptp_check()
+    samples = [
+        dict(_status(last_error_ns=error), sample=i, host_time_ns=1778760000000000000 + i*10_000_000,
+             clock10=_clock10_status(sample_count=10 + i))
+        for i, error in enumerate([5, -7, 12])
+    ]
+    args = _session_args(tmp_path, _fake_stream_util(tmp_path, samples))
+
+    ptp_check.soak(args)
+
+    assert (tmp_path / "args.txt").read_text().split() == [
+        "--ip", "192.168.1.50", "--port", "1234",
+        "--watch-interval", "0.01", "--duration", "2", "ptp-stream", "clock10",
+    ]
+    rows = (tmp_path / "out" / "soak.csv").read_text().splitlines()
+    assert rows[0].split(",")[:2] == ["refresh_time_unix", "host_time_ns"]
+    assert [row.split(",")[1] for row in rows[1:]] == [str(s["host_time_ns"]) for s in samples]
+    assert len((tmp_path / "out" / "soak.clock10.csv").read_text().splitlines()) == 4
+    raw = [json.loads(line) for line in (tmp_path / "out" / "soak.samples.jsonl").read_text().splitlines()]
+    assert [sample["ptp"]["last_error_ns"] for sample in raw] == [5, -7, 12]
+    assert raw[2]["clock10"]["sample_count"] == 12
+    report = json.loads((tmp_path / "out" / "soak.json").read_text())
+    assert report["samples"]["count"] == 3
+    assert report["error_ns"]["signed"]["min"] == -7
+    assert report["clock10"]["counter_deltas"]["sample_count"] == 2
+    assert report["raw_samples_path"].endswith("soak.samples.jsonl")
+    assert "raw_samples" not in report
+
+
+def test_soak_session_reports_stream_failure(tmp_path):
+    ptp_check = _load_ptp_check()
+    util = _fake_stream_util(tmp_path, [dict(_status(), clock10=_clock10_status())], exit_code=1)
+    args = _session_args(tmp_path, util)
+
+    try:
+        ptp_check.soak(args)
+    except ptp_check.CheckError as e:
+        assert "stream stopped" in str(e)
+    else:
+        raise AssertionError("soak did not fail")
+    # Samples received before the failure are kept on disk.
+    assert len((tmp_path / "out" / "soak.samples.jsonl").read_text().splitlines()) == 1
+
+
+def test_streaming_stats_match_exact_stats_then_track_percentiles():
+    ptp_check = _load_ptp_check()
+    values = [((i * 7919) % 1000) - 500 for i in range(5000)]
+
+    exact = ptp_check.StreamingStats(exact_limit=len(values))
+    sketch = ptp_check.StreamingStats(exact_limit=100)
+    for value in values:
+        exact.add(value)
+        sketch.add(value)
+
+    expected = ptp_check.numeric_stats(values)
+    for key, value in exact.summary().items():
+        assert abs(value - expected[key]) < 1e-9
+    assert sketch.exact is None
+    summary = sketch.summary()
+    assert (summary["count"], summary["min"], summary["max"]) == (5000, -500, 499)
+    for key in ("p50", "p95", "p99"):
+        assert abs(summary[key] - expected[key]) < 10
+
+
+def test_stability_stats_match_direct_allan_and_time_deviation():
+    ptp_check = _load_ptp_check()
+    # Deterministic random-walk time error (ns).
+    x = [0.0]
+    seed = 1
+    for _ in range(199):
+        seed = (seed * 1103515245 + 12345) % (1 << 31)
+        x.append(x[-1] + (seed / (1 << 31)) - 0.5)
+    tau0 = 0.5
+
+    stability = ptp_check.StabilityStats(tau0, max_m=20)
+    for value in x:
+        stability.add(value)
+    rows = {row["m"]: row for row in stability.report()}
+
+    assert list(rows) == [1, 2, 5, 10, 20]
+    for m, row in rows.items():
+        tau = m * tau0
+        diffs = [x[i + 2*m] - 2*x[i + m] + x[i] for i in range(len(x) - 2*m)]
+        adev = (sum(d*d for d in diffs) / (2 * len(diffs))) ** 0.5 / (tau * 1e9)
+        sums = [sum(diffs[j:j + m]) for j in range(len(x) - 3*m + 1)]
+        tdev = (sum(v*v for v in sums) / (6 * m * m * len(sums))) ** 0.5
+        assert row["tau_s"] == tau
+        assert abs(row["adev"] - adev) < 1e-6 * adev
+        assert abs(row["tdev_ns"] - tdev) < 1e-6 * tdev
+
+
+def test_soak_session_writes_checkpoint_before_stream_failure(tmp_path):
+    ptp_check = _load_ptp_check()
+    samples = [dict(_status(last_error_ns=error), clock10=_clock10_status()) for error in (3, -4, 5)]
+    util = _fake_stream_util(tmp_path, samples, exit_code=1)
+    args = _session_args(tmp_path, util, checkpoint_interval=1e-9)
+
+    try:
+        ptp_check.soak(args)
+    except ptp_check.CheckError:
+        pass
+    else:
+        raise AssertionError("soak did not fail")
+
+    checkpoint = json.loads((tmp_path / "out" / "soak.checkpoint.json").read_text())
+    assert checkpoint["command"] == "soak"
+    assert checkpoint["samples"]["count"] == 3
+    assert checkpoint["error_ns"]["signed"]["max"] == 5
+    assert checkpoint["stability"][0]["m"] == 1
+    assert not (tmp_path / "out" / "soak.json").exists()
+
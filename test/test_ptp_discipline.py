@@ -9,7 +9,7 @@ from migen import *
 
 from litex.gen.sim import run_simulation
 
-from litex_m2sdr.gateware.ptp_discipline import PTPTimeDiscipline
+from litex_m2sdr.gateware.ptp_discipline import PTPTimeDiscipline, PTPDisciplineHistory
 
 
 def _wait_for_servo_sample(dut, expected_ptp_time, expected_local_time, timeout=128):
@@ -514,3 +514,199 @@ def test_ptp_discipline_drops_lock_after_consecutive_out_of_window_samples():
     assert seen["miss_count_after_second_miss"] == 0
     assert seen["misses_after_second_miss"] == 1
     assert seen["losses_after_second_miss"] == 1
+
+
+def test_ptp_discipline_history_records_updates_and_counts_drops():
+    class DUT(Module):
+        def __init__(self):
+            self.discipline = PTPTimeDiscipline(sys_clk_freq=64, nominal_time_inc=(10 << 24), with_csr=False)
+            self.history    = PTPDisciplineHistory(self.discipline, depth=4, with_csr=False)
+            self.submodules += self.discipline, self.history
+
+    dut = DUT()
+    discipline, history = dut.discipline, dut.history
+    updates = []
+    entries = []
+    seen = {}
+
+    def read_word():
+        data = (yield history.data)
+        yield history.read.eq(1)
+        yield
+        yield history.read.eq(0)
+        yield
+        return data
+
+    def gen():
+        yield discipline.update_cycles_cfg.eq(4)
+        yield discipline.ptp_locked.eq(1)
+        for cycle in range(400):
+            yield discipline.local_time.eq(10*cycle)
+            yield discipline.ptp_nanoseconds.eq(10*cycle + 700 + (cycle % 7))
+            yield
+            if (yield discipline.update):
+                updates.append((
+                    (yield discipline.update_local_time),
+                    (yield discipline.update_error),
+                    (yield discipline.discipline_time_inc),
+                    (yield discipline.state),
+                    (yield discipline.discipline_write),
+                ))
+        yield discipline.enable.eq(0)
+        yield
+        yield
+        seen["level"]   = (yield history.level)
+        seen["dropped"] = (yield history.dropped)
+        while (yield history.level):
+            words = []
+            for _ in range(PTPDisciplineHistory.ENTRY_WORDS):
+                word = yield from read_word()
+                words.append(word)
+            entries.append(words)
+        seen["empty_data"] = (yield history.data)
+        yield history.clear.eq(1)
+        yield
+        yield history.clear.eq(0)
+        yield
+        seen["dropped_after_clear"] = (yield history.dropped)
+
+    run_simulation(dut, gen())
+    assert len(updates) > 5
+    assert seen["level"] == 5 # depth + output buffer.
+    assert seen["dropped"] == len(updates) - 5
+    assert seen["empty_data"] == 0
+    assert seen["dropped_after_clear"] == 0
+    assert len(entries) == 5
+    for sequence, (words, update) in enumerate(zip(entries, updates)):
+        local_time, error, time_inc, state, write = update
+        flags = words[5]
+        assert words[0] | (words[1] << 32) == local_time
+        assert words[2] | (words[3] << 32) == error & (2**64 - 1)
+        assert words[4] == time_inc
+        assert flags & 0b11 == state
+        assert bool(flags & PTPDisciplineHistory.FLAG_COARSE) == bool(write)
+        assert flags >> 16 == sequence
+    assert any(entry[5] & PTPDisciplineHistory.FLAG_COARSE for entry in entries)
+    assert any(entry[4] != (10 << 24) for entry in entries[1:])
+
+
+def _load_servo_sim():
+    import importlib.util
+    import sys
+    from pathlib import Path
+
+    scripts = Path(__file__).resolve().parents[1] / "scripts"
+    sys.path.insert(0, str(scripts))
+    spec = importlib.util.spec_from_file_location("m2sdr_ptp_servo_sim", scripts / "m2sdr_ptp_servo_sim.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_SERVO_MODEL_CFG = {
+    "coarse_threshold": "coarse_threshold_cfg",
+    "phase_threshold":  "phase_threshold_cfg",
+    "lock_window":      "phase_lock_window_cfg",
+    "unlock_misses":    "unlock_misses_cfg",
+    "coarse_confirm":   "coarse_confirm_cfg",
+    "phase_step_shift": "phase_step_shift_cfg",
+    "phase_step_max":   "phase_step_max_cfg",
+    "trim_limit":       "trim_limit_cfg",
+    "p_gain":           "p_gain_cfg",
+}
+
+_SERVO_MODEL_STATUS = (
+    "locked", "holdover", "state", "last_error", "coarse_steps", "phase_steps", "rate_updates",
+    "ptp_lock_losses", "time_lock_misses", "time_lock_miss_count", "time_lock_losses",
+)
+
+
+def test_ptp_discipline_matches_offline_servo_model():
+    servo_sim = _load_servo_sim()
+    config = {
+        "coarse_threshold": 50_000,
+        "phase_threshold":  16,
+        "lock_window":      500,
+        "unlock_misses":    3,
+        "coarse_confirm":   2,
+        "phase_step_shift": 1,
+        "phase_step_max":   300,
+        "trim_limit":       20_000,
+        "p_gain":           5,
+    }
+    dut = PTPTimeDiscipline(sys_clk_freq=64, nominal_time_inc=(10 << 24), with_csr=False)
+    model = servo_sim.TimeServoModel(10 << 24, **config)
+    # (error_ns, ptp_locked): acquisition, trims/clamps, out-of-window misses, rejected then
+    # confirmed runtime coarse errors, holdover and reacquisition.
+    samples = [
+        (250_000, 1), (0, 1), (120, 1), (-37, 1), (9, 1), (900, 1), (-2_000, 1), (-2_000, 1),
+        (700, 1), (3, 1), (60_000, 1), (60_000, 1), (-60_000, 1), (5, 1), (-1, 1), (2, 0),
+        (4_000, 1), (-15, 1), (1_000, 1), (1_000, 1), (1_000, 1), (1_000, 1), (40, 1),
+    ]
+    mismatches = []
+
+    def gen():
+        for name, signal in _SERVO_MODEL_CFG.items():
+            yield getattr(dut, signal).eq(config[name])
+        yield dut.update_cycles_cfg.eq(16)
+        yield
+
+        for index, (error, ptp_locked) in enumerate(samples):
+            local_time = 1_000_000 + 12_345*index
+            ptp_time = local_time + error
+            before = (
+                (yield dut.coarse_steps) + (yield dut.rate_updates) + (yield dut.time_lock_misses)
+            )
+            yield dut.local_time.eq(local_time)
+            yield dut.ptp_seconds.eq(0)
+            yield dut.ptp_nanoseconds.eq(ptp_time)
+            yield dut.ptp_locked.eq(ptp_locked)
+
+            seen = {"write": None, "adjust": None}
+            for cycle in range(64):
+                yield
+                if (yield dut.discipline_write):
+                    seen["write"] = (yield dut.discipline_write_time)
+                if (yield dut.discipline_adjust):
+                    adjustment = (yield dut.discipline_adjustment)
+                    seen["adjust"] = -adjustment if (yield dut.discipline_adjust_sign) else adjustment
+                after = (
+                    (yield dut.coarse_steps) + (yield dut.rate_updates) + (yield dut.time_lock_misses)
+                )
+                # Unlocked samples leave the counters unchanged; wait for at least one sample.
+                if (ptp_locked and after != before) or (not ptp_locked and cycle == 40):
+                    break
+            yield
+
+            action = model.sample(ptp_time, local_time, bool(ptp_locked))
+            expected = {name: int(getattr(model, name)) for name in _SERVO_MODEL_STATUS}
+            expected.update(time_inc=action["time_inc"], write=action["write"], adjust=action["adjust"])
+            actual = {}
+            for name in _SERVO_MODEL_STATUS:
+                actual[name] = (yield getattr(dut, name))
+            actual.update(time_inc=(yield dut.discipline_time_inc), **seen)
+            if actual != expected:
+                mismatches.append((index, error, actual, expected))
+
+    run_simulation(dut, gen())
+    assert mismatches == []
+
+
+def test_ptp_discipline_sample_period_matches_servo_model():
+    servo_sim = _load_servo_sim()
+    dut = PTPTimeDiscipline(sys_clk_freq=64, nominal_time_inc=(10 << 24), with_csr=False)
+    updates = []
+
+    def gen():
+        yield dut.update_cycles_cfg.eq(5)
+        yield dut.ptp_nanoseconds.eq(1_000)
+        yield dut.local_time.eq(1_000)
+        yield dut.ptp_locked.eq(1)
+        for cycle in range(200):
+            yield
+            if (yield dut.rate_updates) != (updates[-1][1] if updates else 0):
+                updates.append((cycle, (yield dut.rate_updates)))
+
+    run_simulation(dut, gen())
+    periods = {b[0] - a[0] for a, b in zip(updates, updates[1:])}
+    assert periods == {5 + servo_sim.TIME_SERVO_SAMPLE_CYCLES}
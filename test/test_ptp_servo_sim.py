@@ -0,0 +1,47 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+spec = importlib.util.spec_from_file_location("m2sdr_ptp_servo_sim", SCRIPTS / "m2sdr_ptp_servo_sim.py")
+servo_sim = importlib.util.module_from_spec(spec)
+sys.modules["m2sdr_ptp_servo_sim"] = servo_sim # Process pool workers unpickle jobs by module name.
+spec.loader.exec_module(servo_sim)
+
+
+def test_time_servo_simulation_locks_and_holds_over_dropout():
+    metrics = servo_sim.simulate_time_servo(
+        scenario={"duration": 20.0, "freq_offset_ppb": 20_000.0, "noise_ns": 10.0, "dropouts": [(5.0, 6.0)]},
+    )
+
+    assert metrics["locked_at_end"]
+    assert 6.0 <= metrics["lock_time_s"] < 6.1
+    assert metrics["coarse_steps"] == 1 # Initial acquisition only; holdover keeps the time.
+    assert metrics["rms_error_ns"] < 100
+    assert set(metrics["adev"]) == {"1"}
+
+
+def test_clock10_servo_simulation_steers_marker_into_lock_window():
+    metrics = servo_sim.simulate_clock10_servo(
+        config={"lock_window": 10},
+        scenario={"duration": 300.0, "initial_offset_ns": 2_000.0, "freq_offset_ppb": 20.0, "noise_ns": 3.0},
+        with_trace=True,
+    )
+
+    assert metrics["trace"][0] == 2_000.0
+    assert metrics["locked_at_end"]
+    assert 0 < metrics["lock_time_s"] < 60
+    assert metrics["p99_abs_error_ns"] < 100
+
+
+def test_gain_search_ranks_stable_settings_first():
+    configs = servo_sim.grid_configs({"p_gain": [64, 8, 1], "phase_threshold": [128]})
+    assert configs == [{"p_gain": p_gain, "phase_threshold": 128} for p_gain in (64, 8, 1)]
+
+    results = servo_sim.search("time", configs, {"duration": 10.0}, workers=2)
+
+    assert [result["config"]["p_gain"] for result in results] == [8, 1, 64]
+    assert not results[-1]["metrics"]["locked_at_end"]
+    assert len(servo_sim.random_configs({"p_gain": list(range(16))}, 4, seed=1)) == 4
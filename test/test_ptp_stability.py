@@ -0,0 +1,83 @@
+import csv
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+
+
+def _load(name):
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+stability = _load("m2sdr_ptp_stability")
+
+
+def _write_csv(path, errors, period_ns):
+    with path.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["refresh_time_unix", "host_time_ns", "last_error_ns"])
+        for i, error in enumerate(errors):
+            writer.writerow([1778760000, 1778760000000000000 + i * period_ns, error])
+
+
+def test_stability_estimators_match_direct_definitions():
+    rng = np.random.default_rng(1)
+    x = np.cumsum(rng.normal(size=300)) + rng.normal(size=300) * 5
+    tau0 = 0.25
+    ms = stability.m_ladder(len(x))
+    rows = stability.analyze(x, tau0)
+
+    assert ms == [1, 2, 5, 10, 20, 50]
+    for m, row in zip(ms, rows):
+        tau = m * tau0
+        n = len(x)
+        avar = sum((x[i + 2*m] - 2*x[i + m] + x[i]) ** 2 for i in range(n - 2*m)) / (2 * (n - 2*m))
+        inner = [
+            sum(x[i + 2*m] - 2*x[i + m] + x[i] for i in range(j, j + m))
+            for j in range(n - 3*m + 1)
+        ]
+        mvar = sum(v*v for v in inner) / (2 * m * m * len(inner))
+        mtie = max(max(x[i:i + m + 1]) - min(x[i:i + m + 1]) for i in range(n - m))
+        assert np.isclose(row["adev"], np.sqrt(avar) / tau * 1e-9)
+        assert np.isclose(row["mdev"], np.sqrt(mvar) / tau * 1e-9)
+        assert np.isclose(row["tdev_ns"], np.sqrt(mvar / 3))
+        assert np.isclose(row["mtie_ns"], mtie)
+
+
+def test_white_phase_noise_adev_slope():
+    # White PM: ADEV ~ 1/tau and TDEV ~ 1/sqrt(tau).
+    x = np.random.default_rng(2).normal(size=200_000)
+    rows = {row["m"]: row for row in stability.analyze(x, 1.0, ms=[10, 100])}
+
+    assert 8 < rows[10]["adev"] / rows[100]["adev"] < 12
+    assert 2.8 < rows[10]["tdev_ns"] / rows[100]["tdev_ns"] < 3.5
+
+
+def test_analyze_subcommand_reads_soak_csv_and_clock10_sidecar(tmp_path, capsys):
+    ptp_check = _load("m2sdr_ptp_check")
+    rng = np.random.default_rng(3)
+    _write_csv(tmp_path / "soak.csv", np.round(rng.normal(size=100) * 20).astype(int), 500_000_000)
+    _write_csv(tmp_path / "soak.clock10.csv", np.round(rng.normal(size=100) * 8).astype(int), 500_000_000)
+
+    class Args:
+        csv = [tmp_path / "soak.csv"]
+        column = "last_error_ns"
+        tau0 = None
+        json_out = tmp_path / "analysis.json"
+
+    ptp_check.analyze(Args)
+
+    report = json.loads((tmp_path / "analysis.json").read_text())
+    assert [series["kind"] for series in report["series"]] == ["ptp", "clock10"]
+    assert report["series"][0]["tau0_s"] == 0.5
+    assert [row["m"] for row in report["series"][1]["stability"]] == [1, 2, 5, 10, 20]
+    assert "TDEV (ns)" in capsys.readouterr().out
@@ -47,6 +47,61 @@ def test_bfp_header_overhead_is_accounted_per_complex_sample():
     assert rows["BFP8"]["bytes_per_complex"] == 2 + 8 / (254 * 2)
 
 
+def test_bfp_widths_trade_bandwidth_for_snr_at_hardware_block_sizes():
+    rows = rows_by_format(block_complex_samples=None)
+    widths = [4, 6, 8, 12]
+
+    assert [fmt.bfp_block_complex_samples(bits) for bits in widths] == [508, 336, 254, 168]
+    assert [rows[f"BFP{bits}"]["bytes_per_complex"] for bits in widths] == [
+        1 + 8 / (508 * 2), 1.5 + 8 / (336 * 2), 2 + 8 / (254 * 2), 3 + 8 / (168 * 2),
+    ]
+    snrs = [rows[f"BFP{bits}"]["snr_-20dbfs"] for bits in widths]
+    assert snrs == sorted(snrs)
+    assert rows["BFP12"]["snr_0dbfs"] == rows["SC16/Q11"]["snr_0dbfs"]
+    assert rows["BFP6"]["snr_-20dbfs"] > rows["SC8 rounded"]["snr_-20dbfs"]
+
+
+def unbalanced_rows_by_format(engine):
+    args = SimpleNamespace(
+        samples=8192,
+        cycles=37.25,
+        amplitudes=[0.0, -20.0, -40.0],
+        block_complex_samples=254,
+        header_bytes=8,
+        channels=2,
+        strong_dbfs=0.0,
+        engine=engine,
+    )
+    return {row["format"]: row for row in fmt.unbalanced_rows(args)}
+
+
+def test_bfp8_per_channel_exponents_recover_weak_channel_snr():
+    rows = unbalanced_rows_by_format("reference")
+    shared, per_channel = rows["BFP8 shared"], rows["BFP8 per-channel"]
+
+    assert per_channel["bytes_per_complex"] == shared["bytes_per_complex"]
+    # Balanced levels: both variants pick the same exponent.
+    assert per_channel["snr_0dbfs"] == shared["snr_0dbfs"]
+    # A full-scale RX1 forces the shared exponent up and the weak RX2 degrades to fixed SC8.
+    assert shared["snr_-20dbfs"] == pytest.approx(rows["SC8 rounded"]["snr_-20dbfs"])
+    assert per_channel["snr_-20dbfs"] - shared["snr_-20dbfs"] > 15.0
+    assert per_channel["snr_-40dbfs"] - shared["snr_-40dbfs"] > 20.0
+
+
+def test_numpy_engine_channel_quantizers_are_bit_exact_with_reference():
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(0xC4A7)
+    strong = rng.uniform(-1.0, 1.0, 2000)
+    weak   = rng.uniform(-0.02, 0.02, 2000)
+
+    for per_channel in [False, True]:
+        reference  = fmt.quantize_bfp_channels([strong.tolist(), weak.tolist()], 8, 64, per_channel)
+        vectorized = fmt.quantize_bfp_channels_np([strong, weak], 8, 64, per_channel)
+        assert vectorized.tolist() == reference
+
+    assert unbalanced_rows_by_format("numpy").keys() == unbalanced_rows_by_format("reference").keys()
+
+
 def test_format_loss_plot_can_be_generated(tmp_path):
     pytest.importorskip("matplotlib")
     args = SimpleNamespace(
@@ -63,3 +118,72 @@ def test_format_loss_plot_can_be_generated(tmp_path):
 
     assert output.exists()
     assert output.stat().st_size > 0
+
+
+def test_numpy_engine_quantizers_are_bit_exact_with_reference():
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(0x5A5A)
+    samples = np.concatenate([
+        rng.uniform(-1.05, 1.05, 4093),
+        rng.uniform(-0.01, 0.01, 4093),
+        np.arange(-2049, 2049) / fmt.Q11_SCALE,
+        (np.arange(-2048, 2048) + 0.5) / fmt.Q11_SCALE,
+    ])
+
+    pairs = [
+        (fmt.quantize_sc16,      fmt.quantize_sc16_np),
+        (fmt.quantize_sc8_trunc, fmt.quantize_sc8_trunc_np),
+        (fmt.quantize_sc8_round, fmt.quantize_sc8_round_np),
+        (lambda s: fmt.quantize_bfp(s, 8, 508), lambda s: fmt.quantize_bfp_np(s, 8, 508)),
+        (lambda s: fmt.quantize_bfp(s, 8, 7),   lambda s: fmt.quantize_bfp_np(s, 8, 7)),
+    ]
+    for reference, vectorized in pairs:
+        assert vectorized(samples).tolist() == reference(samples.tolist())
+
+
+def test_numpy_engine_quantizes_amplitude_sweep_as_2d_array():
+    np = pytest.importorskip("numpy")
+    sweep = fmt.sine_samples_np([0.0, -20.0, -40.0], 1000, 7.5)
+
+    decoded = fmt.quantize_bfp_np(sweep, 8, 64)
+
+    assert decoded.shape == (3, 1000)
+    for row_samples, row_decoded in zip(sweep, decoded):
+        assert row_decoded.tolist() == fmt.quantize_bfp(row_samples.tolist(), 8, 64)
+
+
+def test_numpy_engine_rows_match_reference_engine():
+    pytest.importorskip("numpy")
+    reference = {row["format"]: row for row in fmt.format_rows(SimpleNamespace(
+        samples=4096, cycles=37.25, amplitudes=[0.0, -20.0, -40.0],
+        block_complex_samples=254, header_bytes=8, channels=2, engine="reference",
+    ))}
+    vectorized = {row["format"]: row for row in fmt.format_rows(SimpleNamespace(
+        samples=4096, cycles=37.25, amplitudes=[0.0, -20.0, -40.0],
+        block_complex_samples=254, header_bytes=8, channels=2, engine="numpy",
+    ))}
+
+    assert reference.keys() == vectorized.keys()
+    for name, row in reference.items():
+        for key, value in row.items():
+            if key == "format":
+                continue
+            assert vectorized[name][key] == pytest.approx(value, abs=1e-6)
+
+
+def test_engine_benchmark_reports_bit_exact_results():
+    pytest.importorskip("numpy")
+    args = SimpleNamespace(
+        samples=2048,
+        cycles=11.5,
+        amplitudes=[0.0, -30.0],
+        block_complex_samples=254,
+        header_bytes=8,
+        channels=2,
+    )
+
+    result = fmt.benchmark_engines(args, repeat=1)
+
+    assert result["mismatches"] == []
+    assert result["reference_s"] > 0
+    assert result["numpy_s"] > 0
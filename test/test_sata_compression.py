@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import importlib.util
+import math
+import random
+from pathlib import Path
+
+from migen import *
+
+from litex.gen import *
+from litex.gen.sim import run_simulation
+
+from litex_m2sdr.gateware.sata import SATAStreamCompressor, SATA_COMPRESSION_MAGIC
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "m2sdr_sata_decompress.py"
+spec = importlib.util.spec_from_file_location("m2sdr_sata_decompress", SCRIPT)
+codec = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(codec)
+
+# Helpers -----------------------------------------------------------------------------------------
+
+
+def _word(lanes):
+    return sum((lane & 0xffff) << (16 * i) for i, lane in enumerate(lanes))
+
+
+def _sine_words(count, period=64.0, amplitude=1800):
+    words = []
+    for n in range(count):
+        i1 = round(amplitude * math.cos(2 * math.pi * n / period))
+        q1 = round(amplitude * math.sin(2 * math.pi * n / period))
+        words.append(_word([i1, q1, i1 // 2, q1 // 2]))
+    return words
+
+
+def _run(dut, words, enable=1, stall=0.0, drain=256, tail=()):
+    """Send `words` with `enable`, then disable the compressor and send `tail` words."""
+    random.seed(0x5A7A)
+    inputs  = []
+    outputs = []
+
+    def send(words):
+        for word in words:
+            yield dut.sink.valid.eq(1)
+            yield dut.sink.data.eq(word)
+            yield
+            while not (yield dut.sink.ready):
+                yield
+        yield dut.sink.valid.eq(0)
+
+    def gen():
+        yield dut.enable.eq(enable)
+        yield
+        yield from send(words)
+        for _ in range(drain):
+            yield
+        yield dut.enable.eq(0)
+        yield from send(tail)
+        for _ in range(drain):
+            yield
+
+    @passive
+    def ready_stress():
+        while True:
+            yield dut.source.ready.eq(0 if random.random() < stall else 1)
+            yield
+
+    @passive
+    def mon():
+        while True:
+            if (yield dut.sink.valid) and (yield dut.sink.ready):
+                inputs.append((yield dut.sink.data))
+            if (yield dut.source.valid) and (yield dut.source.ready):
+                outputs.append((yield dut.source.data))
+            yield
+
+    counters = {}
+
+    def counts():
+        for _ in range((len(words) + len(tail)) * 4 + 2 * drain):
+            yield
+        counters["input_words"]  = (yield dut.input_words)
+        counters["output_words"] = (yield dut.output_words)
+
+    run_simulation(dut, [gen(), ready_stress(), mon(), counts()])
+    return inputs, outputs, counters
+
+# Reference Codec Tests ---------------------------------------------------------------------------
+
+
+def test_reference_codec_round_trips_edge_values():
+    random.seed(0xC0DE)
+    words = [
+        0, (1 << 64) - 1, _word([0x8000, 0x7fff, 0x8000, 0x7fff]), _word([0x7fff, 0x8000, 1, 0xffff]),
+        *[random.getrandbits(64) for _ in range(50)],
+        *_sine_words(100),
+    ]
+
+    encoded = codec.encode_words(words, frame_beats=16)
+
+    assert encoded[0] & 0xffffffff == codec.MAGIC == SATA_COMPRESSION_MAGIC
+    assert codec.decode_words(encoded) == words
+
+
+def test_reference_decoder_resyncs_and_handles_truncation():
+    words   = _sine_words(64)
+    encoded = codec.encode_words(words, frame_beats=16)
+    stats   = {}
+
+    # Drop the first frame header and cut the capture in the last frame.
+    frame1 = [i for i, w in enumerate(encoded) if w & 0xffffffff == codec.MAGIC][1]
+    decoded = codec.decode_words(encoded[1:-1], stats)
+
+    assert stats["skipped_words"] == frame1 - 1
+    assert stats["frames"] == 2
+    assert stats["truncated"]
+    assert decoded[:32] == words[16:48]
+    assert decoded == words[16:16 + len(decoded)]
+
+
+def test_reference_codec_compresses_oversampled_sine():
+    words   = _sine_words(4096, period=200.0)
+    encoded = codec.encode_words(words)
+
+    assert codec.compression_ratio(len(words), len(encoded)) > 1.5
+
+# Gateware Tests ----------------------------------------------------------------------------------
+
+
+def test_sata_compressor_matches_reference_encoder():
+    random.seed(0xFACE)
+    words = [*_sine_words(40), *[random.getrandbits(64) for _ in range(20)], (1 << 64) - 1, 0, 0, 0]
+    dut   = SATAStreamCompressor(frame_beats=16, with_csr=False)
+
+    inputs, outputs, counters = _run(dut, words, stall=0.3)
+
+    assert inputs == words
+    assert outputs == codec.encode_words(words, frame_beats=16)
+    assert codec.decode_words(outputs) == words
+    assert counters == {"input_words": len(words), "output_words": len(outputs)}
+
+
+def test_sata_compressor_stores_incompressible_frames_raw():
+    random.seed(0xBEEF)
+    words = [*[random.getrandbits(64) for _ in range(32)], *_sine_words(16)]
+    dut   = SATAStreamCompressor(frame_beats=16, with_csr=False)
+
+    _, outputs, _ = _run(dut, words, stall=0.3)
+    stats = {}
+
+    assert outputs == codec.encode_words(words, frame_beats=16)
+    assert codec.decode_words(outputs, stats) == words
+    assert stats["raw_frames"] == 2
+    assert len(outputs) <= len(words) + 3 # Never more than the frame headers over raw.
+
+
+def test_sata_compressor_flushes_partial_frame_when_disabled():
+    words = _sine_words(40)
+    tail  = _sine_words(8, period=16.0)
+    dut   = SATAStreamCompressor(frame_beats=16, with_csr=False)
+
+    inputs, outputs, counters = _run(dut, words, stall=0.3, tail=tail)
+    encoded = codec.encode_words(words, frame_beats=16)
+
+    # The last 8-beat frame is flushed before the compressor switches to bypass.
+    assert inputs == words + tail
+    assert outputs == encoded + tail
+    assert codec.decode_words(encoded) == words
+    assert counters == {"input_words": len(words) + len(tail), "output_words": len(encoded) + len(tail)}
+
+
+def test_sata_compressor_bypass_when_disabled():
+    words = _sine_words(20)
+    dut   = SATAStreamCompressor(frame_beats=16, with_csr=False)
+
+    inputs, outputs, counters = _run(dut, words, enable=0, stall=0.3)
+
+    assert outputs == words
+    assert counters == {"input_words": len(words), "output_words": len(words)}
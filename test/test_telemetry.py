@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+from migen import *
+
+from litex.gen import *
+from litex.gen.sim import run_simulation
+from litex.tools.remote.csr_builder import CSRRegister
+
+from litex_m2sdr.gateware.telemetry import TelemetrySnapshot
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+spec = importlib.util.spec_from_file_location("m2sdr_telemetry", SCRIPTS / "m2sdr_telemetry.py")
+telemetry_mod = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(telemetry_mod)
+
+# Helpers -----------------------------------------------------------------------------------------
+
+class _DUT(LiteXModule):
+    def __init__(self, capture_delay=8):
+        self.time    = Signal(64)
+        self.level   = Signal(16)
+        self.error   = Signal((20, True))
+        self.event   = Signal()
+        self.meas    = Signal(32)
+        self.meas_in = Signal(32)
+        self.telemetry = TelemetrySnapshot(
+            time          = self.time,
+            values        = [("level", self.level), ("error", self.error)],
+            counters      = [("events", self.event)],
+            measurements  = [("meas", self.meas)],
+            capture_delay = capture_delay,
+            with_csr      = False,
+        )
+        # Free-running time/level/events; measurement updated 3 cycles after the request.
+        req = Signal(3)
+        self.sync += [
+            self.time.eq(self.time + 8),
+            self.level.eq(self.level + 1),
+            self.error.eq(-5),
+            self.meas_in.eq(self.meas_in + 1),
+            req.eq(Cat(self.telemetry.request, req[:-1])),
+            If(req[-1], self.meas.eq(self.meas_in)),
+        ]
+        self.comb += self.event.eq(self.level[0])
+
+
+def _snapshot(dut):
+    t    = dut.telemetry
+    snap = {"sequence": (yield t.sequence), "time": (yield t.time)}
+    for name, shadow in t.entries.items():
+        snap[name] = (yield shadow)
+    return snap
+
+# Gateware Tests ----------------------------------------------------------------------------------
+
+def test_telemetry_captures_values_with_time_in_same_cycle():
+    dut     = _DUT(capture_delay=8)
+    results = {}
+
+    def gen():
+        for _ in range(20):
+            yield
+        yield dut.telemetry.latch.eq(1)
+        yield
+        results["time"]  = (yield dut.time)
+        results["level"] = (yield dut.level)
+        yield dut.telemetry.latch.eq(0)
+        for _ in range(4):
+            yield
+        results["early"] = (yield from _snapshot(dut))
+        for _ in range(8):
+            yield
+        results["snap"] = (yield from _snapshot(dut))
+
+    run_simulation(dut, gen())
+
+    snap = results["snap"]
+    assert results["early"]["sequence"] == 0
+    assert snap["sequence"] == 1
+    assert snap["time"]   == results["time"]
+    assert snap["level"]  == results["level"]
+    assert snap["error"]  == -5
+    assert snap["events"] == results["level"] // 2
+    # Measurement latched on request, captured after its crossing delay.
+    assert snap["meas"] == results["level"] + 3
+
+
+def test_telemetry_ignores_strobes_while_pending_and_latches_on_pps():
+    dut     = _DUT(capture_delay=8)
+    results = {}
+
+    def gen():
+        yield dut.telemetry.latch.eq(1)
+        for _ in range(6):
+            yield # Repeated strobes during the pending capture.
+        yield dut.telemetry.latch.eq(0)
+        for _ in range(10):
+            yield
+        results["after_latch"] = (yield from _snapshot(dut))
+
+        yield dut.telemetry.pps.eq(1)
+        yield
+        yield dut.telemetry.pps.eq(0)
+        for _ in range(12):
+            yield
+        results["pps_disabled"] = (yield from _snapshot(dut))
+
+        yield dut.telemetry.pps_latch.eq(1)
+        yield dut.telemetry.pps.eq(1)
+        yield
+        results["pps_time"] = (yield dut.time)
+        yield dut.telemetry.pps.eq(0)
+        for _ in range(12):
+            yield
+        results["pps"] = (yield from _snapshot(dut))
+
+    run_simulation(dut, gen())
+
+    assert results["after_latch"]["sequence"]  == 1
+    assert results["after_latch"]["time"]      == 8
+    assert results["pps_disabled"]["sequence"] == 1
+    assert results["pps"]["sequence"]          == 2
+    assert results["pps"]["time"]              == results["pps_time"]
+
+# Host Tests --------------------------------------------------------------------------------------
+
+class FakeTelemetryBus:
+    """RemoteClient stand-in exposing telemetry CSRs; each latch takes a new snapshot."""
+    def __init__(self):
+        self.mem   = {}
+        self.reads = []
+        self.snapshots = [
+            {"time": 1_000_000_000, "dma_writer_beats": 0xffff_fff0, "ptp_last_error": (1 << 96) - 12},
+            {"time": 1_500_000_000, "dma_writer_beats": 0x0000_0010, "ptp_last_error": 7},
+        ]
+        layout = [
+            ("telemetry_control",          0x0000, 1, "rw"),
+            ("telemetry_sequence",         0x0004, 1, "ro"),
+            ("telemetry_time",             0x0008, 2, "ro"),
+            ("telemetry_dma_writer_beats", 0x0010, 1, "ro"),
+            ("telemetry_ptp_last_error",   0x0014, 3, "ro"),
+        ]
+        self.layout = {name: (addr, length) for name, addr, length, _ in layout}
+        self.regs   = SimpleNamespace(**{name: CSRRegister(self.read, self.write, name, addr, length, 32, mode)
+            for name, addr, length, mode in layout})
+        self.sequence = 0
+
+    def _store(self, name, value):
+        addr, length = self.layout[name]
+        for i in range(length):
+            self.mem[addr + 4*i] = (value >> (32*(length - 1 - i))) & 0xffffffff
+
+    def read(self, addr, length=None, burst="incr"):
+        self.reads.append((addr, length))
+        datas = [self.mem.get(addr + 4*i, 0) for i in range(1 if length is None else length)]
+        return datas[0] if length is None else datas
+
+    def write(self, addr, datas):
+        if addr == self.layout["telemetry_control"][0] and datas[0] & 1:
+            snapshot = self.snapshots[self.sequence]
+            self.sequence += 1
+            self._store("telemetry_sequence", self.sequence)
+            for name, value in snapshot.items():
+                self._store(f"telemetry_{name}", value)
+
+
+def test_telemetry_driver_reads_burst_and_computes_hardware_rates():
+    bus    = FakeTelemetryBus()
+    driver = telemetry_mod.TelemetryDriver(bus)
+
+    prev = driver.snapshot()
+    curr = driver.snapshot()
+    rates = telemetry_mod.rates(prev, curr)
+
+    assert (prev["sequence"], curr["sequence"]) == (1, 2)
+    assert prev["entries"]["ptp_last_error"] == -12
+    assert curr["entries"]["ptp_last_error"] == 7
+    assert rates == {"dma_writer_beats": 0x20 / 0.5}
+    # One burst for all telemetry registers (plus one sequence re-read) per snapshot.
+    assert bus.reads.count((0x0004, 7)) == 2
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+from migen import *
+
+from litex.gen.sim import run_simulation
+
+from litex_m2sdr.gateware.timestamper import EventTimestamper
+
+
+class _DUT(Module):
+    def __init__(self, depth=16, rising_reset=None):
+        self.time = Signal(64)
+        self.fast = Signal(2) # Dual-edge sampled input.
+        self.slow = Signal(1) # Plain synchronized input.
+        self.submodules.ts = EventTimestamper(
+            time          = self.time,
+            channels      = [("fast", self.fast), ("slow", self.slow)],
+            clk_period_ns = 10,
+            depth         = depth,
+            rising_reset  = rising_reset,
+            with_csr      = False,
+        )
+        self.sync += self.time.eq(self.time + 10)
+
+
+def _drain(ts):
+    entries = []
+    while (yield ts.level):
+        words = []
+        for _ in range(EventTimestamper.ENTRY_WORDS):
+            words.append((yield ts.data))
+            yield ts.read.eq(1)
+            yield
+            yield ts.read.eq(0)
+            yield
+        meta = words[2]
+        entries.append({
+            "time"    : words[0] | (words[1] << 32),
+            "channel" : meta & 0xf,
+            "rising"  : (meta >> 4) & 1,
+            "lost"    : (meta >> 5) & 1,
+            "fine_ps" : meta >> 16,
+        })
+    return entries
+
+
+def test_event_timestamper_latches_time_and_sub_cycle_phase():
+    dut = _DUT()
+    seen = {}
+
+    def gen():
+        yield dut.ts.enable.eq(1)
+        yield dut.ts.falling.eq(0b01)
+        for _ in range(4):
+            yield
+        # fast: rises between the two samples of a cycle (second half), falls on the first sample.
+        yield dut.fast.eq(0b10)
+        seen["fast_rise"] = (yield dut.time)
+        yield
+        yield dut.fast.eq(0b11)
+        for _ in range(3):
+            yield
+        yield dut.fast.eq(0b00)
+        seen["fast_fall"] = (yield dut.time)
+        # slow and fast rise on the same cycle: both captured with the same time.
+        yield
+        yield dut.fast.eq(0b11)
+        yield dut.slow.eq(1)
+        seen["both"] = (yield dut.time)
+        yield
+        for _ in range(8):
+            yield
+        entries = yield from _drain(dut.ts)
+        seen["entries"] = entries
+
+    run_simulation(dut, gen())
+    entries = seen["entries"]
+    # The generator writes take effect on the next edge: event cycles are one time step later.
+    assert [(e["channel"], e["rising"], e["fine_ps"]) for e in entries] == [
+        (0, 1, 5000), (0, 0, 0), (0, 1, 0), (1, 1, 0),
+    ]
+    assert entries[0]["time"] - seen["fast_rise"] == entries[1]["time"] - seen["fast_fall"]
+    assert entries[2]["time"] == entries[3]["time"]
+    assert entries[2]["time"] - seen["both"] == entries[0]["time"] - seen["fast_rise"]
+    assert not any(e["lost"] for e in entries)
+
+
+def _run_toggling(depth):
+    dut = _DUT(depth=depth)
+    seen = {}
+
+    def gen():
+        yield dut.ts.enable.eq(1)
+        yield dut.ts.falling.eq(0b11)
+        # Toggle both channels every cycle: more events than the arbiter (one per cycle) can take.
+        for cycle in range(24):
+            yield dut.fast.eq(0b11 if cycle % 2 else 0b00)
+            yield dut.slow.eq(cycle % 2)
+            yield
+        yield dut.ts.enable.eq(0)
+        for _ in range(8):
+            yield
+        seen["dropped"] = (yield dut.ts.dropped)
+        seen["entries"] = yield from _drain(dut.ts)
+        seen["empty"]   = (yield dut.ts.data)
+        yield dut.ts.clear.eq(1)
+        yield
+        yield dut.ts.clear.eq(0)
+        yield
+        seen["dropped_after_clear"] = (yield dut.ts.dropped)
+
+    run_simulation(dut, gen())
+    return seen
+
+
+def test_event_timestamper_flags_lost_events_and_counts_drops():
+    # Arbiter overrun: every event reaches the FIFO or is flagged on the pending entry.
+    seen = _run_toggling(depth=64)
+    assert seen["dropped"] == 0
+    assert {e["channel"] for e in seen["entries"]} == {0, 1}
+    assert any(e["lost"] for e in seen["entries"])
+
+    # FIFO overflow: the oldest entries are kept, the rest is counted.
+    seen = _run_toggling(depth=2)
+    assert len(seen["entries"]) == 3 # depth + output buffer.
+    assert seen["dropped"] > 0
+    assert seen["empty"] == 0
+    assert seen["dropped_after_clear"] == 0
+
+
+def test_event_timestamper_rising_reset_selects_default_channels():
+    # Only fast is enabled at reset: a free-running clock on slow must not reach the FIFO.
+    dut = _DUT(rising_reset=0b01)
+    seen = {}
+
+    def gen():
+        yield dut.ts.enable.eq(1)
+        for cycle in range(16):
+            yield dut.slow.eq(cycle % 2)
+            yield dut.fast.eq(0b11 if cycle >= 8 else 0b00)
+            yield
+        for _ in range(8):
+            yield
+        seen["entries"] = yield from _drain(dut.ts)
+
+    run_simulation(dut, gen())
+    assert [(e["channel"], e["rising"]) for e in seen["entries"]] == [(0, 1)]
@@ -6,14 +6,26 @@
 # Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
 # SPDX-License-Identifier: BSD-2-Clause
 
+import importlib.util
+from pathlib import Path
+
 from migen import *
 import random
 
 from litex.gen import *
 from litex.gen.sim import run_simulation
 
-from litex_m2sdr.gateware.rfic import RFICDataPacketizer
-from litex_m2sdr.gateware.vrt import VRTSignalPacketInserter
+from litex.soc.interconnect import stream
+
+from litex_m2sdr.gateware.ad9361.bitmode import AD9361RXSampleCounter
+from litex_m2sdr.gateware.rfic import RFICDataPacketizer, RFIC_SAMPLE_COUNT_BITS, rfic_rx_layout
+from litex_m2sdr.gateware.vrt import VRTSignalPacketInserter, VRTContextPacketInserter, VRTSignalPacketStreamer
+from litex_m2sdr.gateware.vrt import vrt_payload_format
+
+SCRIPT = Path(__file__).resolve().parents[1] / "litex_m2sdr" / "software" / "user" / "m2sdr_vrt_rx.py"
+spec = importlib.util.spec_from_file_location("m2sdr_vrt_rx", SCRIPT)
+vrt_rx = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(vrt_rx)
 
 # Helpers -----------------------------------------------------------------------------------------
 
@@ -414,6 +426,344 @@ def test_vrt_packet_structural_invariants_under_stalls():
     assert header_hits >= len(packets)
 
 
+def test_vrt_signal_packet_inserter_class_id_and_trailer():
+    """Verify optional Class ID words and trailer (valid-data / sticky over-range) are emitted."""
+    dut = VRTSignalPacketInserter(data_width=32, with_class_id=True, with_trailer=True)
+    captured = []
+    packets = [
+        ([0x01020304, 0x11121314, 0x21222324], 0),
+        ([0x31323334, 0x41424344, 0x51525354], 1),
+        ([0x61626364, 0x71727374, 0x81828384], None),
+    ]
+
+    def gen():
+        yield dut.source.ready.eq(1)
+        yield dut.class_oui.eq(0x00123456)
+        yield dut.class_icc.eq(0xABCD)
+        yield dut.class_pcc.eq(0x0102)
+        for pidx, (data, over_range_beat) in enumerate(packets):
+            yield dut.sink.stream_id.eq(0x4D320001)
+            yield dut.sink.timestamp_int.eq(0x100 + pidx)
+            yield dut.sink.timestamp_fra.eq(0x200 + pidx)
+            yield dut.sink.data_words.eq(len(data))
+            for i, sample in enumerate(data):
+                yield dut.over_range.eq(i == over_range_beat)
+                yield dut.sink.valid.eq(1)
+                yield dut.sink.first.eq(i == 0)
+                yield dut.sink.last.eq(i == len(data) - 1)
+                yield dut.sink.data.eq(sample)
+                yield
+                while not (yield dut.sink.ready):
+                    yield
+            yield dut.over_range.eq(0)
+            yield dut.sink.valid.eq(0)
+            yield dut.sink.last.eq(0)
+            yield
+        for _ in range(64):
+            yield
+
+    @passive
+    def mon():
+        while True:
+            if (yield dut.source.valid) and (yield dut.source.ready):
+                captured.append(((yield dut.source.data), (yield dut.source.last)))
+            yield
+
+    run_simulation(dut, [gen(), mon()])
+
+    words_per_packet = 7 + 3 + 1
+    assert len(captured) == len(packets) * words_per_packet
+    for pidx, (data, over_range_beat) in enumerate(packets):
+        pkt = captured[pidx * words_per_packet:(pidx + 1) * words_per_packet]
+        assert [last for _, last in pkt] == [0] * (words_per_packet - 1) + [1]
+
+        common = _be32(pkt[0][0])
+        assert ((common >> 27) & 0x1) == 1
+        assert ((common >> 26) & 0x1) == 1
+        assert (common & 0xFFFF) == words_per_packet
+        assert _be32(pkt[1][0]) == 0x4D320001
+        assert _be32(pkt[2][0]) == 0x00123456
+        assert _be32(pkt[3][0]) == 0xABCD0102
+        assert _be32(pkt[4][0]) == 0x100 + pidx
+        assert ((_be32(pkt[5][0]) << 32) | _be32(pkt[6][0])) == 0x200 + pidx
+        assert [word for word, _ in pkt[7:10]] == data
+
+        trailer = _be32(pkt[10][0])
+        assert trailer & (1 << 30) and trailer & (1 << 25)
+        assert trailer & (1 << 18)
+        assert bool(trailer & (1 << 13)) == (over_range_beat is not None)
+
+
+def test_rfic_data_packetizer_runtime_data_words():
+    """Verify data_words changes apply on packet boundaries and are carried with each packet."""
+    dut = RFICDataPacketizer(data_width=32, data_words=4, max_data_words=8)
+    captured = []
+
+    def gen():
+        for i in range(4 + 6 + 6):
+            if i == 2:
+                # Mid-packet change must not truncate the current packet.
+                yield dut.data_words.eq(6)
+            yield dut.sink.valid.eq(1)
+            yield dut.sink.data.eq(i)
+            yield
+            while not (yield dut.sink.ready):
+                yield
+        yield dut.sink.valid.eq(0)
+        for _ in range(32):
+            yield
+
+    @passive
+    def mon():
+        yield dut.source.ready.eq(1)
+        while True:
+            if (yield dut.source.valid) and (yield dut.source.ready):
+                captured.append(((yield dut.source.data), (yield dut.source.last), (yield dut.source.data_words)))
+            yield
+
+    run_simulation(dut, [gen(), mon()])
+
+    assert [w for w, _, _ in captured] == list(range(16))
+    assert [l for _, l, _ in captured] == [0, 0, 0, 1] + [0, 0, 0, 0, 0, 1] * 2
+    assert [dw for _, _, dw in captured] == [4] * 4 + [6] * 12
+
+
+def test_vrt_context_packet_inserter_interleaves_between_signal_packets():
+    """Verify Context packets are sent at start, every interval and on update, never inside a packet."""
+    dut = VRTContextPacketInserter(data_width=32, interval=2, with_csr=False)
+    captured = []
+    npackets = 6
+
+    def gen():
+        yield dut.stream_id.eq(0x4D320001)
+        yield dut.timestamp_int.eq(1000)
+        yield dut.timestamp_fra.eq(0x0000_0012_3456_789A)
+        yield dut.bandwidth.eq(int(56e6) << 20)
+        yield dut.rf_freq.eq(int(2.4e9) << 20)
+        yield dut.gain.eq(20 << 7)
+        yield dut.sample_rate.eq(int(30.72e6) << 20)
+        for pkt in range(npackets):
+            if pkt == 3:
+                yield dut.update.eq(1)
+                yield
+                yield dut.update.eq(0)
+            for i in range(3):
+                yield dut.sink.valid.eq(1)
+                yield dut.sink.last.eq(i == 2)
+                yield dut.sink.data.eq(0x10 * pkt + i)
+                yield
+                while not (yield dut.sink.ready):
+                    yield
+            yield dut.sink.valid.eq(0)
+            yield
+        for _ in range(64):
+            yield
+
+    @passive
+    def mon():
+        cycle = 0
+        while True:
+            yield dut.source.ready.eq(int(cycle % 5 != 0))
+            if (yield dut.source.valid) and (yield dut.source.ready):
+                captured.append(((yield dut.source.data), (yield dut.source.last)))
+            cycle += 1
+            yield
+
+    run_simulation(dut, [gen(), mon()])
+
+    packets, current = [], []
+    for word, last in captured:
+        current.append(word)
+        if last:
+            packets.append(current)
+            current = []
+
+    kinds = ["C" if len(pkt) == 15 else "S" for pkt in packets]
+    assert kinds == ["C", "S", "S", "C", "S", "C", "S", "S", "C", "S"]
+    signal = [pkt for pkt in packets if len(pkt) == 3]
+    assert signal == [[0x10 * p + i for i in range(3)] for p in range(npackets)]
+
+    contexts = [[_be32(w) for w in pkt] for pkt in packets if len(pkt) == 15]
+    for n, ctx in enumerate(contexts):
+        assert (ctx[0] >> 28) == 0x4
+        assert ((ctx[0] >> 16) & 0xF) == n
+        assert (ctx[0] & 0xFFFF) == 15
+        assert ctx[1] == 0x4D320001
+        if n:  # The first context timestamp is latched out of reset, before gen() drives it.
+            assert ctx[2] == 1000
+            assert ((ctx[3] << 32) | ctx[4]) == 0x0000_0012_3456_789A
+        assert ((ctx[11] << 32) | ctx[12]) >> 20 == int(30.72e6)
+        assert ((ctx[8] << 32) | ctx[9]) >> 20 == int(2.4e9)
+        assert ctx[10] == 20 << 7
+        assert ((ctx[13] << 32) | ctx[14]) == vrt_payload_format(16, 2)
+    # Change Indicator on the initial context and on the one following the update.
+    assert [bool(ctx[5] >> 31) for ctx in contexts] == [True, False, True, False]
+
+    # Host receiver decodes the gateware context packet.
+    wire = b"".join(int(w).to_bytes(4, "little") for w in packets[-2])
+    ctx = vrt_rx.parse_vrt_context_packet(wire)
+    assert ctx["sample_rate"] == int(30.72e6)
+    assert ctx["rf_freq"] == int(2.4e9)
+    assert ctx["bandwidth"] == int(56e6)
+    assert ctx["gain"] == (20.0, 0.0)
+    assert (ctx["channels"], ctx["bytes_per_complex"]) == (2, 4)
+
+
+def _capture_packets(dut, gen):
+    captured = []
+
+    @passive
+    def mon():
+        port = dut.vrt_streamer.sink
+        while True:
+            if (yield port.valid) and (yield port.ready):
+                captured.append(((yield port.data), (yield port.last)))
+            yield
+
+    run_simulation(dut, [gen(), mon()])
+
+    packets, current = [], []
+    for word, last in captured:
+        current.append(_be32(word))
+        if last:
+            packets.append(current)
+            current = []
+    return packets
+
+
+def _packet_timestamps(packets):
+    return [(pkt[3] << 32) | pkt[4] for pkt in packets]
+
+
+def _streamer_packets(dut, words, sample_counts=(), sample_count_ref=0):
+    def gen():
+        yield dut.sink.timestamp_int.eq(77)
+        yield dut.sink.timestamp_fra.eq(0x1234)
+        yield dut.sample_count_ref.eq(sample_count_ref)
+        for pkt, sample_count in enumerate(sample_counts):
+            yield dut.sink.data_words.eq(words)
+            yield dut.sink.sample_count.eq(sample_count)
+            for i in range(words):
+                yield dut.sink.valid.eq(1)
+                yield dut.sink.last.eq(i == words - 1)
+                yield dut.sink.data.eq((pkt << 8) | i)
+                yield
+                while not (yield dut.sink.ready):
+                    yield
+            yield dut.sink.valid.eq(0)
+            yield
+        for _ in range(32):
+            yield
+
+    return _capture_packets(dut, gen)
+
+
+class _VRTSampleCountPath(LiteXModule):
+    """RFIC RX output (16-bit mode, one sample instant per 64-bit word) -> RX path able to drop
+    words -> 64/32-bit converter -> VRT packetizer/streamer, as wired in the SoC."""
+    def __init__(self, data_words):
+        from liteeth.core.udp import LiteEthUDPCrossbar
+
+        self.source  = stream.Endpoint(rfic_rx_layout(64, RFIC_SAMPLE_COUNT_BITS))
+        self.drop    = Signal()
+        self.counter = AD9361RXSampleCounter()
+        self.conv    = stream.Converter(64, 32)
+        self.streamer = VRTSignalPacketStreamer(LiteEthUDPCrossbar(32), "239.168.1.100", 4991,
+            with_csr=False, data_words=data_words, timestamp_mode="sample-count")
+        self.packetizer = RFICDataPacketizer(data_width=32, data_words=data_words,
+            max_data_words=self.streamer.max_data_words, sample_count_bits=RFIC_SAMPLE_COUNT_BITS)
+        self.vrt_streamer = self.streamer.vrt_streamer
+
+        self.comb += [
+            self.counter.ce.eq(self.source.valid & self.source.ready),
+            self.source.sample_count.eq(self.counter.count),
+            If(self.drop,
+                self.source.ready.eq(1),
+            ).Else(
+                self.source.connect(self.conv.sink, omit={"sample_count"}),
+            ),
+            self.packetizer.sink.sample_count.eq(self.source.sample_count),
+            self.conv.source.connect(self.packetizer.sink, omit={"sample_count"}),
+            self.packetizer.source.connect(self.streamer.sink),
+            self.packetizer.data_words.eq(self.streamer.data_words),
+            self.streamer.sample_count_ref.eq(self.counter.count),
+            self.streamer.sample_count_base.eq(self.counter.base),
+        ]
+
+
+def _sample_count_path_packets(beats, drops=(), pps_before=None):
+    dut = _VRTSampleCountPath(data_words=4)
+
+    def gen():
+        for beat in range(beats):
+            if beat == pps_before:
+                for _ in range(64): # Let the previous packets out.
+                    yield
+                yield dut.counter.pps_clear.eq(1)
+                yield
+                yield dut.counter.pps_clear.eq(0)
+                yield dut.counter.pps.eq(1)
+                yield
+                yield dut.counter.pps.eq(0)
+            yield dut.drop.eq(beat in drops)
+            yield dut.source.valid.eq(1)
+            yield dut.source.data.eq(beat)
+            yield
+            while not (yield dut.source.ready):
+                yield
+            yield dut.source.valid.eq(0)
+            yield
+        for _ in range(64):
+            yield
+
+    return _capture_packets(dut, gen)
+
+
+def test_vrt_streamer_sample_count_timestamps():
+    """Verify TSF=SAMPLE_COUNT packets carry the index of their first sample, realigned on PPS."""
+    packets = _sample_count_path_packets(beats=10, pps_before=6)
+
+    assert len(packets) == 5
+    assert all(((pkt[0] >> 20) & 0x3) == 0x1 for pkt in packets)  # TSF SAMPLE_COUNT.
+    assert _packet_timestamps(packets) == [0, 2, 4, 0, 2]
+
+    ticks = vrt_rx.vrt_timestamp_ticks([1] * 3, [0] * 3, _packet_timestamps(packets[:3]))
+    assert list(ticks) == [0, 2, 4]
+
+
+def test_vrt_streamer_sample_count_timestamps_show_upstream_drops():
+    """Verify samples dropped between the RFIC and the VRT streamer show up as timestamp gaps."""
+    packets = _sample_count_path_packets(beats=12, drops={4, 5})
+
+    assert len(packets) == 5
+    assert _packet_timestamps(packets) == [0, 2, 6, 8, 10]
+    assert [_be32(pkt[5]) for pkt in packets[1:3]] == [2, 6]  # Payload starts with the timestamped word.
+
+
+def test_vrt_streamer_sample_count_extended_against_live_count():
+    """Verify the carried low sample count bits are extended against the live RFIC count."""
+    from liteeth.core.udp import LiteEthUDPCrossbar
+
+    dut = VRTSignalPacketStreamer(LiteEthUDPCrossbar(32), "239.168.1.100", 4991, with_csr=False,
+        data_words=4, timestamp_mode="sample-count")
+    packets = _streamer_packets(dut, words=4, sample_counts=[0xffff_fff0, 0x0000_0004],
+        sample_count_ref=0x3_0000_0010)
+
+    assert _packet_timestamps(packets) == [0x2_ffff_fff0, 0x3_0000_0004]
+
+
+def test_vrt_streamer_real_time_timestamps_by_default():
+    """Verify the default mode keeps the REAL_TIME sink timestamps."""
+    from liteeth.core.udp import LiteEthUDPCrossbar
+
+    dut = VRTSignalPacketStreamer(LiteEthUDPCrossbar(32), "239.168.1.100", 4991, with_csr=False, data_words=4)
+    packets = _streamer_packets(dut, words=4, sample_counts=[0, 0])
+
+    assert all(((pkt[0] >> 20) & 0x3) == 0x2 for pkt in packets)
+    assert all(pkt[2] == 77 for pkt in packets)
+    assert _packet_timestamps(packets) == [0x1234, 0x1234]
+
+
 if __name__ == "__main__":
     test_vrt_signal_packet_inserter()
     test_rfic_data_packetizer()
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+#
+# This file is part of LiteX-M2SDR.
+#
+# Copyright (c) 2026 Enjoy-Digital <enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import importlib.util
+import os
+import socket
+import struct
+from pathlib import Path
+
+import pytest
+
+
+def _load_vrt_rx():
+    path = Path(__file__).resolve().parents[1] / "litex_m2sdr" / "software" / "user" / "m2sdr_vrt_rx.py"
+    spec = importlib.util.spec_from_file_location("m2sdr_vrt_rx", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _signal_packet(packet_count, payload, stream_id=0xdeadbeef, timestamp_int=12, timestamp_fra=34_000, tsf=2):
+    words = 5 + len(payload) // 4
+    common = (0x1 << 28) | (0x1 << 22) | (tsf << 20) | ((packet_count & 0xF) << 16) | words
+    return struct.pack(">IIIQ", common, stream_id, timestamp_int, timestamp_fra) + payload
+
+
+def _class_trailer_packet(packet_count, payload, class_id=(0x123456, 0xabcd, 0x0102), valid_data=True,
+    over_range=False, stream_id=0xdeadbeef, timestamp_int=12, timestamp_fra=34_000):
+    words = 7 + len(payload) // 4 + 1
+    common = (0x1 << 28) | (0x1 << 27) | (0x1 << 26) | (0x1 << 22) | (0x2 << 20) | ((packet_count & 0xF) << 16) | words
+    trailer = (1 << 30) | (1 << 25) | (valid_data << 18) | (over_range << 13)
+    oui, icc, pcc = class_id
+    return (struct.pack(">IIIHHIQ", common, stream_id, oui, icc, pcc, timestamp_int, timestamp_fra) +
+        payload + struct.pack(">I", trailer))
+
+
+def _context_packet(packet_count=0, stream_id=0xdeadbeef, sample_rate=30.72e6, rf_freq=2.4e9, bandwidth=56e6,
+    gain_db=20, item_bits=8, channels=2, change=False, timestamp_int=12, timestamp_fra=0):
+    cif0 = (change << 31) | (1 << 29) | (1 << 27) | (1 << 23) | (1 << 21) | (1 << 15)
+    fmt  = (((0b01 << 29) | ((item_bits - 1) << 6) | (item_bits - 1)) << 32) | (channels - 1)
+    body = struct.pack(">IIQIQQIQQ", stream_id, timestamp_int, timestamp_fra, cif0,
+        int(bandwidth * 2**20), int(rf_freq * 2**20), int(gain_db * 128) & 0xFFFF, int(sample_rate * 2**20), fmt)
+    common = (0x4 << 28) | (0x1 << 22) | (0x2 << 20) | ((packet_count & 0xF) << 16) | (1 + len(body) // 4)
+    return struct.pack(">I", common) + body
+
+
+def _fill_ring(vrt, packets, slot_bytes=256):
+    np = pytest.importorskip("numpy")
+    ring = np.zeros((len(packets), slot_bytes), dtype=np.uint8)
+    for i, pkt in enumerate(packets):
+        ring[i, :len(pkt)] = np.frombuffer(pkt, dtype=np.uint8)
+    return ring, np.array([len(pkt) for pkt in packets])
+
+
+def test_bulk_header_parse_matches_scalar_parser():
+    vrt = _load_vrt_rx()
+    packets = [
+        _signal_packet(i, bytes(range(i, i + 16)), timestamp_int=100 + i, timestamp_fra=(1 << 40) + i)
+        for i in range(20)
+    ]
+    ring, lengths = _fill_ring(vrt, packets)
+
+    headers = vrt.parse_vrt_signal_headers(ring, lengths)
+
+    assert headers["valid"].all()
+    for i, pkt in enumerate(packets):
+        scalar = vrt.parse_vrt_signal_packet(pkt)
+        for key in ["packet_type", "tsi_type", "tsf_type", "packet_count", "packet_words",
+                    "stream_id", "timestamp_int", "timestamp_fra"]:
+            assert int(headers[key][i]) == scalar[key]
+
+
+def test_bulk_header_parse_flags_invalid_packets():
+    vrt = _load_vrt_rx()
+    good      = _signal_packet(0, bytes(8))
+    truncated = good[:-4]
+    context   = bytes([0x40]) + good[1:]
+    short     = good[:12]
+    ring, lengths = _fill_ring(vrt, [good, truncated, context, short])
+
+    headers = vrt.parse_vrt_signal_headers(ring, lengths)
+
+    assert headers["valid"].tolist() == [True, False, False, False]
+
+
+def test_parser_decodes_class_id_and_trailer():
+    vrt = _load_vrt_rx()
+    pkt = _class_trailer_packet(3, bytes(range(8)), over_range=True, timestamp_int=77, timestamp_fra=88)
+
+    v = vrt.parse_vrt_signal_packet(pkt)
+
+    assert (v["class_oui"], v["class_icc"], v["class_pcc"]) == (0x123456, 0xabcd, 0x0102)
+    assert (v["timestamp_int"], v["timestamp_fra"]) == (77, 88)
+    assert (v["valid_data"], v["over_range"]) == (True, True)
+    assert v["payload"] == bytes(range(8))
+
+    plain = vrt.parse_vrt_signal_packet(_signal_packet(0, bytes(4)))
+    assert plain["class_oui"] is None and plain["trailer"] is None
+
+
+def test_bulk_header_parse_mixes_class_id_trailer_and_plain_packets():
+    vrt = _load_vrt_rx()
+    packets = [
+        _signal_packet(0, bytes(range(16)), timestamp_int=5, timestamp_fra=6),
+        _class_trailer_packet(1, bytes(range(16, 24)), timestamp_int=7, timestamp_fra=8, over_range=True),
+        _class_trailer_packet(2, bytes(range(24, 28)), class_id=(1, 2, 3), valid_data=False),
+    ]
+    ring, lengths = _fill_ring(vrt, packets)
+
+    headers = vrt.parse_vrt_signal_headers(ring, lengths)
+
+    assert headers["valid"].all()
+    assert headers["payload_bytes"].tolist() == [16, 8, 4]
+    for i, pkt in enumerate(packets):
+        scalar = vrt.parse_vrt_signal_packet(pkt)
+        for key in ["timestamp_int", "timestamp_fra"]:
+            assert int(headers[key][i]) == scalar[key]
+        assert bytes(vrt.vrt_payload(ring[i], headers, i)) == scalar["payload"]
+        if scalar["trailer"] is not None:
+            assert int(headers["trailer"][i]) == scalar["trailer"]
+            assert vrt.decode_vrt_trailer(int(headers["trailer"][i])) == (scalar["valid_data"], scalar["over_range"])
+            assert int(headers["class_oui"][i]) == scalar["class_oui"]
+    assert headers["class_icc"].tolist() == [0, 0xabcd, 2]
+
+
+def test_context_packet_decodes_rf_state_and_format():
+    vrt = _load_vrt_rx()
+
+    ctx = vrt.parse_vrt_context_packet(_context_packet(3, stream_id=7, sample_rate=61.44e6, rf_freq=915.25e6,
+        gain_db=-3.5, item_bits=16, channels=1, change=True, timestamp_int=99))
+
+    assert (ctx["packet_count"], ctx["stream_id"], ctx["timestamp_int"], ctx["change"]) == (3, 7, 99, True)
+    assert ctx["sample_rate"] == 61.44e6
+    assert ctx["rf_freq"] == 915.25e6
+    assert ctx["bandwidth"] == 56e6
+    assert ctx["gain"] == (-3.5, 0.0)
+    assert (ctx["item_bits"], ctx["channels"], ctx["bytes_per_complex"]) == (16, 1, 4)
+    with pytest.raises(ValueError):
+        vrt.parse_vrt_context_packet(_signal_packet(0, bytes(4)))
+
+
+def test_offline_analysis_takes_sample_rate_and_format_from_context(tmp_path, capsys):
+    pytest.importorskip("numpy")
+    vrt = _load_vrt_rx()
+    # 1024 payload bytes of 16-bit, single channel samples: 256 samples per packet at 7.68 MS/s.
+    period_ns = 256 * 1e9 / 7.68e6
+    indexes = [0, 1, 2] + list(range(20, 24))
+    packets = [_context_packet(0, sample_rate=7.68e6, item_bits=16, channels=1)]
+    packets += [
+        _signal_packet(i, bytes(1024), timestamp_int=5, timestamp_fra=int(i * period_ns) * 1000)
+        for i in indexes
+    ]
+    vrt_file = tmp_path / "capture.vrt"
+    vrt_file.write_bytes(b"".join(packets))
+    args = vrt.argparse.Namespace(
+        pcap=None, pcap_port=None, vrt_file=str(vrt_file), batch=4, slot_bytes=2048,
+        channels=2, bytes_per_complex=2, sample_rate=None, jitter_bin=100.0, json=True,
+    )
+
+    vrt.run_offline(args)
+
+    summary = vrt.json.loads(capsys.readouterr().out.splitlines()[0])
+    assert summary["period"] == pytest.approx(period_ns)
+    # The 17-packet hole aliases on the 4-bit counter: only the context-derived period sees it.
+    assert summary["lost"] == 17
+
+
+def test_packet_count_losses_handles_wrap_and_batches():
+    vrt = _load_vrt_rx()
+
+    assert vrt.packet_count_losses([14, 15, 0, 1]) == (0, 1)
+    assert vrt.packet_count_losses([3, 5, 6], last_pc=1) == (2, 6)
+    assert vrt.packet_count_losses([], last_pc=7) == (0, 7)
+
+
+def test_rate_stats_aggregate_loss_and_drops():
+    vrt = _load_vrt_rx()
+    packets = [_signal_packet(pc, bytes(32)) for pc in [0, 1, 3, 4]] + [b"\x00" * 8]
+    ring, lengths = _fill_ring(vrt, packets)
+    stats = vrt.VRTRateStats(interval=1.0, bytes_per_sample=4, now=0.0)
+
+    stats.update(vrt.parse_vrt_signal_headers(ring, lengths), len(packets))
+
+    assert stats.report(now=0.5) is None
+    line = stats.report(now=1.0)
+    assert "pkts=4" in line
+    assert "lost=1" in line
+    assert "drops=1" in line
+    assert stats.total_packets == 4
+
+
+def test_batch_receiver_drains_socket_and_writes_payloads(tmp_path):
+    vrt = _load_vrt_rx()
+    pytest.importorskip("numpy")
+    rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        rx.bind(("127.0.0.1", 0))
+        packets = [_signal_packet(i, bytes([i]) * 64) for i in range(6)]
+        for pkt in packets:
+            tx.sendto(pkt, rx.getsockname())
+
+        receiver = vrt.VRTBatchReceiver(rx, batch=4, slot_bytes=512)
+        counts = [receiver.receive(timeout=1.0)]
+        out = tmp_path / "payload.bin"
+        fd = os.open(out, os.O_WRONLY | os.O_CREAT)
+        try:
+            headers = vrt.parse_vrt_signal_headers(receiver.ring, receiver.lengths[:counts[0]])
+            vrt.write_payloads(fd, receiver.payloads(headers, counts[0]))
+            counts.append(receiver.receive(timeout=1.0))
+            headers = vrt.parse_vrt_signal_headers(receiver.ring, receiver.lengths[:counts[1]])
+            vrt.write_payloads(fd, receiver.payloads(headers, counts[1]))
+        finally:
+            os.close(fd)
+    finally:
+        rx.close()
+        tx.close()
+
+    assert counts == [4, 2]
+    assert out.read_bytes() == b"".join(bytes([i]) * 64 for i in range(6))
+
+
+def _analyzer_stream(vrt, indexes, period=256, jitter=None):
+    np = pytest.importorskip("numpy")
+    indexes = np.asarray(indexes)
+    ts = 1_000_000 + indexes * period
+    if jitter is not None:
+        ts = ts + np.asarray(jitter)
+    return indexes & 0xF, ts, np.full(len(indexes), 1024)
+
+
+def test_stream_analyzer_counts_losses_beyond_counter_alias():
+    vrt = _load_vrt_rx()
+    analyzer = vrt.VRTStreamAnalyzer(period=256)
+    # 40 packets lost between index 9 and 50: invisible to the 4-bit counter alone (40 % 16 = 8).
+    pc, ts, nbytes = _analyzer_stream(vrt, list(range(10)) + list(range(50, 60)))
+
+    analyzer.update(pc[:7], ts[:7], nbytes[:7])
+    analyzer.update(pc[7:], ts[7:], nbytes[7:])
+
+    summary = analyzer.summary()
+    assert summary["packets"] == 20
+    assert summary["lost"] == 40
+    assert summary["max_gap"] == 40
+    assert summary["timestamp_jumps"] == 0
+    assert summary["loss_rate"] == pytest.approx(40 / 60)
+
+
+def test_stream_analyzer_detects_reorder_and_duplicates():
+    vrt = _load_vrt_rx()
+    analyzer = vrt.VRTStreamAnalyzer(period=256)
+    pc, ts, nbytes = _analyzer_stream(vrt, [0, 1, 3, 2, 4, 4, 5])
+
+    analyzer.update(pc, ts, nbytes)
+
+    summary = analyzer.summary()
+    assert summary["reordered"] == 1
+    assert summary["duplicates"] == 1
+    assert summary["lost"] == 0
+    assert summary["max_gap"] == 1
+
+
+def test_stream_analyzer_flags_timestamp_jump_and_trusts_counter():
+    vrt = _load_vrt_rx()
+    analyzer = vrt.VRTStreamAnalyzer(period=256)
+    pc, ts, nbytes = _analyzer_stream(vrt, range(8))
+    ts[4:] += 1_000_003 * 256 # Time set by host mid-stream.
+
+    analyzer.update(pc, ts, nbytes)
+
+    summary = analyzer.summary()
+    assert summary["timestamp_jumps"] == 1
+    assert summary["lost"] == 0
+
+
+def test_stream_analyzer_learns_period_and_builds_jitter_histogram():
+    np = pytest.importorskip("numpy")
+    vrt = _load_vrt_rx()
+    analyzer = vrt.VRTStreamAnalyzer(period=None, jitter_bin=10, jitter_bins=4)
+    jitter = np.array([0, 10, -10, 0, 30, 0, 0, -100])
+    pc, ts, nbytes = _analyzer_stream(vrt, range(8), period=8333, jitter=jitter)
+
+    analyzer.update(pc, ts, nbytes)
+    window = analyzer.roll()
+
+    assert analyzer.period == pytest.approx(8333, abs=20)
+    assert window["packets"] == 8
+    assert sum(window["jitter_hist"]) == 7
+    assert window["jitter_hist"][0] == 1  # Underflow bin.
+    assert window["jitter_rms"] > 0
+    assert analyzer.roll()["packets"] == 0
+    assert analyzer.summary()["packets"] == 8
+
+
+def _write_pcap(path, datagrams, dst_port=4991):
+    frames = []
+    for payload in datagrams:
+        udp = struct.pack(">HHHH", 1234, dst_port, 8 + len(payload), 0) + payload
+        ip  = struct.pack(">BBHHHBBH4s4s", 0x45, 0, 20 + len(udp), 0, 0x4000, 64, 17, 0,
+            socket.inet_aton("192.168.1.50"), socket.inet_aton("239.168.1.100")) + udp
+        eth = b"\x01\x00\x5e\x28\x01\x64" + b"\x10\xe2\xd5\x00\x00\x00" + b"\x08\x00" + ip
+        frames.append(eth)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<IHHiIII", 0xa1b2c3d4, 2, 4, 0, 0, 65535, 1))
+        for i, frame in enumerate(frames):
+            f.write(struct.pack("<IIII", i, 0, len(frame), len(frame)))
+            f.write(frame)
+
+
+def test_offline_pcap_and_packet_file_analysis(tmp_path, capsys):
+    pytest.importorskip("numpy")
+    vrt = _load_vrt_rx()
+    indexes = [0, 1, 2, 4, 5, 6, 7]
+    packets = [
+        _signal_packet(i, bytes(1024), timestamp_int=5, timestamp_fra=i * 256 * 1000 * 1000 // 30720 * 1000, tsf=2)
+        for i in indexes
+    ]
+    pcap = tmp_path / "capture.pcap"
+    _write_pcap(pcap, packets + [b"not-vrt"])
+    vrt_file = tmp_path / "capture.vrt"
+    vrt_file.write_bytes(b"".join(packets))
+
+    assert [pkt for _, pkt in vrt.iter_pcap_udp_payloads(pcap, port=4991)] == packets + [b"not-vrt"]
+    assert list(vrt.iter_pcap_udp_payloads(pcap, port=5000)) == []
+    assert list(vrt.iter_vrt_packet_file(vrt_file)) == packets
+
+    for source in [["--pcap", str(pcap)], ["--vrt-file", str(vrt_file)]]:
+        args = vrt.argparse.Namespace(
+            pcap=None, pcap_port=None, vrt_file=None, batch=4, slot_bytes=2048,
+            channels=2, bytes_per_complex=2, sample_rate=30.72e6, jitter_bin=100.0, json=True,
+        )
+        setattr(args, source[0][2:].replace("-", "_"), source[1])
+        vrt.run_offline(args)
+        summary = vrt.json.loads(capsys.readouterr().out.splitlines()[0])
+        assert summary["packets"] == 7
+        assert summary["lost"] == 1
+        assert summary["period"] == pytest.approx(256 * 1e9 / 30.72e6)
+
+
+def _demux_batch(vrt, packets):
+    ring, lengths = _fill_ring(vrt, [pkt for _, pkt in packets], slot_bytes=512)
+    headers = vrt.parse_vrt_signal_headers(ring, lengths)
+    views   = [memoryview(ring[i]) for i in range(len(packets))]
+    return headers, len(packets), [addr for addr, _ in packets], views
+
+
+def _two_board_packets(vrt, count=8):
+    packets = []
+    for i in range(count):
+        packets.append((("192.168.1.50", 1234), _signal_packet(i, bytes([0xa0 + i]) * 16, stream_id=1)))
+        packets.append((("192.168.1.51", 1234), _signal_packet(i, bytes([0xb0 + i]) * 16, stream_id=1)))
+        packets.append((("192.168.1.51", 1234), _signal_packet(i, bytes([0xc0 + i]) * 16, stream_id=2)))
+    return packets
+
+
+def test_ring_buffer_sink_keeps_latest_bytes():
+    vrt = _load_vrt_rx()
+    sink = vrt.RingBufferSink(8)
+
+    sink.write([b"abc", b"defgh"])
+    assert sink.read() == b"abcdefgh"
+    sink.write([b"ijk"])
+    assert sink.read() == b"defghijk"
+    sink.write([b"0123456789"])
+    assert sink.read() == b"23456789"
+    assert sink.total == 21
+
+
+def test_demultiplexer_splits_streams_in_process():
+    pytest.importorskip("numpy")
+    vrt = _load_vrt_rx()
+    demux = vrt.VRTDemultiplexer(vrt.SinkFactory(kind="ring", ring_bytes=1024),
+        analyzer_factory=vrt.StreamAnalyzerFactory())
+    packets = _two_board_packets(vrt)
+
+    demux.dispatch(*_demux_batch(vrt, packets[:10]))
+    demux.dispatch(*_demux_batch(vrt, packets[10:]))
+
+    streams = demux.table.streams
+    assert set(streams) == {
+        (("192.168.1.50", 1234), 1),
+        (("192.168.1.51", 1234), 1),
+        (("192.168.1.51", 1234), 2),
+    }
+    assert streams[(("192.168.1.51", 1234), 2)]["sink"].read() == b"".join(bytes([0xc0 + i]) * 16 for i in range(8))
+    summaries = demux.close()
+    for summary in summaries.values():
+        assert summary["packets"] == 8
+        assert summary["analysis"]["lost"] == 0
+
+
+def test_demultiplexer_worker_pool_writes_raw_and_sigmf_files(tmp_path):
+    pytest.importorskip("numpy")
+    vrt = _load_vrt_rx()
+    packets = _two_board_packets(vrt)
+
+    for kind in ["raw", "sigmf"]:
+        directory = tmp_path / kind
+        directory.mkdir()
+        demux = vrt.VRTDemultiplexer(
+            vrt.SinkFactory(kind=kind, directory=str(directory), sample_rate=30.72e6),
+            workers=2,
+        )
+        demux.dispatch(*_demux_batch(vrt, packets))
+        summaries = demux.close()
+
+        assert len(summaries) == 3
+        key = (("192.168.1.50", 1234), 1)
+        name = vrt.stream_name(key)
+        expected = b"".join(bytes([0xa0 + i]) * 16 for i in range(8))
+        if kind == "raw":
+            assert (directory / f"{name}.bin").read_bytes() == expected
+        else:
+            assert (directory / f"{name}.sigmf-data").read_bytes() == expected
+            meta = vrt.json.loads((directory / f"{name}.sigmf-meta").read_text())
+            assert meta["global"]["core:datatype"] == "ci8"
+            assert meta["global"]["core:sample_rate"] == 30.72e6
+            assert meta["global"]["m2sdr:vrt_stream_id"] == 1
+            assert meta["captures"][0]["core:datetime"].startswith("1970-01-01T00:00:12")
+
+
+def test_demultiplexer_applies_stream_context_to_sigmf_metadata(tmp_path):
+    pytest.importorskip("numpy")
+    vrt = _load_vrt_rx()
+    source = ("192.168.1.50", 1234)
+    packets = [(source, _context_packet(stream_id=1, sample_rate=15.36e6, rf_freq=433.92e6, item_bits=16, channels=1))]
+    packets += [(source, _signal_packet(i, bytes(16), stream_id=1)) for i in range(4)]
+    demux = vrt.VRTDemultiplexer(vrt.SinkFactory(kind="sigmf", directory=str(tmp_path)),
+        analyzer_factory=vrt.StreamAnalyzerFactory())
+
+    demux.dispatch(*_demux_batch(vrt, packets))
+    summaries = demux.close()
+
+    key = (source, 1)
+    assert summaries[key]["packets"] == 4
+    assert summaries[key]["analysis"]["period"] == pytest.approx(4 * 1e9 / 15.36e6)
+    meta = vrt.json.loads((tmp_path / f"{vrt.stream_name(key)}.sigmf-meta").read_text())
+    assert meta["global"]["core:datatype"] == "ci16_le"
+    assert meta["global"]["core:num_channels"] == 1
+    assert meta["global"]["core:sample_rate"] == 15.36e6
+    assert meta["captures"][0]["core:frequency"] == 433.92e6